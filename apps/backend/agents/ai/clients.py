@@ -22,13 +22,14 @@ except Exception:
     Gemini = None
 
 from agents.persistence.cache import instructor_cache
+from agents.ai.prompt_cache_telemetry import get_prompt_cache_telemetry
 from agents.config import ENABLE_ANTHROPIC_PROMPT_CACHING, LOG_ANTHROPIC_CACHE_METRICS, ENABLE_CACHE_METRICS_PROBE
 import langsmith as ls
 import logging
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -260,6 +261,42 @@ def _extract_anthropic_cache_metrics(result) -> tuple:
     except Exception:
         return None, None
 
+def _extract_input_tokens(result) -> Optional[int]:
+    """Uncached input tokens from a Claude response (or its instructor raw response), if reported."""
+    for obj in (result, getattr(result, '_raw_response', None), getattr(result, 'raw_response', None)):
+        usage = getattr(obj, 'usage', None) if obj is not None else None
+        if usage is None:
+            continue
+        tokens = getattr(usage, 'input_tokens', None)
+        if tokens is None and hasattr(usage, 'get'):
+            tokens = usage.get('input_tokens')
+        if isinstance(tokens, int):
+            return tokens
+    return None
+
+def _prompt_section(slide_generation: bool = False, visual_analysis: bool = False, theme_generation: bool = False) -> str:
+    if visual_analysis:
+        return "visual_analysis"
+    if slide_generation:
+        return "slide"
+    if theme_generation:
+        return "theme"
+    return "general"
+
+def _record_prompt_cache(result, model: str, section: str, deck_uuid: str = None, phash: str = None, label: str = "[CLAUDE CACHE]") -> tuple:
+    """Record a Claude response's cache usage in prompt-cache telemetry; returns (read, created)."""
+    read, created = _extract_anthropic_cache_metrics(result)
+    try:
+        outcome = get_prompt_cache_telemetry().record(
+            model, section, read, created,
+            input_tokens=_extract_input_tokens(result), deck_uuid=deck_uuid, phash=phash,
+        )
+        if LOG_ANTHROPIC_CACHE_METRICS:
+            logger.info(f"{label} {section} read={read}, created={created} ({outcome})")
+    except Exception:
+        pass
+    return read, created
+
 def get_client(model_name: str, api_key: str = None, base_url: str = None, wrap_with_instructor: bool = True):
     """
     Get a client for a given model. Accepts either a model alias (key in MODELS)
@@ -345,16 +382,7 @@ def invoke_with_cache(client, model, messages, response_model, invoke_kwargs) ->
             response_model=response_model,
             **invoke_kwargs
         )
-        # Best-effort cache metrics logging (may be None when wrapped)
-        try:
-            if LOG_ANTHROPIC_CACHE_METRICS and isinstance(model, str) and model.startswith("claude"):
-                import logging as _logging
-                _logger = _logging.getLogger(__name__)
-                _read, _created = _extract_anthropic_cache_metrics(res)
-                _logger.info(f"[CLAUDE CACHE] read={_read}, created={_created}")
-                print(f"[CLAUDE CACHE] read={_read}, created={_created}")
-        except Exception:
-            pass
+        # Cache metrics are recorded by invoke() once the call returns
         return res
     else:
         # OpenAI-style clients use chat.completions.create
@@ -409,6 +437,7 @@ def invoke(
         AITimeoutError,
         AIGenerationError
     )
+    from agents.generation.components.prompt_tokens import count_tokens
     
     # Extract our custom parameters for logging (support both styles)
     deck_uuid = deck_uuid or kwargs.pop('deck_uuid', None)
@@ -421,10 +450,6 @@ def invoke(
     temperature = kwargs.pop('temperature', temperature)
     max_tokens = kwargs.pop('max_tokens', max_tokens)
     
-    # Calculate prompt size
-    prompt_chars = sum(len(msg.get('content', '')) for msg in messages)
-    approx_tokens = prompt_chars // 4
-    
     # Save prompts for debugging - especially for Claude models
     if model.startswith("claude"):
         try:
@@ -451,7 +476,8 @@ def invoke(
             
             prompt_file = output_dir / f"{prompt_type}_{model}_{timestamp}.json"
             
-            # Calculate approximate token count for ALL messages
+            # Token count for ALL messages (tokenizer-based, see prompt_tokens)
+            total_tokens = 0
             total_chars = 0
             message_breakdown = []
             
@@ -463,9 +489,10 @@ def invoke(
                 if isinstance(msg.get("content"), str):
                     # Simple string content
                     cleaned_msg["content"] = msg["content"]
-                    char_count = len(msg["content"])
-                    total_chars += char_count
-                    message_breakdown.append(f"  - {msg['role']}: {char_count // 4} tokens")
+                    total_chars += len(msg["content"])
+                    message_tokens = count_tokens(msg["content"])
+                    total_tokens += message_tokens
+                    message_breakdown.append(f"  - {msg['role']}: {message_tokens} tokens")
                 elif isinstance(msg.get("content"), list):
                     # Complex content (may include images)
                     cleaned_content = []
@@ -473,8 +500,7 @@ def invoke(
                         if isinstance(item, dict):
                             if item.get("type") == "text":
                                 cleaned_content.append(item)
-                                text_len = len(item.get("text", ""))
-                                total_chars += text_len
+                                total_chars += len(item.get("text", ""))
                             elif item.get("type") == "image":
                                 # Replace image data with placeholder
                                 cleaned_content.append({
@@ -489,15 +515,16 @@ def invoke(
                             cleaned_content.append(item)
                     cleaned_msg["content"] = cleaned_content
                     # Calculate tokens for this message
-                    text_chars = sum(len(item.get("text", "")) for item in cleaned_content 
-                                   if isinstance(item, dict) and item.get("type") == "text")
-                    message_breakdown.append(f"  - {msg['role']}: {text_chars // 4} tokens")
+                    message_tokens = sum(count_tokens(item.get("text", "")) for item in cleaned_content
+                                         if isinstance(item, dict) and item.get("type") == "text")
+                    total_tokens += message_tokens
+                    message_breakdown.append(f"  - {msg['role']}: {message_tokens} tokens")
                 else:
                     cleaned_msg["content"] = msg.get("content")
                 
                 cleaned_messages.append(cleaned_msg)
             
-            approx_tokens = total_chars // 4  # Rough approximation
+            approx_tokens = total_tokens
             
             # Log a warning for large prompts
             if approx_tokens > 5000:
@@ -601,6 +628,8 @@ def invoke(
     # Convert user message with cache delimiter into Anthropic content blocks (for Claude)
     CACHE_DELIM = "\n<<<CACHE_BREAKPOINT>>>\n"
     cache_static_id = None
+    cache_section = _prompt_section(slide_generation, visual_analysis, theme_generation)
+    cache_prefix_hash = None
     if ENABLE_ANTHROPIC_PROMPT_CACHING and isinstance(model, str) and model.startswith("claude"):
         if deck_uuid:
             cache_static_id = f"deck:{deck_uuid}"
@@ -619,6 +648,9 @@ def invoke(
             if _msg.get("role") == "user" and isinstance(_msg.get("content"), str) and CACHE_DELIM in _msg["content"]:
                 if model.startswith("claude") and ENABLE_ANTHROPIC_PROMPT_CACHING:
                     pre, post = _msg["content"].split(CACHE_DELIM, 1)
+                    cache_prefix_hash = get_prompt_cache_telemetry().note_prefix(
+                        deck_uuid, model, system_content, pre, slide_index=slide_index, section=cache_section
+                    )
                     cache_control = {"type": "ephemeral"}
                     _msg["content"] = [
                         {"type": "text", "text": pre, "cache_control": cache_control},
@@ -627,6 +659,10 @@ def invoke(
                 else:
                     # Remove delimiter for non-Claude providers to avoid extra tokens
                     _msg["content"] = _msg["content"].replace(CACHE_DELIM, "\n")
+        if cache_prefix_hash is None and system_content and model.startswith("claude") and ENABLE_ANTHROPIC_PROMPT_CACHING:
+            cache_prefix_hash = get_prompt_cache_telemetry().note_prefix(
+                deck_uuid, model, system_content, None, slide_index=slide_index, section=cache_section
+            )
     except Exception:
         pass
     
@@ -699,19 +735,8 @@ def invoke(
                         messages=filtered_messages,
                         **anthropic_kwargs
                     )
-                    # Optional: log Anthropic cache metrics
-                    try:
-                        if LOG_ANTHROPIC_CACHE_METRICS and model.startswith("claude"):
-                            logger.info(
-                                f"[CLAUDE CACHE] read={getattr(result,'cache_read_input_tokens', None)}, "
-                                f"created={getattr(result,'cache_creation_input_tokens', None)}"
-                            )
-                            print(
-                                f"[CLAUDE CACHE] read={getattr(result,'cache_read_input_tokens', None)}, "
-                                f"created={getattr(result,'cache_creation_input_tokens', None)}"
-                            )
-                    except Exception:
-                        pass
+                    if model.startswith("claude"):
+                        _record_prompt_cache(result, model, cache_section, deck_uuid, cache_prefix_hash)
                     # Extract text content
                     try:
                         content = result.content[0].text
@@ -841,48 +866,50 @@ def invoke(
                             claude_kwargs['system'] = system_content
                         if ENABLE_ANTHROPIC_PROMPT_CACHING:
                             _ensure_anthropic_prompt_cache_headers(claude_kwargs)
-                        # Proactively prewarm cache with raw Anthropic call using the exact content blocks
-                        try:
-                            raw_client, _ = get_client(model, wrap_with_instructor=False)
-                            # Build prewarm system and user static block if available
-                            prewarm_system = claude_kwargs.get('system') if ENABLE_ANTHROPIC_PROMPT_CACHING else (system_content or "")
-                            prewarm_user = None
+                        # Prewarm the cache with a raw Anthropic call using the exact content blocks,
+                        # unless this prefix was written/read recently enough to still be cached
+                        telemetry = get_prompt_cache_telemetry()
+                        if telemetry.is_warm(cache_prefix_hash):
+                            telemetry.note_prewarm_skipped()
+                        else:
                             try:
-                                for _m in filtered_messages:
-                                    if _m.get('role') == 'user':
-                                        c = _m.get('content')
-                                        if isinstance(c, list) and len(c) > 0 and isinstance(c[0], dict) and c[0].get('cache_control'):
-                                            # Use only the cached static block for prewarm
-                                            prewarm_user = [c[0], {"type": "text", "text": "OK"}]
-                                        break
+                                raw_client, _ = get_client(model, wrap_with_instructor=False)
+                                # Build prewarm system and user static block if available
+                                prewarm_system = claude_kwargs.get('system') if ENABLE_ANTHROPIC_PROMPT_CACHING else (system_content or "")
+                                prewarm_user = None
+                                try:
+                                    for _m in filtered_messages:
+                                        if _m.get('role') == 'user':
+                                            c = _m.get('content')
+                                            if isinstance(c, list) and len(c) > 0 and isinstance(c[0], dict) and c[0].get('cache_control'):
+                                                # Use only the cached static block for prewarm
+                                                prewarm_user = [c[0], {"type": "text", "text": "OK"}]
+                                            break
+                                except Exception:
+                                    pass
+                                if prewarm_user is not None:
+                                    prewarm_res = raw_client.messages.create(
+                                        model=model,
+                                        system=prewarm_system,
+                                        messages=[{"role": "user", "content": prewarm_user}],
+                                        max_tokens=1,
+                                        temperature=0
+                                    )
+                                    _record_prompt_cache(prewarm_res, model, "prewarm", deck_uuid, cache_prefix_hash, label="[CLAUDE CACHE PREWARM]")
                             except Exception:
                                 pass
-                            if prewarm_user is not None:
-                                _ = raw_client.messages.create(
-                                    model=model,
-                                    system=prewarm_system,
-                                    messages=[{"role": "user", "content": prewarm_user}],
-                                    max_tokens=1,
-                                    temperature=0
-                                )
-                        except Exception:
-                            pass
                         result = client.create(
                             model=model,
                             messages=filtered_messages,
                             response_model=response_model,
                             **claude_kwargs
                         )
+                        # Optional: issue a tiny probe call when the wrapped response carries no cache metrics
                         try:
-                            if LOG_ANTHROPIC_CACHE_METRICS and model.startswith("claude"):
-                                read, created = _extract_anthropic_cache_metrics(result)
-                                logger.info(f"[CLAUDE CACHE] read={read}, created={created}")
-                                print(f"[CLAUDE CACHE] read={read}, created={created}")
-                        except Exception:
-                            pass
-                        # Optional: issue a tiny probe call to force cache metrics logging
-                        try:
-                            if ENABLE_CACHE_METRICS_PROBE and model.startswith("claude"):
+                            if (
+                                ENABLE_CACHE_METRICS_PROBE and model.startswith("claude")
+                                and _extract_anthropic_cache_metrics(result) == (None, None)
+                            ):
                                 raw_client, _ = get_client(model, wrap_with_instructor=False)
                                 # Build system for probe
                                 probe_system = None
@@ -910,9 +937,7 @@ def invoke(
                                     max_tokens=1,
                                     temperature=0
                                 )
-                                pr, pc = _extract_anthropic_cache_metrics(probe_res)
-                                logger.info(f"[CLAUDE CACHE PROBE] read={pr}, created={pc}")
-                                print(f"[CLAUDE CACHE PROBE] read={pr}, created={pc}")
+                                _record_prompt_cache(probe_res, model, "probe", deck_uuid, cache_prefix_hash, label="[CLAUDE CACHE PROBE]")
                         except Exception:
                             pass
                     else:
@@ -959,13 +984,8 @@ def invoke(
                         **std_kwargs
                     )
 
-            if LOG_ANTHROPIC_CACHE_METRICS and isinstance(model, str) and model.startswith("claude"):
-                try:
-                    read, created = _extract_anthropic_cache_metrics(result)
-                    logger.info(f"[CLAUDE CACHE] read={read}, created={created}")
-                    print(f"[CLAUDE CACHE] read={read}, created={created}")
-                except Exception:
-                    pass
+            if isinstance(model, str) and model.startswith("claude"):
+                _record_prompt_cache(result, model, cache_section, deck_uuid, cache_prefix_hash)
 
             if not stream:
                 rt.end(outputs={"output": result.model_dump_json()})
@@ -1136,13 +1156,8 @@ def invoke(
                                     response_model=response_model,
                                     **claude_kwargs2
                                 )
-                                if LOG_ANTHROPIC_CACHE_METRICS and model.startswith("claude"):
-                                    try:
-                                        read2, created2 = _extract_anthropic_cache_metrics(result2)
-                                        logger.info(f"[CLAUDE CACHE RETRY DISABLED] read={read2}, created={created2}")
-                                        print(f"[CLAUDE CACHE RETRY DISABLED] read={read2}, created={created2}")
-                                    except Exception:
-                                        pass
+                                if model.startswith("claude"):
+                                    _record_prompt_cache(result2, model, cache_section, deck_uuid, label="[CLAUDE CACHE RETRY DISABLED]")
                                 if not stream:
                                     try:
                                         rt.end(outputs={"output": result2.model_dump_json()})
@@ -0,0 +1,283 @@
+"""
+Anthropic prompt-cache telemetry.
+
+Aggregates cache reads/writes/misses reported in the usage block of Claude
+responses per deck, model and prompt section (slide, theme, visual_analysis,
+prewarm, ...), and watches the cacheable prefix (system prompt + static user
+block) of every call. If the prefix changes between slides of the same deck,
+the cache is silently rebuilt for every slide; each change is counted and
+logged so it shows up in ``GET /api/v1/prompt-cache/stats``.
+
+The prefix helpers are shared with ``scripts/replay_prompt_cache.py`` which
+scores captured prompts offline.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_BREAKPOINT = "\n<<<CACHE_BREAKPOINT>>>\n"
+
+# Anthropic ephemeral cache entries live 5 minutes (refreshed on every read)
+PROMPT_CACHE_TTL_SECONDS = float(os.getenv("PROMPT_CACHE_TTL_SECONDS", "300"))
+# Shorter than the TTL so a prefix is re-written before it can expire mid-request
+PROMPT_CACHE_WARM_SECONDS = float(os.getenv("PROMPT_CACHE_WARM_SECONDS", "270"))
+PROMPT_CACHE_TELEMETRY_MAX_DECKS = int(os.getenv("PROMPT_CACHE_TELEMETRY_MAX_DECKS", "256"))
+
+
+def prefix_hash(system_text: Optional[str], static_text: Optional[str]) -> str:
+    """Hash of the cacheable prefix: system prompt followed by the static user block."""
+    digest = hashlib.sha256()
+    digest.update((system_text or "").encode("utf-8"))
+    digest.update(b"\x1e")
+    digest.update((static_text or "").encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _text_of(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            item.get("text", "") for item in content if isinstance(item, dict) and item.get("type") == "text"
+        )
+    return ""
+
+
+def split_cacheable(messages: List[Dict[str, Any]]) -> Tuple[str, str, str]:
+    """
+    Split chat messages into (system, static_block, dynamic_rest).
+
+    The static block is the part of the first user message before the cache
+    breakpoint (string delimiter or a content block carrying ``cache_control``).
+    Everything else is uncacheable.
+    """
+    system_parts: List[str] = []
+    static = ""
+    dynamic_parts: List[str] = []
+    seen_user = False
+    for msg in messages:
+        role = msg.get("role")
+        content = msg.get("content")
+        if role == "system":
+            system_parts.append(_text_of(content))
+            continue
+        if role == "user" and not seen_user:
+            seen_user = True
+            if isinstance(content, str) and CACHE_BREAKPOINT in content:
+                static, rest = content.split(CACHE_BREAKPOINT, 1)
+                dynamic_parts.append(rest)
+                continue
+            if isinstance(content, list) and content and isinstance(content[0], dict) and content[0].get("cache_control"):
+                static = content[0].get("text", "")
+                dynamic_parts.append(_text_of(content[1:]))
+                continue
+        dynamic_parts.append(_text_of(content))
+    return "\n".join(system_parts), static, "\n".join(dynamic_parts)
+
+
+_OUTCOME_COUNTER = {"hit": "hits", "write": "writes", "miss": "misses", "unknown": "unknown"}
+
+
+def _empty_counters() -> Dict[str, int]:
+    return {
+        "calls": 0,
+        "hits": 0,
+        "writes": 0,
+        "misses": 0,
+        "unknown": 0,
+        "cache_read_tokens": 0,
+        "cache_write_tokens": 0,
+        "uncached_input_tokens": 0,
+    }
+
+
+def _with_rates(counters: Dict[str, int]) -> Dict[str, Any]:
+    known = counters["hits"] + counters["writes"] + counters["misses"]
+    cached_tokens = counters["cache_read_tokens"] + counters["cache_write_tokens"] + counters["uncached_input_tokens"]
+    return {
+        **counters,
+        "hit_rate": round(counters["hits"] / known, 3) if known else None,
+        "token_hit_rate": round(counters["cache_read_tokens"] / cached_tokens, 3) if cached_tokens else None,
+    }
+
+
+class PromptCacheTelemetry:
+    """Thread-safe aggregation of prompt-cache usage and prefix stability."""
+
+    def __init__(self, max_decks: int = PROMPT_CACHE_TELEMETRY_MAX_DECKS):
+        self.max_decks = max_decks
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals = _empty_counters()
+            self._by_model: Dict[str, Dict[str, int]] = {}
+            self._by_section: Dict[str, Dict[str, int]] = {}
+            self._by_deck: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+            # (deck, model, section) -> last prefix seen for that deck
+            self._last_prefix: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+            # prefix hash -> monotonic time the cache entry was last written or read
+            self._warm: "OrderedDict[str, float]" = OrderedDict()
+            self._static_changes = 0
+            self._prewarms_skipped = 0
+            self._recent_changes: deque = deque(maxlen=50)
+
+    def _deck_entry(self, deck_uuid: str) -> Dict[str, Any]:
+        entry = self._by_deck.get(deck_uuid)
+        if entry is None:
+            entry = {"counters": _empty_counters(), "static_changes": 0, "prefixes": set()}
+            self._by_deck[deck_uuid] = entry
+            while len(self._by_deck) > self.max_decks:
+                self._by_deck.popitem(last=False)
+        else:
+            self._by_deck.move_to_end(deck_uuid)
+        return entry
+
+    def note_prefix(
+        self,
+        deck_uuid: Optional[str],
+        model: str,
+        system_text: Optional[str],
+        static_text: Optional[str],
+        slide_index: Optional[int] = None,
+        section: str = "slide",
+    ) -> str:
+        """
+        Record the cacheable prefix for a call and return its hash. A different
+        system or static block than the previous call for the same deck, model
+        and section is counted as a static-block change.
+        """
+        phash = prefix_hash(system_text, static_text)
+        if not deck_uuid:
+            return phash
+        system_hash = prefix_hash(system_text, None)
+        key = (deck_uuid, model, section)
+        with self._lock:
+            deck = self._deck_entry(deck_uuid)
+            deck["prefixes"].add(phash)
+            previous = self._last_prefix.get(key)
+            self._last_prefix[key] = {"hash": phash, "system_hash": system_hash, "slide_index": slide_index}
+            self._last_prefix.move_to_end(key)
+            while len(self._last_prefix) > self.max_decks * 2:
+                self._last_prefix.popitem(last=False)
+            if previous is None or previous["hash"] == phash:
+                return phash
+            part = "system" if previous["system_hash"] != system_hash else "static_block"
+            self._static_changes += 1
+            deck["static_changes"] += 1
+            self._recent_changes.append({
+                "deck_uuid": deck_uuid,
+                "model": model,
+                "section": section,
+                "changed": part,
+                "from_slide": previous.get("slide_index"),
+                "to_slide": slide_index,
+                "at": time.time(),
+            })
+        logger.warning(
+            f"[PROMPT CACHE] {part} changed for deck {deck_uuid} ({model}, {section}) between slide "
+            f"{previous.get('slide_index')} and {slide_index}; cached prefix will be rewritten"
+        )
+        return phash
+
+    def is_warm(self, phash: Optional[str]) -> bool:
+        """True if ``phash`` was written or read recently enough to still be cached."""
+        if not phash:
+            return False
+        with self._lock:
+            seen = self._warm.get(phash)
+        return seen is not None and time.monotonic() - seen < PROMPT_CACHE_WARM_SECONDS
+
+    def mark_warm(self, phash: Optional[str]) -> None:
+        if not phash:
+            return
+        with self._lock:
+            self._warm[phash] = time.monotonic()
+            self._warm.move_to_end(phash)
+            while len(self._warm) > self.max_decks * 4:
+                self._warm.popitem(last=False)
+
+    def note_prewarm_skipped(self) -> None:
+        with self._lock:
+            self._prewarms_skipped += 1
+
+    def record(
+        self,
+        model: str,
+        section: str,
+        cache_read: Optional[int],
+        cache_created: Optional[int],
+        input_tokens: Optional[int] = None,
+        deck_uuid: Optional[str] = None,
+        phash: Optional[str] = None,
+    ) -> str:
+        """Record one response's cache usage; returns the outcome (hit/write/miss/unknown)."""
+        if cache_read is None and cache_created is None:
+            outcome = "unknown"
+        elif cache_read:
+            outcome = "hit"
+        elif cache_created:
+            outcome = "write"
+        else:
+            outcome = "miss"
+        buckets = []
+        with self._lock:
+            buckets.append(self._totals)
+            buckets.append(self._by_model.setdefault(model, _empty_counters()))
+            buckets.append(self._by_section.setdefault(section, _empty_counters()))
+            if deck_uuid:
+                buckets.append(self._deck_entry(deck_uuid)["counters"])
+            for counters in buckets:
+                counters["calls"] += 1
+                counters[_OUTCOME_COUNTER[outcome]] += 1
+                counters["cache_read_tokens"] += cache_read or 0
+                counters["cache_write_tokens"] += cache_created or 0
+                counters["uncached_input_tokens"] += input_tokens or 0
+        if outcome in ("hit", "write"):
+            self.mark_warm(phash)
+        return outcome
+
+    def get_stats(self, deck_uuid: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            if deck_uuid:
+                entry = self._by_deck.get(deck_uuid)
+                if entry is None:
+                    return {"deck_uuid": deck_uuid, "found": False}
+                return {
+                    "deck_uuid": deck_uuid,
+                    "found": True,
+                    **_with_rates(entry["counters"]),
+                    "static_changes": entry["static_changes"],
+                    "distinct_prefixes": len(entry["prefixes"]),
+                    "recent_changes": [c for c in self._recent_changes if c["deck_uuid"] == deck_uuid],
+                }
+            return {
+                "totals": _with_rates(self._totals),
+                "by_model": {name: _with_rates(c) for name, c in self._by_model.items()},
+                "by_section": {name: _with_rates(c) for name, c in self._by_section.items()},
+                "decks_tracked": len(self._by_deck),
+                "static_changes": self._static_changes,
+                "prewarms_skipped": self._prewarms_skipped,
+                "recent_changes": list(self._recent_changes),
+            }
+
+
+_telemetry: Optional[PromptCacheTelemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_prompt_cache_telemetry() -> PromptCacheTelemetry:
+    global _telemetry
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                _telemetry = PromptCacheTelemetry()
+    return _telemetry
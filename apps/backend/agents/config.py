@@ -124,6 +124,8 @@ USE_AGENT_THEMER = os.getenv('USE_AGENT_THEMER', 'true').lower() == 'true'
 #==============================================================================
 
 CACHE_DIR = "/tmp/chat-api-cache"
+# Durable local state (job queue, ...) that must survive a reboot, unlike CACHE_DIR
+APP_DATA_DIR = os.getenv("APP_DATA_DIR", os.path.join(os.path.expanduser("~"), ".nextslide"))
 USE_CACHE = False
 
 # Enable Anthropic prompt caching for Claude models (5-minute TTL via ephemeral cache blocks)
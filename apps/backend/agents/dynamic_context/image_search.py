@@ -93,14 +93,8 @@ def get_image_search_context(component_request: str, num_results: int = 3) -> Op
             )
             return results.get('photos', [])
         
-        # Get event loop and run the async function
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        photos = loop.run_until_complete(search())
+        # asyncio.run closes the loop afterwards, so the pooled HTTP session it used is closed too
+        photos = asyncio.run(search())
         
         if not photos:
             return None
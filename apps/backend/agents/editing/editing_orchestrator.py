@@ -1,5 +1,5 @@
-from typing import Union, List, TypedDict, Dict, Tuple
-from pydantic import BaseModel, Field, create_model
+from typing import List, TypedDict, Dict, Tuple
+from pydantic import BaseModel
 
 try:
     from langgraph.graph import StateGraph, START, END
@@ -16,9 +16,9 @@ except Exception:
 from models.registry import ComponentRegistry
 from models.deck import DeckDiff, DeckDiffBase
 from models.requests import ChatMessage
-from models.tools import undefined_tool, get_tools_descriptions
+from models.tools import undefined_tool
 
-from agents.editing.tools.registry import get_tools_and_call_map
+from agents.editing.tools.registry import get_call_map, get_tool_models
 
 from agents.ai.clients import get_client, invoke
 from agents.config import ORCHESTRATOR_MODEL
@@ -100,28 +100,18 @@ def orchestrate(state: AgentState, event_cb=None):
     # Resolve current slide id for both typed and dict slides
     _cur = state.get('current_slide', {})
     _cur_id = getattr(_cur, 'id', None) if not isinstance(_cur, dict) else _cur.get('id')
-    tools, _map = get_tools_and_call_map(
+    tool_models = get_tool_models(
         deck_data=state.get('deck_data', {}),
         registry=state.get('registry', {}),
         current_slide_id=_cur_id,
     )
-    call_map.update(_map)
+    call_map.update(get_call_map())
 
-    descriptions = get_tools_descriptions(tools)
-
-    prompt = get_orchestrator_prompt(state, descriptions)
+    prompt = get_orchestrator_prompt(state, tool_models.descriptions)
     client, model = get_client(ORCHESTRATOR_MODEL)
 
-    # Dynamically create the EditRequest model based on the available ids and types
-    EditRequest = create_model("EditRequest", 
-        edit_request_summary=(str, Field(description="A succinct description of the edit request")),
-        tool=(
-            Union[tuple(tools)], Field(description="The tool call to use to edit the deck"))
-    )
-
-    ToolsCalls = create_model("ToolsCalls", 
-        tool_calls=(List[EditRequest], Field(description="The list of tool calls to use to edit the deck"))
-    )
+    # EditRequest/ToolsCalls are built from the available ids and types and cached per deck shape
+    ToolsCalls = tool_models.tools_calls_model
 
     # Resolve canvas size for typed/dict deck_data for system prompt
     _deck_for_size = state.get('deck_data', {})
@@ -135,15 +135,20 @@ class EditComponentArgs(ToolModel):
     edit_request: str = Field(description="The detailed description of the edit request for the component. Ensure the instructions are specific and clear enough to be implemented by the editor.")
     relevant_component_ids: List[Union[str]] = Field(description="The ids of the components that are relevant to the edit request")
 
-def get_edit_component_model(deck_data: dict, component_types: List[str], component_ids: List[str], slide_ids: List[str]) -> BaseModel:
+def get_component_infos(deck_data: dict, component_ids: List[str]) -> List[tuple]:
+    """(component_id, component_type, slide_id) for each id found in the deck."""
     infos = []
     for component_id in component_ids:
         info = get_component_info(deck_data, component_id)
-        print(info)
         if not info:
             # Skip components not found (e.g., when frontend didn't include selection)
             continue
         infos.append((component_id, info["component_type"], info["slide_id"]))
+    return infos
+
+def get_edit_component_model(deck_data: dict, component_types: List[str], component_ids: List[str], slide_ids: List[str], infos: List[tuple] | None = None) -> BaseModel:
+    if infos is None:
+        infos = get_component_infos(deck_data, component_ids)
 
     models = []
     for cid, ctype, sid in infos:
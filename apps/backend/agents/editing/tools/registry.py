@@ -1,6 +1,13 @@
-from typing import List, Dict, Any, Tuple
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple, Union
+
+from pydantic import Field, create_model
 
 from models.registry import ComponentRegistry
+from models.tools import CachedSchemaModel, get_tools_descriptions
 
 from agents.editing.tools.component import (
     EditComponentArgs,
@@ -12,6 +19,7 @@ from agents.editing.tools.component import (
     remove_component,
     replace_component,
     get_create_new_component_model,
+    get_component_infos,
     get_edit_component_model,
     get_replace_component_model,
 )
@@ -53,28 +61,51 @@ from agents.editing.tools.firecrawl import (
     FirecrawlFetchArgs,
     firecrawl_fetch,
 )
-from utils.deck import get_all_component_ids, get_all_slide_ids
+from utils.deck import get_all_component_ids
 
 
-def get_tools_and_call_map(
-    deck_data: Dict[str, Any],
-    registry: ComponentRegistry,
-    current_slide_id: str | None,
-) -> Tuple[List[Any], Dict[str, Any]]:
+# Tool models built per (component types, targetable component ids); see get_tool_models
+TOOL_MODEL_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class ToolModelSet:
+    """Tool argument models plus the EditRequest/ToolsCalls response models built from them."""
+    tools: Tuple[Any, ...]
+    edit_request_model: Any
+    tools_calls_model: Any
+    descriptions: str
+
+
+_tool_model_cache: "OrderedDict[Tuple[Tuple[str, ...], str], ToolModelSet]" = OrderedDict()
+_tool_model_cache_lock = threading.Lock()
+_tool_model_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _fingerprint(infos: List[tuple]) -> str:
+    digest = hashlib.sha256()
+    for info in infos:
+        digest.update("\x1f".join(str(part) for part in info).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def _build_tool_models(component_types: List[str], infos: List[tuple]) -> ToolModelSet:
     tools = [
         get_edit_component_model(
-            deck_data=deck_data,
-            component_types=registry.get_component_types(),
-            component_ids=get_all_component_ids(deck_data, current_slide_id),
-            slide_ids=get_all_slide_ids(deck_data),
+            deck_data={},
+            component_types=component_types,
+            component_ids=[info[0] for info in infos],
+            slide_ids=[],
+            infos=infos,
         ),
-        get_create_new_component_model(component_types=registry.get_component_types()),
-        get_replace_component_model(component_types=registry.get_component_types()),
+        get_create_new_component_model(component_types=component_types),
+        get_replace_component_model(component_types=component_types),
         RemoveComponentArgs,
         StyleSlideArgs,
         UpdateBackgroundArgs,
-        get_create_slide_model(get_all_slide_ids(deck_data)),
-        get_duplicate_slide_model(get_all_slide_ids(deck_data)),
+        get_create_slide_model([]),
+        get_duplicate_slide_model([]),
         RemoveSlideArgs,
         InsertImageArgs,
         InsertAttachmentArgs,
@@ -88,6 +119,68 @@ def get_tools_and_call_map(
         FirecrawlFetchArgs,
     ]
 
+    # Dynamically create the EditRequest model based on the available ids and types
+    EditRequest = create_model("EditRequest",
+        __base__=CachedSchemaModel,
+        edit_request_summary=(str, Field(description="A succinct description of the edit request")),
+        tool=(
+            Union[tuple(tools)], Field(description="The tool call to use to edit the deck"))
+    )
+
+    ToolsCalls = create_model("ToolsCalls",
+        __base__=CachedSchemaModel,
+        tool_calls=(List[EditRequest], Field(description="The list of tool calls to use to edit the deck"))
+    )
+    # Generate (and cache) the schema sent to the LLM up front
+    ToolsCalls.model_json_schema()
+
+    return ToolModelSet(
+        tools=tuple(tools),
+        edit_request_model=EditRequest,
+        tools_calls_model=ToolsCalls,
+        descriptions=get_tools_descriptions(tools),
+    )
+
+
+def get_tool_models(
+    deck_data: Dict[str, Any],
+    registry: ComponentRegistry,
+    current_slide_id: str | None,
+) -> ToolModelSet:
+    """
+    Return the tool models for a deck, memoized by the registry's component types
+    and the (component id, type, slide id) set the edit tool may target, so
+    back-to-back edits on the same deck skip model and schema construction.
+    """
+    component_types = registry.get_component_types()
+    infos = get_component_infos(deck_data, get_all_component_ids(deck_data, current_slide_id))
+    key = (tuple(component_types), _fingerprint(infos))
+
+    with _tool_model_cache_lock:
+        cached = _tool_model_cache.get(key)
+        if cached is not None:
+            _tool_model_cache.move_to_end(key)
+            _tool_model_cache_stats["hits"] += 1
+            return cached
+        _tool_model_cache_stats["misses"] += 1
+
+    model_set = _build_tool_models(component_types, infos)
+
+    with _tool_model_cache_lock:
+        _tool_model_cache[key] = model_set
+        _tool_model_cache.move_to_end(key)
+        while len(_tool_model_cache) > TOOL_MODEL_CACHE_SIZE:
+            _tool_model_cache.popitem(last=False)
+            _tool_model_cache_stats["evictions"] += 1
+    return model_set
+
+
+def get_tool_model_cache_stats() -> Dict[str, int]:
+    with _tool_model_cache_lock:
+        return {**_tool_model_cache_stats, "size": len(_tool_model_cache)}
+
+
+def get_call_map() -> Dict[str, Any]:
     call_map = {
         "edit_component": edit_component,
         "create_new_component": create_new_component,
@@ -111,6 +204,12 @@ def get_tools_and_call_map(
         "firecrawl_fetch": firecrawl_fetch,
     }
 
-    return tools, call_map
+    return call_map
 
 
+def get_tools_and_call_map(
+    deck_data: Dict[str, Any],
+    registry: ComponentRegistry,
+    current_slide_id: str | None,
+) -> Tuple[List[Any], Dict[str, Any]]:
+    return list(get_tool_models(deck_data, registry, current_slide_id).tools), get_call_map()
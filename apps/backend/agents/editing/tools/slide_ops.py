@@ -4,16 +4,16 @@ from typing import List, Optional, Dict, Any, Literal
 from pydantic import BaseModel, Field, create_model
 import uuid as _uuid
 import json
-import io
-from io import BytesIO
-import csv
 import urllib.request
 
+import numpy as np
+
 from models.tools import ToolModel
 from models.deck import DeckBase, DeckDiff, DeckDiffBase
 from models.slide import SlideBase
 from models.registry import ComponentRegistry
 from utils.deck import find_current_slide
+from services.tabular_ingestion import TabularData, ingest_csv, ingest_xlsx
 
 
 class CreateSlideArgs(ToolModel):
@@ -259,25 +259,20 @@ def _default_colors(n: int) -> List[str]:
     return colors
 
 
+def _table_items(table: Optional[TabularData]) -> List[Dict[str, Any]]:
+    """First column as labels, second as numeric values (rows without a number are skipped)."""
+    if not table or len(table.columns) < 2:
+        return []
+    labels = table.labels(0)
+    values = table.numeric(1)
+    return [{"name": labels[i], "value": float(values[i])} for i in np.flatnonzero(~np.isnan(values))]
+
+
 def _build_chart_from_csv(csv_text: str, title: Optional[str] = None) -> Dict[str, Any]:
-    reader = csv.reader(io.StringIO(csv_text))
-    rows = [r for r in reader if r]
-    headers = rows[0] if rows else []
-    data_rows = rows[1:11]  # limit
+    table = ingest_csv(csv_text, limit=10)  # limit
+    headers = table.headers if table else []
     # Simple categorical mapping: first column labels, second numeric value
-    items: List[Dict[str, Any]] = []
-    for r in data_rows:
-        if len(r) < 2:
-            continue
-        name = str(r[0])
-        try:
-            value = float(r[1])
-        except Exception:
-            try:
-                value = float(str(r[1]))
-            except Exception:
-                continue
-        items.append({"name": name, "value": value})
+    items = _table_items(table)
 
     colors = _default_colors(len(items))
     for idx, item in enumerate(items):
@@ -310,45 +305,13 @@ def _build_chart_from_excel(xlsx_bytes: bytes, title: Optional[str] = None) -> O
     - Chooses 'line' chart if header suggests dates, else 'bar'
     """
     try:
-        import openpyxl  # type: ignore
-    except Exception:
-        return None
-
-    try:
-        wb = openpyxl.load_workbook(BytesIO(xlsx_bytes), read_only=True, data_only=True)
-        ws = wb.active
-        rows: List[List[Any]] = []
-        for row in ws.iter_rows(values_only=True):
-            # Keep rows that have at least one non-empty value
-            if any(cell is not None and cell != "" for cell in row):
-                rows.append([cell for cell in row])
-        if len(rows) < 2:
+        table = ingest_xlsx(xlsx_bytes, limit=50)  # cap for safety
+        if not table or not table.row_count:
             return None
-        headers = [str(h) if h is not None else "" for h in (rows[0] or [])]
-        data_rows = rows[1:51]  # cap for safety
+        headers = table.headers
 
         # Use first two columns
-        items: List[Dict[str, Any]] = []
-        for r in data_rows:
-            if len(r) < 2:
-                continue
-            label_val = r[0]
-            num_val = r[1]
-            try:
-                label_str = str(label_val) if label_val is not None else ""
-                num_float = float(num_val) if num_val is not None and str(num_val).strip() != "" else None
-            except Exception:
-                label_str = str(label_val) if label_val is not None else ""
-                num_float = None
-            if num_float is None:
-                # Try to coerce integers stored as strings
-                try:
-                    num_float = float(str(num_val)) if num_val is not None else None
-                except Exception:
-                    num_float = None
-            if num_float is None:
-                continue
-            items.append({"name": label_str, "value": num_float})
+        items = _table_items(table)
 
         if not items:
             return None
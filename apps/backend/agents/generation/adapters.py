@@ -8,7 +8,6 @@ import uuid
 from datetime import datetime
 
 import sentry_sdk
-from sentry_sdk import start_span
 
 from agents.core import ISlideGenerator, IThemeManager, IPersistence, IRAGRepository, IDeckComposer
 from agents.domain.models import ThemeSpec, SlideGenerationContext, SlideStatus, DeckState, GenerationEvent, SlideGeneratedEvent
@@ -21,9 +20,15 @@ from agents.generation.tagged_media_processor import TaggedMediaProcessor
 from agents.rag.slide_context_retriever import SlideContextRetriever
 from agents.persistence.deck_persistence import DeckPersistence
 from agents.generation.progress_manager import DeckGenerationProgress, GenerationPhase
+from agents.generation.status_registry import (
+    SLIDE_COMPLETED,
+    SLIDE_STATE_CODES,
+    get_generation_status_registry,
+)
 from models.requests import SlideOutline, DeckOutline
 from setup_logging_optimized import get_logger
 from agents.generation.concurrency_manager import concurrency_manager
+from agents.generation.tracing import span, start_span
 
 logger = get_logger(__name__)
 
@@ -125,7 +130,8 @@ class ThemeManagerAdapter(IThemeManager):
         else:
             logger.info(f"[THEME ADAPTER] ⚠️ NO stylePreferences in deck_outline")
             
-        result = await self.manager.analyze_theme_and_style(deck_outline)
+        with span("theme.analyze"):
+            result = await self.manager.analyze_theme_and_style(deck_outline)
         theme_dict = result.get('theme', {})
         search_terms = result.get('search_terms', [])
         
@@ -141,7 +147,8 @@ class ThemeManagerAdapter(IThemeManager):
     async def generate_palette(self, deck_outline: DeckOutline, theme: ThemeSpec) -> Dict[str, Any]:
         """Generate palette using the existing manager."""
         theme_dict = theme.to_dict() if isinstance(theme, ThemeSpec) else theme
-        return await self.manager.generate_palette(deck_outline, theme_dict)
+        with span("palette.search"):
+            return await self.manager.generate_palette(deck_outline, theme_dict)
     
     def create_style_manifesto(self, style_spec: Dict[str, Any]) -> str:
         """Create style manifesto."""
@@ -162,14 +169,16 @@ class PersistenceAdapter(IPersistence):
     async def save_deck(self, deck_data: Dict[str, Any]) -> None:
         """Save deck using existing persistence."""
         deck_uuid = deck_data.get('uuid')
-        await self.persistence.save_deck(deck_uuid, deck_data)
+        with span("persistence.save_deck", deck_uuid=deck_uuid):
+            await self.persistence.save_deck(deck_uuid, deck_data)
     
     async def update_slide(self, deck_uuid: str, slide_index: int, slide_data: Dict[str, Any], force_immediate: bool = False) -> None:
         """Update slide using existing persistence."""
-        if self.user_id:
-            await self.persistence.update_slide_with_user(deck_uuid, slide_index, slide_data, self.user_id, force_immediate=force_immediate)
-        else:
-            await self.persistence.update_slide(deck_uuid, slide_index, slide_data, force_immediate=force_immediate)
+        with span("persistence.update_slide", deck_uuid=deck_uuid, slide_index=slide_index, immediate=force_immediate):
+            if self.user_id:
+                await self.persistence.update_slide_with_user(deck_uuid, slide_index, slide_data, self.user_id, force_immediate=force_immediate)
+            else:
+                await self.persistence.update_slide(deck_uuid, slide_index, slide_data, force_immediate=force_immediate)
     
     async def get_deck(self, deck_uuid: str) -> Optional[Dict[str, Any]]:
         """Get deck using existing persistence."""
@@ -190,7 +199,8 @@ class PersistenceAdapter(IPersistence):
             logger.info(f"[PERSISTENCE] Saving deck {deck_uuid} WITH narrative flow notes")
         else:
             logger.warning(f"[PERSISTENCE] Saving deck {deck_uuid} WITHOUT narrative flow notes")
-        return await self.persistence.save_deck_with_user(deck_uuid, deck_data, user_id)
+        with span("persistence.save_deck", deck_uuid=deck_uuid):
+            return await self.persistence.save_deck_with_user(deck_uuid, deck_data, user_id)
 
 
 class RAGRepositoryAdapter(IRAGRepository):
@@ -253,7 +263,7 @@ class SimpleDeckComposer(IDeckComposer):
         logger.info(f"🎬 image_manager available: {self.image_manager is not None}")
         
         # Initialize progress manager
-        progress = DeckGenerationProgress()
+        progress = DeckGenerationProgress(deck_id=deck_uuid)
 
         def _palette_from_theme_obj(theme_obj: Optional[ThemeSpec]) -> Dict[str, Any]:
             """Extract a raw color palette from a ThemeSpec without triggering extra theme calls."""
@@ -313,9 +323,11 @@ class SimpleDeckComposer(IDeckComposer):
             return
             
         logger.info(f"✅ Acquired deck generation slot for user {concurrency_user_id}, deck {deck_uuid}")
+        get_generation_status_registry().start_deck(deck_uuid, user_id=user_id)
         
         # Ensure deck_state is defined for error handling paths
         deck_state: Optional[DeckState] = None
+        theme_span = None
         try:
             # Mark deck as being composed for proper caching
             self.persistence.start_composition(deck_uuid)
@@ -335,6 +347,7 @@ class SimpleDeckComposer(IDeckComposer):
                 "progress": progress.progress
             }
             
+            theme_span = start_span("theme", deck_uuid=deck_uuid)
             # Initialize theme variables
             theme = None
             palette = None
@@ -885,6 +898,7 @@ class SimpleDeckComposer(IDeckComposer):
             except Exception:
                 pass
 
+            theme_span.end()
             # Emit theme completion progress
             yield {
                 "type": "progress",
@@ -1271,15 +1285,30 @@ class SimpleDeckComposer(IDeckComposer):
             # Save final state
             await self.persistence.save_deck(deck_state.to_dict())
             
-            # Update final deck status
+            # Update final deck status. Pollers on other workers read currentSlide as the
+            # number of completed slides, so failed slides must not be counted
+            slide_states = get_generation_status_registry().encoded_slide_states(deck_uuid)
+            if slide_states:
+                completed_slides = slide_states.count(SLIDE_STATE_CODES[SLIDE_COMPLETED])
+            else:
+                completed_slides = sum(
+                    1 for s in deck_state.slides
+                    if isinstance(s, dict) and s.get('status') in (SlideStatus.COMPLETED.value, SlideStatus.FIXED.value)
+                )
+            failed_slides = len(deck_state.slides) - completed_slides
             deck_state.status = {
                 'state': 'completed',
-                'currentSlide': len(deck_state.slides),
+                'currentSlide': completed_slides,
                 'totalSlides': len(deck_state.slides),
-                'message': 'Deck generation completed successfully',
+                'message': (
+                    'Deck generation completed successfully' if failed_slides <= 0
+                    else f'Deck generation completed with {failed_slides} slide(s) not generated'
+                ),
                 'progress': 100,
                 'phase': 'complete'
             }
+            if slide_states:
+                deck_state.status['slideStates'] = slide_states
             
             # Save final deck state
             await self.persistence.save_deck(deck_state.to_dict())
@@ -1318,6 +1347,10 @@ class SimpleDeckComposer(IDeckComposer):
                 pass
             yield progress.error(str(e), deck_id=deck_uuid)
         finally:
+            # Closed/cancelled streams never reach theme_span.end() above; end() is idempotent
+            if theme_span is not None:
+                theme_span.end()
+
             # No theme task to cancel - theme generation is synchronous now
             
             # Cancel image search task if still running
@@ -1329,6 +1362,9 @@ class SimpleDeckComposer(IDeckComposer):
                 except asyncio.CancelledError:
                     pass
             
+            # Stream closed before complete/error: polls go back to the persisted status
+            get_generation_status_registry().abandon(deck_uuid)
+
             # Mark composition as ended
             if 'deck_uuid' in locals():
                 self.persistence.end_composition(deck_uuid)
@@ -10,10 +10,17 @@ from datetime import datetime
 from agents.ai.clients import get_client, invoke
 from agents.config import COMPOSER_MODEL
 from agents.domain.models import SlideGenerationContext
+from agents.generation.components import render_sanitizer
 from setup_logging_optimized import get_logger
 
 logger = get_logger(__name__)
 
+_JSX_TAG_PATTERN = re.compile(r"<\s*[A-Za-z]")
+_QUIZ_QUESTION_PATTERN = re.compile(
+    r"question\s*:\s*(['\"])(.*?)\1\s*,\s*options\s*:\s*\[(.*?)\]\s*,\s*correctAnswer\s*:\s*(['\"])(.*?)\4",
+    re.DOTALL
+)
+
 
 class AISlideGenerator:
     """Handles AI generation of slides."""
@@ -442,7 +449,7 @@ class AISlideGenerator:
         violations: List[str] = []
         if "React.useState" in render or "useState(" in render:
             violations.append("hooks")
-        if re.search(r"<\s*[A-Za-z]", render):
+        if _JSX_TAG_PATTERN.search(render):
             violations.append("jsx")
         if "function render" not in render:
             violations.append("signature")
@@ -471,28 +478,17 @@ class AISlideGenerator:
         props["render"] = self._build_safe_placeholder_render()
 
     def _force_double_quotes(self, render: str) -> str:
-        def _replace(match: re.Match) -> str:
-            value = match.group(0)
-            if value.startswith("\'") and value.endswith("\'"):
-                inner = value[1:-1]
-                inner = inner.replace("\\\"", "'")
-                inner = inner.replace("\'", "'")
-                inner = inner.replace("\"", "'")
-                return f'"{inner}"'
-            return value
-
         try:
-            return re.sub(r"\'([^\n\r]*?)\'", _replace, render)
+            return render_sanitizer.force_double_quoted_literals(render)
         except Exception:
             return render
 
     def _extract_quiz_data(self, render: str) -> Optional[Dict[str, Any]]:
-        questions_pattern = re.compile(
-            r"question\s*:\s*(['\"])(.*?)\1\s*,\s*options\s*:\s*\[(.*?)\]\s*,\s*correctAnswer\s*:\s*(['\"])(.*?)\4",
-            re.DOTALL
-        )
+        # Every question entry needs the literal key; skip the scan without it
+        if "correctAnswer" not in render:
+            return None
         questions: List[Dict[str, Any]] = []
-        for match in questions_pattern.finditer(render):
+        for match in _QUIZ_QUESTION_PATTERN.finditer(render):
             question_text = self._normalize_text(match.group(2))
             options_block = match.group(3)
             correct_answer = self._normalize_text(match.group(5))
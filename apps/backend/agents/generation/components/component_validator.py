@@ -7,6 +7,8 @@ import re
 import uuid
 from setup_logging_optimized import get_logger
 from services.adaptive_font_sizer import adaptive_font_sizer
+from agents.generation.tracing import span
+from agents.generation.components import render_sanitizer
 
 logger = get_logger(__name__)
 
@@ -32,7 +34,8 @@ class ComponentValidator:
         # Apply font sizing to all text components if theme provided
         if theme:
             logger.info(f"[FONT SIZING] Applying adaptive font sizing to {len(components)} components")
-            components = self.apply_slide_font_sizing(components, theme)
+            with span("font.sizing", components=len(components)):
+                components = self.apply_slide_font_sizing(components, theme)
         else:
             logger.warning("[FONT SIZING] No theme provided, skipping font sizing")
 
@@ -929,12 +932,9 @@ class ComponentValidator:
         # Fix hardcoded padding values (e.g., "props.width - 80" should be "props.width - padding * 2")
         if render and 'props.width - ' in render:
             # Look for patterns like "props.width - 80" or "props.width - 40" 
-            import re
-            pattern = r'props\.width\s*-\s*(\d+)'
-            matches = re.findall(pattern, render)
-            if matches and 'const padding' in render:
+            if 'const padding' in render and render_sanitizer.HARDCODED_WIDTH_PADDING.search(render):
                 # Replace hardcoded values with padding * 2
-                render = re.sub(pattern, 'props.width - padding * 2', render)
+                render = render_sanitizer.HARDCODED_WIDTH_PADDING.sub('props.width - padding * 2', render)
                 logger.info("[CustomComponent Fix] Fixed hardcoded padding values to use padding variable")
         
         # Sanitize any text content within nested props to remove emojis and normalize whitespace
@@ -953,10 +953,9 @@ class ComponentValidator:
         # Convert `${expr}` to string concatenation and replace backticks with single quotes
         try:
             if isinstance(render, str) and ('${' in render or '`' in render):
-                import re
                 original_len = len(render)
                 # Replace ${...} with ' + ... + '
-                render = re.sub(r"\$\{([^}]+)\}", r"' + \1 + '", render)
+                render = render_sanitizer.TEMPLATE_EXPRESSION.sub(r"' + \1 + '", render)
                 # Replace backticks with single quotes
                 render = render.replace('`', "'")
                 logger.info(
@@ -1030,18 +1029,7 @@ class ComponentValidator:
                 return component
             
             # Check for too many helper functions
-            import re
-            helper_patterns = [
-                r'const\s+safe\w+\s*=',
-                r'function\s+safe\w+',
-                r'const\s+format\w+\s*=',
-                r'function\s+format\w+',
-                r'const\s+get\w+\s*=',
-                r'function\s+get\w+',
-                r'const\s+\w+Helper\s*='
-            ]
-            
-            helper_count = sum(len(re.findall(pattern, render)) for pattern in helper_patterns)
+            helper_count = render_sanitizer.count_helper_definitions(render)
             
             if helper_count >= 2:
                 logger.warning(f"[CustomComponent Fix] Detected {helper_count} helper functions - replacing with simple version")
@@ -1114,10 +1102,9 @@ class ComponentValidator:
             render = render.replace('function render({ props }', 'function render({ props, state, updateState, id, isThumbnail }')
             # Force single-argument signature by stripping any trailing params (e.g., ", instanceId")
             try:
-                import re as _re
-                render = _re.sub(r"function\s+render\s*\(\s*\{[^}]*\}\s*(?:,[^)]*)?\)",
-                                 "function render({ props, state, updateState, id, isThumbnail })",
-                                 render)
+                render = render_sanitizer.RENDER_SIGNATURE.sub(
+                    "function render({ props, state, updateState, id, isThumbnail })", render
+                )
             except Exception:
                 pass
             # Ensure root container styles as well
@@ -1131,16 +1118,15 @@ class ComponentValidator:
                 uses_escaped_n = '\\n' in render
                 nl = '\\n' if uses_escaped_n else '\n'
                 # Always strip defaultVariant token
-                import re
                 # 1) Replace usage: "|| defaultVariant" -> '|| "content"'
-                render = re.sub(r"\|\|\s*defaultVariant", '|| "content"', render)
+                render = render_sanitizer.DEFAULT_VARIANT_USAGE.sub('|| "content"', render)
                 # 2) Remove any declaration: 'const defaultVariant = ...;'
-                render = re.sub(r"const\s+defaultVariant\s*=.*?;", '', render, flags=re.S)
+                render = render_sanitizer.DEFAULT_VARIANT_DECLARATION.sub('', render)
                 # Inline cx value so we never depend on x
                 render = render.replace('cx: x', 'cx: (80 + i * ((1920 - 160) / Math.max(1, (totalSlides - 1))))')
                 # Harden availableWidth/availableHeight fallbacks if present in unsafe form
-                render = re.sub(r"props\\.width\s*-\s*padding\s*\*\s*2", "(props.width || 1920) - padding * 2", render)
-                render = re.sub(r"props\\.height\s*-\s*padding\s*\*\s*2", "(props.height || 1080) - padding * 2", render)
+                render = render_sanitizer.UNSAFE_WIDTH_FALLBACK.sub("(props.width || 1920) - padding * 2", render)
+                render = render_sanitizer.UNSAFE_HEIGHT_FALLBACK.sub("(props.height || 1080) - padding * 2", render)
                 # Ensure padding/available sizes exist and inject common fallbacks (blur, r, c)
                 # Insert right after the function body opening brace
                 open_idx = render.find('{', render.find('function render'))
@@ -1189,7 +1175,7 @@ class ComponentValidator:
             rstr = props.get('render')
             if isinstance(rstr, str):
                 # Match start-of-string or newline (real or escaped) followed by optional spaces and a dot
-                if re.search(r"(?:^|\n)\s*\.", rstr) or re.search(r"(?:^|\\n)\s*\.", rstr):
+                if render_sanitizer.has_leading_dot_line(rstr):
                     logger.warning("[CustomComponent Fix] Leading dot at line start detected; replacing with safe render to avoid syntax error")
                     props['render'] = self._get_simple_render_function()
         except Exception:
@@ -1236,71 +1222,7 @@ class ComponentValidator:
         Operates on escaped JS strings (with \n). Keeps existing declarations intact.
         """
         try:
-            if not isinstance(render_str, str) or 'function render' not in render_str:
-                return render_str
-
-            updated = render_str
-
-            # Helper to look for token usage and declaration presence
-            def token_used(name: str) -> bool:
-                return re.search(rf"\\b{name}\\b", updated) is not None
-
-            def declared(name: str) -> bool:
-                return re.search(rf"\\b(const|let|var)\\s+{name}\\b", updated) is not None
-
-            injections: List[str] = []
-
-            # Ensure availableWidth/availableHeight exist
-            needs_avail_w = not declared('availableWidth')
-            needs_avail_h = not declared('availableHeight')
-            if needs_avail_w:
-                injections.append("  const availableWidth = props.width - padding * 2;")
-            if needs_avail_h:
-                injections.append("  const availableHeight = props.height - padding * 2;")
-
-            # rayCount (only if used)
-            if token_used('rayCount') and not declared('rayCount'):
-                injections.append("  const rayCount = props.rayCount || 12;")
-
-            # iconSize (only if used)
-            if token_used('iconSize') and not declared('iconSize'):
-                injections.append("  const iconSize = Math.min(availableWidth, availableHeight) * 0.4;")
-
-            # Common theme variables – only if referenced and not declared
-            if token_used('primaryColor') and not declared('primaryColor'):
-                injections.append("  const primaryColor = props.primaryColor || props.color || '#FFD100';")
-            if token_used('secondaryColor') and not declared('secondaryColor'):
-                injections.append("  const secondaryColor = props.secondaryColor || '#4CAF50';")
-            if token_used('textColor') and not declared('textColor'):
-                injections.append("  const textColor = props.textColor || '#FFFFFF';")
-            if token_used('fontFamily') and not declared('fontFamily'):
-                injections.append("  const fontFamily = props.fontFamily || 'Poppins';")
-
-            # Content variables – only if referenced
-            if token_used('title') and not declared('title'):
-                injections.append("  const title = props.title || '';")
-            if token_used('description') and not declared('description'):
-                injections.append("  const description = props.description || '';")
-
-            if not injections:
-                return updated
-
-            # Insert injections right after padding line if present; otherwise after function opening brace
-            padding_line = "const padding = props.padding || 32;"
-            padding_idx = updated.find(padding_line)
-            # Use escaped newlines (\\n) to keep render as a single-line-escaped JS string
-            injection_block = "\\n" + "\\n".join(injections)
-
-            if padding_idx != -1:
-                insert_pos = padding_idx + len(padding_line)
-                updated = updated[:insert_pos] + injection_block + updated[insert_pos:]
-                return updated
-
-            # Fallback: inject right after first '{' (function opening)
-            parts = updated.split('{', 1)
-            if len(parts) == 2:
-                updated = parts[0] + '{' + injection_block + parts[1]
-            return updated
+            return render_sanitizer.inject_missing_variable_definitions(render_str)
         except Exception as e:
             logger.debug(f"_inject_missing_variable_definitions failed: {e}")
             return render_str
@@ -1325,60 +1247,18 @@ class ComponentValidator:
 
     def _sanitize_text_value(self, text: str) -> str:
         """Remove emojis and normalize whitespace in a text value."""
-        if not isinstance(text, str):
-            return text
-        # Remove emoji characters
-        text = self._remove_emojis(text)
-        # Normalize CRLF/CR to LF, then collapse excessive whitespace while preserving single spaces
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
-        # Trim and collapse multiple spaces but keep newlines
-        text = re.sub(r"[\t\f\v]+", " ", text)
-        text = re.sub(r"\s*\n\s*", "\n", text)  # trim around newlines
-        text = re.sub(r" {2,}", " ", text)
-        return text.strip()
+        return render_sanitizer.sanitize_text_value(text)
 
     def _remove_emojis(self, text: str) -> str:
         """Strip common emoji code point ranges, ZWJ and variation selectors."""
-        if not isinstance(text, str) or not text:
-            return text
-        emoji_pattern = re.compile(
-            "[" 
-            "\U0001F600-\U0001F64F"  # Emoticons
-            "\U0001F300-\U0001F5FF"  # Misc Symbols & Pictographs
-            "\U0001F680-\U0001F6FF"  # Transport & Map
-            "\U0001F1E6-\U0001F1FF"  # Regional Indicator Symbols (flags)
-            "\U0001F900-\U0001F9FF"  # Supplemental Symbols & Pictographs
-            "\U0001FA70-\U0001FAFF"  # Symbols & Pictographs Extended-A
-            "\u2600-\u26FF"          # Miscellaneous Symbols (includes ☀ etc.)
-            "\u2700-\u27BF"          # Dingbats (includes ✨ etc.)
-            "]",
-            flags=re.UNICODE,
-        )
-        # Remove base emoji codepoints
-        text = emoji_pattern.sub("", text)
-        # Remove popular standalone star emoji specifically (⭐ U+2B50)
-        text = text.replace("\u2B50", "")
-        # Remove variation selectors and zero-width joiners used in emoji sequences
-        text = re.sub(r"[\u200D\uFE0E\uFE0F]", "", text)
-        return text
+        return render_sanitizer.remove_emojis(text)
 
     def _normalize_render_dimensions(self, render_str: str) -> str:
         """Relax hardcoded max widths in the render string to prevent overflow cropping.
         Replaces maxWidth: 'NNNpx' with maxWidth: '100%'. Keeps other widths as-is.
         """
         try:
-            if not isinstance(render_str, str) or not render_str:
-                return render_str
-            # Replace single-quoted px maxWidth
-            render_str = re.sub(r"maxWidth:\s*'\\d+px'", "maxWidth: '100%'", render_str)
-            # Replace double-quoted px maxWidth just in case
-            render_str = re.sub(r'maxWidth:\s*"\\d+px"', 'maxWidth: "100%"', render_str)
-            # Normalize nowrap to wrapping behavior
-            render_str = re.sub(r"whiteSpace:\s*'nowrap'", "whiteSpace: 'normal'", render_str)
-            render_str = re.sub(r'whiteSpace:\s*"nowrap"', 'whiteSpace: "normal"', render_str)
-            render_str = re.sub(r"flexWrap:\s*'nowrap'", "flexWrap: 'wrap'", render_str)
-            render_str = re.sub(r'flexWrap:\s*"nowrap"', 'flexWrap: "wrap"', render_str)
-            return render_str
+            return render_sanitizer.normalize_render_dimensions(render_str)
         except Exception as e:
             logger.debug(f"_normalize_render_dimensions failed: {e}")
             return render_str
@@ -1389,48 +1269,7 @@ class ComponentValidator:
         - Prefer flex-start alignment over center to avoid side-by-side centering in roots
         """
         try:
-            if not isinstance(render_str, str) or not render_str:
-                return render_str
-
-            updated = render_str
-
-            # Convert gridTemplateColumns strings like '1fr 1fr' or '1fr 1fr 1fr'
-            updated = re.sub(
-                r"gridTemplateColumns:\s*'(?:(?:\s*1fr\s*){2,})'",
-                "gridTemplateColumns: 'repeat(auto-fit, minmax(220px, 1fr))'",
-                updated
-            )
-            updated = re.sub(
-                r'gridTemplateColumns:\s*"(?:(?:\s*1fr\s*){2,})"',
-                "gridTemplateColumns: \"repeat(auto-fit, minmax(220px, 1fr))\"",
-                updated
-            )
-
-            # Convert repeat(2, 1fr) or repeat(3, 1fr) (with or without quotes)
-            updated = re.sub(
-                r"gridTemplateColumns:\s*'\s*repeat\(\s*\d+\s*,\s*1fr\s*\)\s*'",
-                "gridTemplateColumns: 'repeat(auto-fit, minmax(220px, 1fr))'",
-                updated
-            )
-            updated = re.sub(
-                r'gridTemplateColumns:\s*"\s*repeat\(\s*\d+\s*,\s*1fr\s*\)\s*"',
-                "gridTemplateColumns: \"repeat(auto-fit, minmax(220px, 1fr))\"",
-                updated
-            )
-            updated = re.sub(
-                r"gridTemplateColumns:\s*repeat\(\s*\d+\s*,\s*1fr\s*\)",
-                "gridTemplateColumns: 'repeat(auto-fit, minmax(220px, 1fr))'",
-                updated
-            )
-
-            # In the first root style block, prefer alignItems/justifyContent flex-start over center
-            # Replace only first occurrence to bias the root container
-            updated = re.sub(r"alignItems:\s*'center'", "alignItems: 'flex-start'", updated, count=1)
-            updated = re.sub(r'alignItems:\s*"center"', 'alignItems: "flex-start"', updated, count=1)
-            updated = re.sub(r"justifyContent:\s*'center'", "justifyContent: 'flex-start'", updated, count=1)
-            updated = re.sub(r'justifyContent:\s*"center"', 'justifyContent: "flex-start"', updated, count=1)
-
-            return updated
+            return render_sanitizer.normalize_layout_responsiveness(render_str)
         except Exception as e:
             logger.debug(f"_normalize_layout_responsiveness failed: {e}")
             return render_str
@@ -1439,101 +1278,8 @@ class ComponentValidator:
         """Remove emojis and escape any literal newlines in the render string.
         Keep existing escaped sequences intact; do not double-escape.
         """
-        if not isinstance(render_str, str) or not render_str:
-            return render_str
-        # Remove emojis first
-        cleaned = self._remove_emojis(render_str)
-        # Normalize CRLF/CR to LF
-        cleaned = cleaned.replace('\r\n', '\n').replace('\r', '\n')
-        # Escape literal newline characters to "\\n" sequences (but not inside existing escapes)
-        if '\n' in cleaned:
-            cleaned = cleaned.replace('\n', '\\n')
-        # Fix broken string literals that were split across lines without escaping, e.g., "Calvin\nCycle"
-        # Also normalize any multi-line quotes into a single-line quoted string with explicit \n
         try:
-            import re
-            # Escape unescaped apostrophes inside words to prevent JS identifier breaks: opponent's -> opponent\'s
-            cleaned = re.sub(r"(?<!\\)([A-Za-z0-9])'([A-Za-z0-9])", r"\1\\'\2", cleaned)
-        except Exception:
-            # Best-effort; keep cleaned as-is if regex fails
-            pass
-
-        # Force literal text children in React.createElement to use double quotes so apostrophes don't break strings
-        try:
-            cleaned = self._force_double_quotes_for_text_nodes(cleaned)
-        except Exception:
-            # Best-effort; keep cleaned as-is if regex fails
-            pass
-        return cleaned
-
-    def _force_double_quotes_for_text_nodes(self, render_str: str) -> str:
-        """Convert single-quoted literal text children in React.createElement calls to double-quoted strings.
-        This avoids bugs when the text contains apostrophes (e.g., Dyna.co's ...).
-
-        Example transform:
-        React.createElement('div', { ... }, 'Dyna.co\'s text') -> React.createElement('div', { ... }, "Dyna.co's text")
-        """
-        try:
-            if not isinstance(render_str, str) or 'React.createElement' not in render_str:
-                return render_str
-            import re
-
-            # Pattern A: Single-quoted third argument (literal string child)
-            pattern_single = re.compile(r"(React\.createElement\s*\([^,]+,\s*(?:\{[^}]*\}|null)\s*,\s*)'((?:\\.|[^'\\])*)'")
-
-            # Pattern B: Double-quoted third argument (literal string child)
-            pattern_double = re.compile(r'(React\.createElement\s*\([^,]+,\s*(?:\{[^}]*\}|null)\s*,\s*)"((?:\\.|[^"\\])*)"')
-
-            def _replacer_single(match: re.Match) -> str:
-                prefix = match.group(1)
-                content = match.group(2)
-                # Normalize: we want outer double quotes and NO internal double quotes.
-                # 1) Unescape apostrophes that were escaped for single-quoted strings
-                normalized = content.replace("\\'", "'")
-                # 2) Replace any escaped or raw double quotes with single quotes
-                normalized = re.sub(r'\\"', "'", normalized)
-                normalized = normalized.replace('"', "'")
-                return f'{prefix}"{normalized}"'
-
-            def _replacer_double(match: re.Match) -> str:
-                prefix = match.group(1)
-                content = match.group(2)
-                # Already double-quoted outside. Ensure no internal double quotes remain.
-                # 1) Replace escaped/unescaped double quotes with single quotes
-                normalized = re.sub(r'\\"', "'", content)
-                normalized = normalized.replace('"', "'")
-                # 2) Ensure apostrophes are not escaped (prefer plain ' inside outer ")
-                normalized = normalized.replace("\\'", "'")
-                return f'{prefix}"{normalized}"'
-
-            updated = pattern_single.sub(_replacer_single, render_str)
-            updated = pattern_double.sub(_replacer_double, updated)
-
-            # Also handle string literals used as direct array children inside the third argument array
-            # Example: React.createElement('div', {...}, [ React.createElement(...), "Text here" ])
-            # We only target strings that are immediate array items: preceded by '[' or ',' and followed by ',' or ']'
-            pattern_array_single = re.compile(r"(\[|,)\s*'((?:\\.|[^'\\])*)'\s*(?=(?:,|\]))")
-            pattern_array_double = re.compile(r'(\[|,)\s*"((?:\\.|[^"\\])*)"\s*(?=(?:,|\])))')
-
-            def _arr_replacer_single(match: re.Match) -> str:
-                prefix = match.group(1)
-                content = match.group(2)
-                normalized = content.replace("\\'", "'")
-                normalized = re.sub(r'\\"', "'", normalized)
-                normalized = normalized.replace('"', "'")
-                return f"{prefix} \"{normalized}\""
-
-            def _arr_replacer_double(match: re.Match) -> str:
-                prefix = match.group(1)
-                content = match.group(2)
-                normalized = re.sub(r'\\"', "'", content)
-                normalized = normalized.replace('"', "'")
-                normalized = normalized.replace("\\'", "'")
-                return f"{prefix} \"{normalized}\""
-
-            updated = pattern_array_single.sub(_arr_replacer_single, updated)
-            updated = pattern_array_double.sub(_arr_replacer_double, updated)
-            return updated
+            return render_sanitizer.sanitize_render_string(render_str)
         except Exception:
             return render_str
 
@@ -1545,38 +1291,7 @@ class ComponentValidator:
         Only targets obvious text fallback patterns after ||.
         """
         try:
-            if not isinstance(render_str, str) or not render_str:
-                return render_str
-            import re
-
-            updated = render_str
-
-            def normalize_inner_quotes(text: str) -> str:
-                # Replace escaped or raw double quotes with single quotes; unescape any escaped apostrophes
-                text = re.sub(r'\\"', "'", text)
-                text = text.replace('"', "'")
-                text = text.replace("\\'", "'")
-                return text
-
-            # 1) Single-quoted fallbacks after || '...'
-            pattern_single = re.compile(r"(\|\|\s*)'((?:\\.|[^'\\])*)'")
-            def repl_single(m: re.Match) -> str:
-                prefix = m.group(1)
-                content = m.group(2)
-                normalized = normalize_inner_quotes(content)
-                return f"{prefix}\"{normalized}\""
-            updated = pattern_single.sub(repl_single, updated)
-
-            # 2) Double-quoted fallbacks after || "..." (ensure no inner double quotes)
-            pattern_double = re.compile(r'(\|\|\s*)"((?:\\.|[^"\\])*)"')
-            def repl_double(m: re.Match) -> str:
-                prefix = m.group(1)
-                content = m.group(2)
-                normalized = normalize_inner_quotes(content)
-                return f"{prefix}\"{normalized}\""
-            updated = pattern_double.sub(repl_double, updated)
-
-            return updated
+            return render_sanitizer.normalize_text_literal_fallbacks(render_str)
         except Exception:
             return render_str
 
@@ -1586,72 +1301,7 @@ class ComponentValidator:
         prepends missing properties. Keeps existing styles intact.
         """
         try:
-            if not isinstance(render_str, str):
-                return render_str
-            # Only act on strings that look like React.createElement with a style object
-            if "React.createElement('div', {" not in render_str or 'style: {' not in render_str:
-                return render_str
-
-            needs_width = "width: '100%'" not in render_str
-            needs_height = "height: '100%'" not in render_str
-            needs_box = "boxSizing: 'border-box'" not in render_str
-            needs_overflow = "overflow: 'hidden'" not in render_str
-            needs_display = "display: 'flex'" not in render_str
-            needs_flex_direction = "flexDirection: 'column'" not in render_str
-            needs_position = "position: 'relative'" not in render_str
-            needs_max_w = "maxWidth: '100%'" not in render_str
-            needs_max_h = "maxHeight: '100%'" not in render_str
-            # NOTE: Do NOT inject CSS 'contain' here; it breaks frontend fit-to-box measurement
-            needs_overflow_wrap = "overflowWrap: 'anywhere'" not in render_str and "overflowWrap: 'break-word'" not in render_str
-            needs_word_break = "wordBreak: 'break-word'" not in render_str and "wordBreak: 'anywhere'" not in render_str
-            needs_text_overflow = "textOverflow: 'ellipsis'" not in render_str
-            needs_white_space = "whiteSpace: 'normal'" not in render_str
-            needs_align_items = "alignItems: 'stretch'" not in render_str
-            needs_justify_content = "justifyContent: 'flex-start'" not in render_str
-
-            if not any([
-                needs_width, needs_height, needs_box, needs_overflow,
-                needs_display, needs_flex_direction, needs_position, needs_max_w, needs_max_h,
-                needs_overflow_wrap, needs_word_break, needs_text_overflow, needs_white_space,
-                needs_align_items, needs_justify_content
-            ]):
-                return render_str
-
-            inject_parts = []
-            if needs_width:
-                inject_parts.append("width: '100%'")
-            if needs_height:
-                inject_parts.append("height: '100%'")
-            if needs_box:
-                inject_parts.append("boxSizing: 'border-box'")
-            if needs_overflow:
-                inject_parts.append("overflow: 'hidden'")
-            if needs_display:
-                inject_parts.append("display: 'flex'")
-            if needs_flex_direction:
-                inject_parts.append("flexDirection: 'column'")
-            if needs_position:
-                inject_parts.append("position: 'relative'")
-            if needs_max_w:
-                inject_parts.append("maxWidth: '100%'")
-            if needs_max_h:
-                inject_parts.append("maxHeight: '100%'")
-            if needs_overflow_wrap:
-                inject_parts.append("overflowWrap: 'anywhere'")
-            if needs_word_break:
-                inject_parts.append("wordBreak: 'break-word'")
-            if needs_text_overflow:
-                inject_parts.append("textOverflow: 'ellipsis'")
-            if needs_white_space:
-                inject_parts.append("whiteSpace: 'normal'")
-            if needs_align_items:
-                inject_parts.append("alignItems: 'stretch'")
-            if needs_justify_content:
-                inject_parts.append("justifyContent: 'flex-start'")
-
-            injection = ', '.join(inject_parts)
-            # Insert immediately after the first occurrence of 'style: {'
-            return render_str.replace('style: {', f"style: {{ {injection}, ", 1)
+            return render_sanitizer.ensure_root_container_styles(render_str)
         except Exception as e:
             logger.warning(f"[CustomComponent Fix] Failed to enforce container styles: {e}")
             return render_str
@@ -1723,27 +1373,12 @@ class ComponentValidator:
         try:
             if not isinstance(render_str, str):
                 return render_str
-            lowered = render_str.lower()
-            forbidden_snippets = [
-                'import ',
-                'require(',
-                'fetch(',
-                'document.',
-                'window.',
-                'dangerouslysetinnerhtml',
-                'eval(',
-                'new websocket(',
-                # Explicit bans to prevent 'Unexpected token catch' and runtime issues
-                'try{', 'try {', ' catch(', 'catch (',
-                'setinterval(', 'settimeout(', 'requestanimationframe(',
-                'updatestate('
-            ]
-            if any(snippet in lowered for snippet in forbidden_snippets):
+            construct = render_sanitizer.find_prohibited_construct(render_str)
+            if construct == 'api':
                 logger.warning("[CustomComponent Fix] Prohibited construct (try/catch, timers, updateState, or disallowed API) detected; replacing with safe render")
                 return self._get_simple_render_function()
-
             # Disallow redeclaring the 'state' parameter inside render (e.g., 'const state = ...')
-            if re.search(r"\b(const|let|var)\s+state\s*=", render_str):
+            if construct == 'state':
                 logger.warning("[CustomComponent Fix] Redeclaration of 'state' detected; replacing with safe render")
                 return self._get_simple_render_function()
             return render_str
@@ -1756,36 +1391,7 @@ class ComponentValidator:
         Operates on escaped JS strings (with \n). Uses regex to identify duplicates.
         """
         try:
-            if not isinstance(render_str, str) or 'function render' not in render_str:
-                return render_str
-            updated = render_str
-            import re
-            # Variables we often see duplicated by LLMs
-            vars_to_dedupe = [
-                'availableWidth', 'availableHeight', 'primaryColor', 'secondaryColor', 'textColor', 'textColor1', 'textColor2', 'fontFamily',
-                'blur', 'r', 'c'
-            ]
-            for var_name in vars_to_dedupe:
-                pattern = re.compile(rf"(?:const|let|var)\s+{var_name}\s*=\s*[^;]+;")
-                matches = list(pattern.finditer(updated))
-                if len(matches) > 1:
-                    # Keep the first declaration, remove subsequent ones
-                    keep_start, keep_end = matches[0].span()
-                    # Build a new string skipping later matches
-                    result = []
-                    last_idx = 0
-                    for i, m in enumerate(matches):
-                        if i == 0:
-                            continue
-                        start, end = m.span()
-                        result.append(updated[last_idx:start])
-                        last_idx = end
-                    result.append(updated[last_idx:])
-                    # Ensure the kept declaration remains
-                    prefix = updated[:keep_end]
-                    suffix = ''.join(result)[keep_end:]
-                    updated = prefix + suffix
-            return updated
+            return render_sanitizer.dedupe_common_declarations(render_str)
         except Exception:
             return render_str
 
@@ -2,11 +2,23 @@
 Prompt builder for slide generation.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
+import os
 import re
 from agents.domain.models import SlideGenerationContext
 from agents.prompts.generation.rag_system_prompt import get_rag_system_prompt
 from agents.generation.components.prompt_compression import PromptCompressor
+from agents.generation.components.prompt_tokens import (
+    LRUTTLCache,
+    PromptBudgeter,
+    PromptSection,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_MEDIUM,
+    PRIORITY_REQUIRED,
+    count_tokens,
+    token_report,
+)
 from agents.generation.slide_color_extractor import SlideColorExtractor
 from setup_logging_optimized import get_logger
 from services.user_info_service import get_user_info_service
@@ -18,12 +30,22 @@ class SlidePromptBuilder:
     """Builds prompts for slide generation."""
     
     MAX_CONTEXT_CHARS = 32000  # ~8,000 tokens (reduced for better performance)
+    STATIC_BLOCK_CACHE_SIZE = int(os.getenv("STATIC_BLOCK_CACHE_SIZE", "64"))
+    STATIC_BLOCK_CACHE_TTL = float(os.getenv("STATIC_BLOCK_CACHE_TTL", "3600"))
+    # Token target for a full user prompt (static + slide blocks). Off by default (0):
+    # trimming drops optional context sections, so only set it where prompt size matters
+    PROMPT_TOKEN_BUDGET = int(os.getenv("SLIDE_PROMPT_TOKEN_BUDGET", "0"))
     
     def __init__(self):
         self.compressor = PromptCompressor()
         self.color_extractor = SlideColorExtractor()
-        # Memoize deck-wide static prompt blocks so every slide reuses identical cached content
-        self._static_block_cache: Dict[str, str] = {}
+        # Memoize deck-wide static prompt blocks so every slide reuses identical cached content;
+        # bounded so long-lived workers don't keep every deck's block forever
+        self._static_block_cache: LRUTTLCache[str] = LRUTTLCache(
+            maxsize=self.STATIC_BLOCK_CACHE_SIZE, ttl=self.STATIC_BLOCK_CACHE_TTL
+        )
+        self.budgeter = PromptBudgeter(self.PROMPT_TOKEN_BUDGET)
+        self.last_token_report: Dict[str, Any] = {}
     
     def build_system_prompt(self) -> str:
         """Build the system prompt."""
@@ -149,7 +171,6 @@ class SlidePromptBuilder:
         """
         # Prepare shared artifacts
         compressed_rag = self.compressor.compress_rag_context(rag_context)
-        slide_sections: List[str] = []
 
         cache_key = self._get_static_block_key(context)
         static_block = self._static_block_cache.get(cache_key)
@@ -226,7 +247,7 @@ class SlidePromptBuilder:
                 pass
 
             static_block = '\n'.join(static_sections)
-            self._static_block_cache[cache_key] = static_block
+            self._static_block_cache.set(cache_key, static_block)
             try:
                 import hashlib as _hashlib
                 digest = _hashlib.sha1(static_block.encode('utf-8')).hexdigest()
@@ -245,30 +266,21 @@ class SlidePromptBuilder:
                 f"[PROMPT BUILDER] static block cache hit for {cache_key}: len={len(static_block)} chars sha1={digest}"
             )
 
-        # Slide-specific details
-        try:
-            self._add_slide_info(slide_sections, context)
-        except Exception:
-            pass
-        try:
-            self._add_extracted_data_context(slide_sections, context)
-        except Exception:
-            pass
+        # Slide-specific details, collected as named sections for token accounting/budgeting
+        sections: List[PromptSection] = []
+        self._collect_section(sections, 'slide_info', PRIORITY_REQUIRED, self._add_slide_info, context)
+        self._collect_section(sections, 'extracted_data', PRIORITY_REQUIRED, self._add_extracted_data_context, context)
         # Theme structural guidance can vary per slide
+        self._collect_section(sections, 'theme_structure', PRIORITY_HIGH, self._add_theme_structural_guidance, context)
+        # RAG context is per slide; split by heading so low-value guidance can be trimmed
+        rag_parts: List[str] = []
         try:
-            self._add_theme_structural_guidance(slide_sections, context)
-        except Exception:
-            pass
-        # RAG context is per slide
-        try:
-            self._add_rag_context(slide_sections, compressed_rag, context)
-        except Exception:
-            pass
-        try:
-            # Slide-level color nudges should live outside the cached static prefix
-            self._add_slide_color_preferences(slide_sections, context)
+            self._add_rag_context(rag_parts, compressed_rag, context)
         except Exception:
             pass
+        sections.extend(self._split_rag_sections(rag_parts))
+        # Slide-level color nudges should live outside the cached static prefix
+        self._collect_section(sections, 'slide_colors', PRIORITY_MEDIUM, self._add_slide_color_preferences, context)
         # Cookbook moved to static block to maximize cache reuse
 
         # Chart requirements (conditional per-slide)
@@ -278,14 +290,14 @@ class SlidePromptBuilder:
             business_terms = ['arr', 'mrr', 'kpi', 'revenue', 'budget', 'forecast', 'metric', 'metrics', 'trend', 'yoy', 'mom', 'growth', 'market share', 'conversion', 'distribution', 'breakdown']
             clearly_business = any(k in topic_text for k in business_terms)
             if getattr(context, 'user_requested_charts', False) or (numeric_signal and clearly_business):
-                self._add_chart_requirements(slide_sections, context)
+                self._collect_section(sections, 'chart_requirements', PRIORITY_HIGH, self._add_chart_requirements, context)
         except Exception:
             pass
 
         # Text heavy layout rules
         try:
             if self._is_text_heavy(context, rag_context):
-                self._add_text_heavy_layout_rules(slide_sections)
+                self._collect_section(sections, 'text_heavy_layout', PRIORITY_MEDIUM, self._add_text_heavy_layout_rules)
         except Exception:
             pass
 
@@ -298,16 +310,79 @@ class SlidePromptBuilder:
                 getattr(context.slide_outline, 'content', '')
             )
             if is_market:
-                self._add_market_sizing_guidance(slide_sections, context)
+                self._collect_section(sections, 'market_sizing', PRIORITY_HIGH, self._add_market_sizing_guidance, context)
         except Exception:
             pass
 
         # Final requirements moved to static block
 
+        static_tokens = count_tokens(static_block)
+        sections, dropped = self.budgeter.fit(sections, reserved_tokens=static_tokens)
+        self.last_token_report = token_report(sections, static_tokens=static_tokens)
+        self.last_token_report['dropped'] = dropped
+        logger.info(
+            f"[PROMPT TOKENS] slide {getattr(context, 'slide_index', 0) + 1}: "
+            f"total={self.last_token_report['total']} static={static_tokens} "
+            + " ".join(f"{name}={tokens}" for name, tokens in self.last_token_report['sections'].items())
+            + (f" dropped={dropped}" if dropped else "")
+            + f" ({self.last_token_report['tokenizer']})"
+        )
+        slide_sections = [section.text for section in sections]
+
         slide_block = '\n'.join(slide_sections)
 
         return static_block, slide_block
 
+    # RAG sub-sections by heading keyword (whole words: "LINES" must not match "GUIDELINES"):
+    # (keyword, section name, priority); first match wins
+    RAG_SECTION_PRIORITIES = [
+        ("COMPONENTS TO USE", "rag.components", PRIORITY_REQUIRED),
+        ("STRUCTURED COMPARISON", "rag.comparison", PRIORITY_REQUIRED),
+        ("COMPONENT SCHEMAS", "rag.schemas", PRIORITY_HIGH),
+        ("CHART COMPONENT", "rag.chart", PRIORITY_HIGH),
+        ("TABLE COMPONENT", "rag.table", PRIORITY_HIGH),
+        ("GRID AND LAYOUT", "rag.layout_rules", PRIORITY_MEDIUM),
+        ("ICON", "rag.icons", PRIORITY_MEDIUM),
+        ("LINES", "rag.lines", PRIORITY_MEDIUM),
+        ("FORMATTING EXAMPLES", "rag.customcomponent_examples", PRIORITY_LOW),
+        ("COOKBOOK", "rag.customcomponent_cookbook", PRIORITY_LOW),
+        ("CUSTOMCOMPONENT", "rag.customcomponent", PRIORITY_MEDIUM),
+        ("LAYOUT VARIATIONS", "rag.layout_variations", PRIORITY_LOW),
+        ("REACTBITS", "rag.reactbits", PRIORITY_LOW),
+    ]
+    _RAG_SECTION_PATTERNS = [
+        (re.compile(rf"\b{re.escape(keyword)}\b"), name, priority) for keyword, name, priority in RAG_SECTION_PRIORITIES
+    ]
+
+    def _collect_section(self, sections: List[PromptSection], name: str, priority: int, add: Callable, *args) -> None:
+        """Run an ``_add_*`` helper into its own named section."""
+        parts: List[str] = []
+        try:
+            add(parts, *args)
+        except Exception:
+            pass
+        if parts:
+            sections.append(PromptSection(name, '\n'.join(parts), priority))
+
+    def _split_rag_sections(self, parts: List[str]) -> List[PromptSection]:
+        """Group RAG output into sections at each heading (lines starting with a newline)."""
+        groups: List[List[str]] = []
+        for part in parts:
+            if not groups or (isinstance(part, str) and part.startswith('\n')):
+                groups.append([])
+            groups[-1].append(part)
+
+        sections: List[PromptSection] = []
+        for index, group in enumerate(groups):
+            heading = group[0].strip().upper()
+            name, priority = ("rag.critical_rules", PRIORITY_HIGH) if index == 0 and "COMPONENTS TO USE" not in heading else ("rag.other", PRIORITY_MEDIUM)
+            for pattern, section_name, section_priority in self._RAG_SECTION_PATTERNS:
+                if pattern.search(heading[:80]):
+                    name, priority = section_name, section_priority
+                    break
+            sections.append(PromptSection(name, '\n'.join(group), priority))
+        return sections
+
     def _get_static_block_key(self, context: SlideGenerationContext) -> str:
         """Build a cache key for deck-static prompt content."""
         try:
@@ -5,6 +5,7 @@ Prompt compression utilities for reducing token usage.
 from typing import Dict, Any, List, Set
 import re
 from setup_logging_optimized import get_logger
+from agents.generation.components.prompt_tokens import count_tokens
 
 logger = get_logger(__name__)
 
@@ -159,8 +160,8 @@ class PromptCompressor:
         return " | ".join(summary_points)
     
     def estimate_tokens(self, text: str) -> int:
-        """Rough estimate of token count (4 chars ≈ 1 token)."""
-        return len(text) // 4
+        """Token count via the shared tokenizer (falls back to 4 chars ≈ 1 token)."""
+        return count_tokens(text)
     
     def compress_prompt(self, prompt: str, target_tokens: int = 5000) -> str:
         """Compress a full prompt to target token count."""
@@ -0,0 +1,215 @@
+"""
+Prompt token accounting: tokenizer-based counts cached per section, a bounded
+LRU/TTL cache for deck-static prompt blocks, and a budgeter that drops the
+lowest-priority sections to fit a token target.
+
+Counts use tiktoken's ``cl100k_base`` encoding when tiktoken is installed
+(Claude's tokenizer is not public; cl100k tracks it far better than
+``len(text) // 4``, which undercounts code/JSON-heavy prompts). Without tiktoken
+the chars/4 estimate is used.
+
+The encoding is loaded in a background thread (``get_encoding`` may download
+the BPE file with no timeout), started at server startup by
+``start_tokenizer_load`` or else on first use; chars/4 is used until it is
+ready. Counts on an event loop thread never wait for it; other threads wait at
+most ``PROMPT_TOKENIZER_LOAD_TIMEOUT`` seconds the first time.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from setup_logging_optimized import get_logger
+
+logger = get_logger(__name__)
+
+TOKENIZER_ENCODING = os.getenv("PROMPT_TOKENIZER_ENCODING", "cl100k_base")
+TOKENIZER_LOAD_TIMEOUT = float(os.getenv("PROMPT_TOKENIZER_LOAD_TIMEOUT", "5"))
+
+_ENCODING = None
+_encoding_ready = threading.Event()
+_encoding_loader: Optional[threading.Thread] = None
+_encoding_lock = threading.Lock()
+
+
+def _load_encoding() -> None:
+    global _ENCODING
+    try:
+        import tiktoken
+        _ENCODING = tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception as e:  # ImportError, or the encoding could not be loaded (offline)
+        logger.info(f"[PROMPT TOKENS] tiktoken unavailable, using chars/4: {e}")
+    finally:
+        _encoding_ready.set()
+
+
+def start_tokenizer_load() -> bool:
+    """Start loading the encoding in the background; True if this call started it."""
+    global _encoding_loader
+    with _encoding_lock:
+        if _encoding_loader is not None:
+            return False
+        _encoding_loader = threading.Thread(target=_load_encoding, name="tiktoken-load", daemon=True)
+        _encoding_loader.start()
+        return True
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _get_encoding():
+    """The tiktoken encoding, or None while it is loading or if it can't be loaded."""
+    if _encoding_ready.is_set():
+        return _ENCODING
+    if start_tokenizer_load() and not _on_event_loop():
+        _encoding_ready.wait(TOKENIZER_LOAD_TIMEOUT)
+    return _ENCODING
+
+
+def tokenizer_name() -> str:
+    encoding = _get_encoding()
+    return encoding.name if encoding is not None else "chars/4"
+
+
+TOKEN_COUNT_CACHE_SIZE = int(os.getenv("PROMPT_TOKEN_COUNT_CACHE_SIZE", "4096"))
+
+_count_cache: "OrderedDict[str, int]" = OrderedDict()
+_count_lock = threading.Lock()
+
+
+def count_tokens(text: str) -> int:
+    """Token count for ``text``, cached by content so repeated sections are tokenized once."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4
+    key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    with _count_lock:
+        cached = _count_cache.get(key)
+        if cached is not None:
+            _count_cache.move_to_end(key)
+            return cached
+    tokens = len(encoding.encode(text, disallowed_special=()))
+    with _count_lock:
+        _count_cache[key] = tokens
+        while len(_count_cache) > TOKEN_COUNT_CACHE_SIZE:
+            _count_cache.popitem(last=False)
+    return tokens
+
+
+V = TypeVar("V")
+
+
+class LRUTTLCache(Generic[V]):
+    """Small thread-safe LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[V]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or now - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._data[key]
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: V) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+# Section priorities: lower numbers are dropped first when over budget
+PRIORITY_REQUIRED = 100
+PRIORITY_HIGH = 80
+PRIORITY_MEDIUM = 50
+PRIORITY_LOW = 20
+
+
+@dataclass
+class PromptSection:
+    name: str
+    text: str
+    priority: int = PRIORITY_REQUIRED
+
+    @property
+    def tokens(self) -> int:
+        return count_tokens(self.text)
+
+
+class PromptBudgeter:
+    """Fit a list of sections into a token budget by dropping the lowest-priority ones."""
+
+    def __init__(self, target_tokens: int):
+        self.target_tokens = target_tokens
+
+    def fit(self, sections: List[PromptSection], reserved_tokens: int = 0) -> Tuple[List[PromptSection], List[str]]:
+        """
+        Return (kept_sections, dropped_names). Sections at PRIORITY_REQUIRED are never
+        dropped; among equal priorities the later (less specific) section goes first.
+        ``reserved_tokens`` accounts for text outside ``sections`` (e.g. the static block).
+        """
+        total = reserved_tokens + sum(s.tokens for s in sections)
+        if self.target_tokens <= 0 or total <= self.target_tokens:
+            return list(sections), []
+
+        candidates = sorted(
+            (i for i, s in enumerate(sections) if s.priority < PRIORITY_REQUIRED),
+            key=lambda i: (sections[i].priority, -i),
+        )
+        dropped = set()
+        for i in candidates:
+            if total <= self.target_tokens:
+                break
+            dropped.add(i)
+            total -= sections[i].tokens
+        if total > self.target_tokens:
+            logger.warning(f"[PROMPT BUDGET] still {total} tokens after trimming (target {self.target_tokens})")
+        kept = [s for i, s in enumerate(sections) if i not in dropped]
+        return kept, [sections[i].name for i in sorted(dropped)]
+
+
+def token_report(sections: List[PromptSection], static_tokens: int = 0) -> Dict[str, Any]:
+    """Per-section token accounting; sections with the same name are summed."""
+    by_section: Dict[str, int] = {}
+    for s in sections:
+        by_section[s.name] = by_section.get(s.name, 0) + s.tokens
+    return {
+        "tokenizer": tokenizer_name(),
+        "static": static_tokens,
+        "sections": by_section,
+        "total": static_tokens + sum(by_section.values()),
+    }
@@ -0,0 +1,357 @@
+"""
+Precompiled string sanitizers for CustomComponent render functions.
+
+``ComponentValidator._fix_custom_component_render`` and
+``AISlideGenerator._sanitize_custom_component`` run every render string
+through a chain of regex rewrites. The patterns live here, compiled once at
+import, and the passes are fused where that cannot change the output:
+
+- emoji, star and ZWJ/variation-selector removal is one character class;
+- single- and double-quoted variants of a rewrite are one pattern, and the
+  five gridTemplateColumns rewrites are one alternation (their matches never
+  overlap, and no replacement creates a match for another pattern);
+- passes that need a literal token (``||``, ``\\b``, ``gridTemplateColumns``,
+  a word-internal apostrophe, a duplicated declaration head, ``state =``)
+  are skipped by a cheap pre-check when the token is absent.
+
+The ``|| '...'`` fallback normalizers stay two sequential passes: their
+matches overlap, and the order decides the output. ``test_render_sanitizer.py``
+pins every function here against a golden corpus of real renders; run it
+after any change.
+"""
+
+import re
+from collections import Counter
+from typing import Optional
+
+EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # Emoticons
+    "\U0001F300-\U0001F5FF"  # Misc Symbols & Pictographs
+    "\U0001F680-\U0001F6FF"  # Transport & Map
+    "\U0001F1E6-\U0001F1FF"  # Regional Indicator Symbols (flags)
+    "\U0001F900-\U0001F9FF"  # Supplemental Symbols & Pictographs
+    "\U0001FA70-\U0001FAFF"  # Symbols & Pictographs Extended-A
+    "\u2600-\u26FF"          # Miscellaneous Symbols (includes ☀ etc.)
+    "\u2700-\u27BF"          # Dingbats (includes ✨ etc.)
+    "\u2B50"                 # Standalone star ⭐
+    "\u200D\uFE0E\uFE0F"     # ZWJ and variation selectors used in emoji sequences
+    "]"
+)
+
+_TEXT_BLANKS = re.compile(r"[\t\f\v]+")
+_TEXT_NEWLINE_PADDING = re.compile(r"\s*\n\s*")
+_TEXT_MULTI_SPACE = re.compile(r" {2,}")
+
+# opponent's -> opponent\'s; the second pattern is a literal-led pre-check
+_WORD_APOSTROPHE = re.compile(r"(?<!\\)([A-Za-z0-9])'([A-Za-z0-9])")
+_WORD_APOSTROPHE_CHECK = re.compile(r"'(?<=[A-Za-z0-9]')(?=[A-Za-z0-9])")
+
+_FALLBACK_SINGLE = re.compile(r"(\|\|\s*)'((?:\\.|[^'\\])*)'")
+_FALLBACK_DOUBLE = re.compile(r'(\|\|\s*)"((?:\\.|[^"\\])*)"')
+
+# Single-line single-quoted literals (AISlideGenerator)
+_SINGLE_QUOTED_LITERAL = re.compile(r"'([^\n\r]*?)'")
+
+# Kept byte-for-byte from the original checks: ``\\b`` matches a literal
+# backslash-b, so availableWidth/availableHeight are always injected and the
+# other defaults only when a literal ``\b`` token surrounds the name. The
+# golden corpus pins that behaviour.
+_INJECTABLE_NAMES = (
+    'availableWidth', 'availableHeight', 'rayCount', 'iconSize', 'primaryColor', 'secondaryColor',
+    'textColor', 'fontFamily', 'title', 'description',
+)
+_TOKEN_USED = {name: re.compile(rf"\\b{name}\\b") for name in _INJECTABLE_NAMES}
+_TOKEN_DECLARED = {name: re.compile(rf"\\b(const|let|var)\\s+{name}\\b") for name in _INJECTABLE_NAMES}
+_PADDING_LINE = "const padding = props.padding || 32;"
+
+# Variables LLMs often declare twice
+DEDUPE_VARIABLES = (
+    'availableWidth', 'availableHeight', 'primaryColor', 'secondaryColor', 'textColor', 'textColor1', 'textColor2', 'fontFamily',
+    'blur', 'r', 'c',
+)
+_DECLARATIONS = {name: re.compile(rf"(?:const|let|var)\s+{name}\s*=\s*[^;]+;") for name in DEDUPE_VARIABLES}
+_DECLARATION_HEAD = re.compile(rf"(?:const|let|var)\s+({'|'.join(DEDUPE_VARIABLES)})\s*=")
+
+# One pass per property, either quote style. ``\\d+px`` is a literal backslash
+# followed by d+px, as in the original passes.
+_FIXED_DIMENSIONS = (
+    ('maxWidth', re.compile(r"maxWidth:\s*(['\"])\\d+px\1"), '100%'),
+    ('whiteSpace', re.compile(r"whiteSpace:\s*(['\"])nowrap\1"), 'normal'),
+    ('flexWrap', re.compile(r"flexWrap:\s*(['\"])nowrap\1"), 'wrap'),
+)
+
+_RIGID_GRID = re.compile(
+    r"gridTemplateColumns:\s*(?:"
+    r"(['\"])(?:(?:\s*1fr\s*){2,}|\s*repeat\(\s*\d+\s*,\s*1fr\s*\)\s*)\1"
+    r"|repeat\(\s*\d+\s*,\s*1fr\s*\))"
+)
+_CENTER_ALIGNMENTS = (
+    (re.compile(r"alignItems:\s*'center'"), "alignItems: 'flex-start'"),
+    (re.compile(r'alignItems:\s*"center"'), 'alignItems: "flex-start"'),
+    (re.compile(r"justifyContent:\s*'center'"), "justifyContent: 'flex-start'"),
+    (re.compile(r'justifyContent:\s*"center"'), 'justifyContent: "flex-start"'),
+)
+
+# (style injected into the root style object, markers meaning it is already set)
+_ROOT_STYLE_DEFAULTS = (
+    ("width: '100%'", ("width: '100%'",)),
+    ("height: '100%'", ("height: '100%'",)),
+    ("boxSizing: 'border-box'", ("boxSizing: 'border-box'",)),
+    ("overflow: 'hidden'", ("overflow: 'hidden'",)),
+    ("display: 'flex'", ("display: 'flex'",)),
+    ("flexDirection: 'column'", ("flexDirection: 'column'",)),
+    ("position: 'relative'", ("position: 'relative'",)),
+    ("maxWidth: '100%'", ("maxWidth: '100%'",)),
+    ("maxHeight: '100%'", ("maxHeight: '100%'",)),
+    # NOTE: Do NOT inject CSS 'contain' here; it breaks frontend fit-to-box measurement
+    ("overflowWrap: 'anywhere'", ("overflowWrap: 'anywhere'", "overflowWrap: 'break-word'")),
+    ("wordBreak: 'break-word'", ("wordBreak: 'break-word'", "wordBreak: 'anywhere'")),
+    ("textOverflow: 'ellipsis'", ("textOverflow: 'ellipsis'",)),
+    ("whiteSpace: 'normal'", ("whiteSpace: 'normal'",)),
+    ("alignItems: 'stretch'", ("alignItems: 'stretch'",)),
+    ("justifyContent: 'flex-start'", ("justifyContent: 'flex-start'",)),
+)
+
+PROHIBITED_SNIPPETS = (
+    'import ',
+    'require(',
+    'fetch(',
+    'document.',
+    'window.',
+    'dangerouslysetinnerhtml',
+    'eval(',
+    'new websocket(',
+    # Explicit bans to prevent 'Unexpected token catch' and runtime issues
+    'try{', 'try {', ' catch(', 'catch (',
+    'setinterval(', 'settimeout(', 'requestanimationframe(',
+    'updatestate(',
+)
+_STATE_REDECLARATION = re.compile(r"\b(const|let|var)\s+state\s*=")
+_STATE_ASSIGNMENT = re.compile(r"state\s*=")
+
+# Patterns used directly by ComponentValidator._fix_custom_component_render
+TEMPLATE_EXPRESSION = re.compile(r"\$\{([^}]+)\}")
+HARDCODED_WIDTH_PADDING = re.compile(r'props\.width\s*-\s*(\d+)')
+RENDER_SIGNATURE = re.compile(r"function\s+render\s*\(\s*\{[^}]*\}\s*(?:,[^)]*)?\)")
+DEFAULT_VARIANT_USAGE = re.compile(r"\|\|\s*defaultVariant")
+DEFAULT_VARIANT_DECLARATION = re.compile(r"const\s+defaultVariant\s*=.*?;", re.S)
+# ``props\\.`` matches a literal backslash plus any character, as in the original pass
+UNSAFE_WIDTH_FALLBACK = re.compile(r"props\\.width\s*-\s*padding\s*\*\s*2")
+UNSAFE_HEIGHT_FALLBACK = re.compile(r"props\\.height\s*-\s*padding\s*\*\s*2")
+# Counted one pattern at a time: a name like safeHelper counts for two
+HELPER_DEFINITIONS = tuple(re.compile(p) for p in (
+    r'const\s+safe\w+\s*=',
+    r'function\s+safe\w+',
+    r'const\s+format\w+\s*=',
+    r'function\s+format\w+',
+    r'const\s+get\w+\s*=',
+    r'function\s+get\w+',
+    r'const\s+\w+Helper\s*=',
+))
+_LEADING_DOT = re.compile(r"\s*\.")
+_NEWLINE_LEADING_DOT = re.compile(r"\n\s*\.")
+_ESCAPED_NEWLINE_LEADING_DOT = re.compile(r"\\n\s*\.")
+
+
+def remove_emojis(text: str) -> str:
+    """Strip common emoji code point ranges, ZWJ and variation selectors."""
+    if not isinstance(text, str) or not text or text.isascii():
+        return text
+    return EMOJI_PATTERN.sub("", text)
+
+
+def sanitize_text_value(text: str) -> str:
+    """Remove emojis and normalize whitespace in a text value."""
+    if not isinstance(text, str):
+        return text
+    text = remove_emojis(text)
+    # Normalize CRLF/CR to LF, then collapse excessive whitespace while preserving single spaces
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = _TEXT_BLANKS.sub(" ", text)
+    text = _TEXT_NEWLINE_PADDING.sub("\n", text)  # trim around newlines
+    text = _TEXT_MULTI_SPACE.sub(" ", text)
+    return text.strip()
+
+
+def escape_word_apostrophes(render: str) -> str:
+    """Escape apostrophes inside words so they cannot end a JS string: opponent's -> opponent\\'s."""
+    if not _WORD_APOSTROPHE_CHECK.search(render):
+        return render
+    return _WORD_APOSTROPHE.sub(r"\1\\'\2", render)
+
+
+def sanitize_render_string(render: str) -> str:
+    """Remove emojis and escape literal newlines; keep existing escapes intact."""
+    if not isinstance(render, str) or not render:
+        return render
+    cleaned = remove_emojis(render)
+    # CRLF/CR/LF -> escaped "\n" sequences
+    cleaned = cleaned.replace('\r\n', '\\n').replace('\r', '\\n').replace('\n', '\\n')
+    return escape_word_apostrophes(cleaned)
+
+
+def _requote(match: re.Match) -> str:
+    # Outer double quotes, no inner double quotes, unescaped apostrophes
+    normalized = match.group(2).replace('\\"', "'").replace('"', "'").replace("\\'", "'")
+    return f'{match.group(1)}"{normalized}"'
+
+
+def normalize_text_literal_fallbacks(render: str) -> str:
+    """Double-quote ``|| '...'`` text fallbacks and strip inner double quotes."""
+    if not isinstance(render, str) or '||' not in render:
+        return render
+    return _FALLBACK_DOUBLE.sub(_requote, _FALLBACK_SINGLE.sub(_requote, render))
+
+
+def force_double_quoted_literals(render: str) -> str:
+    """Turn every single-line '...' literal into "..." with inner double quotes made single."""
+    if "'" not in render:
+        return render
+
+    def replace(match: re.Match) -> str:
+        inner = match.group(0)[1:-1].replace('\\"', "'").replace('"', "'")
+        return f'"{inner}"'
+
+    return _SINGLE_QUOTED_LITERAL.sub(replace, render)
+
+
+def inject_missing_variable_definitions(render: str) -> str:
+    """Inject declarations for common variables that are referenced but undeclared."""
+    if not isinstance(render, str) or 'function render' not in render:
+        return render
+
+    # Every check pattern needs a literal backslash-b
+    has_marker = '\\b' in render
+
+    def used(name: str) -> bool:
+        return has_marker and _TOKEN_USED[name].search(render) is not None
+
+    def declared(name: str) -> bool:
+        return has_marker and _TOKEN_DECLARED[name].search(render) is not None
+
+    injections = []
+    if not declared('availableWidth'):
+        injections.append("  const availableWidth = props.width - padding * 2;")
+    if not declared('availableHeight'):
+        injections.append("  const availableHeight = props.height - padding * 2;")
+    if used('rayCount') and not declared('rayCount'):
+        injections.append("  const rayCount = props.rayCount || 12;")
+    if used('iconSize') and not declared('iconSize'):
+        injections.append("  const iconSize = Math.min(availableWidth, availableHeight) * 0.4;")
+    if used('primaryColor') and not declared('primaryColor'):
+        injections.append("  const primaryColor = props.primaryColor || props.color || '#FFD100';")
+    if used('secondaryColor') and not declared('secondaryColor'):
+        injections.append("  const secondaryColor = props.secondaryColor || '#4CAF50';")
+    if used('textColor') and not declared('textColor'):
+        injections.append("  const textColor = props.textColor || '#FFFFFF';")
+    if used('fontFamily') and not declared('fontFamily'):
+        injections.append("  const fontFamily = props.fontFamily || 'Poppins';")
+    if used('title') and not declared('title'):
+        injections.append("  const title = props.title || '';")
+    if used('description') and not declared('description'):
+        injections.append("  const description = props.description || '';")
+    if not injections:
+        return render
+
+    # Escaped newlines keep the render a single-line JS string
+    injection_block = "\\n" + "\\n".join(injections)
+    padding_idx = render.find(_PADDING_LINE)
+    if padding_idx != -1:
+        insert_pos = padding_idx + len(_PADDING_LINE)
+        return render[:insert_pos] + injection_block + render[insert_pos:]
+    # Fallback: right after the first '{' (function opening)
+    parts = render.split('{', 1)
+    if len(parts) == 2:
+        return parts[0] + '{' + injection_block + parts[1]
+    return render
+
+
+def dedupe_common_declarations(render: str) -> str:
+    """Remove repeated const/let/var declarations of common variables, keeping the first."""
+    if not isinstance(render, str) or 'function render' not in render:
+        return render
+    # A declaration needs a head; heads are recounted after every removal
+    heads = Counter(_DECLARATION_HEAD.findall(render))
+    updated = render
+    for name in DEDUPE_VARIABLES:
+        if heads[name] < 2:
+            continue
+        matches = list(_DECLARATIONS[name].finditer(updated))
+        if len(matches) < 2:
+            continue
+        keep_end = matches[0].end()
+        pieces = [updated[:keep_end]]
+        last_idx = keep_end
+        for match in matches[1:]:
+            pieces.append(updated[last_idx:match.start()])
+            last_idx = match.end()
+        pieces.append(updated[last_idx:])
+        updated = ''.join(pieces)
+        heads = Counter(_DECLARATION_HEAD.findall(updated))
+    return updated
+
+
+def normalize_render_dimensions(render: str) -> str:
+    """maxWidth: 'NNNpx' -> '100%', whiteSpace nowrap -> normal, flexWrap nowrap -> wrap."""
+    if not isinstance(render, str) or not render:
+        return render
+    for key, pattern, value in _FIXED_DIMENSIONS:
+        if key in render:
+            render = pattern.sub(lambda m: f"{key}: {m.group(1)}{value}{m.group(1)}", render)
+    return render
+
+
+def normalize_layout_responsiveness(render: str) -> str:
+    """Rigid grid columns -> auto-fit; first center alignments -> flex-start."""
+    if not isinstance(render, str) or not render:
+        return render
+    updated = render
+    if 'gridTemplateColumns' in updated:
+        updated = _RIGID_GRID.sub(
+            lambda m: "gridTemplateColumns: {0}repeat(auto-fit, minmax(220px, 1fr)){0}".format(m.group(1) or "'"),
+            updated,
+        )
+    if 'center' in updated:
+        # First occurrence only, to bias the root container
+        for pattern, replacement in _CENTER_ALIGNMENTS:
+            updated = pattern.sub(replacement, updated, count=1)
+    return updated
+
+
+def ensure_root_container_styles(render: str) -> str:
+    """Prepend missing sizing/overflow styles to the first style object of a createElement render."""
+    if not isinstance(render, str):
+        return render
+    if "React.createElement('div', {" not in render or 'style: {' not in render:
+        return render
+    inject_parts = [
+        style for style, markers in _ROOT_STYLE_DEFAULTS
+        if not any(marker in render for marker in markers)
+    ]
+    if not inject_parts:
+        return render
+    return render.replace('style: {', f"style: {{ {', '.join(inject_parts)}, ", 1)
+
+
+def find_prohibited_construct(render: str) -> Optional[str]:
+    """'api' for banned APIs/imports/try-catch/timers, 'state' for a redeclared state param, else None."""
+    lowered = render.lower()
+    if any(snippet in lowered for snippet in PROHIBITED_SNIPPETS):
+        return 'api'
+    if _STATE_ASSIGNMENT.search(render) and _STATE_REDECLARATION.search(render):
+        return 'state'
+    return None
+
+
+def count_helper_definitions(render: str) -> int:
+    return sum(len(pattern.findall(render)) for pattern in HELPER_DEFINITIONS)
+
+
+def has_leading_dot_line(render: str) -> bool:
+    """True when the string or any (real or escaped) line starts with '.', a JS syntax error."""
+    return (
+        _LEADING_DOT.match(render) is not None
+        or _NEWLINE_LEADING_DOT.search(render) is not None
+        or _ESCAPED_NEWLINE_LEADING_DOT.search(render) is not None
+    )
@@ -6,6 +6,7 @@ from models.requests import DeckOutline
 from models.registry import ComponentRegistry
 from agents.config import MAX_PARALLEL_SLIDES, DELAY_BETWEEN_SLIDES
 from setup_logging_optimized import get_logger
+from agents.generation.tracing import start_span
 
 logger = get_logger(__name__)
 
@@ -49,6 +50,9 @@ async def compose_deck_stream(
     except Exception as e:
         print(f"❌❌❌ [compose_deck_stream] ERROR creating composer: {e}")
         raise
+    deck_span = start_span(
+        "deck.generate", deck_uuid=deck_uuid, deck_root=True, slides=len(deck_outline.slides)
+    )
     try:
         print(f"[compose_deck_stream] About to call composer.compose_deck")
 
@@ -71,11 +75,16 @@ async def compose_deck_stream(
             user_id=user_id
         ):
             yield update
+        deck_span.end()
     except Exception as e:
+        deck_span.end(error=e)
         print(f"❌❌❌ [compose_deck_stream] ERROR in compose_deck: {e}")
         import traceback
         traceback.print_exc()
         raise
+    finally:
+        # GeneratorExit/CancelledError skip the handlers above; an open root stays in the tracer
+        deck_span.end()
 
 
 def create_deck_composer(registry: ComponentRegistry):
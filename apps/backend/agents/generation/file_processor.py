@@ -14,9 +14,10 @@ import re
 from typing import List, Dict, Any, Optional, Tuple
 from enum import Enum
 import io
-import csv
 from PIL import Image
 
+from services.tabular_ingestion import ingest_data_file, TabularData
+
 logger = logging.getLogger(__name__)
 
 
@@ -308,23 +309,13 @@ class FileProcessor:
             if not content:
                 return None
             
-            # For CSV files, parse the data
-            if file_type == 'text/csv' or filename.endswith('.csv'):
-                data = self._parse_csv_data(content)
-                if data:
-                    chart_suggestion = self._suggest_chart_type(data, filename)
-                    return {
-                        'filename': filename,
-                        'type': 'data',
-                        'format': 'csv',
-                        'data': data,
-                        'chart_suggestion': chart_suggestion,
-                        'interpretation': f"Data from {filename} with {len(data['rows'])} rows and {len(data['headers'])} columns."
-                    }
+            name = filename.lower()
+            is_excel = not name.endswith('.csv') and (
+                name.endswith(('.xlsx', '.xlsm', '.xls')) or 'spreadsheetml' in file_type or 'ms-excel' in file_type
+            )
             
-            # For Excel files, we can't parse directly in Python without dependencies
-            # So we'll just note it needs processing
-            else:
+            # Legacy binary .xls is not readable with openpyxl; just note it needs processing
+            if name.endswith('.xls'):
                 return {
                     'filename': filename,
                     'type': 'data',
@@ -332,52 +323,55 @@ class FileProcessor:
                     'interpretation': f"Excel file {filename} contains structured data. Recommend converting to chart.",
                     'chart_suggestion': self._suggest_chart_from_filename(filename)
                 }
+            
+            table = self._parse_table(content, filename, file_type, is_excel)
+            if not table:
+                return None
+            data = self._table_to_data(table)
+            chart_suggestion = self._suggest_chart_type(data, filename)
+            return {
+                'filename': filename,
+                'type': 'data',
+                'format': 'excel' if is_excel else 'csv',
+                'data': data,
+                'table': table,
+                'chart_suggestion': chart_suggestion,
+                'interpretation': (
+                    f"Data from {filename} with {table.row_count} rows and {len(table.headers)} columns. "
+                    f"{table.describe()}"
+                )
+            }
                 
         except Exception as e:
             logger.error(f"Error processing data file {file_info.get('name', 'unknown')}: {e}")
             return None
     
+    def _parse_table(self, content: Any, filename: str, file_type: str, is_excel: bool) -> Optional[TabularData]:
+        """Stream a CSV/XLSX upload into typed columns (see services.tabular_ingestion)"""
+        if isinstance(content, str) and (is_excel or content.startswith('data:')):
+            # Binary uploads arrive base64 encoded, optionally as a data URL
+            b64 = content.split(';base64,', 1)[1] if content.startswith('data:') and ';base64,' in content else content
+            content = base64.b64decode(b64)
+        if is_excel:
+            return ingest_data_file(content, filename or 'upload.xlsx', file_type)
+        return ingest_data_file(content, filename or 'upload.csv', 'text/csv')
+    
+    def _table_to_data(self, table: TabularData, preview_rows: int = 20) -> Dict[str, Any]:
+        """Compact data description: headers, column stats and a few preview rows"""
+        return {
+            'headers': table.headers,
+            'rows': table.preview_rows(preview_rows),
+            'numeric_columns': table.numeric_columns,
+            'row_count': table.row_count,
+            'column_count': len(table.headers),
+            'summary': table.summary()
+        }
+    
     def _parse_csv_data(self, content: Any) -> Optional[Dict[str, Any]]:
         """Parse CSV data"""
         try:
-            if isinstance(content, bytes):
-                text = content.decode('utf-8')
-            else:
-                text = str(content)
-            
-            # Parse CSV
-            reader = csv.reader(io.StringIO(text))
-            rows = list(reader)
-            
-            if not rows:
-                return None
-            
-            # First row as headers
-            headers = rows[0] if rows else []
-            data_rows = rows[1:] if len(rows) > 1 else []
-            
-            # Try to detect numeric columns
-            numeric_columns = []
-            for col_idx in range(len(headers)):
-                is_numeric = True
-                for row in data_rows[:10]:  # Check first 10 rows
-                    if col_idx < len(row):
-                        try:
-                            float(row[col_idx].replace(',', '').replace('$', '').replace('%', ''))
-                        except:
-                            is_numeric = False
-                            break
-                if is_numeric:
-                    numeric_columns.append(col_idx)
-            
-            return {
-                'headers': headers,
-                'rows': data_rows,
-                'numeric_columns': numeric_columns,
-                'row_count': len(data_rows),
-                'column_count': len(headers)
-            }
-            
+            table = self._parse_table(content, 'upload.csv', 'text/csv', False)
+            return self._table_to_data(table) if table else None
         except Exception as e:
             logger.error(f"Error parsing CSV: {e}")
             return None
@@ -387,10 +381,14 @@ class FileProcessor:
         headers = data.get('headers', [])
         numeric_cols = data.get('numeric_columns', [])
         row_count = data.get('row_count', 0)
+        # Values, not the label column (e.g. a numeric Year column)
+        label_col = data.get('summary', {}).get('label_column')
+        numeric_cols = [c for c in numeric_cols if c != label_col] or numeric_cols
         
-        # If we have time-series data (year, month, date in headers)
+        # If we have time-series data (year, month, date in headers, or date-valued columns)
         time_patterns = ['year', 'month', 'date', 'time', 'quarter', 'q1', 'q2', 'q3', 'q4']
         has_time = any(any(pattern in header.lower() for pattern in time_patterns) for header in headers)
+        has_time = has_time or any(c.get('type') == 'date' for c in data.get('summary', {}).get('columns', []))
         
         # If we have percentage data
         has_percentages = any('%' in str(row) for row in data.get('rows', []))
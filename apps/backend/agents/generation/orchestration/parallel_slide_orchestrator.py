@@ -14,6 +14,9 @@ from agents.domain.models import (
 from agents.application.event_bus import get_event_bus, Events
 from setup_logging_optimized import get_logger
 from agents.config import ENABLE_PROMPT_CACHE_PREWARM
+from agents.generation.status_registry import (
+    get_generation_status_registry, SLIDE_GENERATING, SLIDE_COMPLETED, SLIDE_FAILED
+)
 
 logger = get_logger(__name__)
 
@@ -52,6 +55,13 @@ class ParallelSlideOrchestrator:
         completed_slides = 0
         slides_in_progress = set()
         total_slides = len(deck_state.deck_outline.slides)
+
+        # Per-slide states for cheap status polling (api_deck_status)
+        get_generation_status_registry().set_slides(
+            deck_state.deck_uuid,
+            [(getattr(slide, 'id', None), getattr(slide, 'title', None)) for slide in deck_state.deck_outline.slides],
+            user_id=getattr(deck_state, 'user_id', None)
+        )
         
         # Create a queue for immediate event streaming
         event_queue = asyncio.Queue()
@@ -262,6 +272,7 @@ class ParallelSlideOrchestrator:
         event_queue: asyncio.Queue
     ):
         """Generate a single slide with streaming events."""
+        status_registry = get_generation_status_registry()
         
         logger.info(f"[PARALLEL_ORCH] Slide {slide_index + 1} waiting for semaphore...")
         async with semaphore:
@@ -356,13 +367,15 @@ class ParallelSlideOrchestrator:
                 })
                 
                 # Update deck status for slide start
+                status_registry.set_slide_state(deck_state.deck_uuid, slide_index, SLIDE_GENERATING)
                 deck_state.status = {
                     'state': 'generating',
                     'currentSlide': slide_index,
                     'totalSlides': len(deck_state.slides),
                     'message': f'Generating slide {slide_index + 1} of {len(deck_state.slides)}',
                     'progress': int((slide_index / len(deck_state.slides)) * 40 + 55),  # 55-95% range
-                    'phase': 'slide_generation'
+                    'phase': 'slide_generation',
+                    'slideStates': status_registry.encoded_slide_states(deck_state.deck_uuid)
                 }
                 
                 # Skip saving deck status here to avoid lock contention
@@ -408,6 +421,7 @@ class ParallelSlideOrchestrator:
                     )
                     
                     # Update deck status in database
+                    status_registry.set_slide_state(deck_state.deck_uuid, slide_index, SLIDE_COMPLETED)
                     completed_count = sum(1 for s in deck_state.slides if s.get('status') == SlideStatus.COMPLETED.value)
                     deck_state.status = {
                         'state': 'generating',
@@ -415,7 +429,8 @@ class ParallelSlideOrchestrator:
                         'totalSlides': len(deck_state.slides),
                         'message': f'Generated {completed_count} of {len(deck_state.slides)} slides',
                         'progress': int((completed_count / len(deck_state.slides)) * 40 + 55),  # 55-95% range
-                        'phase': 'slide_generation'
+                        'phase': 'slide_generation',
+                        'slideStates': status_registry.encoded_slide_states(deck_state.deck_uuid)
                     }
                     
                     # Save the updated deck with new status
@@ -433,6 +448,7 @@ class ParallelSlideOrchestrator:
                 
             except asyncio.TimeoutError:
                 logger.error(f"❌ Slide {slide_index + 1} timed out after 300 seconds")
+                status_registry.set_slide_state(deck_state.deck_uuid, slide_index, SLIDE_FAILED)
                 await event_queue.put({
                     'type': 'slide_error',
                     'slide_index': slide_index,
@@ -451,6 +467,7 @@ class ParallelSlideOrchestrator:
                 else:
                     error_message = str(e)
                     logger.error(f"Error generating slide {slide_index + 1}: {error_message}")
+                status_registry.set_slide_state(deck_state.deck_uuid, slide_index, SLIDE_FAILED)
                 
                 await event_queue.put({
                     'type': 'slide_error',
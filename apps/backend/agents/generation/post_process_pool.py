@@ -0,0 +1,286 @@
+"""
+Process pool for CPU-heavy slide post-processing.
+
+``SlideGeneratorV2._post_process_slide`` (layout normalization, icon/text
+adjacency, logo injection, component validation with adaptive font sizing,
+theme enforcement, CustomComponent value injection) is pure CPU work on the
+slide dict. Run on the event loop, one slide's cleanup stalls SSE for every
+other deck on the worker, so it runs here instead:
+
+- ``process`` (default): in a spawned process pool. The payload is the slide
+  dict plus the generation context without image lists; the component
+  registry is rebuilt once per worker from its JSON schemas and then reused by
+  schema hash.
+- ``thread``: in the default thread pool (still contends for the GIL).
+- ``inline``: on the event loop, as before (for comparison benchmarks).
+
+A task that exceeds ``SLIDE_POST_PROCESS_TIMEOUT`` or cannot be pickled, or a
+broken pool, falls back to the thread path. A timed-out worker keeps running
+its task; the pool is recycled once timeouts pile up.
+
+Per-stage CPU time is returned with every result and aggregated in
+``get_stats()`` (``GET /api/v1/post-process/stats``).
+"""
+
+import asyncio
+import dataclasses
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from setup_logging_optimized import get_logger
+
+logger = get_logger(__name__)
+
+POST_PROCESS_MODE = os.getenv("SLIDE_POST_PROCESS_MODE", "process").lower()
+POST_PROCESS_WORKERS = int(os.getenv("SLIDE_POST_PROCESS_WORKERS", str(min(2, os.cpu_count() or 1))))
+# Generous: the first task of a fresh worker also pays for its imports
+POST_PROCESS_TIMEOUT = float(os.getenv("SLIDE_POST_PROCESS_TIMEOUT", "30"))
+# Timed-out tasks keep their worker busy; recycle the pool after this many
+POST_PROCESS_MAX_TIMEOUTS = int(os.getenv("SLIDE_POST_PROCESS_MAX_TIMEOUTS", "3"))
+
+
+class StageCPUTimer:
+    """CPU time per post-processing stage, read from the calling thread's CPU clock."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._last = time.thread_time()
+
+    def mark(self, stage: str) -> None:
+        """Attribute the CPU time since the previous mark to ``stage``."""
+        now = time.thread_time()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+
+class _RegistryMissing(Exception):
+    """The worker has no registry for the schema hash; resend with the schemas."""
+
+
+# Worker process state: schema hash -> SlideGeneratorV2 used for post-processing
+_worker_generators: Dict[Optional[str], Any] = {}
+
+
+def _init_worker() -> None:
+    # Spans recorded in the worker would never reach the server's tracer
+    from agents.generation import tracing
+    tracing.TRACING_ENABLED = False
+    # Pay for the imports before the first task arrives
+    import agents.generation.slide_generator  # noqa: F401
+
+
+def _worker_generator(schema_hash: Optional[str], json_schemas: Optional[Dict[str, Any]]):
+    generator = _worker_generators.get(schema_hash)
+    if generator is not None:
+        return generator
+    if schema_hash is not None and json_schemas is None:
+        raise _RegistryMissing(schema_hash)
+    from agents.generation.slide_generator import SlideGeneratorV2
+    from agents.generation.components.component_validator import ComponentValidator
+    from models.registry import get_registry_for_schemas
+
+    registry = get_registry_for_schemas(json_schemas)[0] if schema_hash is not None else None
+    generator = SlideGeneratorV2(
+        rag_repository=None,
+        ai_generator=None,
+        component_validator=ComponentValidator(registry),
+        registry=registry,
+        theme_system=None,
+    )
+    _worker_generators[schema_hash] = generator
+    return generator
+
+
+def _post_process_in_worker(
+    payload: bytes, schema_hash: Optional[str], json_schemas: Optional[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], Dict[str, float], float]:
+    generator = _worker_generator(schema_hash, json_schemas)
+    slide_data, context = pickle.loads(payload)
+    timer = StageCPUTimer()
+    start = time.process_time()
+    slide_data = generator._post_process_slide_sync(slide_data, context, timer)
+    return slide_data, timer.stages, (time.process_time() - start) * 1000
+
+
+class PostProcessPool:
+    """Runs slide post-processing off the event loop and keeps timing stats."""
+
+    def __init__(
+        self,
+        mode: str = POST_PROCESS_MODE,
+        workers: int = POST_PROCESS_WORKERS,
+        timeout: float = POST_PROCESS_TIMEOUT,
+    ):
+        self.mode = mode if workers > 0 or mode != "process" else "thread"
+        self.workers = workers
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._timeouts_since_recycle = 0
+        self._stats: Dict[str, Any] = {
+            "runs": {"process": 0, "thread": 0, "inline": 0},
+            "fallbacks": {"timeout": 0, "unpicklable": 0, "broken_pool": 0, "error": 0},
+            "registry_resends": 0,
+            "pool_recycles": 0,
+            "wall_ms": 0.0,
+            "cpu_ms": 0.0,
+            "stages": {},
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def _recycle(self, reason: str) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._timeouts_since_recycle = 0
+            self._stats["pool_recycles"] += 1
+        if executor is not None:
+            logger.warning(f"[POST PROCESS] recycling process pool ({reason})")
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _record(self, mode: str, wall_ms: float, cpu_ms: float, stages: Dict[str, float]) -> None:
+        with self._lock:
+            self._stats["runs"][mode] += 1
+            self._stats["wall_ms"] += wall_ms
+            self._stats["cpu_ms"] += cpu_ms
+            for name, ms in stages.items():
+                stage = self._stats["stages"].setdefault(name, {"count": 0, "cpu_ms": 0.0, "max_ms": 0.0})
+                stage["count"] += 1
+                stage["cpu_ms"] += ms
+                stage["max_ms"] = max(stage["max_ms"], ms)
+
+    def _fallback(self, reason: str) -> None:
+        with self._lock:
+            self._stats["fallbacks"][reason] += 1
+
+    async def run(self, generator: Any, slide_data: Dict[str, Any], context: Any) -> Tuple[Dict[str, Any], Dict[str, float], str]:
+        """Post-process ``slide_data``; returns (slide_data, stage CPU ms, mode used)."""
+        start = time.perf_counter()
+        if self.mode == "process":
+            result = await self._run_in_process(generator, slide_data, context)
+            if result is not None:
+                slide_data, stages, cpu_ms = result
+                self._record("process", (time.perf_counter() - start) * 1000, cpu_ms, stages)
+                return slide_data, stages, "process"
+
+        def run_sync() -> Tuple[Dict[str, Any], Dict[str, float], float]:
+            timer = StageCPUTimer()
+            cpu_start = time.thread_time()
+            result = generator._post_process_slide_sync(slide_data, context, timer)
+            return result, timer.stages, (time.thread_time() - cpu_start) * 1000
+
+        mode = "inline" if self.mode == "inline" else "thread"
+        if mode == "inline":
+            slide_data, stages, cpu_ms = run_sync()
+        else:
+            # to_thread copies contextvars, so spans opened inside nest correctly
+            slide_data, stages, cpu_ms = await asyncio.to_thread(run_sync)
+        self._record(mode, (time.perf_counter() - start) * 1000, cpu_ms, stages)
+        return slide_data, stages, mode
+
+    async def _run_in_process(self, generator: Any, slide_data: Dict[str, Any], context: Any):
+        registry = getattr(generator, "registry", None)
+        schema_hash = getattr(registry, "schema_hash", None) if registry is not None else None
+        if registry is not None and schema_hash is None:
+            # Not a ComponentRegistry; it cannot be rebuilt in the worker
+            self._fallback("unpicklable")
+            return None
+        try:
+            if dataclasses.is_dataclass(context):
+                context = dataclasses.replace(context, available_images=[], tagged_media=[])
+            payload = pickle.dumps((slide_data, context), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"[POST PROCESS] slide payload not picklable, using thread fallback: {e}")
+            self._fallback("unpicklable")
+            return None
+
+        loop = asyncio.get_running_loop()
+        json_schemas = None
+        for _ in range(2):
+            try:
+                future = self._get_executor().submit(_post_process_in_worker, payload, schema_hash, json_schemas)
+                return await asyncio.wait_for(asyncio.wrap_future(future, loop=loop), self.timeout)
+            except _RegistryMissing:
+                json_schemas = registry.get_json_schemas()
+                with self._lock:
+                    self._stats["registry_resends"] += 1
+            except asyncio.TimeoutError:
+                logger.warning(f"[POST PROCESS] worker timed out after {self.timeout:.0f}s, using thread fallback")
+                self._fallback("timeout")
+                with self._lock:
+                    self._timeouts_since_recycle += 1
+                    recycle = self._timeouts_since_recycle >= POST_PROCESS_MAX_TIMEOUTS
+                if recycle:
+                    self._recycle("too many timeouts")
+                return None
+            except BrokenProcessPool as e:
+                self._fallback("broken_pool")
+                self._recycle(f"broken pool: {e}")
+                return None
+            except Exception as e:
+                logger.warning(f"[POST PROCESS] worker failed, using thread fallback: {e}")
+                self._fallback("error")
+                return None
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            runs = sum(self._stats["runs"].values())
+            return {
+                "mode": self.mode,
+                "workers": self.workers if self.mode == "process" else 0,
+                "timeout_s": self.timeout,
+                "pool_started": self._executor is not None,
+                "runs": dict(self._stats["runs"]),
+                "fallbacks": dict(self._stats["fallbacks"]),
+                "registry_resends": self._stats["registry_resends"],
+                "pool_recycles": self._stats["pool_recycles"],
+                "avg_wall_ms": round(self._stats["wall_ms"] / runs, 1) if runs else 0.0,
+                "avg_cpu_ms": round(self._stats["cpu_ms"] / runs, 1) if runs else 0.0,
+                "stages": {
+                    name: {
+                        "count": s["count"],
+                        "avg_cpu_ms": round(s["cpu_ms"] / s["count"], 2),
+                        "max_cpu_ms": round(s["max_ms"], 2),
+                    }
+                    for name, s in sorted(self._stats["stages"].items(), key=lambda kv: kv[1]["cpu_ms"], reverse=True)
+                },
+            }
+
+
+_pool: Optional[PostProcessPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_post_process_pool() -> PostProcessPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PostProcessPool()
+    return _pool
+
+
+def shutdown_post_process_pool() -> None:
+    if _pool is not None:
+        _pool.shutdown()
@@ -9,6 +9,8 @@ from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 
+from agents.generation.status_registry import get_generation_status_registry
+
 
 class GenerationPhase(Enum):
     """Standardized phase names for deck generation."""
@@ -37,8 +39,15 @@ class DeckGenerationProgress:
         GenerationPhase.FINALIZATION: (95, 100),      # 95-100% (5% range)
     }
     
-    def __init__(self):
-        """Initialize progress tracker."""
+    def __init__(self, deck_id: Optional[str] = None):
+        """
+        Initialize progress tracker.
+
+        Args:
+            deck_id: When set, phase/message/completion are also published to
+                the generation status registry for status polling
+        """
+        self.deck_id = deck_id
         self.current_phase = GenerationPhase.INITIALIZATION
         self.progress = 0
         self.total_slides = 0
@@ -161,6 +170,8 @@ class DeckGenerationProgress:
         Returns:
             Standardized completion event
         """
+        if self.deck_id:
+            get_generation_status_registry().finish(self.deck_id)
         # Emit a minimal completion event; avoid any progress overlay text on finished slides
         return {
             "type": "deck_complete",
@@ -182,6 +193,8 @@ class DeckGenerationProgress:
         Returns:
             Standardized error event
         """
+        if self.deck_id:
+            get_generation_status_registry().finish(self.deck_id, error=error_message)
         return {
             "type": "error",
             "data": {
@@ -206,6 +219,13 @@ class DeckGenerationProgress:
         # Ensure progress is always included
         if "progress" not in data:
             data["progress"] = self.progress
+
+        if self.deck_id:
+            get_generation_status_registry().update(
+                self.deck_id,
+                phase=data.get("phase", self.current_phase.value),
+                message=data.get("message"),
+            )
             
         return {
             "type": "progress",
@@ -224,6 +244,6 @@ class DeckGenerationProgress:
         return messages.get(phase, f"Processing {phase.value}")
 
 
-def create_progress_manager() -> DeckGenerationProgress:
+def create_progress_manager(deck_id: Optional[str] = None) -> DeckGenerationProgress:
     """Factory function to create progress manager."""
-    return DeckGenerationProgress() 
\ No newline at end of file
+    return DeckGenerationProgress(deck_id=deck_id) 
\ No newline at end of file
@@ -19,6 +19,8 @@ from models.slide_minimal import MinimalSlide
 from setup_logging_optimized import get_logger
 from agents.generation.theme_adapter import ThemeAdapter
 from agents.generation.components.layout_integrator import LayoutIntegrator
+from agents.generation.tracing import current_span, span, start_span
+from agents.generation.post_process_pool import StageCPUTimer, get_post_process_pool
 from services.user_info_service import get_user_info_service
 
 logger = get_logger(__name__)
@@ -62,6 +64,11 @@ class SlideGeneratorV2(ISlideGenerator):
             for i, media in enumerate(context.tagged_media[:2]):  # First 2
                 logger.debug(f"[DEBUG]   Media {i+1}: {media.get('filename', 'unknown')} - URL: {media.get('previewUrl', '')[:100] if media.get('previewUrl') else 'NO URL'}")
         generation_start = datetime.now()
+        # Ended explicitly: an async generator cannot hold the current span across yields
+        slide_span = start_span(
+            "slide.generate", deck_uuid=context.deck_uuid, slide_index=context.slide_index,
+            title=context.slide_outline.title,
+        )
         
         # Emit slide started event
         await self.event_bus.emit(Events.SLIDE_STARTED, {
@@ -81,7 +88,8 @@ class SlideGeneratorV2(ISlideGenerator):
             await self.event_bus.emit(Events.SLIDE_SUBSTEP, substep_event)
             yield substep_event  # Also yield for direct consumption
             
-            rag_context = await self._retrieve_rag_context(context)
+            with span("rag.retrieve", parent=slide_span):
+                rag_context = await self._retrieve_rag_context(context)
             
             # Step 2: Build prompts
             substep_event = {
@@ -93,7 +101,8 @@ class SlideGeneratorV2(ISlideGenerator):
             await self.event_bus.emit(Events.SLIDE_SUBSTEP, substep_event)
             yield substep_event
             
-            system_prompt, user_prompt = await self._build_prompts(context, rag_context)
+            with span("prompt.build", parent=slide_span):
+                system_prompt, user_prompt = await self._build_prompts(context, rag_context)
             
             # Step 3: Generate with AI
             substep_event = {
@@ -105,9 +114,10 @@ class SlideGeneratorV2(ISlideGenerator):
             await self.event_bus.emit(Events.SLIDE_SUBSTEP, substep_event)
             yield substep_event
             
-            slide_data = await self._generate_with_ai(
-                system_prompt, user_prompt, context, rag_context
-            )
+            with span("llm.generate", parent=slide_span):
+                slide_data = await self._generate_with_ai(
+                    system_prompt, user_prompt, context, rag_context
+                )
             
             # Step 4: Post-process and validate
             substep_event = {
@@ -119,11 +129,13 @@ class SlideGeneratorV2(ISlideGenerator):
             await self.event_bus.emit(Events.SLIDE_SUBSTEP, substep_event)
             yield substep_event
             
-            slide_data = await self._post_process_slide(slide_data, context)
+            with span("slide.post_process", parent=slide_span):
+                slide_data = await self._post_process_slide(slide_data, context)
             
             # Calculate timing
             total_elapsed = (datetime.now() - generation_start).total_seconds()
             logger.info(f"✅ Slide {context.slide_index + 1} complete in {total_elapsed:.1f}s")
+            slide_span.end()
             
             # Create event
             event = SlideGeneratedEvent(
@@ -147,6 +159,7 @@ class SlideGeneratorV2(ISlideGenerator):
             
         except Exception as e:
             logger.error(f"Error generating slide {context.slide_index + 1}: {str(e)}")
+            slide_span.end(error=e)
             
             # Emit error event
             await self.event_bus.emit(Events.SLIDE_ERROR, {
@@ -157,6 +170,9 @@ class SlideGeneratorV2(ISlideGenerator):
             
             # Re-raise for proper error handling
             raise
+        finally:
+            # Closed/cancelled generator; end() is a no-op if the span already ended
+            slide_span.end()
     
     async def _retrieve_rag_context(self, context: SlideGenerationContext) -> Dict[str, Any]:
         """Retrieve relevant context using RAG."""
@@ -289,9 +305,25 @@ class SlideGeneratorV2(ISlideGenerator):
         self,
         slide_data: Dict[str, Any],
         context: SlideGenerationContext
+    ) -> Dict[str, Any]:
+        """Post-process off the event loop (process pool by default, see post_process_pool)."""
+        slide_data, stage_cpu_ms, mode = await get_post_process_pool().run(self, slide_data, context)
+        post_span = current_span()
+        if post_span is not None:
+            post_span.set_attribute("mode", mode)
+            for stage, ms in stage_cpu_ms.items():
+                post_span.set_attribute(f"cpu_ms.{stage}", round(ms, 2))
+        return slide_data
+
+    def _post_process_slide_sync(
+        self,
+        slide_data: Dict[str, Any],
+        context: SlideGenerationContext,
+        timer: Optional[StageCPUTimer] = None
     ) -> Dict[str, Any]:
         """
         Post-process slide with validation, font sizing, and theme application.
+        CPU-bound and synchronous; ``timer`` collects CPU time per stage.
 
         Includes:
         - Component ID assignment
@@ -301,6 +333,7 @@ class SlideGeneratorV2(ISlideGenerator):
         - Component validation
         """
         logger.info(f"  [Step 4/4] Post-processing slide {context.slide_index + 1}...")
+        timer = timer or StageCPUTimer()
         try:
             for component in slide_data.get('components', []):
                 if not component.get('id'):
@@ -527,6 +560,7 @@ class SlideGeneratorV2(ISlideGenerator):
         except Exception as e:
             logger.warning(f"[SLIDE GENERATOR] Failed to ensure background defaults: {e}")
         
+        timer.mark("background")
         # Model-only: skip interactive injections
 
         # ThemeOverlay removed
@@ -600,6 +634,7 @@ class SlideGeneratorV2(ISlideGenerator):
         except Exception:
             pass
 
+        timer.mark("theme_layout")
         # Model-only refactor: skip auto centering/balancing
 
         # Normalize component dimensions/positions for reliable overlap detection
@@ -661,6 +696,7 @@ class SlideGeneratorV2(ISlideGenerator):
         except Exception:
             pass
 
+        timer.mark("normalize_geometry")
         # Post-processing: overlap enforcement DISABLED - AI model handles positioning directly
 
         # Ensure icons remain adjacent to their corresponding text blocks
@@ -669,6 +705,7 @@ class SlideGeneratorV2(ISlideGenerator):
         except Exception:
             pass
 
+        timer.mark("icon_adjacency")
         # Model-only: skip title slide enhancements
 
         # Handle images - either apply tagged media or attach available images for frontend selection
@@ -722,6 +759,7 @@ class SlideGeneratorV2(ISlideGenerator):
         except Exception:
             pass
 
+        timer.mark("logo_and_background")
         # Apply adaptive font sizing and validate components
         theme_dict = None
         if context.theme:
@@ -729,14 +767,16 @@ class SlideGeneratorV2(ISlideGenerator):
             logger.info(f"[FONT SIZING] Applying adaptive font sizing to slide {context.slide_index + 1}")
 
         components = slide_data.get('components', [])
-        validated_components = self.component_validator.validate_components(
-            components,
-            self.registry,
-            theme=theme_dict  # Pass theme for font sizing
-        )
+        with span("validation", components=len(components)):
+            validated_components = self.component_validator.validate_components(
+                components,
+                self.registry,
+                theme=theme_dict  # Pass theme for font sizing
+            )
 
         slide_data['components'] = validated_components
         logger.info(f"✅ Validated {len(validated_components)} components")
+        timer.mark("validation")
         slide_data['generated_at'] = datetime.now().isoformat()
         
         # Add theme data to slide
@@ -775,11 +815,13 @@ class SlideGeneratorV2(ISlideGenerator):
         else:
             logger.warning(f"[SLIDE GENERATOR] Skipping theme enforcement - no theme available")
         
+        timer.mark("theme_enforcement")
         # Inject outline-derived values into CustomComponents (value/label/outline chips)
         try:
             self._inject_outline_values_into_custom_components(slide_data, context)
         except Exception as e:
             logger.warning(f"[SLIDE GENERATOR] Outline value injection skipped due to error: {e}")
+        timer.mark("outline_values")
 
         logger.info(
             f"  [Step 4/4] ✓ Post-processing complete - "
@@ -0,0 +1,243 @@
+"""
+In-process registry of deck generation status.
+
+Clients poll ``api_deck_status.get_deck_status`` throughout a generation. It
+used to load the whole deck row (every generated slide) on each poll just to
+count finished slides. Instead, ``ParallelSlideOrchestrator`` and
+``DeckGenerationProgress`` report events here as they happen:
+
+- per deck: one byte per slide (pending/generating/completed/failed), slide
+  ids and titles, and the deck-level state/phase/message;
+- every change bumps the deck's ``version``; the status snapshot served to
+  polls is built once per version.
+
+Polls for a deck generating in this process are served from memory. Other
+workers fall back to the deck's ``status`` column, which carries the same
+compact per-slide states (``slideStates``, see ``encode_slide_states``).
+
+Finished decks stay in the registry for ``GENERATION_STATUS_RETENTION``
+seconds so the final poll still hits memory.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from setup_logging_optimized import get_logger
+
+logger = get_logger(__name__)
+
+GENERATION_STATUS_RETENTION = float(os.getenv("GENERATION_STATUS_RETENTION", "900"))
+GENERATION_STATUS_MAX_DECKS = int(os.getenv("GENERATION_STATUS_MAX_DECKS", "1000"))
+
+SLIDE_PENDING = 0
+SLIDE_GENERATING = 1
+SLIDE_COMPLETED = 2
+SLIDE_FAILED = 3
+SLIDE_STATE_NAMES = ('pending', 'generating', 'completed', 'failed')
+# One character per slide in the persisted status column
+SLIDE_STATE_CODES = 'pgcf'
+_PROGRESS_BY_STATE = (0, 50, 100, 0)
+
+FINISHED_STATES = ('completed', 'failed')
+
+
+def encode_slide_states(states: Sequence[int]) -> str:
+    return ''.join(SLIDE_STATE_CODES[s] for s in states)
+
+
+def decode_slide_states(encoded: str) -> bytearray:
+    return bytearray(SLIDE_STATE_CODES.index(c) if c in SLIDE_STATE_CODES else SLIDE_PENDING for c in encoded)
+
+
+def build_status_snapshot(
+    deck_id: str,
+    status: str,
+    states: Sequence[int],
+    slide_ids: Optional[Sequence[str]] = None,
+    slide_titles: Optional[Sequence[str]] = None,
+    **fields: Any,
+) -> Dict[str, Any]:
+    """Status payload in the shape of ``DeckStatusResponse``."""
+    completed = sum(1 for s in states if s == SLIDE_COMPLETED)
+    total = len(states)
+    slides = []
+    for i, state in enumerate(states):
+        slides.append({
+            'index': i,
+            'id': slide_ids[i] if slide_ids and i < len(slide_ids) and slide_ids[i] else f'slide_{i}',
+            'title': slide_titles[i] if slide_titles and i < len(slide_titles) and slide_titles[i] else f'Slide {i+1}',
+            'status': SLIDE_STATE_NAMES[state],
+            'progress': _PROGRESS_BY_STATE[state],
+        })
+    return {
+        'id': deck_id,
+        'status': status,
+        'progress': {
+            'current_slide': completed,
+            'total_slides': total,
+            'percentage': int(completed / total * 100) if total else 0,
+            'slides_completed': completed,
+        },
+        'slides': slides,
+        **fields,
+    }
+
+
+@dataclass
+class DeckGenerationStatus:
+    deck_id: str
+    user_id: Optional[str] = None
+    status: str = 'pending'
+    phase: Optional[str] = None
+    message: Optional[str] = None
+    error: Optional[str] = None
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    slide_ids: List[str] = field(default_factory=list)
+    slide_titles: List[str] = field(default_factory=list)
+    states: bytearray = field(default_factory=bytearray)
+    version: int = 0
+    updated_at: float = field(default_factory=time.monotonic)
+    _snapshot: Optional[Dict[str, Any]] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        if self._snapshot is None or self._snapshot['version'] != self.version:
+            self._snapshot = build_status_snapshot(
+                self.deck_id, self.status, self.states, self.slide_ids, self.slide_titles,
+                generation_started_at=self.started_at,
+                generation_completed_at=self.completed_at,
+                error=self.error,
+                message=self.message,
+                phase=self.phase,
+                version=self.version,
+            )
+        return self._snapshot
+
+
+class GenerationStatusRegistry:
+    """Thread-safe map of deck id -> ``DeckGenerationStatus``."""
+
+    def __init__(self, retention: float = GENERATION_STATUS_RETENTION, max_decks: int = GENERATION_STATUS_MAX_DECKS):
+        self.retention = retention
+        self.max_decks = max_decks
+        self._decks: Dict[str, DeckGenerationStatus] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, deck_id: str) -> DeckGenerationStatus:
+        entry = self._decks.get(deck_id)
+        if entry is None:
+            self._evict()
+            entry = self._decks[deck_id] = DeckGenerationStatus(deck_id)
+        return entry
+
+    def _touch(self, entry: DeckGenerationStatus) -> None:
+        entry.version += 1
+        entry.updated_at = time.monotonic()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [
+            deck_id for deck_id, entry in self._decks.items()
+            if entry.status in FINISHED_STATES and now - entry.updated_at > self.retention
+        ]
+        for deck_id in expired:
+            del self._decks[deck_id]
+        if len(self._decks) >= self.max_decks:
+            # Oldest first; finished decks go before running ones
+            by_age = sorted(self._decks.values(), key=lambda e: (e.status not in FINISHED_STATES, e.updated_at))
+            for entry in by_age[:len(self._decks) - self.max_decks + 1]:
+                del self._decks[entry.deck_id]
+
+    def start_deck(self, deck_id: str, user_id: Optional[str] = None) -> None:
+        """A generation began: reset the deck's entry (a regeneration starts from scratch)."""
+        with self._lock:
+            self._evict()
+            previous = self._decks.get(deck_id)
+            entry = self._decks[deck_id] = DeckGenerationStatus(deck_id, user_id=user_id)
+            entry.version = previous.version + 1 if previous else 1
+            entry.status = 'generating'
+            entry.started_at = datetime.now().isoformat()
+
+    def set_slides(self, deck_id: str, slides: Sequence[Tuple[Optional[str], Optional[str]]], user_id: Optional[str] = None) -> None:
+        """Declare the deck's slides as (id, title) pairs, all pending."""
+        with self._lock:
+            entry = self._entry(deck_id)
+            entry.slide_ids = [slide_id or f'slide_{i}' for i, (slide_id, _title) in enumerate(slides)]
+            entry.slide_titles = [title or f'Slide {i+1}' for i, (_slide_id, title) in enumerate(slides)]
+            entry.states = bytearray(len(slides))
+            if user_id and not entry.user_id:
+                entry.user_id = user_id
+            if entry.status == 'pending':
+                entry.status = 'generating'
+            self._touch(entry)
+
+    def set_slide_state(self, deck_id: str, index: int, state: int) -> None:
+        with self._lock:
+            entry = self._decks.get(deck_id)
+            if entry is None or not 0 <= index < len(entry.states) or entry.states[index] == state:
+                return
+            entry.states[index] = state
+            self._touch(entry)
+
+    def update(self, deck_id: str, **changes: Any) -> None:
+        """Set deck-level fields (status, phase, message, error, completed_at)."""
+        with self._lock:
+            entry = self._entry(deck_id)
+            changed = False
+            for name, value in changes.items():
+                if getattr(entry, name) != value:
+                    setattr(entry, name, value)
+                    changed = True
+            if changed:
+                self._touch(entry)
+
+    def finish(self, deck_id: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            entry = self._entry(deck_id)
+            entry.status = 'failed' if error else 'completed'
+            entry.error = error
+            entry.completed_at = datetime.now().isoformat()
+            self._touch(entry)
+
+    def abandon(self, deck_id: str) -> None:
+        """Drop a deck whose generation ended without finishing (e.g. the stream was closed)."""
+        with self._lock:
+            entry = self._decks.get(deck_id)
+            if entry is not None and entry.status not in FINISHED_STATES:
+                del self._decks[deck_id]
+                logger.info(f"[GENERATION STATUS] dropped unfinished deck {deck_id}")
+
+    def get(self, deck_id: str) -> Optional[Tuple[Optional[str], Dict[str, Any]]]:
+        """(owner user id, status snapshot) for a deck tracked by this process, else None."""
+        with self._lock:
+            entry = self._decks.get(deck_id)
+            if entry is None:
+                return None
+            return entry.user_id, entry.snapshot()
+
+    def encoded_slide_states(self, deck_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._decks.get(deck_id)
+            return encode_slide_states(entry.states) if entry is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            running = sum(1 for e in self._decks.values() if e.status not in FINISHED_STATES)
+            return {'decks': len(self._decks), 'running': running}
+
+
+_registry: Optional[GenerationStatusRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_generation_status_registry() -> GenerationStatusRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = GenerationStatusRegistry()
+    return _registry
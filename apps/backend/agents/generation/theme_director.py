@@ -16,6 +16,7 @@ from agents.application import get_event_bus, AGENT_EVENT, TOOL_CALL_EVENT, TOOL
 from agents.domain.models import ThemeDocument
 from agents.ai.clients import get_client, invoke
 from agents.config import COMPOSER_MODEL
+from agents.generation.tracing import traced
 
 logger = get_logger(__name__)
 
@@ -33,6 +34,7 @@ class ThemeDirector:
     def __init__(self):
         self.event_bus = get_event_bus()
 
+    @traced("theme.director")
     async def generate_theme_document(
         self,
         deck_outline: Any,
@@ -0,0 +1,492 @@
+"""
+In-process tracing for deck generation.
+
+Spans cover the generation stages (outline, theme, palette search, image
+search/upload, RAG retrieval, prompt build, LLM call, validation, font sizing,
+persistence) and carry the deck UUID and slide index. Finished spans are kept
+per deck for ``GET /api/v1/traces/{deck_uuid}/summary`` and, when
+``TRACE_EXPORT_PATH`` is set, appended to that file as OTLP/JSON lines (one
+``ExportTraceServiceRequest`` per line) for offline analysis with
+``scripts/summarize_traces.py``.
+
+Usage:
+    with span("rag.retrieve", slide_index=3):          # sync or inside a coroutine
+        ...
+
+    @traced("image.upload")                             # sync or async function
+    async def upload(...): ...
+
+    root = start_span("slide.generate", deck_uuid=..)   # crosses ``yield``s: end explicitly
+    ...
+    root.end()
+
+``span`` sets the current span in a contextvar, so it must not be held open
+across a ``yield`` of an async generator; use ``start_span`` with an explicit
+``parent`` there. A span without a parent is attached to the root span of its
+deck (``start_span(..., deck_root=True)``) if one is open.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from agents.generation.logging_config import deck_id_var, slide_index_var
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("GENERATION_TRACING", "true").lower() == "true"
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+TRACE_MAX_DECKS = int(os.getenv("TRACE_MAX_DECKS", "64"))
+TRACE_MAX_SPANS_PER_DECK = int(os.getenv("TRACE_MAX_SPANS_PER_DECK", "5000"))
+
+SERVICE_NAME = "slide-generation"
+SCOPE_NAME = __name__
+
+# OTLP enums
+SPAN_KIND_INTERNAL = 1
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("generation_current_span", default=None)
+
+
+def _trace_id_for(deck_uuid: Optional[str]) -> str:
+    """Decks map to one trace: the deck UUID is the trace id when it is a UUID."""
+    if deck_uuid:
+        try:
+            return uuid.UUID(str(deck_uuid)).hex
+        except ValueError:
+            return uuid.uuid5(uuid.NAMESPACE_URL, str(deck_uuid)).hex
+    return secrets.token_hex(16)
+
+
+class Span:
+    """A timed operation. Ended spans are immutable records handed to the tracer."""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "deck_uuid", "slide_index",
+        "start_ns", "end_ns", "attributes", "error", "_tracer",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        deck_uuid: Optional[str],
+        slide_index: Optional[int],
+        attributes: Dict[str, Any],
+    ):
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.deck_uuid = deck_uuid
+        self.slide_index = slide_index
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self._tracer._finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "deck_uuid": self.deck_uuid,
+            "slide_index": self.slide_index,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "attributes": dict(self.attributes),
+            "error": self.error,
+        }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _from_otlp_value(value: Dict[str, Any]) -> Any:
+    if "intValue" in value:
+        return int(value["intValue"])
+    for key in ("boolValue", "doubleValue", "stringValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+def span_to_otlp(record: Dict[str, Any]) -> Dict[str, Any]:
+    attributes = dict(record["attributes"])
+    if record.get("deck_uuid"):
+        attributes["deck.uuid"] = record["deck_uuid"]
+    if record.get("slide_index") is not None:
+        attributes["slide.index"] = record["slide_index"]
+    otlp = {
+        "traceId": record["trace_id"],
+        "spanId": record["span_id"],
+        "name": record["name"],
+        "kind": SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(record["start_ns"]),
+        "endTimeUnixNano": str(record["end_ns"]),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items() if v is not None],
+        "status": {"code": STATUS_ERROR, "message": record["error"]} if record.get("error") else {"code": STATUS_OK},
+    }
+    if record.get("parent_id"):
+        otlp["parentSpanId"] = record["parent_id"]
+    return otlp
+
+
+def spans_from_otlp(request: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Span records (as produced by ``Span.to_dict``) from one OTLP/JSON export request."""
+    records = []
+    for resource_spans in request.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for otlp in scope_spans.get("spans", []):
+                attributes = {a["key"]: _from_otlp_value(a.get("value", {})) for a in otlp.get("attributes", [])}
+                status = otlp.get("status") or {}
+                records.append({
+                    "name": otlp.get("name", ""),
+                    "trace_id": otlp.get("traceId"),
+                    "span_id": otlp.get("spanId"),
+                    "parent_id": otlp.get("parentSpanId") or None,
+                    "deck_uuid": attributes.pop("deck.uuid", None),
+                    "slide_index": attributes.pop("slide.index", None),
+                    "start_ns": int(otlp.get("startTimeUnixNano", 0)),
+                    "end_ns": int(otlp.get("endTimeUnixNano", 0)),
+                    "attributes": attributes,
+                    "error": status.get("message") if status.get("code") == STATUS_ERROR else None,
+                })
+    return records
+
+
+class OTLPJsonFileSink:
+    """Appends finished spans to a file as OTLP/JSON export requests, one per line."""
+
+    def __init__(self, path: str, batch_size: int = 256):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def export(self, record: Dict[str, Any], flush: bool = False) -> None:
+        with self._lock:
+            self._buffer.append(record)
+            if not flush and len(self._buffer) < self.batch_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self._write(batch)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": [span_to_otlp(r) for r in batch]}],
+            }]
+        }
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(request, separators=(",", ":")) + "\n")
+        except OSError as e:
+            logger.warning(f"[TRACE] could not write spans to {self.path}: {e}")
+
+
+class Tracer:
+    """Creates spans and keeps the finished ones per deck (bounded LRU)."""
+
+    def __init__(self, sink: Optional[OTLPJsonFileSink] = None, max_decks: int = TRACE_MAX_DECKS):
+        self.sink = sink
+        self.max_decks = max_decks
+        self._lock = threading.Lock()
+        self._decks: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._deck_roots: Dict[str, Span] = {}
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        deck_uuid: Optional[str] = None,
+        slide_index: Optional[int] = None,
+        deck_root: bool = False,
+        **attributes: Any,
+    ) -> Span:
+        """Start a span without making it current. Deck and slide are inherited from the parent."""
+        if parent is None and not deck_root:
+            parent = _current_span.get()
+        if deck_uuid is None:
+            deck_uuid = parent.deck_uuid if parent is not None else deck_id_var.get()
+        if slide_index is None:
+            slide_index = parent.slide_index if parent is not None else slide_index_var.get()
+        if parent is None and deck_uuid and not deck_root:
+            parent = self._deck_roots.get(deck_uuid)
+        trace_id = parent.trace_id if parent is not None else _trace_id_for(deck_uuid)
+        new_span = Span(
+            self, name, trace_id, parent.span_id if parent is not None else None,
+            deck_uuid, slide_index, attributes,
+        )
+        if deck_root and deck_uuid:
+            with self._lock:
+                self._deck_roots[deck_uuid] = new_span
+        return new_span
+
+    def _finish(self, finished: Span) -> None:
+        record = finished.to_dict()
+        is_root = False
+        if finished.deck_uuid:
+            with self._lock:
+                spans = self._decks.get(finished.deck_uuid)
+                if spans is None:
+                    spans = self._decks[finished.deck_uuid] = []
+                    while len(self._decks) > self.max_decks:
+                        self._decks.popitem(last=False)
+                else:
+                    self._decks.move_to_end(finished.deck_uuid)
+                if len(spans) < TRACE_MAX_SPANS_PER_DECK:
+                    spans.append(record)
+                is_root = self._deck_roots.get(finished.deck_uuid) is finished
+                if is_root:
+                    del self._deck_roots[finished.deck_uuid]
+        if self.sink is not None:
+            self.sink.export(record, flush=is_root)
+        if is_root:
+            summary = self.get_summary(finished.deck_uuid)
+            stages = ", ".join(
+                f"{name} {ms:.0f}ms" for name, ms in list(summary["critical_path_ms_by_stage"].items())[:4]
+            )
+            logger.info(f"[TRACE] deck {finished.deck_uuid}: {summary['wall_ms']:.0f}ms wall, critical path: {stages}")
+
+    def get_spans(self, deck_uuid: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._decks.get(deck_uuid, []))
+
+    def get_summary(self, deck_uuid: str) -> Dict[str, Any]:
+        spans = self.get_spans(deck_uuid)
+        if not spans:
+            return {"deck_uuid": deck_uuid, "found": False}
+        return {"deck_uuid": deck_uuid, "found": True, **critical_path_summary(spans)}
+
+    def list_decks(self) -> List[str]:
+        with self._lock:
+            return list(self._decks)
+
+
+def critical_path_summary(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Per-stage totals and the critical path of one deck's spans.
+
+    The critical path is walked backwards from the end of the root: the child
+    that finished last, then the child that finished last before that one
+    started, and so on; each chosen child is expanded the same way. Time on
+    the path that no chosen child covers is the span's own (exclusive) time.
+    Several roots (e.g. a deck without a root span) are grouped under a
+    synthetic ``deck`` root covering all of them.
+    """
+    finished = [s for s in spans if s.get("end_ns")]
+    if not finished:
+        return {"wall_ms": 0.0, "span_count": 0, "stages": {}, "critical_path": [], "critical_path_ms_by_stage": {}}
+
+    ids = {s["span_id"] for s in finished}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+    for s in finished:
+        children[s["parent_id"] if s["parent_id"] in ids else None].append(s)
+
+    roots = children[None]
+    if len(roots) == 1:
+        root = roots[0]
+    else:
+        root = {
+            "name": "deck", "span_id": None, "parent_id": None, "slide_index": None,
+            "start_ns": min(s["start_ns"] for s in roots), "end_ns": max(s["end_ns"] for s in roots),
+        }
+        children[None] = roots
+
+    path: List[Dict[str, Any]] = []
+    by_stage: Dict[str, float] = defaultdict(float)
+
+    def walk(node: Dict[str, Any], depth: int) -> None:
+        chain = []
+        cursor = node["end_ns"]
+        for child in sorted(children.get(node["span_id"], []), key=lambda s: s["end_ns"], reverse=True):
+            if child["end_ns"] <= cursor:
+                chain.append(child)
+                cursor = child["start_ns"]
+        covered = sum(c["end_ns"] - c["start_ns"] for c in chain)
+        exclusive_ms = max(0, node["end_ns"] - node["start_ns"] - covered) / 1e6
+        by_stage[node["name"]] += exclusive_ms
+        path.append({
+            "name": node["name"],
+            "slide_index": node.get("slide_index"),
+            "depth": depth,
+            "start_ms": round((node["start_ns"] - root["start_ns"]) / 1e6, 1),
+            "duration_ms": round((node["end_ns"] - node["start_ns"]) / 1e6, 1),
+            "exclusive_ms": round(exclusive_ms, 1),
+        })
+        for child in reversed(chain):
+            walk(child, depth + 1)
+
+    walk(root, 0)
+
+    stages: Dict[str, Dict[str, Any]] = {}
+    for s in finished:
+        ms = (s["end_ns"] - s["start_ns"]) / 1e6
+        stage = stages.setdefault(s["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+        stage["count"] += 1
+        stage["total_ms"] += ms
+        stage["max_ms"] = max(stage["max_ms"], ms)
+        stage["errors"] += 1 if s.get("error") else 0
+    for stage in stages.values():
+        stage["total_ms"] = round(stage["total_ms"], 1)
+        stage["max_ms"] = round(stage["max_ms"], 1)
+
+    return {
+        "wall_ms": round((root["end_ns"] - root["start_ns"]) / 1e6, 1),
+        "span_count": len(finished),
+        "stages": dict(sorted(stages.items(), key=lambda kv: kv[1]["total_ms"], reverse=True)),
+        "critical_path": path,
+        "critical_path_ms_by_stage": {
+            name: round(ms, 1) for name, ms in sorted(by_stage.items(), key=lambda kv: kv[1], reverse=True)
+        },
+    }
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer(OTLPJsonFileSink(TRACE_EXPORT_PATH) if TRACE_EXPORT_PATH else None)
+    return _tracer
+
+
+class _NoopSpan:
+    deck_uuid = None
+    slide_index = None
+    duration_ms = 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def current_span() -> Optional[Span]:
+    """The span opened by the innermost enclosing ``span`` block, if any."""
+    return _current_span.get()
+
+
+def start_span(name: str, parent: Optional[Span] = None, **kwargs: Any) -> Span:
+    """Start a span that the caller ends with ``span.end()``; it is not made current."""
+    if not TRACING_ENABLED:
+        return _NOOP_SPAN  # type: ignore[return-value]
+    if isinstance(parent, _NoopSpan):
+        parent = None
+    return get_tracer().start_span(name, parent=parent, **kwargs)
+
+
+@contextmanager
+def span(name: str, parent: Optional[Span] = None, **kwargs: Any) -> Iterator[Span]:
+    """Time the block as a span and make it the current span for nested spans."""
+    current = start_span(name, parent=parent, **kwargs)
+    if current is _NOOP_SPAN:
+        yield current
+        return
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.end(error=e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorator running the function inside ``span(name)``. ``deck_uuid``/``deck_id``
+    and ``slide_index`` arguments of the function, when present, tag the span.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        params = signature.parameters
+        deck_param = next((p for p in ("deck_uuid", "deck_id") if p in params), None)
+        slide_param = "slide_index" if "slide_index" in params else None
+
+        def span_kwargs(args, kwargs) -> Dict[str, Any]:
+            if not (deck_param or slide_param):
+                return {}
+            try:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+            except TypeError:
+                return {}
+            return {
+                "deck_uuid": bound.get(deck_param) if deck_param else None,
+                "slide_index": bound.get(slide_param) if slide_param else None,
+            }
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, **span_kwargs(args, kwargs)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with span(name, **span_kwargs(args, kwargs)):
+                return func(*args, **kwargs)
+        return sync_wrapper
+
+    return decorator
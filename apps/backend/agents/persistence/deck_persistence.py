@@ -7,6 +7,7 @@ import logging
 from typing import Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor
 from utils.supabase import get_deck, upload_deck
+from services.context_cache import invalidate_deck_hashes
 
 
 class DeckPersistence:
@@ -104,6 +105,7 @@ class DeckPersistence:
         try:
             # Update cache first - this is the source of truth during composition
             self._deck_cache[deck_uuid] = copy.deepcopy(deck_data)
+            invalidate_deck_hashes(deck_uuid)
             
             # Check if we should throttle this save
             if self.should_throttle_save(deck_uuid):
@@ -276,6 +278,7 @@ class DeckPersistence:
             
             # Update cache FIRST - this ensures other parallel updates see the latest data
             self._deck_cache[deck_uuid] = copy.deepcopy(deck)
+            invalidate_deck_hashes(deck_uuid)
             logger.info(f"[PERSISTENCE] Updated deck cache for {deck_uuid}")
             
             # Then save to database
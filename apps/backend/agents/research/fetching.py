@@ -0,0 +1,216 @@
+"""Fetch-side helpers for research tools: page cache and off-loop text extraction.
+
+- ``PageCache``: process-wide LRU keyed by URL, bounded by entry count and by
+  total size. Entries are served without a network call while fresh (TTL) and
+  revalidated with ETag / Last-Modified once stale, so repeated outlines on the
+  same topic do not refetch the same pages.
+- ``decode_body``: decodes a (possibly truncated) body using the header
+  charset, a ``<meta charset>`` sniff, UTF-8, then windows-1252.
+- ``extract_text``: strips scripts/styles and flattens a page to text. Uses lxml
+  when installed (several times faster than ``html.parser``) and runs in a
+  worker pool via ``extract_text_async`` so parsing never blocks the event loop.
+"""
+
+import asyncio
+import codecs
+import logging
+import multiprocessing
+import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - depends on environment
+    HTML_PARSER = "html.parser"
+
+# Bodies are truncated while streaming; nothing downstream reads past this
+MAX_BODY_BYTES = int(os.getenv("RESEARCH_FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+PAGE_CACHE_TTL_SECONDS = float(os.getenv("RESEARCH_PAGE_CACHE_TTL", "3600"))
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("RESEARCH_PAGE_CACHE_SIZE", "512"))
+# Total HTML + extracted text held by the cache (characters, ~bytes)
+PAGE_CACHE_MAX_BYTES = int(os.getenv("RESEARCH_PAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+EXTRACT_WORKERS = int(os.getenv("RESEARCH_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+TEXT_LIMIT = 20000
+FALLBACK_HTML_LIMIT = 10000
+
+
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9_\-]+)""", re.IGNORECASE)
+
+
+def decode_body(body: bytes, charset: Optional[str] = None) -> str:
+    """Decode a page body that may have been truncated mid-character."""
+    candidates = [charset] if charset else []
+    match = _META_CHARSET_RE.search(body[:4096])
+    if match:
+        candidates.append(match.group(1).decode("ascii"))
+    for encoding in candidates:
+        try:
+            return body.decode(encoding, errors="replace")
+        except LookupError:
+            continue
+    try:
+        # Incremental: a multi-byte character cut off by truncation is not an error
+        return codecs.getincrementaldecoder("utf-8")().decode(body, final=False)
+    except UnicodeDecodeError:
+        # Legacy undeclared pages: windows-1252 is the HTML spec's fallback
+        return body.decode("cp1252", errors="replace")
+
+
+def extract_text(html: str, limit: int = TEXT_LIMIT, parser: Optional[str] = None) -> str:
+    """Flatten an HTML page to newline-separated text (best-effort)."""
+    try:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, parser or HTML_PARSER)
+        for tag in soup(["script", "style", "noscript"]):
+            tag.decompose()
+        text = "\n".join(t.strip() for t in soup.get_text("\n").splitlines() if t.strip())
+        return text[:limit]
+    except Exception:
+        return html[:FALLBACK_HTML_LIMIT]
+
+
+_executor: Optional[Executor] = None
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        try:
+            # spawn: forking the multi-threaded server can deadlock children on held locks
+            _executor = ProcessPoolExecutor(
+                max_workers=max(1, EXTRACT_WORKERS), mp_context=multiprocessing.get_context("spawn")
+            )
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"[PageFetcher] Process pool unavailable ({e}); extracting in threads")
+            _executor = ThreadPoolExecutor(max_workers=max(1, EXTRACT_WORKERS), thread_name_prefix="page-extract")
+    return _executor
+
+
+async def extract_text_async(html: str, limit: int = TEXT_LIMIT) -> str:
+    """Run ``extract_text`` in the worker pool, falling back inline if the pool breaks."""
+    global _executor
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_executor(), extract_text, html, limit)
+    except Exception as e:
+        # A BrokenProcessPool poisons the executor; drop it so the next call rebuilds it
+        logger.warning(f"[PageFetcher] Extraction pool failed ({e}); retrying in thread")
+        _executor = None
+        return await asyncio.to_thread(extract_text, html, limit)
+
+
+def shutdown_extractor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+@dataclass
+class CachedPage:
+    url: str
+    html: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = field(default_factory=time.time)
+    # Extracted text keyed by limit, filled lazily
+    texts: Dict[int, str] = field(default_factory=dict)
+
+    def size(self) -> int:
+        return len(self.html) + sum(len(text) for text in self.texts.values())
+
+    def is_fresh(self, ttl: float) -> bool:
+        return (time.time() - self.fetched_at) < ttl
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """In-process LRU of fetched pages with TTL + conditional revalidation.
+
+    Bounded by ``max_entries`` and by ``max_bytes`` (HTML plus extracted text),
+    since bodies can be up to ``MAX_BODY_BYTES`` each.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = PAGE_CACHE_MAX_ENTRIES,
+        ttl: float = PAGE_CACHE_TTL_SECONDS,
+        max_bytes: int = PAGE_CACHE_MAX_BYTES,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def put(self, entry: CachedPage) -> None:
+        size = entry.size()
+        if size > self.max_bytes:
+            self._discard(entry.url)
+            return
+        self.total_bytes += size - self._sizes.get(entry.url, 0)
+        self._sizes[entry.url] = size
+        self._entries[entry.url] = entry
+        self._entries.move_to_end(entry.url)
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            url, _ = self._entries.popitem(last=False)
+            self.total_bytes -= self._sizes.pop(url, 0)
+
+    def _discard(self, url: str) -> None:
+        if self._entries.pop(url, None) is not None:
+            self.total_bytes -= self._sizes.pop(url, 0)
+
+    def set_text(self, entry: CachedPage, limit: int, text: str) -> None:
+        """Store extracted text on an entry, keeping the size accounting current."""
+        entry.texts[limit] = text
+        if entry.url in self._entries and self._entries[entry.url] is entry:
+            self.put(entry)
+
+    def touch(self, entry: CachedPage, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Mark a stale entry fresh again after a 304."""
+        entry.fetched_at = time.time()
+        entry.etag = etag or entry.etag
+        entry.last_modified = last_modified or entry.last_modified
+        self.put(entry)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sizes.clear()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_page_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> PageCache:
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = PageCache()
+    return _page_cache
@@ -8,6 +8,9 @@ import json
 from urllib.parse import urlparse
 
 from agents.ai.clients import get_client, invoke
+from agents.research.fetching import (
+    CachedPage, PageCache, get_page_cache, decode_body, extract_text_async, MAX_BODY_BYTES, TEXT_LIMIT
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -339,10 +342,17 @@ class WebSearcher:
 
 
 class PageFetcher:
-    """Fetches and lightly cleans web pages (best-effort)."""
+    """Fetches and lightly cleans web pages (best-effort).
 
-    def __init__(self) -> None:
+    Bodies are truncated while streaming, pages are shared through the
+    process-wide ``PageCache`` (TTL + ETag/Last-Modified revalidation) and text
+    extraction runs in a worker pool so it never blocks the event loop.
+    """
+
+    def __init__(self, cache: Optional[PageCache] = None, max_bytes: int = MAX_BODY_BYTES) -> None:
         self._session: Optional[Any] = None
+        self.cache = cache if cache is not None else get_page_cache()
+        self.max_bytes = max_bytes
 
     async def _get_session(self):
         import aiohttp
@@ -351,38 +361,62 @@ class PageFetcher:
             self._session = aiohttp.ClientSession(timeout=timeout)
         return self._session
 
-    async def fetch(self, url: str) -> str:
+    async def _read_limited(self, resp) -> str:
+        """Read at most ``max_bytes`` of the body and decode it."""
+        chunks: List[bytes] = []
+        size = 0
+        async for chunk in resp.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                break
+        body = b"".join(chunks)[: self.max_bytes]
+        return decode_body(body, resp.charset)
+
+    async def _get_page(self, url: str) -> Optional[CachedPage]:
+        cached = self.cache.get(url)
+        if cached is not None and cached.is_fresh(self.cache.ttl):
+            self.cache.stats["hits"] += 1
+            return cached
+
+        headers = {"User-Agent": "slide-agent/1.0"}
+        if cached is not None:
+            headers.update(cached.validators())
         try:
             session = await self._get_session()
-            async with session.get(url, headers={"User-Agent": "slide-agent/1.0"}) as resp:
+            async with session.get(url, headers=headers) as resp:
+                if resp.status == 304 and cached is not None:
+                    self.cache.stats["revalidated"] += 1
+                    self.cache.touch(cached, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+                    return cached
                 if resp.status != 200:
-                    return ""
-                html = await resp.text(errors="ignore")
+                    return None
+                html = await self._read_limited(resp)
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
         except Exception:
-            return ""
+            return None
 
-        # Light extraction
-        try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, "html.parser")
-            for tag in soup(["script", "style", "noscript"]):
-                tag.decompose()
-            text = "\n".join(t.strip() for t in soup.get_text("\n").splitlines() if t.strip())
-            return text[:20000]
-        except Exception:
-            return html[:10000]
+        self.cache.stats["misses"] += 1
+        page = CachedPage(url=url, html=html, etag=etag, last_modified=last_modified)
+        self.cache.put(page)
+        return page
+
+    async def fetch(self, url: str) -> str:
+        page = await self._get_page(url)
+        if page is None:
+            return ""
+        if TEXT_LIMIT not in page.texts:
+            # Light extraction, off the event loop
+            self.cache.set_text(page, TEXT_LIMIT, await extract_text_async(page.html, TEXT_LIMIT))
+        return page.texts[TEXT_LIMIT]
 
     async def fetch_raw(self, url: str) -> str:
         """Fetch raw HTML without stripping tags/scripts/styles."""
-        try:
-            session = await self._get_session()
-            async with session.get(url, headers={"User-Agent": "slide-agent/1.0"}) as resp:
-                if resp.status != 200:
-                    return ""
-                html = await resp.text(errors="ignore")
-                return html[:200000]
-        except Exception:
+        page = await self._get_page(url)
+        if page is None:
             return ""
+        return page.html[:200000]
 
     async def close(self) -> None:
         if self._session and not self._session.closed:
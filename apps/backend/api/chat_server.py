@@ -14,6 +14,7 @@ import json
 import uuid
 import asyncio
 import logging
+import threading
 import hashlib
 from pathlib import Path
 from typing import Optional, Literal, List, Dict, Any, Tuple
@@ -76,6 +77,9 @@ QUIET_REGISTRY = os.environ.get("QUIET_REGISTRY", "true").lower() == "true"
 # Set up logging first
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from setup_logging_optimized import setup_logging
+# Routers are included (or registered lazily) via api.lazy_routers; handlers that pull
+# in heavy SDKs (instructor, langchain, LLM clients) are imported inside the endpoints
+from api.lazy_routers import LAZY_STARTUP, include_routers, get_router_stats
 
 # Configure logging for the entire application
 setup_logging()
@@ -100,19 +104,16 @@ sentry_sdk.init(
     environment=os.getenv("ENV", "development"),
     release=os.getenv("RENDER_GIT_COMMIT", "unknown"),  # Tracks deployments
     send_default_pii=False,  # Don't send personally identifiable information
+    # Auto-enabled integrations import every SDK they patch (anthropic, openai, langchain,
+    # sqlalchemy, ...) at init; lazy startup keeps only the explicit integrations above
+    auto_enabling_integrations=not LAZY_STARTUP,
     before_send=lambda event, hint: event if event.get('level') != 'debug' else None  # Filter debug events
 )
 
 from models.requests import ChatRequest, ChatResponse, RegistryUpdateRequest, QualityEvaluationRequest, QualityEvaluationResponse, DeckOutline, DeckOutlineResponse, SlideOutline, DeckComposeRequest
 from models.deck import DeckBase
-from models.registry import ComponentRegistry
-
-from api.requests.api_chat import process_api_chat
-from api.requests.api_registry import api_registry
-from api.requests.api_quality_evaluate import api_evaluate_quality
-from api.requests.api_deck_outline import process_deck_outline
-from api.requests.api_pptx_convert import convert_pptx_to_png
-from api.requests.api_deck_check import check_deck_exists, DeckCheckRequest, DeckCheckResponse
+
+from api.requests.api_deck_check import DeckCheckRequest, DeckCheckResponse
 from api.requests.api_openai_outline import (
     process_openai_outline, 
     OpenAIOutlineRequest, 
@@ -126,37 +127,7 @@ from api.requests.api_media_search import (
     MediaSearchRequest,
     MediaSearchResponse
 )
-
-# Import the image options router
-from api.image_options_endpoints import router as image_options_router
-from api.image_generation_endpoint import router as image_generation_router
-# Import the font server router
-from api.font_server import router as font_router
-# Import the auth router
-from api.requests.api_auth import router as auth_router
 from api.requests.api_auth import get_auth_header
-from api.requests.api_deck_sharing import router as deck_sharing_router
-from api.requests.api_public_deck import router as public_deck_router
-from api.requests.api_teams import router as teams_router
-from api.requests.api_deck_access import router as deck_access_router
-from api.requests.api_comments import router as comments_router
-from api.requests.api_outline_chat import router as outline_chat_router
-from api.requests.api_slide_research import router as slide_research_router
-from api.requests.api_slide_reorder import router as slide_reorder_router
-# Make narrative test optional if module was removed during cleanup
-try:
-    from api.requests.api_narrative_test import router as narrative_test_router
-except Exception:  # ModuleNotFoundError or other import errors
-    narrative_test_router = None
-from api.requests.api_websocket_analytics import router as websocket_analytics_router
-from api.requests.api_agent_endpoints import router as agent_router
-from api.requests.api_agent_stream import router as agent_stream_router
-from api.requests.api_uploads import router as uploads_router
-from api.requests.api_agent_messages import router as agent_messages_router
-from api.requests.api_theme import router as theme_router
-from api.requests.api_deck_notes import router as deck_notes_router
-from api.requests.api_admin import router as admin_router
-from api.requests.api_google_integration import router as google_router
 from fastapi import Depends
 
 # Middleware imports removed - files were deleted
@@ -175,8 +146,42 @@ class MediaInterpretationRequest(BaseModel):
     mediaPrompt: str
     systemPrompts: Optional[Dict[str, str]] = None
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start/stop background services tied to the server process."""
+    from services.jobs import JOB_RUNNER_EMBEDDED, get_job_runner
+    from utils.loop_lag import get_loop_lag_monitor
+    job_runner = get_job_runner() if JOB_RUNNER_EMBEDDED else None
+    # Load tiktoken off the request path (it may download its BPE file)
+    from agents.generation.components.prompt_tokens import start_tokenizer_load
+    start_tokenizer_load()
+    if job_runner:
+        # With lazy startup the route modules that register job types may not be
+        # imported yet; a runner without handlers would fail every claimed job
+        from services.jobs.worker import load_job_modules
+        load_job_modules()
+        await job_runner.start()
+    loop_lag_monitor = get_loop_lag_monitor()
+    loop_lag_monitor.start()
+    try:
+        yield
+    finally:
+        await loop_lag_monitor.stop()
+        if job_runner:
+            await job_runner.stop()
+        from agents.generation.post_process_pool import shutdown_post_process_pool
+        shutdown_post_process_pool()
+        from services.font_manifest import stop_font_manifest_watcher
+        stop_font_manifest_watcher()
+        from services.deck_sharing_service import stop_share_access_flusher
+        stop_share_access_flusher()
+        from services.image_hashing import shutdown_image_hasher
+        shutdown_image_hasher()
+        from utils.http_client import close_http_sessions
+        await close_http_sessions()
+
 # Create FastAPI app
-app = FastAPI(title="Slide Sorcery Chat API")
+app = FastAPI(title="Slide Sorcery Chat API", lifespan=lifespan)
 
 # Custom middleware removed - files were deleted
 
@@ -228,30 +233,8 @@ app.add_middleware(
 assets_dir = (Path(__file__).resolve().parent.parent / "assets").resolve()
 app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
 
-# Include the routers
-app.include_router(auth_router)
-app.include_router(image_options_router)
-app.include_router(image_generation_router)
-app.include_router(font_router)
-app.include_router(deck_sharing_router)
-app.include_router(public_deck_router)
-app.include_router(teams_router)
-app.include_router(deck_access_router)
-app.include_router(comments_router)
-app.include_router(outline_chat_router)
-app.include_router(slide_research_router)
-app.include_router(slide_reorder_router)
-if narrative_test_router is not None:
-    app.include_router(narrative_test_router, prefix="", tags=["Narrative Test"])
-app.include_router(websocket_analytics_router, prefix="", tags=["Websocket Analytics"])
-app.include_router(deck_notes_router, prefix="", tags=["Deck Notes"])
-app.include_router(admin_router)
-app.include_router(agent_router)
-app.include_router(agent_stream_router)
-app.include_router(uploads_router)
-app.include_router(agent_messages_router)
-app.include_router(google_router)
-app.include_router(theme_router)
+# Include the routers (lazily imported on first use with CHAT_SERVER_LAZY_STARTUP=true)
+include_routers(app)
 
 # Global registry storage
 REGISTRY = None
@@ -270,20 +253,31 @@ def load_registry_on_startup():
     
     if os.path.exists(schemas_path):
         try:
-            with open(schemas_path, 'r') as f:
-                schemas = json.load(f)
-            
-            REGISTRY = ComponentRegistry(schemas)
+            from api.requests.api_registry import load_registry_snapshot
+            REGISTRY = load_registry_snapshot(schemas_path)
             if not QUIET_REGISTRY:
-                print(f"✅ Registry loaded from {schemas_path} ({len(schemas)} schemas)")
+                print(f"✅ Registry loaded from {schemas_path} ({len(REGISTRY.get_json_schemas())} schemas)")
             return True
         except Exception as e:
             print(f"⚠️  Failed to load registry from {schemas_path}: {e}")
     
     return False
 
-# Try to load registry on startup
-load_registry_on_startup()
+# Try to load registry on startup; in lazy startup mode build it in the background so the
+# server answers /api/health while models load (handlers wait via _registry_ready)
+_registry_thread: Optional[threading.Thread] = None
+if LAZY_STARTUP:
+    _registry_thread = threading.Thread(target=load_registry_on_startup, name="registry-load", daemon=True)
+    _registry_thread.start()
+else:
+    load_registry_on_startup()
+
+async def _registry_ready():
+    """Return REGISTRY, waiting for the background startup load if it is still running"""
+    thread = _registry_thread
+    if thread is not None and thread.is_alive():
+        await asyncio.to_thread(thread.join)
+    return REGISTRY
 
 @app.get("/")
 def read_root():
@@ -291,8 +285,8 @@ def read_root():
 
 @app.post("/api/chat", response_model=ChatResponse)
 async def api_chat_endpoint(request: ChatRequest):
-    global REGISTRY
-    return await process_api_chat(request, REGISTRY)
+    from api.requests.api_chat import process_api_chat
+    return await process_api_chat(request, await _registry_ready())
 
 @app.post("/api/registry")
 async def api_registry_endpoint(request: RegistryUpdateRequest):
@@ -302,12 +296,15 @@ async def api_registry_endpoint(request: RegistryUpdateRequest):
     try:
         # Store the registry data in our global variable
         global REGISTRY
-        REGISTRY = await api_registry(request)
+        from api.requests.api_registry import api_registry
+        await _registry_ready()
+        REGISTRY, report = await api_registry(request)
 
         return {
             "status": "success",
             "message": "Registry data received and stored",
-            "schemas_processed": request.schemas is not None and len(request.schemas) > 0
+            "schemas_processed": request.schemas is not None and len(request.schemas) > 0,
+            **report,
         }
     except Exception as e:
         import traceback
@@ -315,6 +312,17 @@ async def api_registry_endpoint(request: RegistryUpdateRequest):
         print(traceback.format_exc())
         return {"error": str(e)}
 
+@app.get("/api/registry/stats")
+async def api_registry_stats():
+    """Registry cache hits/misses and model build times per schema hash"""
+    from models.registry import get_registry_cache_stats
+    return get_registry_cache_stats()
+
+@app.get("/api/v1/startup/stats")
+async def api_startup_stats():
+    """Which routers are loaded (lazy startup mode) and how long each import took"""
+    return get_router_stats(app)
+
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
@@ -344,6 +352,7 @@ async def trigger_error():
 
 @app.post("/api/quality-evaluate", response_model=QualityEvaluationResponse)
 async def api_quality_evaluate_endpoint(request: QualityEvaluationRequest):
+    from api.requests.api_quality_evaluate import api_evaluate_quality
     return await api_evaluate_quality(request, debug=DEBUG_VISUALIZE_IMAGES)
 
 @app.post("/api/deck-outline", response_model=DeckOutlineResponse)
@@ -353,7 +362,8 @@ async def api_deck_outline_endpoint(request: DeckOutline):
     """
     try:
         # Wait for the deck to be composed and uploaded
-        result = await process_deck_outline(request, REGISTRY)
+        from api.requests.api_deck_outline import process_deck_outline
+        result = await process_deck_outline(request, await _registry_ready())
         
         # The result contains the deck_data with the uploaded deck
         if result and 'deck_data' in result:
@@ -402,6 +412,7 @@ async def api_deck_check_endpoint(request: DeckCheckRequest, token: Optional[str
                 logger.info(f"Authenticated user for deck check: {user_id}")
         except Exception as e:
             logger.warning(f"Could not extract user from token: {str(e)}")
+    from api.requests.api_deck_check import check_deck_exists
     return await check_deck_exists(request)
 
 @app.get("/api/v1/concurrency/stats")
@@ -417,6 +428,60 @@ async def api_concurrency_stats():
     from api.requests.api_deck_check import get_concurrency_stats
     return await get_concurrency_stats()
 
+@app.get("/api/v1/prompt-cache/stats")
+async def api_prompt_cache_stats(deck_uuid: Optional[str] = None):
+    """
+    Anthropic prompt-cache telemetry: reads/writes/misses and hit rates per model,
+    prompt section and deck, plus static-block changes that break caching.
+    Pass ``deck_uuid`` for a single deck.
+    """
+    from agents.ai.prompt_cache_telemetry import get_prompt_cache_telemetry
+    return get_prompt_cache_telemetry().get_stats(deck_uuid)
+
+@app.get("/api/v1/post-process/stats")
+async def api_post_process_stats():
+    """Slide post-processing offload (mode, fallbacks, CPU per stage) and event-loop lag"""
+    from agents.generation.post_process_pool import get_post_process_pool
+    from utils.loop_lag import get_loop_lag_monitor
+    return {"post_process": get_post_process_pool().get_stats(), "loop_lag": get_loop_lag_monitor().get_stats()}
+
+@app.get("/api/v1/edit-latency/stats")
+async def api_edit_latency_stats():
+    """Fast-path deck edits: load/apply/write latency percentiles and conflict retries"""
+    from services.agent_apply import get_edit_latency_stats
+    return get_edit_latency_stats()
+
+@app.get("/api/v1/http-pool/stats")
+async def api_http_pool_stats():
+    """Shared outbound HTTP connection pool (image providers, validation, downloads)"""
+    from utils.http_client import get_http_client_manager
+    return get_http_client_manager().get_stats()
+
+@app.get("/api/v1/image-search-cache/stats")
+async def api_image_search_cache_stats():
+    """Shared image-search result cache: hit/stale/miss counts and hit rate per provider"""
+    from services.image_search_cache import get_image_search_cache
+    return get_image_search_cache().stats()
+
+@app.get("/api/v1/image-hash/stats")
+async def api_image_hash_stats():
+    """Perceptual hashing of image candidates: hashed/failed/timed-out counts and hash cache"""
+    from services.image_hashing import get_image_hasher
+    return get_image_hasher().stats()
+
+@app.get("/api/v1/traces/{deck_uuid}/summary")
+async def api_trace_summary(deck_uuid: str, include_spans: bool = False):
+    """
+    Generation trace of a recent deck: wall time, critical path and per-stage
+    totals (outline, theme, image search, RAG, prompt build, LLM, validation, ...).
+    """
+    from agents.generation.tracing import get_tracer
+    tracer = get_tracer()
+    summary = tracer.get_summary(deck_uuid)
+    if include_spans and summary.get("found"):
+        summary["spans"] = tracer.get_spans(deck_uuid)
+    return summary
+
 @app.post("/api/pptx-convert")
 async def api_pptx_convert_endpoint(file: UploadFile = File(...)):
     """
@@ -424,6 +489,7 @@ async def api_pptx_convert_endpoint(file: UploadFile = File(...)):
     """
     try:
         # Convert the PPTX file to PNG images
+        from api.requests.api_pptx_convert import convert_pptx_to_png
         screenshots = await convert_pptx_to_png(file)
         
         return {
@@ -477,7 +543,7 @@ async def api_openai_outline_stream_endpoint(request: OpenAIOutlineRequest, toke
         
         # Pass user_id to the outline processing
         request._user_id = user_id  # Attach user_id to request
-        result = await process_openai_outline_stream(request, REGISTRY)
+        result = await process_openai_outline_stream(request, await _registry_ready())
         logger.info(f"Returning streaming response (model: {request.model})")
         return result
     except Exception as e:
@@ -536,8 +602,7 @@ async def api_openai_outline_stream_get_endpoint(
         # Attach user id
         setattr(req, "_user_id", user_id)
 
-        global REGISTRY
-        result = await process_openai_outline_stream(req, REGISTRY)
+        result = await process_openai_outline_stream(req, await _registry_ready())
         return result
     except Exception as e:
         logger.error(f"Error in GET outline stream endpoint: {e}")
@@ -665,7 +730,7 @@ async def api_deck_compose_stream_endpoint(request: DeckComposeRequest, token: O
     try:
         # Use global registry
         global REGISTRY
-        if REGISTRY is None:
+        if await _registry_ready() is None:
             raise HTTPException(status_code=500, detail="Registry not initialized")
         
         # Create streaming response
@@ -700,8 +765,8 @@ async def api_deck_create_endpoint(request: DeckComposeRequest):
     Create a new deck from an outline
     """
     try:
-        global REGISTRY
-        result = await process_deck_outline(request, REGISTRY)
+        from api.requests.api_deck_outline import process_deck_outline
+        result = await process_deck_outline(request, await _registry_ready())
         
         if result and 'deck_data' in result:
             deck_data = result['deck_data']
@@ -800,7 +865,7 @@ async def api_deck_create_from_outline_endpoint(request: dict, token: Optional[s
     try:
         # Use global registry
         global REGISTRY
-        if REGISTRY is None:
+        if await _registry_ready() is None:
             raise HTTPException(status_code=500, detail="Registry not initialized")
         
         # Import and create the request object from the proper module
@@ -18,6 +18,7 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.enhanced_font_service import EnhancedFontService
+from services.font_manifest import BACKEND_ROOT, get_font_manifest, get_font_manifest_stats
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,17 @@ _font_list_cache_time = 0
 CACHE_DURATION = 300  # 5 minutes
 
 
+def _font_file_exists(full_path: Path) -> bool:
+    """Manifest lookup; only paths the manifest does not know are checked on disk."""
+    try:
+        rel = full_path.relative_to(BACKEND_ROOT).as_posix()
+    except ValueError:
+        rel = None
+    if rel is not None and get_font_manifest().get_file(rel) is not None:
+        return True
+    return full_path.is_file()
+
+
 class FontInfo(BaseModel):
     """Font information model"""
     id: str
@@ -167,9 +179,9 @@ async def serve_font_file(
         raise HTTPException(status_code=404, detail=f"Font file not found for '{font_id}'")
     
     # Resolve full path
-    full_path = Path(__file__).parent.parent / font_path
+    full_path = BACKEND_ROOT / font_path
     
-    if not full_path.exists():
+    if not _font_file_exists(full_path):
         try:
             logger.error(f"[/file] 404: {full_path}")
         except Exception:
@@ -308,7 +320,7 @@ async def serve_pixelbuddha_font(font_id: str, path: str):
     """
     # Construct the full path
     # Real folder layout is pixelbuddha/downloads/extracted/{font_id}/...
-    base_dir = Path(__file__).parent.parent / "assets" / "fonts" / "pixelbuddha"
+    base_dir = BACKEND_ROOT / "assets" / "fonts" / "pixelbuddha"
     # Decode any percent-encoded characters (including %2F which often isn't decoded automatically)
     decoded = unquote(path)
     # Strip optional leading assets prefix and normalize legacy folder names
@@ -325,7 +337,7 @@ async def serve_pixelbuddha_font(font_id: str, path: str):
     except Exception:
         pass
     
-    if not font_path.exists():
+    if not _font_file_exists(font_path):
         try:
             logger.error(f"[PB] 404 missing: {font_path}")
         except Exception:
@@ -364,9 +376,9 @@ async def serve_designer_font(font_id: str, filename: str):
     Handles the flatter directory structure
     """
     # Construct the full path
-    font_path = Path(__file__).parent.parent / "assets" / "fonts" / "designer" / font_id / filename
+    font_path = BACKEND_ROOT / "assets" / "fonts" / "designer" / font_id / filename
     
-    if not font_path.exists():
+    if not _font_file_exists(font_path):
         raise HTTPException(status_code=404, detail=f"Font file not found")
     
     # Determine MIME type
@@ -454,5 +466,6 @@ async def health_check():
         "designer_fonts": stats['designer'],
         "fonts_with_metadata": stats['with_metadata'],
         "indexed_tags": len(stats.get('tags', {})),
-        "use_cases": list(stats.get('use_cases', {}).keys())
+        "use_cases": list(stats.get('use_cases', {}).keys()),
+        "manifest": get_font_manifest_stats()
     }
\ No newline at end of file
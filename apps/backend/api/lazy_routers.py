@@ -0,0 +1,172 @@
+"""
+Router registration for chat_server, eager or lazy.
+
+In lazy startup mode (``CHAT_SERVER_LAZY_STARTUP=true``) a router module is not
+imported at startup. A placeholder route sits where ``include_router`` would
+have put its routes; the first request whose path starts with one of the
+router's prefixes imports the module and splices the real routes in right
+after the placeholder, so route precedence is the same as in eager mode.
+Worker spawns then only pay for the modules they actually serve.
+
+Routes of a lazy router are missing from ``/openapi.json`` until loaded; call
+``load_all_routers(app)`` (or run eagerly) when the full schema is needed.
+"""
+
+import importlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+
+try:
+    from starlette.routing import get_route_path
+except ImportError:  # older Starlette
+    def get_route_path(scope) -> str:
+        return scope["path"]
+
+logger = logging.getLogger(__name__)
+
+LAZY_STARTUP = os.getenv("CHAT_SERVER_LAZY_STARTUP", "false").lower() == "true"
+
+
+@dataclass(frozen=True)
+class RouterSpec:
+    module: str
+    # Path prefixes covering every route of the router (checked by scripts/benchmark_startup.py)
+    prefixes: Tuple[str, ...]
+    attr: str = "router"
+    include_kwargs: Dict[str, Any] = field(default_factory=dict)
+    # Missing module is not an error (router removed during cleanup)
+    optional: bool = False
+
+
+# Order matters: it is the include order, i.e. route precedence
+ROUTERS: List[RouterSpec] = [
+    RouterSpec("api.requests.api_auth", ("/auth/",)),
+    RouterSpec("api.image_options_endpoints", ("/api/image-options/",)),
+    RouterSpec("api.image_generation_endpoint", ("/api/images/",)),
+    RouterSpec("api.font_server", ("/api/fonts/",)),
+    RouterSpec("api.requests.api_deck_sharing", ("/api/decks/",)),
+    RouterSpec("api.requests.api_public_deck", ("/api/public/",)),
+    RouterSpec("api.requests.api_teams", ("/api/teams",)),
+    RouterSpec("api.requests.api_deck_access", ("/api/decks/",)),
+    RouterSpec("api.requests.api_comments", ("/api/decks/",)),
+    RouterSpec("api.requests.api_outline_chat", ("/api/outline/",)),
+    RouterSpec("api.requests.api_slide_research", ("/api/slides/research",)),
+    RouterSpec("api.requests.api_slide_reorder", ("/api/slides/reorder",)),
+    RouterSpec(
+        "api.requests.api_narrative_test", ("/api/narrative",),
+        include_kwargs={"prefix": "", "tags": ["Narrative Test"]}, optional=True,
+    ),
+    RouterSpec(
+        "api.requests.api_websocket_analytics", ("/ws/shares/",),
+        include_kwargs={"prefix": "", "tags": ["Websocket Analytics"]},
+    ),
+    RouterSpec("api.requests.api_deck_notes", ("/api/deck/",), include_kwargs={"prefix": "", "tags": ["Deck Notes"]}),
+    RouterSpec("api.requests.api_admin", ("/api/admin/",)),
+    RouterSpec("api.requests.api_agent_endpoints", ("/v1/agent/",)),
+    RouterSpec("api.requests.api_agent_stream", ("/v1/agent/stream",)),
+    RouterSpec("api.requests.api_uploads", ("/v1/uploads/",)),
+    RouterSpec("api.requests.api_agent_messages", ("/v1/agent/",)),
+    RouterSpec(
+        "api.requests.api_google_integration",
+        ("/api/google/", "/api/import/", "/api/jobs/", "/api/charts/", "/api/export/"),
+    ),
+    RouterSpec("api.requests.api_theme", ("/api/theme/",)),
+]
+
+
+def _import_router(spec: RouterSpec) -> Optional[APIRouter]:
+    try:
+        return getattr(importlib.import_module(spec.module), spec.attr)
+    except ModuleNotFoundError as e:
+        if spec.optional and e.name == spec.module:
+            return None
+        raise
+
+
+class LazyRouterRoute(BaseRoute):
+    """Placeholder that imports its router on the first matching request."""
+
+    def __init__(self, app: FastAPI, spec: RouterSpec):
+        self.app = app
+        self.spec = spec
+        self.loaded = False
+        self.load_ms: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def matches(self, scope) -> Tuple[Match, dict]:
+        if self.loaded or scope.get("type") not in ("http", "websocket"):
+            return Match.NONE, {}
+        path = get_route_path(scope)
+        if any(path.startswith(prefix) for prefix in self.spec.prefixes):
+            self.load()
+        # Never matches itself: once loaded, the real routes follow this one
+        return Match.NONE, {}
+
+    def load(self) -> None:
+        with self._lock:
+            if self.loaded:
+                return
+            start = time.perf_counter()
+            try:
+                router = _import_router(self.spec)
+            except Exception as e:
+                logger.error(f"[LAZY ROUTERS] failed to import {self.spec.module}: {e}")
+                self.loaded = True
+                return
+            if router is not None:
+                staging = APIRouter()
+                staging.include_router(router, **self.spec.include_kwargs)
+                routes = self.app.router.routes
+                index = routes.index(self) + 1
+                routes[index:index] = staging.routes
+                # Regenerate the OpenAPI schema with the new routes
+                self.app.openapi_schema = None
+            self.load_ms = (time.perf_counter() - start) * 1000
+            self.loaded = True
+        logger.info(f"[LAZY ROUTERS] loaded {self.spec.module} in {self.load_ms:.0f}ms")
+
+    async def handle(self, scope, receive, send) -> None:  # pragma: no cover - never matched
+        raise RuntimeError("LazyRouterRoute does not handle requests")
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        raise NoMatchFound(name, path_params)
+
+
+def include_routers(app: FastAPI, specs: List[RouterSpec] = ROUTERS, lazy: bool = LAZY_STARTUP) -> None:
+    """Include ``specs`` in order, either directly or behind lazy placeholders."""
+    for spec in specs:
+        if lazy:
+            app.router.routes.append(LazyRouterRoute(app, spec))
+            continue
+        try:
+            router = _import_router(spec)
+        except Exception:
+            if not spec.optional:
+                raise
+            router = None
+        if router is not None:
+            app.include_router(router, **spec.include_kwargs)
+
+
+def load_all_routers(app: FastAPI) -> None:
+    for route in list(app.router.routes):
+        if isinstance(route, LazyRouterRoute):
+            route.load()
+
+
+def get_router_stats(app: FastAPI) -> Dict[str, Any]:
+    placeholders = [r for r in app.router.routes if isinstance(r, LazyRouterRoute)]
+    return {
+        "lazy": bool(placeholders),
+        "routers": {
+            r.spec.module: {"loaded": r.loaded, "load_ms": round(r.load_ms, 1) if r.load_ms is not None else None}
+            for r in placeholders
+        },
+    }
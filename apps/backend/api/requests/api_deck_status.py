@@ -1,12 +1,22 @@
 """
 API endpoint for getting real-time deck generation status
+
+Decks generating in this process are answered from the in-process
+generation status registry. Otherwise only the deck's ``user_id`` and
+``status`` columns are read; the full deck is loaded only for decks whose
+status carries no slide counts.
 """
 
+import asyncio
 from typing import Dict, Any, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
-from utils.supabase import get_deck
+from agents.generation.status_registry import (
+    get_generation_status_registry, build_status_snapshot, decode_slide_states,
+    SLIDE_COMPLETED, SLIDE_PENDING
+)
+from utils.supabase import get_deck, get_supabase_client
 from services.session_manager import SessionManager
 from setup_logging_optimized import get_logger
 
@@ -40,6 +50,47 @@ class DeckStatusResponse(BaseModel):
     generation_completed_at: Optional[str] = None
     error: Optional[str] = None
     message: Optional[str] = None
+    phase: Optional[str] = None
+    version: Optional[int] = None  # Bumped on every change while generating in this process
+
+
+def _get_status_row(deck_id: str) -> Optional[Dict[str, Any]]:
+    """Owner and status column only - not the slides."""
+    response = get_supabase_client().table("decks").select("user_id, status").eq("uuid", deck_id).limit(1).execute()
+    return response.data[0] if response.data else None
+
+
+def _snapshot_from_status(deck_id: str, status_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Status payload from the persisted status column, None if it has no slide counts."""
+    encoded = status_info.get('slideStates')
+    if encoded:
+        states = decode_slide_states(encoded)
+    elif status_info.get('totalSlides'):
+        total = int(status_info['totalSlides'])
+        completed = min(int(status_info.get('currentSlide') or 0), total)
+        states = bytearray([SLIDE_COMPLETED] * completed + [SLIDE_PENDING] * (total - completed))
+    else:
+        return None
+    state = status_info.get('state') or 'generating'
+    if state == 'error':
+        state = 'failed'
+    return build_status_snapshot(
+        deck_id, state, states,
+        generation_started_at=status_info.get('generation_started_at'),
+        generation_completed_at=status_info.get('generation_completed_at'),
+        error=status_info.get('error'),
+        message=status_info.get('message'),
+        phase=status_info.get('phase'),
+    )
+
+
+async def _check_access(deck_id: str, owner_id: Optional[str], auth_token: Optional[str]) -> None:
+    if auth_token:
+        session_mgr = SessionManager()
+        user_data = await session_mgr.validate_token(auth_token)
+        if user_data and owner_id and owner_id != user_data.get('id'):
+            logger.warning(f"User {user_data.get('id')} attempted to access deck {deck_id} owned by {owner_id}")
+            raise ValueError("Access denied")
 
 
 async def get_deck_status(deck_id: str, auth_token: Optional[str] = None) -> DeckStatusResponse:
@@ -53,22 +104,31 @@ async def get_deck_status(deck_id: str, auth_token: Optional[str] = None) -> Dec
     Returns:
         DeckStatusResponse with current status
     """
-    logger.info(f"Getting status for deck {deck_id}")
-    
-    # Get deck from database
-    deck = get_deck(deck_id)
+    logger.debug(f"Getting status for deck {deck_id}")
+
+    # Generating (or just finished) in this process
+    tracked = get_generation_status_registry().get(deck_id)
+    if tracked is not None:
+        owner_id, snapshot = tracked
+        await _check_access(deck_id, owner_id, auth_token)
+        return DeckStatusResponse(**snapshot)
+
+    # Another worker (or an older generation): status column only
+    row = await asyncio.to_thread(_get_status_row, deck_id)
+    if not row:
+        logger.warning(f"Deck {deck_id} not found")
+        raise ValueError(f"Deck {deck_id} not found")
+    await _check_access(deck_id, row.get('user_id'), auth_token)
+    snapshot = _snapshot_from_status(deck_id, row.get('status') or {})
+    if snapshot is not None:
+        return DeckStatusResponse(**snapshot)
+
+    # No slide counts in the status: count generated slides in the full deck
+    deck = await asyncio.to_thread(get_deck, deck_id)
     if not deck:
         logger.warning(f"Deck {deck_id} not found")
         raise ValueError(f"Deck {deck_id} not found")
     
-    # Check user access if auth token provided
-    if auth_token:
-        session_mgr = SessionManager()
-        user_data = await session_mgr.validate_token(auth_token)
-        if user_data and deck.get('user_id') and deck['user_id'] != user_data.get('id'):
-            logger.warning(f"User {user_data.get('id')} attempted to access deck {deck_id} owned by {deck['user_id']}")
-            raise ValueError("Access denied")
-    
     # Extract status information
     deck_data = deck.get('data', {})
     status_info = deck_data.get('status', {})
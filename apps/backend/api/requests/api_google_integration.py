@@ -12,13 +12,17 @@ import asyncio
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from api.requests.api_auth import get_auth_header
 from services.supabase_auth_service import get_auth_service
 from services.pptx_importer import PPTXImporter
 from services.agent_stream_bus import agent_stream_bus
+from services.jobs import (
+    JobContext, JobError, JobRecord, PermanentJobError,
+    get_job_queue, get_job_runner, register_job_type, stream_job_progress,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -506,8 +510,10 @@ class GoogleApiClient:
 
 
 # ============================
-# Jobs (minimal scaffolding)
+# Jobs
 # ============================
+# Import/export work runs through services.jobs (durable queue + worker
+# process pool). Supabase conversion_jobs is kept in sync as a mirror.
 
 
 class JobType:
@@ -525,13 +531,15 @@ class JobStatus:
 
 
 class ConversionJobs:
+    """Supabase mirror of job status (source of truth is the services.jobs queue)."""
+
     def __init__(self):
         from utils.supabase import get_supabase_client
 
         self.supabase = get_supabase_client()
 
-    def create(self, user_id: str, job_type: str, input_payload: Dict[str, Any]) -> str:
-        job_id = str(uuid.uuid4())
+    def create(self, user_id: str, job_type: str, input_payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        job_id = job_id or str(uuid.uuid4())
         row = {
             "id": job_id,
             "user_id": user_id,
@@ -558,6 +566,16 @@ class ConversionJobs:
             return None
         return res.data[0]
 
+    # Async wrappers: the Supabase client is synchronous, keep it off the event loop
+    async def acreate(self, user_id: str, job_type: str, input_payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.create, user_id, job_type, input_payload, job_id)
+
+    async def aupdate(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        await asyncio.to_thread(self.update, job_id, status, result, error)
+
+    async def aget(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get, job_id)
+
 
 jobs_store = ConversionJobs()
 
@@ -1686,10 +1704,12 @@ async def _map_slides_to_internal(presentation: Dict[str, Any]) -> Dict[str, Any
     return deck
 
 
-async def _run_import_slides_job(user_id: str, job_id: str, presentation_id: str) -> None:
+async def _import_slides_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """IMPORT_SLIDES handler; runs in a job worker process."""
+    user_id = payload["user_id"]
+    presentation_id = payload["presentationId"]
     oauth = GoogleOAuthService()
     api = GoogleApiClient(oauth)
-    jobs_store.update(job_id, JobStatus.RUNNING)
     
     temp_file_path = None
     try:
@@ -1707,9 +1727,10 @@ async def _run_import_slides_job(user_id: str, job_id: str, presentation_id: str
         # Get access token for the user
         access_token = await oauth.refresh_access_token(user_id)
         if not access_token:
-            raise HTTPException(status_code=401, detail="Google authentication required")
+            raise PermanentJobError("Google authentication required")
             
         logger.info(f"Exporting presentation {presentation_id} as PPTX")
+        ctx.progress(0.1, "Exporting Google Slides")
         
         # Download the PPTX file with proper headers
         async with httpx.AsyncClient(follow_redirects=True, timeout=60.0) as client:
@@ -1731,13 +1752,13 @@ async def _run_import_slides_job(user_id: str, job_id: str, presentation_id: str
             if response.status_code != 200:
                 logger.error(f"Export failed with status {response.status_code}: {response.text[:500]}")
                 if response.status_code == 401:
-                    raise HTTPException(status_code=401, detail="Google authentication expired. Please reconnect your Google account.")
+                    raise PermanentJobError("Google authentication expired. Please reconnect your Google account.")
                 elif response.status_code == 403:
-                    raise HTTPException(status_code=403, detail="Access denied. Please ensure you have access to this presentation.")
+                    raise PermanentJobError("Access denied. Please ensure you have access to this presentation.")
                 elif response.status_code == 404:
-                    raise HTTPException(status_code=404, detail="Presentation not found.")
+                    raise PermanentJobError("Presentation not found.")
                 else:
-                    raise HTTPException(status_code=response.status_code, detail=f"Failed to export Google Slides: {response.status_code}")
+                    raise JobError(f"Failed to export Google Slides: {response.status_code}")
                     
             response.raise_for_status()
             
@@ -1748,6 +1769,7 @@ async def _run_import_slides_job(user_id: str, job_id: str, presentation_id: str
                 
         # Step 2: Import the PPTX file
         logger.info("Importing PPTX file")
+        ctx.progress(0.5, "Importing slides")
         importer = PPTXImporter()
         deck = await importer.import_file(temp_file_path)
         
@@ -1764,34 +1786,12 @@ async def _run_import_slides_job(user_id: str, job_id: str, presentation_id: str
             }
         }
         
-        # For large presentations, update in chunks to avoid timeout
-        try:
-            jobs_store.update(job_id, JobStatus.SUCCEEDED, result_data)
-        except Exception as e:
-            # If update fails due to size/timeout, store minimal data
-            logger.warning(f"Failed to store full deck data: {e}")
-            minimal_data = {
-                "deck": {
-                    "id": deck.get("id"),
-                    "name": deck.get("name"),
-                    "slides": len(deck.get("slides", [])),
-                    "metadata": deck.get("metadata", {})
-                },
-                "importMetadata": result_data["importMetadata"],
-                "error": "Full deck data too large for storage"
-            }
-            jobs_store.update(job_id, JobStatus.SUCCEEDED, minimal_data)
+        return result_data
         
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 401:
-            error_msg = "Google authentication expired. Please reconnect your Google account."
-        else:
-            error_msg = f"Failed to export Google Slides: {e.response.status_code}"
-        logger.error(error_msg)
-        jobs_store.update(job_id, JobStatus.FAILED, error=error_msg)
-    except Exception as e:
-        logger.exception("IMPORT_SLIDES job failed")
-        jobs_store.update(job_id, JobStatus.FAILED, error=str(e))
+            raise PermanentJobError("Google authentication expired. Please reconnect your Google account.")
+        raise JobError(f"Failed to export Google Slides: {e.response.status_code}")
     finally:
         # Clean up temp file
         if temp_file_path:
@@ -1801,60 +1801,95 @@ async def _run_import_slides_job(user_id: str, job_id: str, presentation_id: str
                 pass
 
 
-async def _run_import_pptx_job(user_id: str, job_id: str, uploaded_file_path: str) -> None:
-    jobs_store.update(job_id, JobStatus.RUNNING)
+async def _import_pptx_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """IMPORT_PPTX handler; the upload is deleted by the runner once the job is final."""
+    uploaded_file_path = payload["path"]
+    # Use the robust PPTX importer with schema validation
+    from services.robust_pptx_importer import RobustPPTXImporter
+    ctx.progress(0.1, "Parsing presentation")
+    importer = RobustPPTXImporter()
+    deck = await importer.import_file(uploaded_file_path)
+    
+    # Get import report for metadata
+    report = importer.get_import_report()
+    
+    # Update deck name from filename
+    deck["name"] = os.path.splitext(payload.get("filename") or os.path.basename(uploaded_file_path))[0]
+    
+    # Add import metadata to result
+    import_metadata = deck.pop("metadata", {})
+    import_metadata.update({
+        "robust_import_report": report,
+        "schema_validation": report['stats'].get('schema_validation', {}),
+        "success_rate": report['success_rate'],
+        "recovery_methods": report.get('recovery_methods_used', [])
+    })
+    
+    return {
+        "deck": deck,
+        "importMetadata": import_metadata
+    }
+
+
+async def _export_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """EXPORT_EDITABLE / EXPORT_IMAGES handler."""
+    # Placeholder: real implementation would render or create Slides
+    return {
+        "presentationId": None,
+        "webViewLink": None,
+        "thumbnailLink": None,
+        "note": f"{payload.get('job_type')} not yet implemented",
+    }
+
+
+async def _mirror_job_status(record: JobRecord) -> None:
+    """Mirror queue state into Supabase conversion_jobs for clients reading it directly."""
     try:
-        # Use the robust PPTX importer with schema validation
-        from services.robust_pptx_importer import RobustPPTXImporter
-        importer = RobustPPTXImporter()
-        deck = await importer.import_file(uploaded_file_path)
-        
-        # Get import report for metadata
-        report = importer.get_import_report()
-        
-        # Update deck name from filename
-        deck["name"] = os.path.splitext(os.path.basename(uploaded_file_path))[0]
-        
-        # Add import metadata to result
-        import_metadata = deck.pop("metadata", {})
-        import_metadata.update({
-            "robust_import_report": report,
-            "schema_validation": report['stats'].get('schema_validation', {}),
-            "success_rate": report['success_rate'],
-            "recovery_methods": report.get('recovery_methods_used', [])
-        })
-        
-        result_data = {
-            "deck": deck,
-            "importMetadata": import_metadata
-        }
-        
-        jobs_store.update(job_id, JobStatus.SUCCEEDED, result_data)
+        await jobs_store.aupdate(record.id, record.status, record.result, record.error)
     except Exception as e:
-        logger.exception("IMPORT_PPTX job failed")
-        jobs_store.update(job_id, JobStatus.FAILED, error=str(e))
-    finally:
-        # Clean up temp file
-        try:
-            os.unlink(uploaded_file_path)
-        except:
-            pass
+        if record.status != JobStatus.SUCCEEDED or not record.result:
+            raise
+        # If update fails due to size/timeout, store minimal data
+        logger.warning(f"Failed to store full deck data: {e}")
+        deck = record.result.get("deck") or {}
+        minimal_data = {
+            "deck": {
+                "id": deck.get("id"),
+                "name": deck.get("name"),
+                "slides": len(deck.get("slides", [])),
+                "metadata": deck.get("metadata", {})
+            },
+            "importMetadata": record.result.get("importMetadata"),
+            "error": "Full deck data too large for storage"
+        }
+        await jobs_store.aupdate(record.id, record.status, minimal_data)
+
 
+_HANDLER_MODULE = __name__
+register_job_type(JobType.IMPORT_SLIDES, f"{_HANDLER_MODULE}:_import_slides_job", concurrency=2, timeout=900)
+register_job_type(JobType.IMPORT_PPTX, f"{_HANDLER_MODULE}:_import_pptx_job", concurrency=2, timeout=900)
+register_job_type(JobType.EXPORT_EDITABLE, f"{_HANDLER_MODULE}:_export_job", concurrency=1)
+register_job_type(JobType.EXPORT_IMAGES, f"{_HANDLER_MODULE}:_export_job", concurrency=1)
+get_job_runner().on_update = _mirror_job_status
 
-async def _run_export_job(user_id: str, job_id: str, job_type: str, deck: Dict[str, Any], options: Optional[Dict[str, Any]]) -> None:
-    jobs_store.update(job_id, JobStatus.RUNNING)
+
+async def _submit_job(user_id: str, job_type: str, payload: Dict[str, Any], input_payload: Dict[str, Any]) -> str:
+    # Create the mirror row before enqueueing: the embedded runner may claim the job at
+    # once, and its status updates must not race (or be overwritten by) the insert
+    job_id = str(uuid.uuid4())
     try:
-        # Placeholder: real implementation would render or create Slides
-        result = {
-            "presentationId": None,
-            "webViewLink": None,
-            "thumbnailLink": None,
-            "note": f"{job_type} not yet implemented",
-        }
-        jobs_store.update(job_id, JobStatus.SUCCEEDED, result)
+        await jobs_store.acreate(user_id=user_id, job_type=job_type, input_payload=input_payload, job_id=job_id)
     except Exception as e:
-        logger.exception("EXPORT job failed")
-        jobs_store.update(job_id, JobStatus.FAILED, error=str(e))
+        # The local queue is authoritative; the Supabase row is a convenience mirror
+        logger.warning(f"Failed to mirror job {job_id} to conversion_jobs: {e}")
+    try:
+        return await get_job_runner().submit(job_type, payload, user_id=user_id, job_id=job_id)
+    except Exception as e:
+        try:
+            await jobs_store.aupdate(job_id, JobStatus.FAILED, None, f"Failed to enqueue job: {e}")
+        except Exception:
+            pass
+        raise
 
 
 # ============================
@@ -2014,10 +2049,12 @@ async def import_slides(body: SlidesImportRequest, token: Optional[str] = Depend
     if not user:
         raise HTTPException(status_code=401, detail="Authentication required")
     user_id = user["id"]
-    job_id = jobs_store.create(user_id=user_id, job_type=JobType.IMPORT_SLIDES, input_payload=body.model_dump())
-    import asyncio
-
-    asyncio.create_task(_run_import_slides_job(user_id=user_id, job_id=job_id, presentation_id=body.presentationId))
+    job_id = await _submit_job(
+        user_id,
+        JobType.IMPORT_SLIDES,
+        {"user_id": user_id, "presentationId": body.presentationId},
+        input_payload=body.model_dump(),
+    )
     return JobResponse(jobId=job_id)
 
 
@@ -2036,25 +2073,78 @@ async def import_pptx_upload(file: UploadFile = File(...), token: Optional[str]
         content = await file.read()
         tmp.write(content)
         tmp_path = tmp.name
-    job_id = jobs_store.create(user_id=user_id, job_type=JobType.IMPORT_PPTX, input_payload={"filename": file.filename})
-    import asyncio
-
-    asyncio.create_task(_run_import_pptx_job(user_id=user_id, job_id=job_id, uploaded_file_path=tmp_path))
+    job_id = await _submit_job(
+        user_id,
+        JobType.IMPORT_PPTX,
+        {"path": tmp_path, "filename": file.filename, "cleanup_files": [tmp_path]},
+        input_payload={"filename": file.filename},
+    )
     return JobResponse(jobId=job_id)
 
 
+async def _load_job(job_id: str) -> Optional[Dict[str, Any]]:
+    record = await asyncio.to_thread(get_job_queue().get, job_id)
+    if record is not None:
+        return record.to_status_dict()
+    # Jobs created before the local queue existed (or on another host) only live in Supabase
+    return await jobs_store.aget(job_id)
+
+
+@router.get("/jobs/stats")
+async def get_job_stats(token: Optional[str] = Depends(get_auth_header)):
+    """Runner throughput/latency metrics plus queue depth by type and status."""
+    auth_service = get_auth_service()
+    user = auth_service.get_user_with_token(token) if token else None
+    if not user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    runner = get_job_runner()
+    counts = await asyncio.to_thread(get_job_queue().counts)
+    return {"runner": runner.stats(), "queue": counts}
+
+
 @router.get("/jobs/{job_id}")
 async def get_job_status(job_id: str, token: Optional[str] = Depends(get_auth_header)):
     # Optional auth; return job if exists
-    job = jobs_store.get(job_id)
+    job = await _load_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return {"status": job.get("status"), "result": job.get("result"), "error": job.get("error")}
+    return {
+        "status": job.get("status"),
+        "progress": job.get("progress"),
+        "message": job.get("message"),
+        "result": job.get("result"),
+        "error": job.get("error"),
+    }
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, token: Optional[str] = Depends(get_auth_header)):
+    """Server-Sent Events stream of job progress until it succeeds or fails."""
+    auth_service = get_auth_service()
+    user = auth_service.get_user_with_token(token) if token else None
+    if not user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    queue = get_job_queue()
+    record = await asyncio.to_thread(queue.get, job_id)
+    # Other users' jobs look like missing ones
+    if record is None or (record.user_id and record.user_id != user["id"]):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_gen():
+        async for status in stream_job_progress(queue, job_id):
+            if status.get("status") != JobStatus.SUCCEEDED:
+                status = {**status, "result": None}  # Large decks are fetched via /result
+            yield f"data: {json.dumps(status, default=str)}\n\n"
+
+    return StreamingResponse(event_gen(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
 
 
 @router.get("/jobs/{job_id}/result")
 async def get_job_result(job_id: str):
-    job = jobs_store.get(job_id)
+    job = await _load_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     if job.get("status") != JobStatus.SUCCEEDED:
@@ -2484,10 +2574,12 @@ async def export_slides_editable(body: ExportEditableRequest, token: Optional[st
     if not user:
         raise HTTPException(status_code=401, detail="Authentication required")
     user_id = user["id"]
-    job_id = jobs_store.create(user_id=user_id, job_type=JobType.EXPORT_EDITABLE, input_payload={"options": body.options or {}})
-    import asyncio
-
-    asyncio.create_task(_run_export_job(user_id=user_id, job_id=job_id, job_type=JobType.EXPORT_EDITABLE, deck=body.deck, options=body.options))
+    job_id = await _submit_job(
+        user_id,
+        JobType.EXPORT_EDITABLE,
+        {"job_type": JobType.EXPORT_EDITABLE, "deck": body.deck, "options": body.options},
+        input_payload={"options": body.options or {}},
+    )
     return JobResponse(jobId=job_id)
 
 
@@ -2498,10 +2590,12 @@ async def export_slides_images(body: ExportImagesRequest, token: Optional[str] =
     if not user:
         raise HTTPException(status_code=401, detail="Authentication required")
     user_id = user["id"]
-    job_id = jobs_store.create(user_id=user_id, job_type=JobType.EXPORT_IMAGES, input_payload={"options": body.options or {}})
-    import asyncio
-
-    asyncio.create_task(_run_export_job(user_id=user_id, job_id=job_id, job_type=JobType.EXPORT_IMAGES, deck=body.deck, options=body.options))
+    job_id = await _submit_job(
+        user_id,
+        JobType.EXPORT_IMAGES,
+        {"job_type": JobType.EXPORT_IMAGES, "deck": body.deck, "options": body.options},
+        input_payload={"options": body.options or {}},
+    )
     return JobResponse(jobId=job_id)
 
 
@@ -5,9 +5,6 @@ Media search endpoint for finding images, videos, and gifs using SerpAPI.
 import logging
 from typing import Dict, Any, List, Literal
 from pydantic import BaseModel, Field
-from services.serpapi_service import SerpAPIService
-from services.combined_image_service import CombinedImageService
-from services.perplexity_image_service import PerplexityImageService
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +40,10 @@ async def process_media_search(request: MediaSearchRequest) -> MediaSearchRespon
     - images: Per provider flag (Perplexity or SerpAPI) via CombinedImageService
     - videos/gifs: SerpAPI
     """
+    # Image services import the LLM clients; keep them out of server startup
+    from services.serpapi_service import SerpAPIService
+    from services.combined_image_service import CombinedImageService
+    from services.perplexity_image_service import PerplexityImageService
     try:
         async with SerpAPIService() as serpapi_service:
             if not serpapi_service.is_available:
@@ -16,13 +16,12 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
 
-from services.outline_service import OutlineGenerator, OutlineOptions
 from models.requests import DeckOutline, SlideOutline, ExtractedDataItem, TaggedMediaItem
-from api.requests.api_deck_outline import process_deck_outline
 from agents.config import OUTLINE_PLANNING_MODEL, OUTLINE_CONTENT_MODEL
 from models.requests import StylePreferencesItem
 from models.narrative_flow import NarrativeFlow
-from services.narrative_flow_analyzer import NarrativeFlowAnalyzer
+# services.outline_service / NarrativeFlowAnalyzer pull in the LLM SDKs; they are imported
+# inside the handlers so importing the request models here stays cheap
 
 logger = logging.getLogger(__name__)
 
@@ -709,6 +708,8 @@ def _convert_to_api_format(result) -> DeckOutline:
 
 async def process_outline(request: OutlineRequest, registry=None) -> OutlineResponse:
     """Process outline generation request"""
+    from services.outline_service import OutlineGenerator, OutlineOptions
+    from services.narrative_flow_analyzer import NarrativeFlowAnalyzer
     try:
         generator = OutlineGenerator(registry)
         
@@ -772,6 +773,8 @@ async def process_outline(request: OutlineRequest, registry=None) -> OutlineResp
 
 async def process_outline_stream(request: OutlineRequest, registry=None):
     """Process outline generation request and return streaming response"""
+    from services.outline_service import OutlineGenerator, OutlineOptions
+    from services.narrative_flow_analyzer import NarrativeFlowAnalyzer
     logger.info(f"Outline generation started for model: {request.model}")
     logger.info(f"Returning streaming response (model: {request.model})")
     
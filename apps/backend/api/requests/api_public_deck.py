@@ -2,11 +2,12 @@
 API endpoints for public deck access via share links.
 These endpoints don't require authentication.
 """
+import asyncio
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
 
 from services.deck_sharing_service import get_sharing_service
@@ -16,6 +17,13 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/public", tags=["public-deck"])
 
+# Viewers may reuse a response only after revalidating it (edits and revocations apply immediately)
+PUBLIC_DECK_CACHE_CONTROL = "private, no-cache"
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": PUBLIC_DECK_CACHE_CONTROL})
+
 
 # Response Models
 class PublicDeckResponse(BaseModel):
@@ -31,6 +39,7 @@ class PublicDeckResponse(BaseModel):
 async def get_public_deck(
     short_code: str,
     request: Request,
+    response: Response,
     include_slides: bool = Query(True, description="Include slide data in response")
 ):
     """
@@ -40,21 +49,27 @@ async def get_public_deck(
     - Records the access
     - Returns deck data based on share permissions
     - Works for both view-only and edit share links
+    - Answers 304 when If-None-Match carries the current ETag
     """
     try:
-        # Get deck using share code
+        # Get deck using share code (cached per deck version; see services/public_share_cache.py)
         sharing_service = get_sharing_service()
-        deck = sharing_service.get_deck_by_share_code(short_code)
+        public = await asyncio.to_thread(
+            sharing_service.get_public_deck, short_code, include_slides, request.headers.get("if-none-match")
+        )
         
-        if not deck:
+        if not public:
             raise HTTPException(
                 status_code=404, 
                 detail="Invalid share link or deck not found"
             )
+        if public['deck'] is None:
+            return _not_modified(public['etag'])
         
-        # Extract share info
-        share_info = deck.pop('share_info', {})
-        is_editable = share_info.get('is_editable', False)
+        # Shallow copy: the cached row is shared between viewers
+        deck = dict(public['deck'])
+        share_info = {'share_type': public['share_type'], 'is_editable': public['share_type'] == 'edit'}
+        is_editable = share_info['is_editable']
         
         # For view-only links, ensure certain fields are read-only
         if not is_editable:
@@ -65,15 +80,17 @@ async def get_public_deck(
             # Mark as read-only
             deck['read_only'] = True
         
-        # Optionally exclude slides for faster loading
-        if not include_slides and 'slides' in deck:
-            deck['slide_count'] = len(deck.get('slides', []))
+        # Optionally exclude slides for faster loading (the summary row only holds the first one)
+        if not include_slides:
+            deck.setdefault('slide_count', len(deck.get('slides') or []))
             deck.pop('slides', None)
         
         # Log access with IP for analytics
         client_ip = request.client.host if request.client else "unknown"
         logger.info(f"Public deck access: {short_code} from IP {client_ip}")
         
+        response.headers["ETag"] = public['etag']
+        response.headers["Cache-Control"] = PUBLIC_DECK_CACHE_CONTROL
         return PublicDeckResponse(
             deck=deck,
             share_info={
@@ -92,21 +109,26 @@ async def get_public_deck(
 
 
 @router.get("/deck/{short_code}/metadata")
-async def get_public_deck_metadata(short_code: str):
+async def get_public_deck_metadata(short_code: str, request: Request, response: Response):
     """
     Get minimal deck metadata for preview purposes.
     Useful for generating link previews, OG tags, etc.
     """
     try:
-        # Get deck using share code
+        # Summary row only: first slide and slide_count, not the whole slides array
         sharing_service = get_sharing_service()
-        deck = sharing_service.get_deck_by_share_code(short_code)
+        public = await asyncio.to_thread(
+            sharing_service.get_public_deck, short_code, False, request.headers.get("if-none-match")
+        )
         
-        if not deck:
+        if not public:
             raise HTTPException(
                 status_code=404, 
                 detail="Invalid share link or deck not found"
             )
+        if public['deck'] is None:
+            return _not_modified(public['etag'])
+        deck = public['deck']
         
         # Extract metadata
         first_slide = None
@@ -123,7 +145,7 @@ async def get_public_deck_metadata(short_code: str):
         
         metadata = {
             'title': deck.get('name', 'Untitled Presentation'),
-            'slide_count': len(deck.get('slides', [])),
+            'slide_count': deck.get('slide_count', len(deck.get('slides') or [])),
             'created_at': deck.get('created_at'),
             'first_slide': first_slide,
             'theme': {
@@ -132,6 +154,8 @@ async def get_public_deck_metadata(short_code: str):
             } if deck.get('data') else None
         }
         
+        response.headers["ETag"] = public['etag']
+        response.headers["Cache-Control"] = PUBLIC_DECK_CACHE_CONTROL
         return metadata
         
     except HTTPException:
@@ -153,7 +177,7 @@ async def duplicate_public_deck(
     try:
         # Get deck using share code
         sharing_service = get_sharing_service()
-        deck = sharing_service.get_deck_by_share_code(short_code)
+        deck = await asyncio.to_thread(sharing_service.get_deck_by_share_code, short_code)
         
         if not deck:
             raise HTTPException(
@@ -1,8 +1,10 @@
 from models.requests import RegistryUpdateRequest
-from models.registry import ComponentRegistry
+from models.registry import ComponentRegistry, get_registry_for_schemas, schema_hash
 import os
 import json
+import threading
 import time
+from typing import Any, Dict, Optional, Tuple
 
 # Track last registry update to avoid duplicate logging
 _last_registry_update = 0
@@ -11,9 +13,54 @@ _registry_update_count = 0
 # Check if we should be quiet about registry updates
 QUIET_REGISTRY = os.environ.get("QUIET_REGISTRY", "true").lower() == "true"
 
-async def api_registry(request: RegistryUpdateRequest):
+SCHEMAS_DIR = os.path.join(os.path.dirname(__file__), '../../schemas')
+SNAPSHOT_FILENAME = 'typebox_schemas_latest.json'
+
+
+def _snapshot_path() -> str:
+    return os.path.join(SCHEMAS_DIR, SNAPSHOT_FILENAME)
+
+
+def _write_snapshot(schemas: Dict[str, Any]) -> None:
+    """Atomically replace the warm-start snapshot loaded on boot."""
+    os.makedirs(SCHEMAS_DIR, exist_ok=True)
+    tmp_path = _snapshot_path() + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(schemas, f, indent=2)
+    os.replace(tmp_path, _snapshot_path())
+
+
+def prewarm_registry(registry: ComponentRegistry) -> None:
+    """Build every model of ``registry`` on a background thread."""
+    def _warm():
+        try:
+            registry.warm()
+            if not QUIET_REGISTRY:
+                print(f"[Registry] Pre-warmed {registry.schema_hash[:12]} in {registry.build_seconds * 1000:.0f}ms")
+        except Exception as e:
+            print(f"⚠️  Registry pre-warm failed: {e}")
+
+    threading.Thread(target=_warm, name="registry-prewarm", daemon=True).start()
+
+
+def load_registry_snapshot(path: Optional[str] = None) -> Optional[ComponentRegistry]:
+    """Load the registry from the last snapshot written by api_registry, pre-warming it."""
+    path = path or _snapshot_path()
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        schemas = json.load(f)
+    registry, _ = get_registry_for_schemas(schemas)
+    prewarm_registry(registry)
+    return registry
+
+
+async def api_registry(request: RegistryUpdateRequest) -> Tuple[ComponentRegistry, Dict[str, Any]]:
     """
     Receive and store registry data from the frontend
+
+    Returns the registry (shared with earlier uploads of the same schemas) and
+    a small report: schema hash, cache hit, and build time so far.
     """
     global _last_registry_update, _registry_update_count
     
@@ -42,19 +89,30 @@ async def api_registry(request: RegistryUpdateRequest):
         # In quiet mode, just log once that registry was received
         print(f"✅ Registry initialized from {request.source}")
         
-    if request.schemas:
-        schemas_dir = os.path.join(os.path.dirname(__file__), '../../schemas')
-        os.makedirs(schemas_dir, exist_ok=True)
-        
-        if should_log:
-            print(f"Writing schemas to {schemas_dir}")
-            
-        with open(os.path.join(schemas_dir, 'typebox_schemas_latest.json'), 'w') as f:
-            json.dump(request.schemas, f, indent=2)
-
-    # Create registry with TypeBox schemas if available
-    return ComponentRegistry(
-        request.schemas
-    )
-
- 
+    start = time.perf_counter()
+    registry, cache_hit = get_registry_for_schemas(request.schemas)
+
+    if request.schemas and not cache_hit:
+        # Only rewrite the snapshot when the schemas actually changed
+        snapshot_hash = None
+        if os.path.exists(_snapshot_path()):
+            try:
+                with open(_snapshot_path(), 'r') as f:
+                    snapshot_hash = schema_hash(json.load(f))
+            except Exception:
+                snapshot_hash = None
+        if snapshot_hash != registry.schema_hash:
+            if should_log:
+                print(f"Writing schemas to {SCHEMAS_DIR}")
+            _write_snapshot(request.schemas)
+        prewarm_registry(registry)
+
+    report = {
+        "schema_hash": registry.schema_hash,
+        "cache_hit": cache_hit,
+        "request_ms": round((time.perf_counter() - start) * 1000, 1),
+        "build_ms": round(registry.build_seconds * 1000, 1),
+    }
+    if should_log:
+        print(f"[Registry] {'cache hit' if cache_hit else 'new registry'} {report}")
+    return registry, report
@@ -1,9 +1,11 @@
 from typing import Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
 
 from api.requests.api_auth import get_auth_header
 from services.supabase_auth_service import get_auth_service
 from utils.supabase import get_supabase_client
+from services.blob_store import EXTENSION_MIMES, get_blob_store
 
 router = APIRouter(prefix="/v1/uploads", tags=["Uploads"])
 
@@ -59,3 +61,19 @@ async def complete_upload(body: Dict[str, Any], token: Optional[str] = Depends(g
     return {"attachment": {"id": att["id"], "mimeType": att.get("mime_type"), "name": att.get("name"), "size": att.get("size"), "url": att.get("url")}}
 
 
+
+
+@router.get("/blobs/{name}")
+async def get_blob(name: str):
+    """Serve a content-addressed blob (e.g. images externalized by the PPTX importer)."""
+    store = get_blob_store()
+    path = store.path_for(name)
+    if path is None or not path.exists():
+        raise HTTPException(status_code=404, detail="Blob not found")
+    ext = name.rsplit(".", 1)[-1]
+    # Content-addressed: the bytes behind a name never change
+    return FileResponse(
+        path,
+        media_type=EXTENSION_MIMES.get(ext, "application/octet-stream"),
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
@@ -1,9 +1,63 @@
-from typing import Any, Dict, List, Optional, Type
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
 from models.deck import create_typed_deck_model, create_typed_deck_diff_model
 from models.slide import create_typed_slide_model, create_typed_slide_diff_model
 from models.component import create_typed_component_model, create_typed_component_diff_model, ComponentBase, ComponentDiffBase
 from models.props import create_props_model, create_diff_model
 
+logger = logging.getLogger(__name__)
+
+# Registries kept per schema hash (frontends on different builds may alternate)
+REGISTRY_CACHE_SIZE = 4
+
+
+def schema_hash(json_schemas: Optional[Dict[str, Any]]) -> str:
+    """Canonical SHA-256 of a schema payload (key order and whitespace independent)."""
+    canonical = json.dumps(json_schemas or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _LazyModelMap(Mapping):
+    """Read-only mapping over known component types that builds each model on first access."""
+
+    def __init__(self, keys: List[str], factory: Callable[[str], Any]):
+        self._keys = list(keys)
+        self._key_set = set(keys)
+        self._factory = factory
+        self._built: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._built:
+            return self._built[key]
+        if key not in self._key_set:
+            raise KeyError(key)
+        with self._lock:
+            if key not in self._built:
+                self._built[key] = self._factory(key)
+            return self._built[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._key_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def built_count(self) -> int:
+        return len(self._built)
+
+
 class ComponentRegistry:
     """
     A centralized registry that provides access to all typed models.
@@ -37,25 +91,71 @@ class ComponentRegistry:
             json_schemas: Optional JSON schemas for more accurate type definitions
         """
         self._json_schemas = json_schemas or {}
-        self._props_models = {}
-        self._props_diff_models = {}
-        self._component_models = {}
-        self._component_diff_models = {}
-        
+        self.schema_hash = schema_hash(self._json_schemas)
+        self.build_seconds = 0.0
+        self._build_depth = threading.local()
 
-        # Process traditional registry data for any remaining components
-        for type_name, schema in self._json_schemas.items():
-            self._props_models[type_name] = create_props_model(type_name, schema["schema"])
-            self._props_diff_models[type_name] = create_diff_model(self._props_models[type_name])
+        # Per-component models are built lazily on first use; the slide/deck
+        # models below need every component and build them all when first accessed.
+        type_names = list(self._json_schemas.keys())
+        self._props_models = _LazyModelMap(
+            type_names, lambda t: self._timed(create_props_model, t, self._json_schemas[t]["schema"])
+        )
+        self._props_diff_models = _LazyModelMap(
+            type_names, lambda t: self._timed(create_diff_model, self._props_models[t])
+        )
+        self._component_models = _LazyModelMap(
+            type_names, lambda t: self._timed(create_typed_component_model, t, self._props_models[t])
+        )
+        self._component_diff_models = _LazyModelMap(
+            type_names, lambda t: self._timed(create_typed_component_diff_model, t, self._props_diff_models[t])
+        )
+        self._model_lock = threading.RLock()
 
-            self._component_models[type_name] = create_typed_component_model(type_name, self._props_models[type_name])
-            self._component_diff_models[type_name] = create_typed_component_diff_model(type_name, self._props_diff_models[type_name])
+    def _timed(self, factory: Callable[..., Any], *args: Any) -> Any:
+        # Builds nest (deck -> slide -> component -> props); only time the outermost
+        depth = getattr(self._build_depth, "value", 0)
+        self._build_depth.value = depth + 1
+        start = time.perf_counter()
+        try:
+            return factory(*args)
+        finally:
+            self._build_depth.value = depth
+            if depth == 0:
+                self.build_seconds += time.perf_counter() - start
 
-        self.SlideModel = create_typed_slide_model(self._component_models)
-        self.SlideDiffModel = create_typed_slide_diff_model(self._component_models, self._component_diff_models)
+    def _build_once(self, factory: Callable[..., Any], *args: Any) -> Any:
+        with self._model_lock:
+            return self._timed(factory, *args)
 
-        self.DeckModel = create_typed_deck_model(self.SlideModel)
-        self.DeckDiffModel = create_typed_deck_diff_model(self.SlideModel, self.SlideDiffModel)
+    @cached_property
+    def SlideModel(self):
+        return self._build_once(create_typed_slide_model, self._component_models)
+
+    @cached_property
+    def SlideDiffModel(self):
+        return self._build_once(create_typed_slide_diff_model, self._component_models, self._component_diff_models)
+
+    @cached_property
+    def DeckModel(self):
+        return self._build_once(create_typed_deck_model, self.SlideModel)
+
+    @cached_property
+    def DeckDiffModel(self):
+        return self._build_once(create_typed_deck_diff_model, self.SlideModel, self.SlideDiffModel)
+
+    def warm(self) -> "ComponentRegistry":
+        """Build every model now (used to pre-warm in the background)."""
+        _ = self.DeckModel, self.DeckDiffModel
+        return self
+
+    def get_build_stats(self) -> Dict[str, Any]:
+        return {
+            "schema_hash": self.schema_hash,
+            "component_types": len(self._json_schemas),
+            "component_models_built": self._component_models.built_count,
+            "build_ms": round(self.build_seconds * 1000, 1),
+        }
 
     def get_json_schemas(self):
         return self._json_schemas
@@ -162,3 +262,36 @@ class ComponentRegistry:
         Validate deck diff data against the deck diff model
         """
         return self.DeckDiffModel.model_validate(deck_diff_data)
+
+
+_registry_cache: "OrderedDict[str, ComponentRegistry]" = OrderedDict()
+_registry_cache_lock = threading.Lock()
+_registry_cache_stats = {"hits": 0, "misses": 0}
+
+
+def get_registry_for_schemas(json_schemas: Optional[Dict[str, Any]]) -> Tuple[ComponentRegistry, bool]:
+    """
+    Return the registry for a schema payload, reusing the cached one when the
+    canonical hash matches. Returns (registry, cache_hit).
+    """
+    digest = schema_hash(json_schemas)
+    with _registry_cache_lock:
+        registry = _registry_cache.get(digest)
+        if registry is not None:
+            _registry_cache.move_to_end(digest)
+            _registry_cache_stats["hits"] += 1
+            return registry, True
+        _registry_cache_stats["misses"] += 1
+        registry = ComponentRegistry(json_schemas)
+        _registry_cache[digest] = registry
+        while len(_registry_cache) > REGISTRY_CACHE_SIZE:
+            _registry_cache.popitem(last=False)
+    return registry, False
+
+
+def get_registry_cache_stats() -> Dict[str, Any]:
+    with _registry_cache_lock:
+        return {
+            **_registry_cache_stats,
+            "registries": [r.get_build_stats() for r in _registry_cache.values()],
+        }
@@ -1,5 +1,9 @@
+import copy
+import threading
+import weakref
 from typing import Literal, List
 from pydantic import BaseModel, Field
+from pydantic.json_schema import DEFAULT_REF_TEMPLATE, GenerateJsonSchema
 
 class ToolModel(BaseModel):
     tool_name: Literal["undefined"] = Field(description="The name of the tool")
@@ -8,4 +12,43 @@ def undefined_tool(tool_args: ToolModel, state: any):
     raise Exception(f"Tool {tool_args.tool_name} is not defined")
 
 def get_tools_descriptions(tools: List[ToolModel]):
-    return "\n".join([f"{tool.model_json_schema()['title']}: {tool.model_fields['tool_name'].description}" for tool in tools])
\ No newline at end of file
+    return "\n".join([f"{tool.model_json_schema()['title']}: {tool.model_fields['tool_name'].description}" for tool in tools])
+
+
+_schema_cache: "weakref.WeakKeyDictionary[type, dict]" = weakref.WeakKeyDictionary()
+_schema_cache_lock = threading.Lock()
+
+
+class CachedSchemaModel(BaseModel):
+    """
+    Base for dynamically created response models whose JSON schema is requested
+    repeatedly (LLM tool schemas). The schema is generated once per class and
+    copies are returned afterwards. Field-less wrapper subclasses (instructor wraps
+    the response model on every call) reuse their parent's cached schema.
+    """
+
+    @classmethod
+    def model_json_schema(
+        cls,
+        by_alias: bool = True,
+        ref_template: str = DEFAULT_REF_TEMPLATE,
+        schema_generator: type[GenerateJsonSchema] = GenerateJsonSchema,
+        mode: Literal['validation', 'serialization'] = 'validation',
+    ) -> dict:
+        owner = cls
+        for base in cls.__mro__[1:]:
+            if base is CachedSchemaModel or not (isinstance(base, type) and issubclass(base, CachedSchemaModel)):
+                break
+            if base.model_fields.keys() != owner.model_fields.keys() or base.__doc__ != owner.__doc__:
+                break
+            owner = base
+        key = (by_alias, ref_template, schema_generator, mode)
+        with _schema_cache_lock:
+            cached = _schema_cache.get(owner, {}).get(key)
+        if cached is None:
+            cached = super(CachedSchemaModel, owner).model_json_schema(
+                by_alias=by_alias, ref_template=ref_template, schema_generator=schema_generator, mode=mode
+            )
+            with _schema_cache_lock:
+                _schema_cache.setdefault(owner, {})[key] = cached
+        return copy.deepcopy(cached)
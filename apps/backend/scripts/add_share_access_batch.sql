@@ -0,0 +1,28 @@
+-- Batched share-access counters for the public share read path
+-- (DeckSharingService buffers views per short code and flushes them here)
+-- Without this function the backend falls back to one record_share_access call per view.
+
+CREATE OR REPLACE FUNCTION record_share_access_batch(p_counts JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    -- p_counts: {"<short_code>": <views since last flush>, ...}
+    UPDATE deck_shares s
+    SET access_count = COALESCE(s.access_count, 0) + c.value::INTEGER,
+        last_accessed_at = NOW()
+    FROM jsonb_each_text(p_counts) AS c
+    WHERE s.short_code = c.key
+      AND s.is_active = TRUE;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Only the backend (service role) flushes counters
+REVOKE EXECUTE ON FUNCTION record_share_access_batch(JSONB) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION record_share_access_batch(JSONB) TO service_role;
+
+-- Share-code lookups on the read path
+CREATE INDEX IF NOT EXISTS idx_deck_shares_short_code_active ON deck_shares(short_code) WHERE is_active;
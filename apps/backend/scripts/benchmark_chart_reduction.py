@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Chart data reduction: slide payload size and reduction cost.
+
+Builds large synthetic chart data (a daily line series with spikes and a
+long-tailed category list), runs it through
+``ChartGenerator.convert_chart_data_to_extracted_data`` and reports the
+extractedData JSON size before/after reduction and the time spent. The
+line series must keep its global max/min after LTTB, and the categorical
+total must be preserved by the "Other" bucket.
+
+Usage:
+    python scripts/benchmark_chart_reduction.py [--points 100000] [--categories 2000] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import chart_reduction
+from services.outline.chart_generator import ChartGenerator
+from services.outline.models import ChartData
+
+
+def convert(generator: ChartGenerator, chart_type: str, data: list, reduce: bool):
+    budgets = dict(chart_reduction.CHART_POINT_BUDGETS)
+    if not reduce:
+        chart_reduction.CHART_POINT_BUDGETS.clear()
+    try:
+        start = time.perf_counter()
+        extracted = generator.convert_chart_data_to_extracted_data(ChartData(chart_type=chart_type, data=data, title='Benchmark'), 'Benchmark')
+        elapsed = time.perf_counter() - start
+    finally:
+        chart_reduction.CHART_POINT_BUDGETS.update(budgets)
+    return extracted, elapsed, len(json.dumps(extracted))
+
+
+def run_case(generator: ChartGenerator, name: str, chart_type: str, data: list) -> dict:
+    full, full_s, full_bytes = convert(generator, chart_type, data, reduce=False)
+    reduced, reduced_s, reduced_bytes = convert(generator, chart_type, data, reduce=True)
+    full_values = np.array([p['value'] for p in full['data']])
+    reduced_values = np.array([p['value'] for p in reduced['data']])
+    if chart_type == 'line':
+        ok = full_values.max() == reduced_values.max() and full_values.min() == reduced_values.min()
+    else:
+        ok = bool(np.isclose(full_values.sum(), reduced_values.sum()))
+    return {
+        'case': name,
+        'points': [len(full['data']), len(reduced['data'])],
+        'bytes': [full_bytes, reduced_bytes],
+        'seconds': [round(full_s, 4), round(reduced_s, 4)],
+        'ok': bool(ok),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=100_000, help="line series length")
+    parser.add_argument("--categories", type=int, default=2_000, help="bar/pie categories")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = np.random.default_rng(42)
+    days = np.datetime64('2000-01-01') + np.arange(args.points).astype('timedelta64[D]')
+    y = np.cumsum(rng.normal(size=args.points)) + 1000
+    y[rng.integers(0, args.points, 5)] += 500
+    line = [{'label': str(d), 'value': float(v)} for d, v in zip(days, y)]
+    sales = rng.pareto(1.5, args.categories) * 1000
+    categories = [{'label': f'SKU {i:05d}', 'value': round(float(v), 2)} for i, v in enumerate(sales)]
+
+    generator = ChartGenerator.__new__(ChartGenerator)
+    reports = [
+        run_case(generator, 'line', 'line', line),
+        run_case(generator, 'bar', 'bar', categories),
+        run_case(generator, 'pie', 'pie', categories),
+    ]
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for r in reports:
+            print(
+                f"{r['case']:<5}{r['points'][0]:>8} -> {r['points'][1]:<5} points  "
+                f"{r['bytes'][0] / 1e3:>9.1f} -> {r['bytes'][1] / 1e3:.1f} KB  "
+                f"convert {r['seconds'][0]:.3f} s -> {r['seconds'][1]:.3f} s  {'ok' if r['ok'] else 'MISMATCH'}"
+            )
+    if not all(r['ok'] for r in reports):
+        print("❌ reduced series lost extremes or totals")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark deck context snapshots on a 40-slide deck with inline images and long
+CustomComponent render strings.
+
+Compares the old whole-deck json.dumps + SHA-256 hash (plus full digest rebuild)
+with the per-slide hash tree: a full rebuild, a lookup for a version written
+through the edit path, an incremental update after a one-slide edit, and a
+lookup after a UI save (same version, new last_modified, one slide changed).
+
+Usage:
+    python scripts/benchmark_deck_hashing.py [--slides 40] [--image-kb 300]
+"""
+import argparse
+import base64
+import copy
+import json
+import os
+import sys
+import time
+import uuid
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import context_cache
+from services.context_cache import _json_hash, get_deck_context_snapshot, note_deck_edit
+from utils.summaries import build_deck_digest
+
+
+def make_deck(slides: int, image_kb: int) -> dict:
+    image = "data:image/png;base64," + base64.b64encode(os.urandom(image_kb * 1024)).decode()
+    render = "function render({ props }) { return React.createElement('div', null, 'x'); }\n" * 400
+    deck = {"uuid": str(uuid.uuid4()), "name": "Benchmark deck", "version": str(uuid.uuid4()),
+            "last_modified": time.time(), "slides": []}
+    for s in range(slides):
+        components = [
+            {"id": f"bg-{s}", "type": "Background", "props": {"backgroundColor": "#fff"}},
+            {"id": f"title-{s}", "type": "TiptapTextBlock", "props": {"texts": [{"text": f"Slide {s}"}], "position": {"x": 80, "y": 60}}},
+        ]
+        if s % 2 == 0:
+            components.append({"id": f"img-{s}", "type": "Image", "props": {"src": image, "position": {"x": 960, "y": 200}}})
+        if s % 3 == 0:
+            components.append({"id": f"cc-{s}", "type": "CustomComponent", "props": {"render": render}})
+        components += [{"id": f"shape-{s}-{i}", "type": "Shape", "props": {"fill": "#123456", "position": {"x": i * 40, "y": 900}}} for i in range(10)]
+        deck["slides"].append({"id": f"slide-{s}", "title": f"Slide {s}", "components": components})
+    return deck
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=40)
+    parser.add_argument("--image-kb", type=int, default=300)
+    args = parser.parse_args()
+
+    deck = make_deck(args.slides, args.image_kb)
+    deck_id = deck["uuid"]
+    print(f"Deck: {args.slides} slides, {len(json.dumps(deck)) / 1e6:.1f} MB JSON")
+
+    def old_path():
+        _json_hash(deck)
+        build_deck_digest(deck)
+
+    def full_rebuild():
+        context_cache.clear_cache()
+        get_deck_context_snapshot(deck_id, deck)
+
+    # Simulate the edit path: one slide changes, a new version is written
+    edited = copy.deepcopy(deck)
+
+    def edit_and_lookup():
+        edited["slides"][5]["components"][1]["props"]["position"]["x"] += 1
+        edited["version"] = str(uuid.uuid4())
+        edited["last_modified"] = time.time()
+        note_deck_edit(deck_id, edited, ["slide-5"])
+        get_deck_context_snapshot(deck_id, edited, current_slide_id="slide-5")
+
+    def version_hit():
+        get_deck_context_snapshot(deck_id, edited, current_slide_id="slide-7")
+
+    # PUT /auth/decks keeps the version but bumps last_modified
+    def ui_save_and_lookup():
+        edited["slides"][9]["components"][1]["props"]["position"]["y"] += 1
+        edited["last_modified"] = time.time()
+        get_deck_context_snapshot(deck_id, edited, current_slide_id="slide-9")
+
+    rows = [
+        ("old: json.dumps + sha256 + digest", timed(old_path)),
+        ("tree: full rebuild", timed(full_rebuild)),
+    ]
+    context_cache.clear_cache()
+    get_deck_context_snapshot(deck_id, edited)
+    rows.append(("tree: 1-slide edit + lookup", timed(edit_and_lookup)))
+    rows.append(("tree: lookup of edited version", timed(version_hit)))
+    rows.append(("tree: UI save (1 slide) + lookup", timed(ui_save_and_lookup)))
+
+    for name, ms in rows:
+        print(f"{name:<38}{ms:>10.2f} ms")
+    print(context_cache.get_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Font recommendation scoring: per-font loop vs. the feature matrix.
+
+Scores a grid of theme contexts (vibe x deck title x keywords) against the
+whole EnhancedFontService catalog three ways and checks they agree:
+
+- ``loop``: ``_score_font_for_context`` for every font, then a sort (the old
+  ``_get_hero_fonts_with_scoring`` / ``_get_body_fonts_with_scoring``)
+- ``matrix``: ``FontFeatureMatrix.rank`` with an empty cache
+- ``cached``: ``FontFeatureMatrix.rank`` again for the same contexts
+
+Usage:
+    python scripts/benchmark_font_scoring.py [--rounds 5] [--limit 12] [--json]
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.enhanced_font_service import EnhancedFontService
+
+VIBES = ['professional', 'creative', 'modern', 'elegant', 'retro', 'playful', 'bold']
+TITLES = ['AI data platform launch', 'Banking outlook 2025', 'Cafe opening', 'Quarterly review', 'Halloween party']
+KEYWORDS = [None, ['tech', 'growth'], ['food', 'warm'], ['clean', 'minimal'], ['history', 'vintage', 'print']]
+
+
+def loop_rank(service: EnhancedFontService, context, for_body: bool, limit):
+    scored = []
+    for font_id in service.all_fonts.keys():
+        score = service._score_font_for_context(font_id, context, for_body=for_body)
+        if score > 0:
+            scored.append((font_id, score))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return [font_id for font_id, _ in scored][:limit]
+
+
+def _measure(fn, contexts, rounds: int):
+    start = time.perf_counter()
+    results = []
+    for _ in range(rounds):
+        results = [fn(context, for_body) for context in contexts for for_body in (False, True)]
+    return time.perf_counter() - start, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=12, help="Top-k per context (0 = full ranking)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    service = EnhancedFontService()
+    matrix = service.feature_matrix
+    limit = args.limit or None
+    contexts = [
+        service._analyze_context(title, vibe, keywords, None)
+        for vibe, title, keywords in itertools.product(VIBES, TITLES, KEYWORDS)
+    ]
+    rankings = len(contexts) * 2
+
+    loop_s, expected = _measure(lambda c, b: loop_rank(service, c, b, limit), contexts, args.rounds)
+
+    def uncached(context, for_body):
+        matrix._ranked.clear()
+        return matrix.rank(context, for_body, limit)
+
+    matrix_s, actual = _measure(uncached, contexts, args.rounds)
+    _measure(lambda c, b: matrix.rank(c, b, limit), contexts, 1)  # fill the cache
+    cached_s, cached = _measure(lambda c, b: matrix.rank(c, b, limit), contexts, args.rounds)
+
+    report = {
+        "fonts": len(service.all_fonts),
+        "contexts": len(contexts),
+        "limit": limit,
+        "matrix": {k: v for k, v in matrix.get_stats().items() if k in ("tags", "best_for", "nonzeros")},
+        "identical": expected == actual == cached,
+        "us_per_ranking": {
+            "loop": round(loop_s / (rankings * args.rounds) * 1e6, 1),
+            "matrix": round(matrix_s / (rankings * args.rounds) * 1e6, 1),
+            "cached": round(cached_s / (rankings * args.rounds) * 1e6, 1),
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(
+        f"{report['fonts']} fonts, {report['contexts']} contexts x hero/body, top-{limit or 'all'}, "
+        f"{args.rounds} rounds; matrix {report['matrix']}"
+    )
+    for name, us in report["us_per_ranking"].items():
+        print(f"{name:<8}{us:>10.1f} us/ranking{report['us_per_ranking']['loop'] / us:>8.1f}x")
+    print("rankings identical" if report["identical"] else "❌ rankings differ")
+    if not report["identical"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash image deduplication: URL identity vs. pHash/dHash.
+
+Builds synthetic "stock photos", serves each from a local aiohttp server at
+several URLs as the same picture in other renditions (downscaled, recompressed,
+slightly brightened, PNG), and simulates a deck picking images slide by slide
+from search results that mix these renditions:
+
+- ``url``: the old rule, an image is a duplicate only if its URL was used
+- ``phash``: ``ImageHasher`` + ``DeckImageIndex`` (vectorized Hamming index) rejection
+
+Also reports hashing throughput, index lookup latency vs. a per-item Python
+scan, and false duplicates among distinct pictures.
+
+Usage:
+    python scripts/benchmark_image_dedup.py [--photos 40] [--slides 10] [--index-size 20000] [--json]
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from aiohttp import web
+from PIL import Image, ImageEnhance
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.image_hashing import DeckImageIndex, ImageHash, ImageHasher, hamming, hash_image_bytes
+from utils.http_client import close_http_sessions
+
+RENDITIONS = ("original", "half", "q40", "bright", "png")
+
+
+def make_photo(rng: np.random.Generator) -> Image.Image:
+    """Smooth random scene with some texture, 640x480."""
+    coarse = rng.integers(0, 256, size=(6, 8, 3), dtype=np.uint8)
+    image = Image.fromarray(coarse, "RGB").resize((640, 480), Image.Resampling.BICUBIC)
+    noise = rng.normal(0, 12, size=(480, 640, 3))
+    return Image.fromarray(np.clip(np.asarray(image, dtype=np.float64) + noise, 0, 255).astype(np.uint8), "RGB")
+
+
+def render(photo: Image.Image, rendition: str) -> bytes:
+    out = io.BytesIO()
+    if rendition == "half":
+        photo.resize((320, 240), Image.Resampling.LANCZOS).save(out, "JPEG", quality=85)
+    elif rendition == "q40":
+        photo.save(out, "JPEG", quality=40)
+    elif rendition == "bright":
+        ImageEnhance.Brightness(photo).enhance(1.1).save(out, "JPEG", quality=85)
+    elif rendition == "png":
+        photo.resize((480, 360)).save(out, "PNG")
+    else:
+        photo.save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+async def start_server(files: dict):
+    async def image(request: web.Request) -> web.Response:
+        return web.Response(body=files[request.match_info["name"]], content_type="image/jpeg")
+
+    app = web.Application()
+    app.router.add_get("/{name}", image)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def run(args) -> dict:
+    rng = np.random.default_rng(7)
+    random.seed(7)
+    photos = [make_photo(rng) for _ in range(args.photos)]
+    files = {f"p{i}-{r}.img": render(photo, r) for i, photo in enumerate(photos) for r in RENDITIONS}
+    runner, base = await start_server(files)
+    hasher = ImageHasher()
+    try:
+        # Every search result list mixes renditions of a random subset of photos
+        results = []
+        for _ in range(args.slides):
+            picked = random.sample(range(args.photos), min(8, args.photos))
+            results.append([
+                {"url": f"{base}/p{i}-{random.choice(RENDITIONS)}.img", "photo": i} for i in picked
+            ])
+
+        start = time.perf_counter()
+        all_images = [img for batch in results for img in batch]
+        await hasher.hash_images(all_images, deadline=60)
+        hash_s = time.perf_counter() - start
+        cold_hashed = hasher.hashed
+
+        used_urls, url_photos = set(), []
+        index, hash_photos = DeckImageIndex(), []
+        for batch in results:
+            url_pick = next((img for img in batch if img["url"] not in used_urls), None)
+            if url_pick:
+                used_urls.add(url_pick["url"])
+                url_photos.append(url_pick["photo"])
+            hashes = await hasher.hash_images(batch)
+            for img, h in zip(batch, hashes):
+                if h is not None and index.find_duplicate(h) is None:
+                    index.add(h, img["url"])
+                    hash_photos.append(img["photo"])
+                    break
+
+        # Rendition vs. original distances (same picture) and distinct-picture false duplicates
+        hashes = {name: hash_image_bytes(data) for name, data in files.items()}
+        same = [hamming(hashes[f"p{i}-original.img"].phash, hashes[f"p{i}-{r}.img"].phash)
+                for i in range(args.photos) for r in RENDITIONS[1:]]
+        missed = sum(1 for i in range(args.photos) for r in RENDITIONS[1:]
+                     if not hashes[f"p{i}-original.img"].is_duplicate(hashes[f"p{i}-{r}.img"]))
+        originals = [hashes[f"p{i}-original.img"] for i in range(args.photos)]
+        pairs = [(a, b) for n, a in enumerate(originals) for b in originals[n + 1:]]
+        false_dupes = sum(1 for a, b in pairs if a.is_duplicate(b))
+    finally:
+        hasher.shutdown()
+        await close_http_sessions()
+        await runner.cleanup()
+
+    # Lookup latency against a large index of random hashes
+    big = DeckImageIndex()
+    random_hashes = [ImageHash(random.getrandbits(64), random.getrandbits(64)) for _ in range(args.index_size)]
+    for h in random_hashes:
+        big.add(h)
+    probes = [ImageHash(random.getrandbits(64), random.getrandbits(64)) for _ in range(200)]
+    start = time.perf_counter()
+    for p in probes:
+        big.find_duplicate(p)
+    index_us = (time.perf_counter() - start) / len(probes) * 1e6
+    start = time.perf_counter()
+    for p in probes:
+        any(p.is_duplicate(h) for h in random_hashes)
+    scan_us = (time.perf_counter() - start) / len(probes) * 1e6
+
+    return {
+        "photos": args.photos,
+        "slides": args.slides,
+        "url_dedup": {"slides": len(url_photos), "repeated_pictures": len(url_photos) - len(set(url_photos))},
+        "phash_dedup": {"slides": len(hash_photos), "repeated_pictures": len(hash_photos) - len(set(hash_photos))},
+        "renditions": {
+            "max_phash_distance": max(same),
+            "mean_phash_distance": round(float(np.mean(same)), 2),
+            "missed_duplicates": missed,
+            "false_duplicates": false_dupes,
+            "distinct_pairs": len(pairs),
+        },
+        "hashing": {"images": cold_hashed, "seconds": round(hash_s, 3),
+                    "per_image_ms": round(hash_s / max(1, cold_hashed) * 1000, 2)},
+        "lookup": {"index_size": args.index_size, "index_us": round(index_us, 1), "python_scan_us": round(scan_us, 1)},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--photos", type=int, default=40)
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--index-size", type=int, default=20000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    report = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['photos']} pictures x {len(RENDITIONS)} renditions, {report['slides']} slides")
+        for name in ("url_dedup", "phash_dedup"):
+            r = report[name]
+            print(f"  {name:<12} {r['repeated_pictures']} repeated pictures over {r['slides']} slides")
+        r = report["renditions"]
+        print(f"  same picture pHash distance: mean {r['mean_phash_distance']}, max {r['max_phash_distance']}; "
+              f"missed {r['missed_duplicates']}, false duplicates {r['false_duplicates']}/{r['distinct_pairs']}")
+        h = report["hashing"]
+        print(f"  hashing: {h['images']} thumbnails in {h['seconds']} s ({h['per_image_ms']} ms each)")
+        lk = report["lookup"]
+        print(f"  lookup in {lk['index_size']} hashes: index {lk['index_us']} us, Python scan {lk['python_scan_us']} us")
+    if report["phash_dedup"]["repeated_pictures"] or report["renditions"]["false_duplicates"]:
+        print("❌ perceptual dedup repeated a picture or merged distinct ones")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
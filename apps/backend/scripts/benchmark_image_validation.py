@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Image URL validation: session per URL vs. the shared connection pool.
+
+Starts a local aiohttp server serving image HEAD responses (with a small
+per-request delay, plus a few URLs that never answer in time) and validates
+the same batch of URLs two ways:
+
+- ``per-session``: the old ``ImageValidator.validate_image`` shape, a new
+  ``aiohttp.ClientSession`` per URL, 5 at a time
+- ``pooled``: ``ImageValidator.validate_images`` over ``utils.http_client``
+  with its batch deadline
+
+Reports wall time and the number of TCP connections the server accepted.
+Handshake savings grow with TLS and real network latency, which this local
+plain-HTTP setup doesn't have. The verdicts for the fast URLs must match.
+
+Usage:
+    python scripts/benchmark_image_validation.py [--urls 200] [--slow 5] [--delay 0.01] [--deadline 2] [--json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.image_validator import ImageValidator
+from utils.http_client import close_http_sessions
+
+
+async def start_server(delay: float, connections: set):
+    async def image(request: web.Request) -> web.Response:
+        connections.add(request.transport.get_extra_info("peername"))
+        if request.match_info["name"].startswith("slow"):
+            await asyncio.sleep(30)
+        await asyncio.sleep(delay)
+        # A body gives the HEAD response a Content-Length, as CDNs send; without
+        # one the client can't keep the connection alive
+        return web.Response(body=b"\0" * 2048, headers={"Content-Type": "image/jpeg"})
+
+    app = web.Application()
+    app.router.add_route("HEAD", "/{name}", image)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def per_session(urls, timeout: float):
+    async def check(url):
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.head(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    return url, response.status == 200 and response.headers.get("Content-Type", "").startswith("image/")
+        except Exception:
+            return url, False
+
+    semaphore = asyncio.Semaphore(5)
+
+    async def limited(url):
+        async with semaphore:
+            return await check(url)
+
+    return dict(await asyncio.gather(*(limited(url) for url in urls)))
+
+
+async def run(args) -> dict:
+    connections: set = set()
+    runner, base = await start_server(args.delay, connections)
+    urls = [f"{base}/img{i}.jpg" for i in range(args.urls)] + [f"{base}/slow{i}.jpg" for i in range(args.slow)]
+    try:
+        start = time.perf_counter()
+        legacy = await per_session(urls, timeout=5)
+        legacy_s = time.perf_counter() - start
+        legacy_conns = len(connections)
+
+        connections.clear()
+        start = time.perf_counter()
+        results = await ImageValidator.validate_images(urls, deadline=args.deadline)
+        pooled_s = time.perf_counter() - start
+        pooled = {url: result["valid"] for url, result in results.items()}
+        pooled_conns = len(connections)
+    finally:
+        await close_http_sessions()
+        await runner.cleanup()
+
+    fast = [url for url in urls if "/img" in url]
+    return {
+        "urls": len(urls),
+        "slow_urls": args.slow,
+        "per_session": {"seconds": round(legacy_s, 2), "connections": legacy_conns},
+        "pooled": {"seconds": round(pooled_s, 2), "connections": pooled_conns, "deadline": args.deadline},
+        "fast_urls_match": all(legacy[url] == pooled[url] for url in fast),
+        "slow_urls_rejected": sum(1 for url in urls if "/slow" in url and not pooled[url]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=200, help="URLs that answer")
+    parser.add_argument("--slow", type=int, default=5, help="URLs that never answer in time")
+    parser.add_argument("--delay", type=float, default=0.01, help="server delay per request (s)")
+    parser.add_argument("--deadline", type=float, default=2.0, help="pooled batch deadline (s)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    report = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['urls']} URLs ({report['slow_urls']} never answer)")
+        for name in ("per_session", "pooled"):
+            r = report[name]
+            print(f"  {name:<12}{r['seconds']:>8.2f} s{r['connections']:>8} TCP connections")
+        print(f"  fast URL verdicts match: {report['fast_urls_match']}; "
+              f"slow URLs rejected at the deadline: {report['slow_urls_rejected']}")
+    if not report["fast_urls_match"]:
+        print("❌ validation results differ")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
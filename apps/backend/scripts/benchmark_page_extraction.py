@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark research page text extraction over a corpus of saved HTML pages.
+
+Compares the old in-loop html.parser path with the lxml parser and with the
+off-loop worker pool used by PageFetcher, and reports event-loop stall time.
+
+Usage:
+    python scripts/benchmark_page_extraction.py path/to/html_dir
+    python scripts/benchmark_page_extraction.py            # synthetic corpus
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.research.fetching import extract_text, extract_text_async, shutdown_extractor, HTML_PARSER
+
+
+def load_corpus(directory: str) -> List[str]:
+    pages = []
+    for path in sorted(Path(directory).rglob("*.htm*")):
+        pages.append(path.read_text(errors="ignore"))
+    return pages
+
+
+def synthetic_corpus(count: int = 40) -> List[str]:
+    paragraph = "<p>Market growth accelerated in 2024 as adoption of <a href='#'>renewable</a> energy rose.</p>"
+    script = "<script>var tracking = {" + ",".join(f"k{i}: {i}" for i in range(500)) + "};</script>"
+    pages = []
+    for i in range(count):
+        body = "".join(f"<div class='section'><h2>Section {j}</h2>{paragraph * 20}</div>" for j in range(30))
+        pages.append(f"<html><head><title>Page {i}</title>{script}<style>.a{{color:red}}</style></head><body>{body}</body></html>")
+    return pages
+
+
+def bench_sync(pages: List[str], parser: str) -> float:
+    start = time.perf_counter()
+    for html in pages:
+        extract_text(html, parser=parser)
+    return time.perf_counter() - start
+
+
+async def measure_loop_lag(work) -> tuple:
+    """Run ``work`` while a ticker measures the longest event-loop stall."""
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_lag
+        interval = 0.005
+        while not done.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(interval)
+            max_lag = max(max_lag, time.perf_counter() - before - interval)
+
+    task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    done.set()
+    await task
+    return elapsed, max_lag
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", help="Directory of saved .html pages")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    total_mb = sum(len(p) for p in pages) / (1024 * 1024)
+    print(f"Corpus: {len(pages)} pages, {total_mb:.1f} MB (default parser: {HTML_PARSER})")
+
+    baseline = bench_sync(pages, "html.parser")
+    print(f"{'html.parser, serial:':<28}{baseline:.2f}s")
+    if HTML_PARSER != "html.parser":
+        fast = bench_sync(pages, HTML_PARSER)
+        print(f"{HTML_PARSER + ', serial:':<28}{fast:.2f}s  ({baseline / fast:.1f}x)")
+
+    async def in_loop():
+        for html in pages:
+            extract_text(html, parser="html.parser")
+            await asyncio.sleep(0)
+
+    async def off_loop():
+        await asyncio.gather(*(extract_text_async(html) for html in pages))
+
+    elapsed, lag = await measure_loop_lag(in_loop)
+    print(f"{'in-loop html.parser:':<28}{elapsed:.2f}s, max loop stall {lag * 1000:.0f}ms")
+    await extract_text_async("<p>warm up</p>")
+    elapsed, lag = await measure_loop_lag(off_loop)
+    print(f"{'worker pool (' + HTML_PARSER + '):':<28}{elapsed:.2f}s, max loop stall {lag * 1000:.0f}ms")
+    shutdown_extractor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Event-loop lag under concurrent slide post-processing, per offload mode.
+
+Simulates ``--decks`` decks generating concurrently. Each deck post-processes
+``--slides`` synthetic slides (text blocks, icons, lines, CustomComponents
+with long render strings) through ``SlideGeneratorV2._post_process_slide``,
+with a short await between slides standing in for the LLM call. A loop-lag
+monitor samples every 10 ms; the report shows wall time, loop lag
+percentiles and CPU time per post-processing stage for each mode.
+
+``inline`` is the old behaviour (post-processing on the event loop).
+
+Usage:
+    python scripts/benchmark_post_process.py [--decks 4] [--slides 8] [--modes inline,thread,process] [--workers 2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.domain.models import SlideGenerationContext, ThemeSpec
+from agents.generation.components.component_validator import ComponentValidator
+from agents.generation.post_process_pool import PostProcessPool
+from agents.generation import slide_generator as slide_generator_module
+from agents.generation.slide_generator import SlideGeneratorV2
+from models.registry import ComponentRegistry
+from models.requests import DeckOutline, SlideOutline
+from utils.loop_lag import LoopLagMonitor
+
+THEME = {
+    "theme_name": "Benchmark",
+    "color_palette": {
+        "primary_background": "#0F172A", "primary_text": "#F8FAFC",
+        "accent_1": "#38BDF8", "accent_2": "#F472B6", "colors": ["#38BDF8", "#F472B6", "#FACC15"],
+    },
+    "typography": {"hero_title": {"family": "Inter"}, "body_text": {"family": "Inter"}},
+}
+
+
+def _render_string(index: int) -> str:
+    rows = "\n".join(
+        f"      React.createElement('div', {{ key: {i}, style: {{ padding: '12px', color: props.color }} }}, "
+        f"props.items && props.items[{i}] ? props.items[{i}].label : 'Metric {i}'),"
+        for i in range(40)
+    )
+    return f"function render({{ props }}) {{\n  return React.createElement('div', {{ id: 'cc-{index}' }},\n{rows}\n  );\n}}"
+
+
+def make_slide(index: int) -> dict:
+    components = [
+        {"type": "TiptapTextBlock", "props": {
+            "position": {"x": "80px", "y": 60 + 20 * i}, "width": 1760, "height": 120,
+            "texts": [{"text": f"Point {i}: " + "quarterly revenue grew across every region " * 3, "style": {}}],
+            "fontSize": 48,
+        }}
+        for i in range(6)
+    ]
+    components += [
+        {"type": "Icon", "props": {"position": {"x": 60, "y": 300 + 90 * i}, "size": 48, "iconName": "Star"}}
+        for i in range(4)
+    ]
+    components += [
+        {"type": "Lines", "props": {"startPoint": {"x": 80, "y": 200}, "endPoint": {"x": 1840, "y": 200}}},
+        {"type": "CustomComponent", "props": {
+            "position": {"x": 960, "y": 400}, "width": "800", "height": "500", "render": _render_string(index),
+        }},
+    ]
+    return {"id": str(uuid.uuid4()), "title": f"Slide {index + 1}", "components": components}
+
+
+def make_context(deck: DeckOutline, index: int) -> SlideGenerationContext:
+    return SlideGenerationContext(
+        slide_outline=deck.slides[index], slide_index=index, deck_outline=deck,
+        theme=ThemeSpec.from_dict(THEME), palette={"colors": THEME["color_palette"]["colors"]},
+        style_manifesto="", deck_uuid=deck.id,
+    )
+
+
+async def run_mode(mode: str, decks: int, slides: int, workers: int):
+    registry = ComponentRegistry(json_schemas=None)
+    generator = SlideGeneratorV2(
+        rag_repository=None, ai_generator=None, component_validator=ComponentValidator(registry),
+        registry=registry, theme_system=None,
+    )
+    pool = PostProcessPool(mode=mode, workers=workers, timeout=120)
+    slide_generator_module.get_post_process_pool = lambda: pool
+    outlines = [
+        DeckOutline(id=str(uuid.uuid4()), title=f"Deck {d}", slides=[
+            SlideOutline(id=str(uuid.uuid4()), title=f"Slide {i + 1}", content="Revenue 42% growth, 3 regions, $1.2M ARR")
+            for i in range(slides)
+        ])
+        for d in range(decks)
+    ]
+
+    if mode == "process":
+        # Exclude worker spawn/import time from the measurement
+        await pool.run(generator, make_slide(0), make_context(outlines[0], 0))
+
+    async def deck_task(deck: DeckOutline) -> None:
+        for i in range(slides):
+            await asyncio.sleep(0.02)  # stands in for the LLM call
+            await generator._post_process_slide(make_slide(i), make_context(deck, i))
+
+    monitor = LoopLagMonitor(interval=0.01, window=100000)
+    monitor.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(deck_task(deck) for deck in outlines))
+    wall = time.perf_counter() - start
+    await monitor.stop()
+    pool.shutdown()
+    return wall, monitor.get_stats(), pool.get_stats()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--decks", type=int, default=4)
+    parser.add_argument("--slides", type=int, default=8)
+    parser.add_argument("--modes", default="inline,thread,process")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = {}
+    for mode in args.modes.split(","):
+        wall, lag, stats = asyncio.run(run_mode(mode.strip(), args.decks, args.slides, args.workers))
+        report[mode] = {"wall_s": round(wall, 2), "loop_lag": lag, "post_process": stats}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{args.decks} decks x {args.slides} slides")
+    print(f"{'mode':<10}{'wall':>8}{'lag p50':>10}{'lag p95':>10}{'lag p99':>10}{'lag max':>10}{'cpu/slide':>11}")
+    for mode, r in report.items():
+        lag = r["loop_lag"]
+        print(
+            f"{mode:<10}{r['wall_s']:>7.2f}s{lag['p50_ms']:>8.1f}ms{lag['p95_ms']:>8.1f}ms"
+            f"{lag['p99_ms']:>8.1f}ms{lag['max_ms']:>8.1f}ms{r['post_process']['avg_cpu_ms']:>9.1f}ms"
+        )
+    for mode, r in report.items():
+        stages = ", ".join(f"{name} {s['avg_cpu_ms']:.1f}ms" for name, s in r["post_process"]["stages"].items())
+        print(f"  {mode} stages (avg CPU): {stages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark PPTX import: in-process with base64 images vs. the process pool with
+images externalized to the blob store.
+
+Reports total time, time to first streamed slide and deck JSON size.
+
+Usage:
+    python scripts/benchmark_pptx_import.py path/to/deck.pptx
+    python scripts/benchmark_pptx_import.py --slides 60 --images 4   # generated deck
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from PIL import Image
+
+from services.blob_store import ContentAddressedBlobStore
+from services.pptx_importer import PPTXImporter
+
+
+def _random_image(seed: int, size=(800, 600)) -> bytes:
+    rng = random.Random(seed)
+    img = Image.new("RGB", size, tuple(rng.randrange(256) for _ in range(3)))
+    # Noise block so JPEG output is realistically sized
+    noise = Image.frombytes("RGB", (200, 150), bytes(rng.randrange(256) for _ in range(200 * 150 * 3)))
+    img.paste(noise.resize(size), (0, 0))
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+
+def generate_deck(path: str, slides: int, images_per_slide: int) -> None:
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Inches(13.333), Inches(7.5)
+    logo = _random_image(0, (200, 200))
+    for s in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12), Inches(1))
+        box.text_frame.text = f"Slide {s + 1}: quarterly results"
+        box.text_frame.paragraphs[0].runs[0].font.size = Pt(36)
+        body = slide.shapes.add_textbox(Inches(0.5), Inches(1.5), Inches(6), Inches(4))
+        body.text_frame.text = "Revenue grew across all regions. " * 8
+        # Shared logo exercises blob de-duplication
+        slide.shapes.add_picture(io.BytesIO(logo), Inches(12), Inches(6.5), Inches(1), Inches(1))
+        for i in range(images_per_slide):
+            slide.shapes.add_picture(
+                io.BytesIO(_random_image(s * 100 + i + 1)),
+                Inches(6.8 + (i % 2) * 3), Inches(1.5 + (i // 2) * 2.5), Inches(3), Inches(2.2),
+            )
+    prs.save(path)
+
+
+async def run_import(path: str, pooled: bool, externalize: bool, blob_root: str):
+    importer = PPTXImporter(
+        externalize_images=externalize,
+        blob_store=ContentAddressedBlobStore(blob_root, "http://localhost:9090/v1/uploads/blobs"),
+        use_process_pool=pooled,
+    )
+    start = time.perf_counter()
+    first_slide = None
+    deck, slides = None, []
+    async for event in importer.iter_slides(path):
+        if event["type"] == "deck":
+            deck = event["deck"]
+        else:
+            if first_slide is None:
+                first_slide = time.perf_counter() - start
+            slides.append(event["slide"])
+    deck["slides"] = slides
+    importer._finalize_deck(deck)
+    total = time.perf_counter() - start
+    return total, first_slide or total, len(json.dumps(deck)), len(importer.assets)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pptx", nargs="?", help="PPTX file (default: generate one)")
+    parser.add_argument("--slides", type=int, default=40)
+    parser.add_argument("--images", type=int, default=4, help="Images per generated slide")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.pptx
+        if not path:
+            path = os.path.join(tmp, "bench.pptx")
+            generate_deck(path, args.slides, args.images)
+        print(f"Deck: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+        modes = [
+            ("serial + base64", False, False),
+            ("serial + blob store", False, True),
+            ("pool + blob store (cold)", True, True),
+            ("pool + blob store (warm)", True, True),
+        ]
+        print(f"{'mode':<28}{'total':>10}{'first slide':>14}{'json':>12}{'blobs':>8}")
+        for name, pooled, externalize in modes:
+            total, first, size, blobs = await run_import(path, pooled, externalize, os.path.join(tmp, "blobs"))
+            print(f"{name:<28}{total:>9.2f}s{first:>13.2f}s{size / 1e6:>10.2f}MB{blobs:>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
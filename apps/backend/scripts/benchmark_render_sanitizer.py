@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Throughput of CustomComponent render sanitization.
+
+Runs every render in the golden corpus (testdata/render_sanitizer_golden.json,
+see test_render_sanitizer.py) through each ComponentValidator sanitizer step,
+the full ``_fix_custom_component_render`` pipeline and
+``AISlideGenerator._sanitize_custom_component``, and reports renders/s and
+MB/s per step.
+
+Usage:
+    python scripts/benchmark_render_sanitizer.py [--rounds 20] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.generation.components.ai_generator import AISlideGenerator
+from agents.generation.components.component_validator import ComponentValidator
+
+GOLDEN_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "testdata", "render_sanitizer_golden.json"
+)
+
+STEPS = [
+    "_sanitize_render_string",
+    "_normalize_text_literal_fallbacks",
+    "_inject_missing_variable_definitions",
+    "_dedupe_common_declarations",
+    "_normalize_render_dimensions",
+    "_normalize_layout_responsiveness",
+    "_ensure_root_container_styles",
+    "_sanitize_prohibited_apis",
+]
+
+
+def _measure(fn, renders, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for render in renders:
+            fn(render)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    # The pipeline logs every fix at INFO; keep that out of the measurement
+    logging.disable(logging.WARNING)
+
+    with open(GOLDEN_PATH) as f:
+        renders = [case["input"] for case in json.load(f)["cases"]]
+    total_bytes = sum(len(r.encode("utf-8")) for r in renders)
+
+    validator = ComponentValidator()
+    generator = AISlideGenerator()
+    benchmarks = {step: getattr(validator, step) for step in STEPS}
+    benchmarks["fix_custom_component_render"] = lambda r: validator._fix_custom_component_render(
+        {"type": "CustomComponent", "props": {"render": r}}
+    )
+    benchmarks["ai_sanitize_custom_component"] = lambda r: generator._sanitize_custom_component(
+        {"type": "CustomComponent", "props": {"render": r}}
+    )
+
+    report = {}
+    for name, fn in benchmarks.items():
+        _measure(fn, renders, 1)  # warm up (regex compile caches)
+        elapsed = _measure(fn, renders, args.rounds)
+        report[name] = {
+            "renders_per_s": round(len(renders) * args.rounds / elapsed),
+            "mb_per_s": round(total_bytes * args.rounds / elapsed / 1e6, 2),
+            "us_per_render": round(elapsed / (len(renders) * args.rounds) * 1e6, 1),
+        }
+
+    if args.json:
+        print(json.dumps({"renders": len(renders), "bytes": total_bytes, "steps": report}, indent=2))
+        return
+    print(f"{len(renders)} renders, {total_bytes / 1000:.0f} KB, {args.rounds} rounds")
+    print(f"{'step':<38}{'renders/s':>12}{'MB/s':>10}{'us/render':>12}")
+    for name, r in report.items():
+        print(f"{name:<38}{r['renders_per_s']:>12}{r['mb_per_s']:>10.2f}{r['us_per_render']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
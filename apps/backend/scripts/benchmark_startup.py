@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Cold-start import benchmark for api/chat_server.py with a regression budget.
+
+Runs ``python -X importtime -c "import api.chat_server"`` in fresh
+subprocesses (lazy startup mode by default), reports the best cumulative
+import time and the heaviest direct imports, and exits non-zero if the best
+run exceeds the budget. ``--check-routes`` additionally verifies that every
+route of every lazily registered router is covered by its declared prefixes.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs 3] [--budget-ms 2500] [--eager] [--check-routes]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DEFAULT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "2500"))
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_importtime(lazy: bool) -> Tuple[float, List[Tuple[float, str]]]:
+    """Return (cumulative ms for api.chat_server, [(ms, module)] of its direct imports)."""
+    env = dict(os.environ, CHAT_SERVER_LAZY_STARTUP="true" if lazy else "false", PYTHONPATH=BACKEND_DIR)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import api.chat_server"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import api.chat_server failed:\n{proc.stderr[-2000:]}")
+
+    rows = [(int(m.group(2)), len(m.group(3)), m.group(4)) for m in map(IMPORT_LINE.match, proc.stderr.splitlines()) if m]
+    total = 0.0
+    children: List[Tuple[float, str]] = []
+    # importtime prints children before their parent, one level deeper (two spaces)
+    for index, (cumulative, indent, name) in enumerate(rows):
+        if name != "api.chat_server":
+            continue
+        total = cumulative / 1000
+        for child_cumulative, child_indent, child_name in reversed(rows[:index]):
+            if child_indent <= indent:
+                break
+            if child_indent == indent + 2:
+                children.append((child_cumulative / 1000, child_name))
+        break
+    return total, sorted(children, reverse=True)
+
+
+def check_routes() -> List[str]:
+    """Routes of lazily registered routers that none of their prefixes cover."""
+    from fastapi import APIRouter
+    from api.lazy_routers import ROUTERS, _import_router
+
+    problems = []
+    for spec in ROUTERS:
+        try:
+            router = _import_router(spec)
+        except Exception as e:
+            problems.append(f"{spec.module}: import failed ({e})")
+            continue
+        if router is None:
+            continue
+        staging = APIRouter()
+        staging.include_router(router, **spec.include_kwargs)
+        paths = []
+        for route in staging.routes:
+            paths.extend([route.path] if hasattr(route, "path") else [r.path for r in getattr(route, "routes", [])])
+        for path in paths:
+            if not any(path.startswith(prefix) for prefix in spec.prefixes):
+                problems.append(f"{spec.module}: {path} not covered by {spec.prefixes}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--eager", action="store_true", help="Measure eager router imports instead of lazy startup")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest direct imports to list")
+    parser.add_argument("--check-routes", action="store_true")
+    args = parser.parse_args()
+
+    lazy = not args.eager
+    results = [run_importtime(lazy) for _ in range(args.runs)]
+    best, children = min(results, key=lambda r: r[0])
+    print(f"Mode: {'lazy' if lazy else 'eager'} startup, {args.runs} runs")
+    print(f"import api.chat_server: best {best:.0f} ms, runs {', '.join(f'{r[0]:.0f}' for r in results)} ms")
+    for ms, name in children[:args.top]:
+        print(f"  {ms:>8.0f} ms  {name}")
+
+    failed = False
+    if args.check_routes:
+        problems = check_routes()
+        for problem in problems:
+            print(f"ROUTE NOT COVERED: {problem}")
+        failed = failed or bool(problems)
+
+    if best > args.budget_ms:
+        print(f"FAIL: cold start {best:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    else:
+        print(f"OK: within budget {args.budget_ms:.0f} ms")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Uploaded data file parsing: whole-file lists vs. streaming column ingestion.
+
+Generates a CSV (date, region, product, revenue, units, margin %) and
+optionally an XLSX with the same columns, then parses each two ways:
+
+- ``legacy``: the old ``FileProcessor._parse_csv_data`` (decode, whole
+  ``list(csv.reader)``, numeric columns sniffed from 10 rows) / the old
+  ``slide_ops._build_chart_from_excel`` row loading
+- ``ingest``: ``services.tabular_ingestion`` (streamed chunks, typed NumPy
+  columns, one-pass stats, ``INGEST_MAX_ROWS`` kept in memory)
+
+Time and peak traced memory are measured in separate runs. Column means from
+the ingested stats are checked against a straight Python sum.
+
+Usage:
+    python scripts/benchmark_tabular_ingestion.py [--rows 1000000] [--xlsx-rows 20000] [--json]
+"""
+import argparse
+import csv
+import gc
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.tabular_ingestion import ingest_csv, ingest_xlsx
+
+HEADERS = ['date', 'region', 'product', 'revenue', 'units', 'margin']
+REGIONS = ['North', 'South', 'East', 'West']
+
+
+def generate_rows(n: int):
+    rng = random.Random(42)
+    for i in range(n):
+        yield [
+            f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            rng.choice(REGIONS),
+            f"P{i % 500}",
+            f"{rng.random() * 1000:.2f}",
+            rng.randint(1, 50),
+            f"{rng.random() * 40:.1f}%",
+        ]
+
+
+def legacy_csv(content: bytes):
+    text = content.decode('utf-8')
+    rows = list(csv.reader(io.StringIO(text)))
+    headers, data_rows = rows[0], rows[1:]
+    numeric_columns = []
+    for col_idx in range(len(headers)):
+        is_numeric = True
+        for row in data_rows[:10]:
+            if col_idx < len(row):
+                try:
+                    float(row[col_idx].replace(',', '').replace('$', '').replace('%', ''))
+                except ValueError:
+                    is_numeric = False
+                    break
+        if is_numeric:
+            numeric_columns.append(col_idx)
+    return {'headers': headers, 'rows': data_rows, 'numeric_columns': numeric_columns}
+
+
+def legacy_xlsx(content: bytes):
+    import openpyxl
+
+    wb = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    rows = [list(row) for row in wb.active.iter_rows(values_only=True) if any(c is not None and c != "" for c in row)]
+    wb.close()
+    return rows
+
+
+def measure(fn, *args):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def compare(name: str, legacy_fn, ingest_fn, content: bytes, check_rows) -> dict:
+    legacy_s, legacy_peak, _ = measure(legacy_fn, content)
+    ingest_s, ingest_peak, table = measure(ingest_fn, content)
+    # Means of the clean numeric columns against a plain Python pass
+    max_error = 0.0
+    for col in (3, 4):
+        values = [float(row[col]) for row in check_rows()]
+        expected = sum(values) / len(values)
+        actual = table.columns[col].summary()['mean']
+        max_error = max(max_error, abs(actual - expected) / abs(expected))
+    return {
+        'file': name,
+        'bytes': len(content),
+        'rows': table.row_count,
+        'retained_rows': table.retained_rows,
+        'types': {col.name: col.kind for col in table.columns},
+        'legacy': {'seconds': round(legacy_s, 2), 'peak_mb': round(legacy_peak / 1e6, 1)},
+        'ingest': {'seconds': round(ingest_s, 2), 'peak_mb': round(ingest_peak / 1e6, 1)},
+        'mean_rel_error': max_error,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="CSV data rows")
+    parser.add_argument("--xlsx-rows", type=int, default=20_000, help="XLSX data rows (0 = skip)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    reports = []
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADERS)
+    writer.writerows(generate_rows(args.rows))
+    csv_bytes = buffer.getvalue().encode('utf-8')
+    del buffer
+    reports.append(compare('csv', legacy_csv, ingest_csv, csv_bytes, lambda: generate_rows(args.rows)))
+    del csv_bytes
+
+    if args.xlsx_rows:
+        import openpyxl
+
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(HEADERS)
+        for row in generate_rows(args.xlsx_rows):
+            ws.append(row)
+        with tempfile.TemporaryFile() as f:
+            wb.save(f)
+            f.seek(0)
+            xlsx_bytes = f.read()
+        reports.append(compare('xlsx', legacy_xlsx, ingest_xlsx, xlsx_bytes, lambda: generate_rows(args.xlsx_rows)))
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+    for report in reports:
+        print(
+            f"{report['file']}: {report['rows']} rows, {report['bytes'] / 1e6:.1f} MB, "
+            f"{report['retained_rows']} kept in memory; types {report['types']}"
+        )
+        for name in ('legacy', 'ingest'):
+            r = report[name]
+            print(f"  {name:<8}{r['seconds']:>8.2f} s{r['peak_mb']:>10.1f} MB peak")
+        print(f"  column means match (max rel. error {report['mean_rel_error']:.1e})")
+    if any(report['mean_rel_error'] > 1e-9 for report in reports):
+        print("❌ column stats differ")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
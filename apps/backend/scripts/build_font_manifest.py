@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Build the font file manifest (services/font_manifest.py) with checksums.
+
+Walks assets/fonts, resolves every registry font to a file and writes the
+result to FONT_MANIFEST_PATH (default assets/fonts/font_manifest.json).
+Checksums from an existing manifest are reused for unchanged files, so
+re-running after adding a few fonts only hashes the new ones.
+
+Usage:
+    python scripts/build_font_manifest.py [--output PATH] [--no-checksums] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.font_manifest import FONT_MANIFEST_PATH, FontManifest, _load_saved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=str(FONT_MANIFEST_PATH))
+    parser.add_argument("--no-checksums", action="store_true", help="Skip hashing files not in the previous manifest")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    start = time.perf_counter()
+    manifest = FontManifest.build(previous=_load_saved(output), include_checksums=not args.no_checksums)
+    manifest.save(output)
+    summary = manifest.summary()
+    summary["build_ms"] = round((time.perf_counter() - start) * 1000)
+    summary["output"] = str(output)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(
+        f"✅ {summary['resolved_fonts']}/{summary['fonts']} fonts resolved, {summary['files']} files "
+        f"({summary['checksummed_files']} checksummed) in {summary['build_ms']}ms -> {output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Replay captured Claude prompts and score how much of each was cacheable.
+
+Reads the prompt captures written by ``agents.ai.clients.invoke``
+(``test_output/<deck_uuid>/prompts/*.json``), splits every prompt into the
+cacheable prefix (system prompt + static block before the cache breakpoint)
+and the per-call remainder, and simulates Anthropic's ephemeral cache in
+capture order: a prefix is a hit if the same prefix was seen within the cache
+TTL, otherwise a write. Prefixes below the provider's minimum cacheable length
+are counted as uncacheable.
+
+Reports per deck and overall: cacheable share of input tokens, simulated hit
+rate, and static-block changes between consecutive slide prompts.
+
+Usage:
+    python scripts/replay_prompt_cache.py [test_output] [--ttl 300] [--min-tokens 1024] [--json]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.ai.prompt_cache_telemetry import PROMPT_CACHE_TTL_SECONDS, prefix_hash, split_cacheable
+from agents.generation.components.prompt_tokens import count_tokens, tokenizer_name
+
+
+def load_captures(root: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Captures grouped by deck (directory above ``prompts``), sorted by timestamp."""
+    by_deck: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for path in glob.glob(os.path.join(root, "**", "prompts", "*.json"), recursive=True):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except Exception:
+            continue
+        if not isinstance(data, dict) or "messages" not in data:
+            continue
+        deck = os.path.basename(os.path.dirname(os.path.dirname(path)))
+        if deck == os.path.basename(os.path.normpath(root)):
+            deck = "unknown"
+        data["_path"] = path
+        by_deck[deck].append(data)
+    for captures in by_deck.values():
+        captures.sort(key=lambda c: c.get("timestamp", ""))
+    return by_deck
+
+
+def _ts(capture: Dict[str, Any]) -> float:
+    try:
+        return datetime.strptime(capture.get("timestamp", ""), "%Y%m%d_%H%M%S_%f").timestamp()
+    except ValueError:
+        return 0.0
+
+
+def replay_deck(captures: List[Dict[str, Any]], ttl: float, min_tokens: int) -> Dict[str, Any]:
+    cache: Dict[str, float] = {}  # prefix hash -> expiry
+    last_prefix: Dict[tuple, str] = {}
+    result = {
+        "prompts": 0, "input_tokens": 0, "cacheable_tokens": 0, "read_tokens": 0,
+        "hits": 0, "writes": 0, "uncacheable": 0, "static_changes": 0,
+    }
+    for capture in captures:
+        system, static, dynamic = split_cacheable(capture.get("messages", []))
+        prefix_tokens = count_tokens(system) + count_tokens(static)
+        total = prefix_tokens + count_tokens(dynamic)
+        result["prompts"] += 1
+        result["input_tokens"] += total
+
+        phash = prefix_hash(system, static)
+        key = (capture.get("model"), capture.get("prompt_type"))
+        if key in last_prefix and last_prefix[key] != phash:
+            result["static_changes"] += 1
+        last_prefix[key] = phash
+
+        if prefix_tokens < min_tokens:
+            result["uncacheable"] += 1
+            continue
+        result["cacheable_tokens"] += prefix_tokens
+        now = _ts(capture)
+        if cache.get(phash, 0) >= now:
+            result["hits"] += 1
+            result["read_tokens"] += prefix_tokens
+        else:
+            result["writes"] += 1
+        # Reads refresh the TTL just like writes
+        cache[phash] = now + ttl
+
+    cacheable_calls = result["hits"] + result["writes"]
+    result["cacheable_share"] = round(result["cacheable_tokens"] / result["input_tokens"], 3) if result["input_tokens"] else 0.0
+    result["hit_rate"] = round(result["hits"] / cacheable_calls, 3) if cacheable_calls else 0.0
+    result["token_hit_rate"] = round(result["read_tokens"] / result["input_tokens"], 3) if result["input_tokens"] else 0.0
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", nargs="?", default="test_output", help="Directory holding prompt captures")
+    parser.add_argument("--ttl", type=float, default=PROMPT_CACHE_TTL_SECONDS, help="Cache TTL in seconds")
+    parser.add_argument("--min-tokens", type=int, default=1024, help="Minimum cacheable prefix length")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    by_deck = load_captures(args.root)
+    if not by_deck:
+        print(f"No prompt captures found under {args.root}")
+        return
+
+    report = {deck: replay_deck(captures, args.ttl, args.min_tokens) for deck, captures in sorted(by_deck.items())}
+    overall = replay_deck([c for captures in by_deck.values() for c in captures], args.ttl, args.min_tokens)
+    overall["static_changes"] = sum(r["static_changes"] for r in report.values())
+
+    if args.json:
+        print(json.dumps({"tokenizer": tokenizer_name(), "decks": report, "overall": overall}, indent=2))
+        return
+
+    print(f"Token counts: {tokenizer_name()}")
+    print(f"{'deck':<38}{'prompts':>8}{'cacheable':>11}{'hit rate':>10}{'tok hit':>9}{'changes':>9}")
+    for deck, r in list(report.items()) + [("OVERALL", overall)]:
+        print(
+            f"{deck[:37]:<38}{r['prompts']:>8}{r['cacheable_share']:>10.0%}"
+            f"{r['hit_rate']:>10.0%}{r['token_hit_rate']:>9.0%}{r['static_changes']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
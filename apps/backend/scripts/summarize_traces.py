@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Summarize generation traces exported to an OTLP/JSON file.
+
+Reads the file written when the backend runs with ``TRACE_EXPORT_PATH`` set
+(one OTLP ``ExportTraceServiceRequest`` per line, see
+``agents/generation/tracing.py``), groups spans by deck and prints each deck's
+wall time, critical path and per-stage totals. ``--stages`` aggregates the
+stage totals over all decks instead.
+
+Usage:
+    python scripts/summarize_traces.py traces.jsonl [--deck <uuid>] [--stages] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.generation.tracing import critical_path_summary, spans_from_otlp
+
+
+def load_spans(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Span records grouped by trace (one trace per deck)."""
+    by_trace: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            for record in spans_from_otlp(request):
+                by_trace[record["trace_id"]].append(record)
+    return by_trace
+
+
+def _deck_of(spans: List[Dict[str, Any]]) -> str:
+    return next((s["deck_uuid"] for s in spans if s.get("deck_uuid")), spans[0]["trace_id"])
+
+
+def print_summary(deck: str, summary: Dict[str, Any]) -> None:
+    print(f"\nDeck {deck}: {summary['wall_ms'] / 1000:.1f}s wall, {summary['span_count']} spans")
+    print("  Critical path:")
+    for step in summary["critical_path"]:
+        slide = f" [slide {step['slide_index'] + 1}]" if step.get("slide_index") is not None else ""
+        print(
+            f"    {'  ' * step['depth']}{step['name']}{slide}  +{step['start_ms'] / 1000:.2f}s  "
+            f"{step['duration_ms']:.0f}ms (self {step['exclusive_ms']:.0f}ms)"
+        )
+    print("  Critical path time by stage:")
+    for name, ms in summary["critical_path_ms_by_stage"].items():
+        print(f"    {name:<28}{ms:>10.0f}ms")
+    print_stages(summary["stages"])
+
+
+def print_stages(stages: Dict[str, Dict[str, Any]]) -> None:
+    print(f"  {'stage':<28}{'count':>7}{'total':>12}{'max':>10}{'errors':>8}")
+    for name, stage in stages.items():
+        print(f"  {name:<28}{stage['count']:>7}{stage['total_ms']:>10.0f}ms{stage['max_ms']:>8.0f}ms{stage['errors']:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace_file", help="OTLP/JSON lines file (TRACE_EXPORT_PATH)")
+    parser.add_argument("--deck", help="Only this deck UUID")
+    parser.add_argument("--stages", action="store_true", help="Aggregate stage totals over all decks")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of text")
+    args = parser.parse_args()
+
+    by_deck = {_deck_of(spans): spans for spans in load_spans(args.trace_file).values()}
+    if args.deck:
+        by_deck = {deck: spans for deck, spans in by_deck.items() if deck == args.deck}
+    if not by_deck:
+        print(f"No spans found in {args.trace_file}")
+        return
+
+    if args.stages:
+        summary = critical_path_summary([s for spans in by_deck.values() for s in spans])
+        if args.json:
+            print(json.dumps({"decks": len(by_deck), "stages": summary["stages"]}, indent=2))
+        else:
+            print(f"{len(by_deck)} decks")
+            print_stages(summary["stages"])
+        return
+
+    report = {deck: critical_path_summary(spans) for deck, spans in by_deck.items()}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for deck, summary in report.items():
+        print_summary(deck, summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List, Tuple, Optional
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Any, List, Tuple, Optional
 from datetime import datetime
 
-from utils.supabase import get_deck
+from utils.supabase import get_deck, update_deck_slides_if_version
 from agents.persistence.deck_persistence import DeckPersistence
+from services.context_cache import note_deck_edit
+
+logger = logging.getLogger(__name__)
 
 
 def _find_component(slide: Dict[str, Any], component_id: str) -> Optional[Dict[str, Any]]:
@@ -408,15 +416,8 @@ def _apply_align_components(slide: Dict[str, Any], component_ids: List[str], ali
     return False
 
 
-async def apply_fast_operations(deck_id: str, operations: List[Dict[str, Any]], user_id: Optional[str] = None) -> Optional[str]:
-    """Apply a list of simple operations directly to deck and persist updated slides.
-
-    Returns the new deck version (revision) if available, otherwise None.
-    """
-    deck = get_deck(deck_id)
-    if not deck:
-        return None
-
+def _apply_operations_in_memory(deck: Dict[str, Any], operations: List[Dict[str, Any]]) -> set[str]:
+    """Apply fast-path operations to ``deck`` in place; returns the ids of changed slides."""
     # Group operations by slide_id when provided; otherwise we must locate by component across slides
     # For simplicity we require caller to pass slide context per op when possible.
     changed_slide_ids: set[str] = set()
@@ -513,31 +514,13 @@ async def apply_fast_operations(deck_id: str, operations: List[Dict[str, Any]],
                 pass
             changed_slide_ids.add(slide.get("id"))
 
-    # Persist changed slides
-    if not changed_slide_ids:
-        return None
-
-    persistence = DeckPersistence()
-    # Apply updates one by one; DeckPersistence will update version/last_modified
-    for sid in changed_slide_ids:
-        sidx = slide_index_map.get(sid)
-        if sidx is None:
-            continue
-        slide_data = slides[sidx]
-        await persistence.update_slide_with_user(deck_id, sidx, slide_data, user_id=user_id, force_immediate=True)
+    return changed_slide_ids
 
-    # Re-fetch deck to get updated version
-    updated = get_deck(deck_id)
-    return updated.get("version") if updated else None
-
-
-async def apply_deckdiff(deck_id: str, deck_diff: Dict[str, Any], user_id: Optional[str] = None) -> Optional[str]:
-    """Apply our internal DeckDiff schema (slides_to_update/add/remove with component diffs)."""
-    deck = get_deck(deck_id)
-    if not deck:
-        return None
 
+def _apply_deckdiff_in_memory(deck: Dict[str, Any], deck_diff: Dict[str, Any]) -> set[str]:
+    """Apply a DeckDiff to ``deck`` in place; returns the ids of changed (added/removed/updated) slides."""
     slides = deck.get("slides", []) or []
+    deck["slides"] = slides
     changed_slide_ids: set[str] = set()
 
     # Remove slides first
@@ -655,31 +638,153 @@ async def apply_deckdiff(deck_id: str, deck_diff: Dict[str, Any], user_id: Optio
             slide[k] = v
         changed_slide_ids.add(sid)
 
-    persistence = DeckPersistence()
-
-    # If slides were added or removed, persist the entire deck once (ensures new slides are saved)
-    has_adds = bool(deck_diff.get("slides_to_add"))
-    has_removes = bool(deck_diff.get("slides_to_remove"))
-    if has_adds or has_removes:
-        # Save full deck to include structure changes and then return new version
-        # Ensure deck object contains our updated slides list
-        deck["slides"] = slides
-        await persistence.save_deck_with_user(deck_id, deck, user_id=user_id)
-        updated = get_deck(deck_id)
-        return updated.get("version") if updated else None
-
-    # Otherwise, persist only changed slides
-    if not changed_slide_ids:
+    return changed_slide_ids
+
+
+# Recently edited decks, keyed by deck id. Entries carry the version and last_modified
+# they were read at (UI saves change only the latter), so a stale entry only costs a
+# conflict and one reload.
+HOT_DECK_CACHE_SIZE = 64
+_hot_decks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_MAX_EDIT_ATTEMPTS = 3
+
+# End-to-end edit latencies (ms) for get_edit_latency_stats()
+_edit_latencies: Deque[Dict[str, float]] = deque(maxlen=500)
+
+
+def _remember_deck(deck_id: str, deck: Dict[str, Any]) -> None:
+    _hot_decks[deck_id] = deck
+    _hot_decks.move_to_end(deck_id)
+    while len(_hot_decks) > HOT_DECK_CACHE_SIZE:
+        _hot_decks.popitem(last=False)
+
+
+def invalidate_hot_deck(deck_id: str) -> None:
+    """Drop a deck from the edit cache (call after writing the deck through another path)."""
+    _hot_decks.pop(deck_id, None)
+
+
+async def _load_deck(deck_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """Return a private copy of the deck, from the hot cache when possible."""
+    if use_cache and deck_id in _hot_decks:
+        _hot_decks.move_to_end(deck_id)
+        return copy.deepcopy(_hot_decks[deck_id])
+    deck = await asyncio.to_thread(get_deck, deck_id)
+    if not deck:
         return None
-    # Recompute index map in case slide list changed during updates
-    slide_index_map = {s.get("id"): idx for idx, s in enumerate(slides) if isinstance(s, dict) and s.get("id")}
-    for sid in changed_slide_ids:
-        idx = slide_index_map.get(sid)
-        if idx is None or idx >= len(slides):
+    _remember_deck(deck_id, copy.deepcopy(deck))
+    return deck
+
+
+async def _run_edit_transaction(
+    deck_id: str,
+    mutate: Callable[[Dict[str, Any]], set[str]],
+    user_id: Optional[str],
+    label: str,
+) -> Optional[str]:
+    """Load once, apply ``mutate`` in memory, write slides in one version-checked update.
+
+    On a version conflict the deck is reloaded from the database and ``mutate`` is
+    re-applied to the fresh copy. Returns the new version, or None if nothing changed
+    or the write failed.
+    """
+    started = time.perf_counter()
+    timings = {"load_ms": 0.0, "apply_ms": 0.0, "write_ms": 0.0}
+    use_cache = True
+    for attempt in range(1, _MAX_EDIT_ATTEMPTS + 1):
+        t0 = time.perf_counter()
+        deck = await _load_deck(deck_id, use_cache=use_cache)
+        timings["load_ms"] += (time.perf_counter() - t0) * 1000
+        if not deck:
+            return None
+
+        t0 = time.perf_counter()
+        changed = mutate(deck)
+        timings["apply_ms"] += (time.perf_counter() - t0) * 1000
+        if not changed:
+            return None
+
+        t0 = time.perf_counter()
+        try:
+            result = await asyncio.to_thread(
+                update_deck_slides_if_version,
+                deck_id,
+                deck.get("slides", []),
+                deck.get("version"),
+                user_id if user_id and not deck.get("user_id") else None,
+                deck.get("last_modified"),
+            )
+        except Exception as e:
+            invalidate_hot_deck(deck_id)
+            logger.warning(f"[FastPath] {label} write failed for deck {deck_id}: {e}")
+            return None
+        finally:
+            timings["write_ms"] += (time.perf_counter() - t0) * 1000
+
+        if result is None:
+            logger.info(f"[FastPath] {label} version conflict on deck {deck_id} (attempt {attempt}); reloading")
+            invalidate_hot_deck(deck_id)
+            use_cache = False
             continue
-        await persistence.update_slide_with_user(deck_id, idx, slides[idx], user_id=user_id, force_immediate=True)
 
-    updated = get_deck(deck_id)
-    return updated.get("version") if updated else None
+        deck.update(result)
+        if user_id and not deck.get("user_id"):
+            deck["user_id"] = user_id
+        _remember_deck(deck_id, deck)
+        note_deck_edit(deck_id, deck, changed)
+        persistence = DeckPersistence()
+        if deck_id in persistence._deck_cache:
+            persistence.cache_deck(deck_id, deck)
+
+        timings["total_ms"] = (time.perf_counter() - started) * 1000
+        timings["attempts"] = attempt
+        _edit_latencies.append(timings)
+        logger.info(
+            f"[FastPath] {label} committed {len(changed)} slide(s) on deck {deck_id} "
+            f"in {timings['total_ms']:.0f}ms (load {timings['load_ms']:.0f}ms, "
+            f"apply {timings['apply_ms']:.1f}ms, write {timings['write_ms']:.0f}ms, attempts {attempt})"
+        )
+        return result["version"]
+
+    logger.warning(f"[FastPath] {label} gave up on deck {deck_id} after {_MAX_EDIT_ATTEMPTS} version conflicts")
+    return None
+
+
+def get_edit_latency_stats() -> Dict[str, Any]:
+    """Percentiles of recent end-to-end edit latencies."""
+    if not _edit_latencies:
+        return {"count": 0}
+    stats: Dict[str, Any] = {"count": len(_edit_latencies), "hot_decks": len(_hot_decks)}
+    for key in ("total_ms", "load_ms", "apply_ms", "write_ms"):
+        values = sorted(t[key] for t in _edit_latencies)
+        stats[key] = {
+            "p50": round(values[len(values) // 2], 1),
+            "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 1),
+            "max": round(values[-1], 1),
+        }
+    stats["conflict_retries"] = sum(t["attempts"] - 1 for t in _edit_latencies)
+    return stats
+
 
+async def apply_fast_operations(deck_id: str, operations: List[Dict[str, Any]], user_id: Optional[str] = None) -> Optional[str]:
+    """Apply a list of simple operations directly to deck and persist updated slides.
 
+    Returns the new deck version (revision) if available, otherwise None.
+    """
+    return await _run_edit_transaction(
+        deck_id,
+        lambda deck: _apply_operations_in_memory(deck, copy.deepcopy(operations)),
+        user_id,
+        "operations",
+    )
+
+
+async def apply_deckdiff(deck_id: str, deck_diff: Dict[str, Any], user_id: Optional[str] = None) -> Optional[str]:
+    """Apply our internal DeckDiff schema (slides_to_update/add/remove with component diffs)."""
+    # The diff is copied per attempt: application mutates it (added slides, prop normalization)
+    return await _run_edit_transaction(
+        deck_id,
+        lambda deck: _apply_deckdiff_in_memory(deck, copy.deepcopy(deck_diff)),
+        user_id,
+        "deckdiff",
+    )
@@ -0,0 +1,100 @@
+"""
+Content-addressed blob store for imported media.
+
+Blobs are written once under ``<root>/<sha[:2]>/<sha>.<ext>`` and referenced by
+URL instead of being inlined as base64 data URLs, so identical images (logos
+repeated on every slide) are stored once and deck JSON stays small. Writes are
+atomic, so worker processes can share the same root safely.
+
+Blobs are served by ``GET /v1/uploads/blobs/{name}`` (api_uploads). Like
+public storage URLs, a blob URL is a capability: names are SHA-256 digests of
+the content, so they can't be enumerated or guessed, and ``<img>`` tags can
+load them without credentials.
+
+The URLs end up in deck JSON, so a deployment that enables externalization
+(``PPTX_EXTERNALIZE_IMAGES``) needs ``BLOB_STORE_ROOT`` on persistent storage
+shared by every instance and ``BLOB_URL_PREFIX`` (or ``BACKEND_URL``) set to
+its public address.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from agents.config import APP_DATA_DIR
+
+BLOB_STORE_ROOT = os.getenv("BLOB_STORE_ROOT", os.path.join(APP_DATA_DIR, "blobs"))
+BLOB_URL_PREFIX = os.getenv(
+    "BLOB_URL_PREFIX",
+    os.getenv("BACKEND_URL", "http://localhost:9090").rstrip("/") + "/v1/uploads/blobs",
+)
+
+MIME_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "image/svg+xml": "svg",
+    "image/webp": "webp",
+    "image/bmp": "bmp",
+    "image/tiff": "tiff",
+    "image/x-emf": "emf",
+    "image/x-wmf": "wmf",
+}
+EXTENSION_MIMES = {ext: mime for mime, ext in MIME_EXTENSIONS.items()}
+
+_NAME_RE = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]{1,5}$")
+
+
+class ContentAddressedBlobStore:
+    """Filesystem blob store keyed by SHA-256."""
+
+    def __init__(self, root: str = BLOB_STORE_ROOT, url_prefix: str = BLOB_URL_PREFIX):
+        self.root = Path(root)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def blob_name(digest: str, mime_type: str) -> str:
+        return f"{digest}.{MIME_EXTENSIONS.get(mime_type, 'bin')}"
+
+    def path_for(self, name: str) -> Optional[Path]:
+        """Filesystem path for a blob name, or None if the name is not a valid blob name."""
+        if not _NAME_RE.match(name):
+            return None
+        return self.root / name[:2] / name
+
+    def url_for(self, name: str) -> str:
+        return f"{self.url_prefix}/{name}"
+
+    def put(self, data: bytes, mime_type: str) -> Dict[str, object]:
+        """Store ``data`` (no-op if already present) and return its reference."""
+        digest = hashlib.sha256(data).hexdigest()
+        name = self.blob_name(digest, mime_type)
+        path = self.path_for(name)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        return {"hash": digest, "name": name, "mimeType": mime_type, "size": len(data), "url": self.url_for(name)}
+
+
+_store: Optional[ContentAddressedBlobStore] = None
+
+
+def get_blob_store() -> ContentAddressedBlobStore:
+    global _store
+    if _store is None:
+        _store = ContentAddressedBlobStore()
+    return _store
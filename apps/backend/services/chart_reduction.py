@@ -0,0 +1,235 @@
+"""
+Chart series reduction before data enters a slide.
+
+Chart data used to go into slide JSON (and from there into generation
+prompts and the frontend chart) with however many points it arrived with.
+``reduce_points`` brings a series down to the point budget of its chart type:
+
+- line-like charts: Largest-Triangle-Three-Buckets (LTTB) downsampling,
+  which keeps the first/last points and, per bucket, the point forming the
+  largest triangle with its neighbours, so peaks and troughs survive;
+- bar/column/pie-like charts: the top N-1 categories by magnitude, in their
+  original order, plus one "Other" bucket with the rest;
+- scatter/bubble: evenly strided sample.
+
+``aggregate_time_buckets`` rolls timestamped rows (e.g. an uploaded
+transaction log) up into day/week/month/quarter/year buckets, choosing the
+finest unit that fits the budget.
+
+Budgets per chart type are in ``CHART_POINT_BUDGETS`` and can be overridden
+with ``CHART_POINT_BUDGETS="line=500,pie=6"``. Chart types without a budget
+(sankey, heatmap, ...) are left alone.
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POINT_BUDGETS = {
+    'line': 300, 'area': 300, 'spline': 300, 'areaspline': 300,
+    'bar': 15, 'column': 15, 'waterfall': 15, 'radar': 12,
+    'pie': 10, 'donut': 10,
+    'scatter': 500, 'bubble': 200,
+}
+SERIES_CHARTS = {'line', 'area', 'spline', 'areaspline'}
+CATEGORY_CHARTS = {'bar', 'column', 'pie', 'donut', 'radar', 'funnel'}
+SAMPLED_CHARTS = {'scatter', 'bubble'}
+
+OTHER_LABEL = 'Other'
+
+# Values of these columns are levels (averaged per time bucket), not amounts (summed)
+LEVEL_NAME_HINTS = ('price', 'rate', 'avg', 'average', 'mean', 'ratio', 'margin', '%', 'percent', 'temperature', 'score', 'index')
+
+
+def _load_budgets() -> Dict[str, int]:
+    budgets = dict(DEFAULT_POINT_BUDGETS)
+    for item in os.getenv('CHART_POINT_BUDGETS', '').split(','):
+        chart_type, _, value = item.partition('=')
+        if chart_type.strip() and value.strip().isdigit():
+            budgets[chart_type.strip().lower()] = int(value)
+    return budgets
+
+
+CHART_POINT_BUDGETS = _load_budgets()
+
+
+def point_budget(chart_type: Optional[str]) -> Optional[int]:
+    return CHART_POINT_BUDGETS.get((chart_type or '').lower())
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Indices of the ``budget`` points LTTB keeps from (x, y), x ascending."""
+    n = len(y)
+    if budget >= n:
+        return np.arange(n)
+    if budget < 3:
+        return np.array([0, n - 1][:max(budget, 1)])
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # budget-2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    # Prefix sums give each bucket's average in O(1)
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(budget - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        count = next_end - next_start
+        avg_x = (cx[next_end] - cx[next_start]) / count
+        avg_y = (cy[next_end] - cy[next_start]) / count
+        ax, ay = x[a], y[a]
+        areas = np.abs((ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay))
+        a = start + int(areas.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def top_n_with_other(
+    labels: Sequence[str], values: np.ndarray, budget: int, other_label: str = OTHER_LABEL
+) -> Tuple[List[str], np.ndarray]:
+    """The budget-1 largest categories (by magnitude) in original order, plus their remainder summed as ``other_label``."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) <= budget:
+        return list(labels), values
+    keep_count = max(budget - 1, 1)
+    keep = np.sort(np.argpartition(-np.abs(values), keep_count - 1)[:keep_count])
+    rest = np.ones(len(values), dtype=bool)
+    rest[keep] = False
+    return [labels[i] for i in keep] + [other_label], np.append(values[keep], values[rest].sum())
+
+
+def stride_indices(n: int, budget: int) -> np.ndarray:
+    if budget >= n:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, budget).astype(np.int64))
+
+
+def parse_times(labels: Sequence[Any]) -> Optional[np.ndarray]:
+    """Labels as datetime64[s] if every one is an ISO-style date/time ('2024', '2024-03', '2024-03-01 09:00'), else None."""
+    if not len(labels):
+        return None
+    try:
+        times = np.array([str(label).strip() for label in labels], dtype='datetime64[s]')
+    except ValueError:
+        return None
+    return None if np.isnat(times).any() else times
+
+
+def default_aggregation(value_name: str) -> str:
+    name = (value_name or '').lower()
+    return 'mean' if any(hint in name for hint in LEVEL_NAME_HINTS) else 'sum'
+
+
+def _truncate(times: np.ndarray, unit: str) -> np.ndarray:
+    if unit == 'day':
+        return times.astype('datetime64[D]')
+    if unit == 'week':
+        days = times.astype('datetime64[D]').astype(np.int64)
+        # 1970-01-01 was a Thursday; weeks start on Monday
+        return (days - (days + 3) % 7).astype('datetime64[D]')
+    if unit == 'month':
+        return times.astype('datetime64[M]')
+    if unit == 'quarter':
+        months = times.astype('datetime64[M]').astype(np.int64)
+        return (months - months % 3).astype('datetime64[M]')
+    return times.astype('datetime64[Y]')
+
+
+def _bucket_label(key: np.datetime64, unit: str) -> str:
+    text = str(key)
+    if unit == 'quarter':
+        return f"{text[:4]}-Q{(int(text[5:7]) - 1) // 3 + 1}"
+    return text
+
+
+TIME_UNITS = ('day', 'week', 'month', 'quarter', 'year')
+
+
+def aggregate_time_buckets(
+    times: np.ndarray, values: np.ndarray, budget: int, how: str = 'sum', unit: Optional[str] = None
+) -> Tuple[List[str], np.ndarray, str]:
+    """
+    Aggregate values per time bucket.
+
+    Args:
+        times: datetime64 array
+        values: Values aligned with ``times`` (NaN rows are dropped)
+        budget: Maximum number of buckets when ``unit`` is chosen automatically
+        how: 'sum' or 'mean'
+        unit: 'day', 'week', 'month', 'quarter' or 'year'; default: the finest that fits ``budget``
+
+    Returns:
+        (bucket labels in time order, aggregated values, unit used)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    times, values = times[valid], values[valid]
+    for candidate in ([unit] if unit else TIME_UNITS):
+        keys = _truncate(times, candidate)
+        buckets, inverse = np.unique(keys, return_inverse=True)
+        if unit or len(buckets) <= budget:
+            break
+    totals = np.bincount(inverse, weights=values, minlength=len(buckets))
+    if how == 'mean':
+        totals = totals / np.bincount(inverse, minlength=len(buckets))
+    return [_bucket_label(key, candidate) for key in buckets], totals, candidate
+
+
+def reduce_points(
+    chart_type: Optional[str], labels: Sequence[str], values: Sequence[float], budget: Optional[int] = None
+) -> Tuple[List[str], np.ndarray, Optional[Dict[str, Any]]]:
+    """
+    Bring one series within the point budget of its chart type.
+
+    Returns:
+        (labels, values, reduction info or None if the series was left as is)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    chart_type = (chart_type or '').lower()
+    budget = budget or point_budget(chart_type)
+    n = len(values)
+    if not budget or n <= budget:
+        return list(labels), values, None
+
+    if chart_type in SERIES_CHARTS:
+        times = parse_times(labels)
+        x = times.astype(np.int64) if times is not None else np.arange(n)
+        order = np.argsort(x, kind='stable')
+        if (order != np.arange(n)).any():
+            x, values, labels = x[order], values[order], [labels[i] for i in order]
+        idx = lttb_indices(x, values, budget)
+        method = 'lttb'
+    elif chart_type in CATEGORY_CHARTS:
+        labels, values = top_n_with_other(labels, values, budget)
+        idx = None
+        method = 'top_n_other'
+    elif chart_type in SAMPLED_CHARTS:
+        idx = stride_indices(n, budget)
+        method = 'stride'
+    else:
+        return list(labels), values, None
+
+    if idx is not None:
+        labels, values = [labels[i] for i in idx], values[idx]
+    logger.debug(f"[CHART REDUCE] {chart_type}: {n} -> {len(values)} points ({method})")
+    return list(labels), values, {'method': method, 'original_points': n, 'points': len(values)}
+
+
+def fold_categories(
+    totals_by_label: Dict[str, float], budget: int
+) -> Optional[set]:
+    """Labels to keep across several series of a categorical chart (None: keep all)."""
+    if len(totals_by_label) <= budget:
+        return None
+    names = list(totals_by_label)
+    kept, _ = top_n_with_other(names, np.array([totals_by_label[name] for name in names]), budget)
+    return set(kept[:-1])
@@ -1,16 +1,12 @@
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass, field
 from collections import defaultdict, Counter
 from datetime import datetime, timedelta
-import aiohttp
 import asyncio
-import time
 import os
 import random
 import re
 from pathlib import Path
-import hashlib
-import json
 
 import logging
 
@@ -22,7 +18,10 @@ from agents.config import IMAGE_PROVIDER, IMAGE_TRANSPARENT_DEFAULT_SUPPORTING,
 from services.unsplash_service import UnsplashService  # Keep for future use
 from services.image_storage_service import ImageStorageService
 from services.image_validator import ImageValidator
+from services.image_search_planner import assign_images, execute_plan, plan_image_searches
+from services.image_hashing import IMAGE_HASH_ENABLED, DeckImageIndex, get_image_hasher, select_diverse
 from utils.token_bucket import TokenBucket
+from agents.generation.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -65,101 +64,29 @@ class CombinedImageService:
         
         # Track image uniqueness per deck
         self._used_images_per_deck: Dict[str, set] = {}
+        # Perceptual hashes of the images used per deck, and candidates rejected as near-duplicates
+        self._image_index_per_deck: Dict[str, DeckImageIndex] = {}
+        self._near_duplicates_per_deck: Dict[str, int] = {}
+        
+        # Provider (SerpAPI/Perplexity) searches issued per deck
+        self._provider_calls_per_deck: Dict[str, int] = {}
         
         # Rate limiting for API calls (10 calls per second)
         self.rate_limiter = TokenBucket(tokens=10, time_unit=1)
-        
-        # Cache for search results (in-memory cache with TTL)
-        self._search_cache: Dict[str, Tuple[List[Dict], float]] = {}
-        self._cache_ttl = 3600  # 1 hour TTL
-        
-        # Connection pool for better performance
-        self._connector = None
-        self._session = None
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self._connector = aiohttp.TCPConnector(limit=100, limit_per_host=30)
-        self._session = aiohttp.ClientSession(connector=self._connector)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self._session:
-            await self._session.close()
-        if self._connector:
-            await self._connector.close()
-        # Ensure provider sessions are closed
+        # HTTP connections come from the shared pool (utils.http_client), closed at shutdown
         try:
             if hasattr(self, 'serpapi') and hasattr(self.serpapi, '__aexit__'):
                 await self.serpapi.__aexit__(None, None, None)
         except Exception:
             pass
     
-    def __del__(self):
-        """Cleanup resources when object is garbage collected"""
-        try:
-            # Close the session if it exists and is not closed
-            if self._session and not self._session.closed:
-                try:
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        asyncio.create_task(self._session.close())
-                    else:
-                        loop.run_until_complete(self._session.close())
-                except Exception:
-                    pass
-            
-            # Close the connector if it exists
-            if self._connector and not self._connector.closed:
-                try:
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        asyncio.create_task(self._connector.close())
-                    else:
-                        loop.run_until_complete(self._connector.close())
-                except Exception:
-                    pass
-            
-            # Ensure SerpAPI service is cleaned up
-            if hasattr(self, 'serpapi') and hasattr(self.serpapi, '__del__'):
-                self.serpapi.__del__()
-        except Exception:
-            pass  # Silently fail in destructor
-    
-    def _get_cache_key(self, query: str, **kwargs) -> str:
-        """Generate cache key for search query."""
-        # Create a deterministic key from query and parameters
-        key_data = {'query': query, **kwargs}
-        key_str = json.dumps(key_data, sort_keys=True)
-        return hashlib.md5(key_str.encode()).hexdigest()
-    
-    async def _get_cached_results(self, cache_key: str) -> Optional[List[Dict]]:
-        """Get cached search results if still valid."""
-        if cache_key in self._search_cache:
-            results, timestamp = self._search_cache[cache_key]
-            if time.time() - timestamp < self._cache_ttl:
-                logger.debug(f"Cache hit for key: {cache_key}")
-                return results
-            else:
-                # Expired, remove from cache
-                del self._search_cache[cache_key]
-        return None
-    
-    def _set_cached_results(self, cache_key: str, results: List[Dict]):
-        """Store results in cache."""
-        self._search_cache[cache_key] = (results, time.time())
-        
-        # Clean up old cache entries if cache is getting large
-        if len(self._search_cache) > 1000:
-            current_time = time.time()
-            expired_keys = [
-                k for k, (_, ts) in self._search_cache.items()
-                if current_time - ts > self._cache_ttl
-            ]
-            for k in expired_keys:
-                del self._search_cache[k]
-    
     async def cleanup(self):
         """Properly clean up resources. Call this when done with the service."""
         # Clean up storage service session
@@ -171,15 +98,35 @@ class CombinedImageService:
         self._ai_usage_per_deck[deck_id] = 0
         # Also reset used images tracking
         self._used_images_per_deck[deck_id] = set()
+        self._image_index_per_deck[deck_id] = DeckImageIndex()
+        self._near_duplicates_per_deck[deck_id] = 0
+        self._provider_calls_per_deck[deck_id] = 0
     
     def get_ai_count(self, deck_id: str) -> int:
         """Get current AI generation count for a deck."""
         return self._ai_usage_per_deck.get(deck_id, 0)
     
+    def _count_provider_call(self, deck_id: Optional[str], search_results: Optional[Dict[str, Any]]):
+        # Results served by the shared image-search cache didn't reach the provider
+        if deck_id and (search_results or {}).get('cache', 'miss') == 'miss':
+            self._provider_calls_per_deck[deck_id] = self._provider_calls_per_deck.get(deck_id, 0) + 1
+    
+    def get_provider_call_count(self, deck_id: str) -> int:
+        """Get the number of image provider searches issued for a deck."""
+        return self._provider_calls_per_deck.get(deck_id, 0)
+    
+    def get_near_duplicate_count(self, deck_id: str) -> int:
+        """Get the number of candidates rejected as visual duplicates of images used in a deck."""
+        return self._near_duplicates_per_deck.get(deck_id, 0)
+    
     async def _select_diverse_images(self, images: List[Dict[str, Any]], num_images: int, deck_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Select diverse images from search results, avoiding duplicates across the deck.
         
+        Candidates are perceptually hashed (services.image_hashing): the same picture
+        at another URL or size is rejected, and among the rest the visually most
+        distinct are chosen. Unhashed candidates fall back to URL identity.
+        
         Args:
             images: List of image search results
             num_images: Number of images to select
@@ -193,13 +140,32 @@ class CombinedImageService:
             
         # Get set of already used images for this deck
         used_urls = self._used_images_per_deck.get(deck_id, set()) if deck_id else set()
+        deck_index = self._image_index_per_deck.get(deck_id) if deck_id else None
+        
+        if IMAGE_HASH_ENABLED:
+            hashes = await get_image_hasher().hash_images(images)
+        else:
+            hashes = [None] * len(images)
+        image_hashes = {id(img): h for img, h in zip(images, hashes)}
         
-        # Filter out already used images
+        # Filter out already used images, and images that look like a used or earlier candidate
         available_images = []
-        for img in images:
+        batch_index = DeckImageIndex()
+        near_duplicates = 0
+        for img, img_hash in zip(images, hashes):
             img_url = img.get('url', img.get('original', ''))
-            if img_url and img_url not in used_urls:
-                available_images.append(img)
+            if not img_url or img_url in used_urls:
+                continue
+            if img_hash is not None:
+                if (deck_index is not None and deck_index.find_duplicate(img_hash) is not None) \
+                        or batch_index.find_duplicate(img_hash) is not None:
+                    near_duplicates += 1
+                    continue
+                batch_index.add(img_hash, img_url)
+            available_images.append(img)
+        if deck_id and near_duplicates:
+            self._near_duplicates_per_deck[deck_id] = self._near_duplicates_per_deck.get(deck_id, 0) + near_duplicates
+            logger.debug(f"[IMAGE HASH] rejected {near_duplicates} near-duplicate candidates for deck {deck_id}")
         
         # If we filtered out too many, include some used ones but at the end
         if len(available_images) < num_images and len(images) > len(available_images):
@@ -212,6 +178,15 @@ class CombinedImageService:
         
         if len(available_images) <= num_images:
             selected = available_images
+        elif any(image_hashes.get(id(img)) is not None for img in available_images):
+            # Keep some top results (they're most relevant), then pick by visual distance
+            selected = select_diverse(
+                [(img, image_hashes.get(id(img))) for img in available_images],
+                num_images,
+                used=deck_index,
+                keep_top=min(num_images // 2, 3),
+            )
+            random.shuffle(selected)
         else:
             # Strategy: Mix top results with some from middle and end
             selected = []
@@ -250,6 +225,9 @@ class CombinedImageService:
                 img_url = img.get('url', img.get('original', ''))
                 if img_url:
                     self._used_images_per_deck.setdefault(deck_id, set()).add(img_url)
+                img_hash = image_hashes.get(id(img))
+                if img_hash is not None:
+                    self._image_index_per_deck.setdefault(deck_id, DeckImageIndex()).add(img_hash, img_url)
         
         return selected
     
@@ -364,6 +342,7 @@ class CombinedImageService:
             
         return None
     
+    @traced("image.search")
     async def search_images_for_slide(
         self,
         slide_content: str,
@@ -546,7 +525,6 @@ class CombinedImageService:
         self.reset_deck_ai_count(deck_id)
         
         # Extract all topics first
-        topics_to_search = {}  # topic -> list of slide IDs that need it
         slide_topics = {}  # slide_id -> list of topics
         
         for i, slide in enumerate(deck_outline.slides):
@@ -576,84 +554,51 @@ class CombinedImageService:
                     continue
                 
                 slide_topics[slide.id] = topics
-                
-                # Map topics to slides
-                for topic in topics:
-                    if topic not in topics_to_search:
-                        topics_to_search[topic] = []
-                    topics_to_search[topic].append(slide.id)
         
-        # Step 2: Search for all topics in parallel
-        search_tasks = []
-        task_to_topic = {}  # Map tasks to their topics for easy lookup
+        # Step 2: Plan one query per cluster of overlapping topics across the deck
+        plan = plan_image_searches(slide_topics, ignore=self.STOP_WORDS | self.VAGUE_TERMS)
+        style_preferences = deck_outline.stylePreferences.model_dump() if deck_outline.stylePreferences else None
         
-        for topic, slide_ids in topics_to_search.items():
-            # Create a task for each topic search
-            task = asyncio.create_task(
-                self._search_images_for_topic(
-                    topic=topic,
-                    deck_id=deck_id,
-                    style_preferences=deck_outline.stylePreferences.model_dump() if deck_outline.stylePreferences else None,
-                    num_images=12  # Get more images since they'll be distributed
-                )
+        async def search(query: str, num_images: int) -> List[Dict[str, Any]]:
+            return await self._search_images_for_topic(
+                topic=query,
+                deck_id=deck_id,
+                style_preferences=style_preferences,
+                num_images=num_images
             )
-            search_tasks.append((topic, slide_ids, task))
-            task_to_topic[task] = (topic, slide_ids)  # Store mapping
+        
+        # Get more images than a slide needs since they'll be distributed
+        search_tasks = execute_plan(plan, search, images_for=lambda slides: 12)
         
         # Step 3: Gather results as they complete
         topic_images = {}
         topics_processed = 0
-        total_topics = len(topics_to_search)
+        total_topics = len(search_tasks)
         
-        # Process completed searches as they finish - USE asyncio.as_completed!
-        for completed in asyncio.as_completed([task for _, _, task in search_tasks]):
-            try:
-                # Wait for the next completed task
-                images = await completed
-                
-                # Get topic info from our mapping
-                topic, slide_ids = task_to_topic.get(completed, (None, None))
-                
-                if topic:
-                    topic_images[topic] = images
-                    topics_processed += 1
-                    
-                    # Stream progress for this topic search
-                    yield {
-                        "type": "topic_images_found",
-                        "message": f"Found {len(images)} images for topic: {topic}",
-                        "progress": 18 + int((topics_processed / total_topics) * 2),
-                        "data": {
-                            "topic": topic,
-                            "images_count": len(images),
-                            "slides_using_topic": slide_ids
-                        }
-                    }
-            except Exception as e:
-                logger.error(f"Error in image search task: {e}")
+        for completed in asyncio.as_completed(search_tasks):
+            topic, images = await completed
+            topic_images[topic] = images
+            topics_processed += 1
+            
+            # Stream progress for this topic search
+            yield {
+                "type": "topic_images_found",
+                "message": f"Found {len(images)} images for topic: {topic}",
+                "progress": 18 + int((topics_processed / total_topics) * 2),
+                "data": {
+                    "topic": topic,
+                    "images_count": len(images),
+                    "slides_using_topic": plan.slides_for(topic)
+                }
+            }
         
-        # Step 4: Distribute images to slides
-        images_by_slide = {}
+        # Step 4: Distribute images to slides, each slide leading with images no other slide got
+        assigned = assign_images(plan, topic_images, max_per_slide=max_images_per_slide)
+        slide_positions = {s.id: (i, s) for i, s in enumerate(deck_outline.slides)}
         
-        for slide_id, topics in slide_topics.items():
-            slide_images = []
-            images_used = set()  # Track images already used to avoid duplicates within a slide
-            
-            # Collect images from all topics for this slide
-            for topic in topics:
-                if topic in topic_images:
-                    # Take images for this topic, avoiding duplicates
-                    for img in topic_images[topic]:
-                        img_id = img.get('id') or img.get('url')
-                        if img_id not in images_used and len(slide_images) < max_images_per_slide:
-                            slide_images.append(img)
-                            images_used.add(img_id)
-            
-            images_by_slide[slide_id] = slide_images
-            
-            # Find slide info
-            slide_info = next((s for s in deck_outline.slides if s.id == slide_id), None)
-            slide_index = next((i for i, s in enumerate(deck_outline.slides) if s.id == slide_id), 0)
+        for slide_id, topics in plan.slide_queries.items():
+            slide_images = [img for images in assigned.get(slide_id, {}).values() for img in images]
+            slide_index, slide_info = slide_positions.get(slide_id, (0, None))
             
             # Stream update for this slide
             yield {
@@ -671,15 +616,22 @@ class CombinedImageService:
             }
         
         # Final completion event
-        logger.info(f"Deck {deck_id} used {self.get_ai_count(deck_id)} AI-generated images")
+        provider_calls = self.get_provider_call_count(deck_id)
+        logger.info(
+            f"Deck {deck_id} used {self.get_ai_count(deck_id)} AI-generated images, "
+            f"{provider_calls} provider searches for {plan.topics_requested} slide topics"
+        )
         yield {
             "type": "images_collection_complete",
-            "message": f"Images collection complete - searched {len(topics_to_search)} unique topics",
+            "message": f"Images collection complete - searched {len(plan.clusters)} unique topics",
             "progress": 20,
             "data": {
-                "total_topics_searched": len(topics_to_search),
-                "total_slides_processed": len(slide_topics),
-                "ai_images_used": self.get_ai_count(deck_id)
+                "total_topics_searched": len(plan.clusters),
+                "total_slides_processed": len(plan.slide_queries),
+                "ai_images_used": self.get_ai_count(deck_id),
+                "provider_calls": provider_calls,
+                "near_duplicates_rejected": self.get_near_duplicate_count(deck_id),
+                **plan.stats()
             }
         }
     
@@ -1309,15 +1261,7 @@ class CombinedImageService:
             logger.warning(f"Skipping vague search term: {topic}")
             return []
         
-        # Check cache first
-        cache_key = self._get_cache_key(topic, orientation='landscape', num_images=num_images)
-        cached_results = await self._get_cached_results(cache_key)
-        if cached_results:
-            logger.info(f"Using cached results for topic: {topic}")
-            # Select diverse images from cached results
-            selected_images = await self._select_diverse_images(cached_results, num_images, deck_id)
-            return selected_images
-        
+        # Provider results are cached in the shared image-search cache
         # When we already have a topic/search query, search directly without AI extraction
         google_results = []
         
@@ -1329,6 +1273,7 @@ class CombinedImageService:
                 per_page=num_images * 3,
                 orientation='landscape'
             )
+            self._count_provider_call(deck_id, search_results)
         elif getattr(self.serpapi, 'is_available', False):
             logger.info(f"Using Google Images (SerpAPI) for topic: {topic}")
             search_results = await self.serpapi.search_images(
@@ -1336,13 +1281,11 @@ class CombinedImageService:
                 per_page=num_images * 3,
                 orientation='landscape'
             )
+            self._count_provider_call(deck_id, search_results)
             
             if search_results and search_results.get('photos'):
                 google_results = search_results['photos']
                 
-                # Cache the results
-                self._set_cached_results(cache_key, google_results)
-                
                 # Select diverse images and return them directly - NO UPLOAD!
                 selected_images = await self._select_diverse_images(google_results, num_images, deck_id)
                 return selected_images
@@ -1553,6 +1496,12 @@ class CombinedImageService:
                             topics_to_search[topic] = []
                         topics_to_search[topic].append(slide_id)
         
+        # Plan one query per cluster of overlapping topics across the deck
+        plan = plan_image_searches(slide_topics, ignore=self.STOP_WORDS | self.VAGUE_TERMS)
+        logger.info(f"🖼️ {len(topics_to_search)} distinct topics planned as {len(plan.clusters)} queries")
+        topics_to_search = {cluster.query: cluster.slide_ids for cluster in plan.clusters}
+        slide_topics = plan.slide_queries
+        
         logger.info(f"🖼️ Total unique topics to search: {len(topics_to_search)}")
         if len(topics_to_search) <= 10:
             logger.info(f"🖼️ Topics: {list(topics_to_search.keys())}")
@@ -1567,130 +1516,61 @@ class CombinedImageService:
         
         # Process results as they complete
         async def process_results():
-            # OPTIMIZATION 1: Create all search tasks at once for parallel execution
-            search_tasks = []
-            
-            logger.debug(f"Creating search tasks for {len(topics_to_search)} topics")
+            style_preferences = deck_outline.stylePreferences.model_dump() if deck_outline.stylePreferences else None
             
-            for topic, slide_ids in topics_to_search.items():
-                # With deck-wide searches, we can search for more images per topic
-                # since we have fewer total searches
-                # Calculate how many images we need based on number of slides using this topic
-                slides_using_topic = len(slide_ids)
-                # Get more images when multiple slides will share them
-                num_images_per_topic = max(8, slides_using_topic * 4) if deck_wide_topics else 8
-                
-                # Create coroutine (not task yet)
-                coro = self._search_images_for_topic_optimized(
-                    topic=topic,
+            async def search(query: str, num_images: int) -> List[Dict[str, Any]]:
+                return await self._search_images_for_topic_optimized(
+                    topic=query,
                     deck_id=deck_id,
-                    style_preferences=deck_outline.stylePreferences.model_dump() if deck_outline.stylePreferences else None,
-                    num_images=num_images_per_topic
+                    style_preferences=style_preferences,
+                    num_images=num_images
                 )
-                
-                # Store topic info with coroutine
-                search_tasks.append((topic, slide_ids, coro))
-                logger.info(f"Created search coroutine for topic: '{topic}'")
             
-            # OPTIMIZATION 2: Process results in order while tracking which topic each belongs to
+            # With deck-wide searches there are fewer queries, so get more images
+            # when multiple slides will share them
+            def images_for(slides_using_topic: int) -> int:
+                return max(8, slides_using_topic * 4) if deck_wide_topics else 8
+            
             topic_images = {}
-            topics_processed = 0
-            total_topics = len(topics_to_search)
             
             # Track slides that have received images
             slides_with_images = set()
             total_images_sent = 0
             
-            # Track accumulated images per slide WITH their topics
-            slide_accumulated_images = {}  # slide_id -> list of (topic, images)
-            
+            # Searches run with bounded concurrency; report each topic as it completes
+            search_tasks = execute_plan(plan, search, images_for)
             logger.info(f"Processing {len(search_tasks)} search tasks")
-            
-            # Process all tasks concurrently using gather
-            logger.debug(f"Processing {len(search_tasks)} search tasks...")
-            
-            # Create list of coroutines paired with their metadata
-            task_metadata = []
-            coroutines = []
-            for topic, slide_ids, coro in search_tasks:
-                task_metadata.append((topic, slide_ids))
-                coroutines.append(coro)
-            
-            # Track total number of tasks for progress logging
-            total_tasks = len(coroutines)
-            
-            # Gather all results at once
-            try:
-                results = await asyncio.gather(*coroutines, return_exceptions=True)
-            except Exception as e:
-                logger.error(f"Error gathering search results: {e}")
-                results = []
-            
-            # Process results with their metadata
-            completed_count = 0
-            for (topic, slide_ids), result in zip(task_metadata, results):
-                try:
-                    logger.debug(f"Processing result for topic '{topic}' -> slides: {slide_ids}")
-                    
-                    if isinstance(result, Exception):
-                        logger.error(f"Error in search task for topic '{topic}': {result}")
-                        continue
-                    if not result:
-                        continue
-                    
-                    # Result is directly a list of images, not a dict
-                    logger.debug(f"Result type: {type(result)}, is_list={isinstance(result, list)}")
-                    
-                    images = result if isinstance(result, list) else []
-                    if not images:
-                        logger.warning(f"Topic '{topic}' returned no images")
-                        logger.debug("No images in result")
-                        continue
-                    
-                    logger.info(f"Topic '{topic}' returned {len(images)} images for {len(slide_ids)} slides")
-                    
-                    # Store topic images for caching
-                    topic_images[topic] = images
-                    
-                    # Send topic_images_found callback
-                    if callback and len(images) > 0:
-                        await callback({
-                            "type": "topic_images_found",
-                            "message": f"Found {len(images)} images for: {topic}",
-                            "progress": 18,
-                            "data": {
-                                "topic": topic,
-                                "images_count": len(images),
-                                "slides_using_topic": slide_ids
-                            }
-                        })
-                    
-                    # Give ALL images from this topic to EACH slide (don't distribute/divide)
-                    for slide_id in slide_ids:
-                        # Initialize slide data if needed
-                        if slide_id not in slide_accumulated_images:
-                            slide_accumulated_images[slide_id] = {}  # topic -> images mapping
-                        
-                        # Give ALL images from this topic to this slide
-                        topic_slide_images = images.copy()  # Copy so we don't modify original
-                        
-                        # Add topic field to each image
-                        for img in topic_slide_images:
-                            img['topic'] = topic
-                        
-                        # Store under the topic
-                        slide_accumulated_images[slide_id][topic] = topic_slide_images
-                        
-                        logger.info(f"Added ALL {len(topic_slide_images)} images from topic '{topic}' to slide {slide_id}")
-                        
-                    completed_count += 1
-                    logger.debug(f"Task {completed_count}/{total_tasks} completed")
-                    
-                except asyncio.TimeoutError:
-                    logger.warning(f"Image search timed out after 10s")
+            for completed in asyncio.as_completed(search_tasks):
+                topic, images = await completed
+                if not images:
+                    logger.warning(f"Topic '{topic}' returned no images")
                     continue
-                except Exception as e:
-                    logger.error(f"Error processing search result: {e}", exc_info=True)
+                
+                slide_ids = topics_to_search.get(topic, [])
+                logger.info(f"Topic '{topic}' returned {len(images)} images for {len(slide_ids)} slides")
+                topic_images[topic] = images
+                
+                if callback:
+                    await callback({
+                        "type": "topic_images_found",
+                        "message": f"Found {len(images)} images for: {topic}",
+                        "progress": 18,
+                        "data": {
+                            "topic": topic,
+                            "images_count": len(images),
+                            "slides_using_topic": slide_ids
+                        }
+                    })
+            
+            # Every slide gets all images of its topics as options, each slide
+            # sharing a topic leading with images no other slide leads with
+            slide_accumulated_images = {}  # slide_id -> {topic: images}
+            for slide_id, images_by_topic in assign_images(plan, topic_images).items():
+                if images_by_topic:
+                    slide_accumulated_images[slide_id] = {
+                        topic: [{**img, 'topic': topic} for img in images]
+                        for topic, images in images_by_topic.items()
+                    }
             
             # Now send accumulated images for each slide (only ONE update per slide)
             logger.info(f"Sending accumulated images for {len(slide_accumulated_images)} slides")
@@ -1844,6 +1724,9 @@ class CombinedImageService:
             slides_with_images_count = len(slides_with_images)
             logger.info(f"Final totals: {total_images_collected} images sent to {slides_with_images_count} slides")
             
+            provider_calls = self.get_provider_call_count(deck_id)
+            logger.info(f"Deck {deck_id}: {provider_calls} provider searches for {plan.topics_requested} slide topics")
+            
             # Stream completion event
             if callback:
                 await callback({
@@ -1853,7 +1736,10 @@ class CombinedImageService:
                     "data": {
                         "total_topics_searched": len(topics_to_search),
                         "total_slides_processed": len(slide_topics),
-                        "ai_images_used": self.get_ai_count(deck_id)
+                        "ai_images_used": self.get_ai_count(deck_id),
+                        "provider_calls": provider_calls,
+                        "near_duplicates_rejected": self.get_near_duplicate_count(deck_id),
+                        **plan.stats()
                     }
                 })
                 
@@ -1916,6 +1802,7 @@ class CombinedImageService:
                 )
             
             search_results = await asyncio.wait_for(search_task, timeout=10.0)
+            self._count_provider_call(deck_id, search_results)
             
             if not search_results or not search_results.get('photos'):
                 logger.warning(f"No results for topic: '{topic}'")
@@ -3,6 +3,15 @@
 The goal is to avoid recomputing verbose deck summaries on every agent turn
 and to provide lightweight digests that can be attached to prompts without
 re-sending the full deck payload.
+
+Decks are hashed Merkle-style: every component and slide has its own content
+hash and the deck root hash combines them. The per-deck ``DeckHashTree`` is
+kept up to date by the edit path (``note_deck_edit``), so a snapshot lookup
+for a deck state we produced ourselves (same version *and* last_modified; UI
+saves change only the latter) does no hashing at all, and after an edit only
+the touched slides are re-hashed and re-digested. For decks changed elsewhere,
+each slide is fingerprinted with one cheap serialization and only slides whose
+fingerprint changed get component hashes and a new digest.
 """
 
 from __future__ import annotations
@@ -11,32 +20,215 @@ import hashlib
 import json
 import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from utils.summaries import build_deck_digest
+from utils.summaries import assemble_deck_digest, build_slide_digest, deck_slides, deck_title
 
 
 _CACHE_LOCK = threading.Lock()
 _CACHE: Dict[str, Dict[str, Any]] = {}
 _DEFAULT_TTL = 60.0  # seconds
 
+_TREES: Dict[str, "DeckHashTree"] = {}
+_MAX_TREES = 256
+_STATS = {"version_hits": 0, "rebuilds": 0, "incremental_updates": 0, "slides_hashed": 0, "slides_fingerprinted": 0}
+
+
+def _default(obj: Any) -> Any:
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "dict"):
+        return obj.dict()
+    if isinstance(obj, set):
+        return sorted(list(obj))
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
 
 def _json_hash(data: Any) -> str:
     """Compute a stable hash for arbitrary deck structures."""
 
-    def _default(obj: Any) -> Any:
-        if hasattr(obj, "model_dump"):
-            return obj.model_dump()
-        if hasattr(obj, "dict"):
-            return obj.dict()
-        if isinstance(obj, set):
-            return sorted(list(obj))
-        raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
     payload = json.dumps(data, sort_keys=True, default=_default)
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
+def _as_dict(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return obj
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return obj
+
+
+def _combine(parts: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def _slide_key(slide: Any, index: int) -> str:
+    slide_id = _as_dict(slide).get("id") if isinstance(_as_dict(slide), dict) else None
+    return slide_id or f"#{index}"
+
+
+def _fingerprint(slide: Any) -> str:
+    """Cheap change detector for a slide (key order as stored, not canonical)."""
+    payload = json.dumps(_as_dict(slide), default=_default)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _deck_field(deck_data: Any, name: str) -> Any:
+    value = getattr(deck_data, name, None)
+    if value is None and isinstance(deck_data, dict):
+        value = deck_data.get(name)
+    return value
+
+
+def _deck_stamp(deck_data: Any) -> Optional[str]:
+    """Version + last_modified; None unless both are known (PUT /auth/decks keeps the version)."""
+    version = _deck_field(deck_data, "version")
+    last_modified = _deck_field(deck_data, "last_modified")
+    if not version or not last_modified:
+        return None
+    return f"{version}@{last_modified}"
+
+
+class DeckHashTree:
+    """Per-slide/per-component content hashes for one deck, combined into a root hash."""
+
+    def __init__(self) -> None:
+        self.stamp: Optional[str] = None
+        # Set only for deck states written through the edit path (note_deck_edit): their
+        # content is exactly what we hashed, so lookups for them can skip hashing.
+        self.trusted_stamp: Optional[str] = None
+        self.meta_hash: str = ""
+        self.order: List[str] = []
+        self.fingerprints: Dict[str, str] = {}
+        self.slide_hashes: Dict[str, str] = {}
+        self.component_hashes: Dict[str, Dict[str, str]] = {}
+        self.slide_digests: Dict[str, Dict[str, Any]] = {}
+        self.title: str = "Untitled Deck"
+        self.root: str = ""
+
+    def _hash_slide(self, key: str, slide: Any, index: int, fingerprint: Optional[str] = None) -> None:
+        slide_dict = _as_dict(slide)
+        components = (slide_dict.get("components", []) or []) if isinstance(slide_dict, dict) else []
+        component_hashes: Dict[str, str] = {}
+        ordered: List[str] = []
+        for cidx, comp in enumerate(components):
+            comp_hash = _json_hash(comp)
+            comp_dict = _as_dict(comp)
+            comp_key = (comp_dict.get("id") if isinstance(comp_dict, dict) else None) or f"#{cidx}"
+            component_hashes[comp_key] = comp_hash
+            ordered.append(comp_hash)
+        fields = {k: v for k, v in slide_dict.items() if k != "components"} if isinstance(slide_dict, dict) else slide_dict
+        slide_hash = _combine([_json_hash(fields), *ordered])
+        self.component_hashes[key] = component_hashes
+        if self.slide_hashes.get(key) != slide_hash or key not in self.slide_digests:
+            self.slide_digests[key] = build_slide_digest(slide, index)
+        self.slide_hashes[key] = slide_hash
+        self.fingerprints[key] = fingerprint or _fingerprint(slide)
+        _STATS["slides_hashed"] += 1
+
+    def _finish(self, deck_data: Any, keys: List[str]) -> None:
+        for stale in set(self.slide_hashes) - set(keys):
+            self.slide_hashes.pop(stale, None)
+            self.fingerprints.pop(stale, None)
+            self.component_hashes.pop(stale, None)
+            self.slide_digests.pop(stale, None)
+        self.order = keys
+        deck_dict = _as_dict(deck_data)
+        if isinstance(deck_dict, dict):
+            meta = {k: v for k, v in deck_dict.items() if k not in ("slides", "version", "last_modified")}
+        else:
+            meta = {}
+        self.meta_hash = _json_hash(meta)
+        self.title = deck_title(deck_data)
+        self.root = _combine([self.meta_hash, *(self.slide_hashes[k] for k in keys)])
+        self.stamp = _deck_stamp(deck_data)
+
+    def refresh(self, deck_data: Any) -> None:
+        """Bring the tree up to date with a deck that did not come through the edit path.
+
+        Every slide is fingerprinted; only new slides and slides whose fingerprint
+        changed are re-hashed and re-digested.
+        """
+        keys = []
+        for index, slide in enumerate(deck_slides(deck_data)):
+            key = _slide_key(slide, index)
+            fingerprint = _fingerprint(slide)
+            _STATS["slides_fingerprinted"] += 1
+            if (
+                key not in self.slide_hashes
+                or key.startswith("#")
+                or self.fingerprints.get(key) != fingerprint
+            ):
+                self._hash_slide(key, slide, index, fingerprint)
+            keys.append(key)
+        self._finish(deck_data, keys)
+
+    def apply_changes(self, deck_data: Any, changed_slide_ids: Iterable[str]) -> None:
+        """Re-hash only ``changed_slide_ids`` (plus slides new to the tree); reorder/remove the rest."""
+        changed = set(changed_slide_ids)
+        keys = []
+        for index, slide in enumerate(deck_slides(deck_data)):
+            key = _slide_key(slide, index)
+            if key in changed or key not in self.slide_hashes or key.startswith("#"):
+                self._hash_slide(key, slide, index)
+            keys.append(key)
+        self._finish(deck_data, keys)
+
+    def digest(self, current_slide_id: Optional[str] = None) -> Dict[str, Any]:
+        return assemble_deck_digest(
+            self.title, [self.slide_digests[key] for key in self.order], current_slide_id=current_slide_id
+        )
+
+
+def _tree_for(deck_id: Optional[str], deck_data: Any) -> Tuple[DeckHashTree, bool]:
+    """Return an up-to-date tree for the deck and whether it was reused without hashing."""
+    stamp = _deck_stamp(deck_data)
+    with _CACHE_LOCK:
+        tree = _TREES.get(deck_id) if deck_id else None
+        if tree is not None and stamp and tree.trusted_stamp == stamp:
+            _STATS["version_hits"] += 1
+            return tree, True
+    if tree is None:
+        tree = DeckHashTree()
+    tree.refresh(deck_data)
+    tree.trusted_stamp = None
+    with _CACHE_LOCK:
+        _STATS["rebuilds"] += 1
+        if deck_id:
+            _TREES.pop(deck_id, None)
+            _TREES[deck_id] = tree
+            while len(_TREES) > _MAX_TREES:
+                _TREES.pop(next(iter(_TREES)))
+    return tree, False
+
+
+def note_deck_edit(deck_id: str, deck_data: Any, changed_slide_ids: Iterable[str]) -> None:
+    """Record an edit written through the edit path: re-hash only the changed slides.
+
+    ``deck_data`` must carry the version and last_modified that were just
+    written, so the next snapshot lookup for that state is served from the tree.
+    """
+    with _CACHE_LOCK:
+        tree = _TREES.get(deck_id)
+    if tree is None:
+        return
+    tree.apply_changes(deck_data, changed_slide_ids)
+    tree.trusted_stamp = tree.stamp
+    with _CACHE_LOCK:
+        _STATS["incremental_updates"] += 1
+
+
+def invalidate_deck_hashes(deck_id: str) -> None:
+    """Forget a deck's hash tree (the deck was written outside the edit path)."""
+    with _CACHE_LOCK:
+        _TREES.pop(deck_id, None)
+
+
 def get_deck_context_snapshot(
     deck_id: Optional[str],
     deck_data: Any,
@@ -52,8 +244,12 @@ def get_deck_context_snapshot(
         ttl: Cache expiry window in seconds.
     """
 
-    deck_hash = _json_hash(deck_data)
-    cache_key = deck_id or deck_hash
+    if not deck_data:
+        return {"hash": _json_hash(None), "summary_text": "Deck unavailable", "slides": [], "meta": {"slide_count": 0}}
+
+    tree, _ = _tree_for(deck_id, deck_data)
+    deck_hash = tree.root
+    cache_key = f"{deck_id or deck_hash}:{current_slide_id or ''}"
 
     now = time.time()
     with _CACHE_LOCK:
@@ -67,7 +263,8 @@ def get_deck_context_snapshot(
             snapshot["stored_at"] = now
             return snapshot["payload"]  # type: ignore[return-value]
 
-    digest = build_deck_digest(deck_data, current_slide_id=current_slide_id)
+    # Only slides whose hash changed were re-digested while updating the tree
+    digest = tree.digest(current_slide_id=current_slide_id)
     payload = {
         "hash": deck_hash,
         "summary_text": digest.get("summary_text"),
@@ -94,9 +291,14 @@ def get_deck_context_snapshot(
     return payload
 
 
+def get_cache_stats() -> Dict[str, Any]:
+    with _CACHE_LOCK:
+        return {**_STATS, "snapshots": len(_CACHE), "trees": len(_TREES)}
+
+
 def clear_cache() -> None:
     """Utility for tests to flush cached snapshots."""
 
     with _CACHE_LOCK:
         _CACHE.clear()
-
+        _TREES.clear()
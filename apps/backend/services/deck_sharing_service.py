@@ -3,12 +3,21 @@ Deck sharing service for creating and managing share links with short URLs.
 """
 import logging
 from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import secrets
 import string
 import os
 
 from utils.supabase import get_supabase_client
+from services.public_share_cache import (
+    PUBLIC_DECK_CACHE_SIZE,
+    PUBLIC_DECK_VERSION_TTL,
+    PUBLIC_SHARE_TTL,
+    ShareAccessBuffer,
+    TTLCache,
+    etag_matches,
+    make_etag,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +33,20 @@ class DeckSharingService:
     SHORT_CODE_CHARS = string.ascii_letters + string.digits
     # Remove ambiguous characters
     SHORT_CODE_CHARS = SHORT_CODE_CHARS.replace('0', '').replace('O', '').replace('l', '').replace('I', '')
-    
+    # decks_optimized carries only the first slide plus slide_count; enough for previews/metadata
+    PUBLIC_DECK_SUMMARY_COLUMNS = (
+        'uuid, name, created_at, updated_at, last_modified, status, description, visibility, data, user_id, '
+        'slides, slide_count'
+    )
+
     def __init__(self):
         self.supabase = get_supabase_client()
+        # Public share read path; see services/public_share_cache.py
+        self._share_codes = TTLCache(maxsize=4096, ttl=PUBLIC_SHARE_TTL)
+        self._deck_fingerprints = TTLCache(maxsize=1024, ttl=PUBLIC_DECK_VERSION_TTL)
+        self._public_decks = TTLCache(maxsize=PUBLIC_DECK_CACHE_SIZE)
+        self.access_buffer = ShareAccessBuffer(self._flush_share_access)
+        self._batch_access_rpc = True
     
     def generate_short_code(self, length: int = 8) -> str:
         """Generate a random short code for URLs."""
@@ -95,41 +115,119 @@ class DeckSharingService:
             Deck data if valid share code, None otherwise
         """
         try:
-            # Record access and get deck UUID
-            result = self.supabase.rpc(
-                'record_share_access',
-                {'p_short_code': short_code}
-            ).execute()
-            
-            if result.data:
-                deck_uuid = result.data
-                
-                # Get the deck data
-                deck_response = self.supabase.table('decks').select('*').eq('uuid', deck_uuid).execute()
-                
-                if deck_response.data and len(deck_response.data) > 0:
-                    deck = deck_response.data[0]
-                    
-                    # Get share details for additional info
-                    share_response = self.supabase.table('deck_shares').select(
-                        'share_type, created_by, metadata'
-                    ).eq('short_code', short_code).eq('is_active', True).execute()
-                    
-                    if share_response.data:
-                        share_info = share_response.data[0]
-                        deck['share_info'] = {
-                            'share_type': share_info['share_type'],
-                            'is_editable': share_info['share_type'] == 'edit'
-                        }
-                    
-                    return deck
-            
-            return None
-            
+            public = self.get_public_deck(short_code)
+            if not public:
+                return None
+
+            deck = dict(public['deck'])
+            deck['share_info'] = {
+                'share_type': public['share_type'],
+                'is_editable': public['share_type'] == 'edit'
+            }
+            return deck
+
         except Exception as e:
             logger.error(f"Error accessing deck by share code: {str(e)}")
             return None
-    
+
+    def get_public_deck(
+        self,
+        short_code: str,
+        include_slides: bool = True,
+        if_none_match: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read path for public share links: cached, with conditional-request support.
+
+        Records the access (buffered) and returns ``{'deck', 'share_type', 'etag'}``,
+        or None for an unknown, revoked or expired code. ``deck`` is None when
+        ``if_none_match`` matches the current ETag; otherwise it is the cached
+        row, so callers must copy it before changing it. Without slides the row
+        comes from ``decks_optimized`` (first slide only, plus ``slide_count``).
+        """
+        share = self.resolve_share_code(short_code)
+        if share is None:
+            return None
+        deck_uuid = share['deck_uuid']
+        fingerprint = self._deck_fingerprint(deck_uuid)
+        if fingerprint is None:
+            return None
+
+        self.access_buffer.record(short_code)
+        variant = 'full' if include_slides else 'summary'
+        etag = make_etag(deck_uuid, fingerprint, share['share_type'], variant)
+        result = {'deck': None, 'share_type': share['share_type'], 'etag': etag}
+        if etag_matches(if_none_match, etag):
+            return result
+
+        def load_deck() -> Optional[Dict[str, Any]]:
+            if include_slides:
+                response = self.supabase.table('decks').select('*').eq('uuid', deck_uuid).execute()
+            else:
+                response = self.supabase.table('decks_optimized').select(
+                    self.PUBLIC_DECK_SUMMARY_COLUMNS
+                ).eq('uuid', deck_uuid).execute()
+            return response.data[0] if response.data else None
+
+        # Keyed by deck version: after an edit the fingerprint changes and the old body is never served
+        result['deck'] = self._public_decks.get_or_load((short_code, fingerprint, variant), load_deck)
+        return result if result['deck'] is not None else None
+
+    def resolve_share_code(self, short_code: str) -> Optional[Dict[str, Any]]:
+        """Active, unexpired share for a code (deck_uuid, share_type, expires_at), cached briefly."""
+        def load_share() -> Optional[Dict[str, Any]]:
+            response = self.supabase.table('deck_shares').select(
+                'deck_uuid, share_type, expires_at'
+            ).eq('short_code', short_code).eq('is_active', True).limit(1).execute()
+            return response.data[0] if response.data else None
+
+        share = self._share_codes.get_or_load(short_code, load_share)
+        if share is None or _is_expired(share.get('expires_at')):
+            return None
+        return share
+
+    def _deck_fingerprint(self, deck_uuid: str) -> Optional[str]:
+        def load_fingerprint() -> Optional[str]:
+            response = self.supabase.table('decks').select(
+                'version, updated_at, last_modified'
+            ).eq('uuid', deck_uuid).limit(1).execute()
+            if not response.data:
+                return None
+            row = response.data[0]
+            return f"{row.get('version')}|{row.get('updated_at')}|{row.get('last_modified')}"
+
+        return self._deck_fingerprints.get_or_load(deck_uuid, load_fingerprint)
+
+    def _flush_share_access(self, counts: Dict[str, int]) -> None:
+        """Write buffered access counts; on failure ``counts`` keeps only what was not written."""
+        if self._batch_access_rpc:
+            try:
+                self.supabase.rpc('record_share_access_batch', {'p_counts': counts}).execute()
+                counts.clear()
+                return
+            except Exception as e:
+                if 'PGRST202' not in str(e) and 'Could not find the function' not in str(e):
+                    raise
+                # Database without scripts/add_share_access_batch.sql
+                logger.warning("record_share_access_batch is not installed; recording share accesses one by one")
+                self._batch_access_rpc = False
+
+        for short_code in list(counts):
+            while counts[short_code] > 0:
+                self.supabase.rpc('record_share_access', {'p_short_code': short_code}).execute()
+                counts[short_code] -= 1
+            del counts[short_code]
+
+    def get_public_cache_stats(self) -> Dict[str, Any]:
+        """Hit rates of the public read path caches and the access buffer."""
+        return {
+            'share_codes': self._share_codes.stats(),
+            'deck_fingerprints': self._deck_fingerprints.stats(),
+            'decks': self._public_decks.stats(),
+            'access_buffer': self.access_buffer.stats(),
+            'batch_access_rpc': self._batch_access_rpc
+        }
+
     def get_user_share_links(self, user_id: str, deck_uuid: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get all share links created by a user.
@@ -173,6 +271,7 @@ class DeckSharingService:
             
             if result.data:
                 logger.info(f"Revoked share link {share_id}")
+                self._share_codes.invalidate(lambda short_code: True)
                 return True
             
             return False
@@ -213,6 +312,8 @@ class DeckSharingService:
                 allowed_updates
             ).eq('id', share_id).eq('created_by', user_id).execute()
             
+            if result.data:
+                self._share_codes.invalidate(lambda short_code: True)
             return result.data[0] if result.data else None
             
         except Exception as e:
@@ -387,6 +488,18 @@ class DeckSharingService:
             raise
 
 
+def _is_expired(expires_at: Optional[str]) -> bool:
+    if not expires_at:
+        return False
+    try:
+        expires = datetime.fromisoformat(str(expires_at).replace('Z', '+00:00'))
+    except ValueError:
+        return False
+    if expires.tzinfo is None:
+        expires = expires.replace(tzinfo=timezone.utc)
+    return expires <= datetime.now(timezone.utc)
+
+
 # Singleton instance
 _sharing_service = None
 
@@ -395,4 +508,10 @@ def get_sharing_service() -> DeckSharingService:
     global _sharing_service
     if _sharing_service is None:
         _sharing_service = DeckSharingService()
-    return _sharing_service 
\ No newline at end of file
+    return _sharing_service 
+
+
+def stop_share_access_flusher() -> None:
+    """Flush buffered share-access counts (server shutdown)."""
+    if _sharing_service is not None:
+        _sharing_service.access_buffer.stop()
@@ -10,6 +10,9 @@ from typing import Dict, List, Optional, Tuple, Set
 import logging
 from difflib import SequenceMatcher
 
+from services.font_manifest import get_font_manifest
+from services.font_scoring import PROFESSIONAL_INAPPROPRIATE_TAGS, STYLE_TAGS, FontFeatureMatrix
+
 logger = logging.getLogger(__name__)
 
 class EnhancedFontService:
@@ -27,6 +30,8 @@ class EnhancedFontService:
         # Build tag index for fast lookup
         self.tag_index = self._build_tag_index()
         self.best_for_index = self._build_best_for_index()
+        # Tag/best_for matrices for scoring a context against every font at once
+        self.feature_matrix = FontFeatureMatrix(list(self.all_fonts.keys()), self.font_metadata)
         
         logger.info(f"Loaded {len(self.pixelbuddha_fonts)} PixelBuddha fonts")
         logger.info(f"Loaded {len(self.designer_fonts)} Designer fonts")
@@ -149,14 +154,14 @@ class EnhancedFontService:
         context = self._analyze_context(deck_title, vibe, content_keywords, target_audience)
         
         # Get fonts with scoring based on metadata
-        hero_fonts = self._get_hero_fonts_with_scoring(context)
-        body_fonts = self._get_body_fonts_with_scoring(context)
+        hero_fonts = self._get_hero_fonts_with_scoring(context, limit=12)
+        body_fonts = self._get_body_fonts_with_scoring(context, limit=8)
         
         # Format response with metadata
         return {
             'context': context,
-            'hero': self._format_font_recommendations(hero_fonts[:12]),
-            'body': self._format_font_recommendations(body_fonts[:8])
+            'hero': self._format_font_recommendations(hero_fonts),
+            'body': self._format_font_recommendations(body_fonts)
         }
     
     def _analyze_context(self, deck_title: str, vibe: str, 
@@ -260,56 +265,25 @@ class EnhancedFontService:
                 score += 3
         
         # Bonus for matching style
-        style_tags = {
-            'professional': ['clean', 'modern', 'professional', 'corporate'],
-            'creative': ['creative', 'artistic', 'unique', 'playful'],
-            'elegant': ['elegant', 'sophisticated', 'luxury', 'refined'],
-            'modern': ['modern', 'minimal', 'contemporary'],
-            'retro': ['retro', 'vintage', 'nostalgic', 'classic']
-        }
-        
-        if context['style'] in style_tags:
-            for tag in style_tags[context['style']]:
+        if context['style'] in STYLE_TAGS:
+            for tag in STYLE_TAGS[context['style']]:
                 if tag in tags:
                     score += 7
         
         # Penalize inappropriate fonts for professional contexts
         if context['style'] == 'professional':
-            inappropriate = ['graffiti', 'horror', 'comic', 'distorted', 'halloween']
-            if any(tag in tags for tag in inappropriate):
+            if any(tag in tags for tag in PROFESSIONAL_INAPPROPRIATE_TAGS):
                 score -= 50
         
         return max(score, 0)
     
-    def _get_hero_fonts_with_scoring(self, context: Dict) -> List[str]:
-        """Get hero fonts with intelligent scoring based on metadata"""
-        scored_fonts = []
-        
-        for font_id in self.all_fonts.keys():
-            score = self._score_font_for_context(font_id, context, for_body=False)
-            if score > 0:
-                scored_fonts.append((font_id, score))
-        
-        # Sort by score descending
-        scored_fonts.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return font IDs only
-        return [font_id for font_id, _ in scored_fonts]
+    def _get_hero_fonts_with_scoring(self, context: Dict, limit: Optional[int] = None) -> List[str]:
+        """Get hero fonts with intelligent scoring based on metadata (same scores as _score_font_for_context)"""
+        return self.feature_matrix.rank(context, for_body=False, limit=limit)
     
-    def _get_body_fonts_with_scoring(self, context: Dict) -> List[str]:
-        """Get body fonts with intelligent scoring based on metadata"""
-        scored_fonts = []
-        
-        for font_id in self.all_fonts.keys():
-            score = self._score_font_for_context(font_id, context, for_body=True)
-            if score > 0:
-                scored_fonts.append((font_id, score))
-        
-        # Sort by score descending
-        scored_fonts.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return font IDs only
-        return [font_id for font_id, _ in scored_fonts]
+    def _get_body_fonts_with_scoring(self, context: Dict, limit: Optional[int] = None) -> List[str]:
+        """Get body fonts with intelligent scoring based on metadata (same scores as _score_font_for_context)"""
+        return self.feature_matrix.rank(context, for_body=True, limit=limit)
     
     def _format_font_recommendations(self, font_ids: List[str]) -> List[Dict]:
         """Format font recommendations with metadata"""
@@ -393,94 +367,8 @@ class EnhancedFontService:
         if not font_data:
             return None
         
-        source = font_data.get('source', 'pixelbuddha')
-        assets_root = Path(__file__).parent.parent / 'assets' / 'fonts'
-
-        def _path_exists(rel: str) -> bool:
-            return (Path(__file__).parent.parent / rel).exists()
-
-        def _scan_for_best(base_dir: Path, is_pixelbuddha: bool) -> Optional[str]:
-            if not base_dir.exists():
-                return None
-            # Recursively find valid font files, excluding macOS resource files
-            candidates = []
-            try:
-                for ext in ['*.woff2', '*.woff', '*.otf', '*.ttf']:
-                    for p in base_dir.rglob(ext):
-                        parts = {part for part in p.parts}
-                        name = p.name
-                        if any(seg == '__MACOSX' for seg in p.parts):
-                            continue
-                        if name.startswith('._'):
-                            continue
-                        candidates.append(p)
-            except Exception:
-                return None
-            if not candidates:
-                return None
-            # Preference is already implied by extension iteration order
-            chosen = candidates[0]
-            if is_pixelbuddha:
-                remainder = chosen.relative_to(base_dir).as_posix()
-                # Use actual on-disk layout under downloads/extracted
-                return f"assets/fonts/pixelbuddha/downloads/extracted/{font_id}/{remainder}"
-            else:
-                remainder = chosen.relative_to(base_dir).as_posix()
-                return f"assets/fonts/designer/{font_id}/{remainder}"
-
-        if source == 'pixelbuddha':
-            # Prefer declared files if they exist
-            files = font_data.get('files', []) or []
-            for f in files:
-                rel = f.get('path') or f.get('url') or f.get('filename')
-                if not rel:
-                    continue
-                # rel is already relative to assets root
-                if _path_exists(rel):
-                    return rel
-            # Fallback: scan directory to locate a usable file
-            # Use actual on-disk layout
-            base_dir = assets_root / 'pixelbuddha' / 'downloads' / 'extracted' / font_id
-            resolved = _scan_for_best(base_dir, True)
-            if resolved:
-                return resolved
-            # Secondary fallback: try to find a directory that matches the id loosely
-            try:
-                pb_root = assets_root / 'pixelbuddha' / 'downloads' / 'extracted'
-                if pb_root.exists():
-                    # Normalize id by stripping common suffix patterns like " (1)"
-                    base_id = font_id.split(' (')[0]
-                    candidate_dir: Optional[Path] = None
-                    for d in pb_root.iterdir():
-                        if not d.is_dir():
-                            continue
-                        name = d.name
-                        if name == font_id or name == base_id or name.startswith(base_id + '-'):
-                            candidate_dir = d
-                            break
-                    if candidate_dir:
-                        return _scan_for_best(candidate_dir, True)
-            except Exception:
-                pass
-            return None
-        else:
-            styles = font_data.get('styles', {}) or {}
-            # Try requested style
-            if style in styles and styles[style]:
-                file_info = styles[style][0]
-                rel = f"assets/fonts/designer/{file_info['path']}"
-                if _path_exists(rel):
-                    return rel
-            # Fallback to common style keys
-            for fallback in ['regular', 'normal'] + (list(styles.keys()) if styles else []):
-                if fallback and fallback in styles and styles[fallback]:
-                    file_info = styles[fallback][0]
-                    rel = f"assets/fonts/designer/{file_info['path']}"
-                    if _path_exists(rel):
-                        return rel
-            # Final fallback: scan designer folder for the id
-            base_dir = assets_root / 'designer' / font_id
-            return _scan_for_best(base_dir, False)
+        # Resolved once for the whole catalog; see services/font_manifest.py
+        return get_font_manifest().resolve(font_id, style, font_data.get('source'))
     
     def get_statistics(self) -> Dict:
         """Get enhanced statistics about the font collection"""
@@ -513,4 +401,5 @@ class EnhancedFontService:
         for use_case, fonts in self.best_for_index.items():
             stats['use_cases'][use_case] = len(fonts)
         
+        stats['scoring'] = self.feature_matrix.get_stats()
         return stats
\ No newline at end of file
@@ -0,0 +1,395 @@
+"""
+Font file manifest: every font ID/style resolved to a file once, not per call.
+
+``EnhancedFontService.get_font_path`` used to probe the filesystem on every
+call: ``Path.exists()`` for each declared file, then four ``rglob`` passes
+over the font's folder, then a listing of the whole PixelBuddha tree to match
+folder names loosely. ``/api/fonts/list?available_only=true`` did that for
+every font in the catalog.
+
+The manifest walks ``assets/fonts`` once, resolves each registry font with the
+same rules (declared files first, then the best file in the font's folder:
+woff2 > woff > otf > ttf, skipping ``__MACOSX`` and ``._`` resource forks) and
+keeps path, format, size and checksum per file. Lookups are dict reads.
+
+- ``scripts/build_font_manifest.py`` writes the manifest with checksums to
+  ``FONT_MANIFEST_PATH``; at startup the walk reuses those checksums for
+  files whose size and mtime are unchanged (others are hashed on demand).
+- A watcher thread (watchfiles when installed, directory-mtime polling
+  otherwise) rebuilds the manifest when the font tree changes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+FONTS_ROOT = BACKEND_ROOT / 'assets' / 'fonts'
+FONT_MANIFEST_PATH = Path(os.getenv("FONT_MANIFEST_PATH", str(FONTS_ROOT / 'font_manifest.json')))
+FONT_MANIFEST_WATCH = os.getenv("FONT_MANIFEST_WATCH", "true").lower() == "true"
+FONT_MANIFEST_POLL_INTERVAL = float(os.getenv("FONT_MANIFEST_POLL_INTERVAL", "30"))
+
+MANIFEST_VERSION = 1
+# Preference order when a font's folder is scanned
+FONT_EXTENSIONS = ('.woff2', '.woff', '.otf', '.ttf')
+PIXELBUDDHA_EXTRACTED = 'pixelbuddha/downloads/extracted'
+
+
+@dataclass
+class FontFileEntry:
+    path: str  # relative to the backend root, e.g. assets/fonts/designer/x/X.otf
+    format: str
+    size: int
+    mtime_ns: int
+    sha256: Optional[str] = None
+
+
+def _is_usable(rel_parts: Tuple[str, ...]) -> bool:
+    return '__MACOSX' not in rel_parts and not rel_parts[-1].startswith('._')
+
+
+def _load_registry(path: Path) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return {}
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and isinstance(data.get('fonts'), dict):
+        data = data['fonts']
+    return {font_id: font for font_id, font in data.items() if isinstance(font, dict)} if isinstance(data, dict) else {}
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FontManifest:
+    """Resolved font files: ``fonts[font_id][source] = {styles: {style: path}, default: path}``.
+
+    A few IDs exist in both registries; a lookup whose ``source`` is not one
+    of them prefers the designer entry, like the merged catalogs do.
+    """
+
+    def __init__(self, files: Dict[str, FontFileEntry], fonts: Dict[str, Dict[str, Dict[str, Any]]], built_at: float):
+        self.files = files
+        self.fonts = fonts
+        self.built_at = built_at
+        self._checksum_lock = threading.Lock()
+
+    def resolve(self, font_id: str, style: str = 'regular', source: Optional[str] = None) -> Optional[str]:
+        """Relative path of the file for ``font_id``/``style``, or None when nothing usable is on disk."""
+        entries = self.fonts.get(font_id)
+        if not entries:
+            return None
+        font = entries.get(source) or entries.get('designer') or entries['pixelbuddha']
+        return font['styles'].get(style) or font['default']
+
+    def get_file(self, rel_path: str) -> Optional[FontFileEntry]:
+        return self.files.get(rel_path)
+
+    def checksum(self, rel_path: str) -> Optional[str]:
+        """SHA-256 of a manifest file, hashed on first request when the build did not include it."""
+        entry = self.files.get(rel_path)
+        if entry is None:
+            return None
+        if entry.sha256 is None:
+            with self._checksum_lock:
+                if entry.sha256 is None:
+                    entry.sha256 = _sha256(BACKEND_ROOT / rel_path)
+        return entry.sha256
+
+    def summary(self) -> Dict[str, Any]:
+        resolved = sum(
+            1 for entries in self.fonts.values() if any(font['default'] or font['styles'] for font in entries.values())
+        )
+        return {
+            'built_at': self.built_at,
+            'files': len(self.files),
+            'fonts': len(self.fonts),
+            'resolved_fonts': resolved,
+            'checksummed_files': sum(1 for entry in self.files.values() if entry.sha256),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': MANIFEST_VERSION,
+            'built_at': self.built_at,
+            'files': {rel: asdict(entry) for rel, entry in sorted(self.files.items())},
+            'fonts': dict(sorted(self.fonts.items())),
+        }
+
+    def save(self, path: Path = FONT_MANIFEST_PATH) -> None:
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def build(
+        cls,
+        fonts_root: Path = FONTS_ROOT,
+        previous: Optional[Dict[str, Any]] = None,
+        include_checksums: bool = False,
+    ) -> 'FontManifest':
+        """Walk ``fonts_root`` once and resolve every registry font.
+
+        ``previous`` is a saved manifest dict; its checksums are reused for
+        files whose size and mtime did not change.
+        """
+        known = previous.get('files', {}) if previous and previous.get('version') == MANIFEST_VERSION else {}
+        prefix = fonts_root.relative_to(BACKEND_ROOT).as_posix() if fonts_root.is_relative_to(BACKEND_ROOT) else str(fonts_root)
+        files: Dict[str, FontFileEntry] = {}
+        # Font folder (e.g. designer/<dir>, pixelbuddha/downloads/extracted/<dir>) -> usable files in it
+        folders: Dict[str, List[str]] = {}
+
+        root = str(fonts_root)
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d != '__MACOSX']
+            rel_dir = tuple(dirpath[len(root) + 1:].split(os.sep)) if dirpath != root else ()
+            for name in filenames:
+                ext = os.path.splitext(name)[1].lower()
+                if ext not in FONT_EXTENSIONS or not _is_usable(rel_dir + (name,)):
+                    continue
+                full = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(full)
+                except OSError:
+                    continue
+                rel = '/'.join((prefix,) + rel_dir + (name,))
+                cached = known.get(rel) or {}
+                sha = cached.get('sha256') if (cached.get('size'), cached.get('mtime_ns')) == (stat.st_size, stat.st_mtime_ns) else None
+                if sha is None and include_checksums:
+                    sha = _sha256(Path(full))
+                files[rel] = FontFileEntry(rel, ext[1:], stat.st_size, stat.st_mtime_ns, sha)
+                if rel_dir[:1] == ('designer',) and len(rel_dir) > 1:
+                    folders.setdefault('/'.join(rel_dir[:2]), []).append(rel)
+                elif '/'.join(rel_dir[:3]) == PIXELBUDDHA_EXTRACTED and len(rel_dir) > 3:
+                    folders.setdefault('/'.join(rel_dir[:4]), []).append(rel)
+
+        resolver = _Resolver(fonts_root, prefix, files, folders)
+        fonts: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for font_id, font in _load_registry(fonts_root / 'pixelbuddha' / 'font_registry.json').items():
+            fonts.setdefault(font_id, {})['pixelbuddha'] = resolver.resolve_pixelbuddha(font_id, font)
+        for font_id, font in _load_registry(fonts_root / 'designer' / 'font_registry.json').items():
+            fonts.setdefault(font_id, {})['designer'] = resolver.resolve_designer(font_id, font)
+        return cls(files, fonts, time.time())
+
+
+class _Resolver:
+    """Resolution rules of the old per-call lookup, run against the walked file index."""
+
+    def __init__(self, fonts_root: Path, prefix: str, files: Dict[str, FontFileEntry], folders: Dict[str, List[str]]):
+        self.fonts_root = fonts_root
+        self.prefix = prefix
+        self.files = files
+        self.folders = folders
+        self.extracted_dirs = sorted(
+            key.rsplit('/', 1)[1] for key in folders if key.startswith(PIXELBUDDHA_EXTRACTED + '/')
+        )
+        self.prefix_parts = tuple(prefix.split('/'))
+        self._dirs: Dict[str, bool] = {}
+
+    def _exists(self, rel: str) -> bool:
+        if rel in self.files:
+            return True
+        parts = tuple(rel.split('/'))
+        indexable = (
+            parts[:len(self.prefix_parts)] == self.prefix_parts
+            and os.path.splitext(parts[-1])[1].lower() in FONT_EXTENSIONS
+            and _is_usable(parts)
+        )
+        # The walk saw every such file; anything else (odd extensions, resource forks) is probed,
+        # unless one of its directories is already known to be missing
+        if indexable:
+            return False
+        for depth in range(1, len(parts)):
+            if not self._dir_exists('/'.join(parts[:depth])):
+                return False
+        return (BACKEND_ROOT / rel).is_file()
+
+    def _dir_exists(self, rel_dir: str) -> bool:
+        exists = self._dirs.get(rel_dir)
+        if exists is None:
+            exists = self._dirs[rel_dir] = (BACKEND_ROOT / rel_dir).is_dir()
+        return exists
+
+    def _best_in_folder(self, folder: str) -> Optional[str]:
+        candidates = self.folders.get(folder)
+        if not candidates:
+            return None
+
+        # Extension preference, then the regular cut (shortest name wins: Foo-Regular over
+        # Foo-ExtendedRegular), then path order so the pick is stable across machines
+        def rank(rel: str) -> Tuple[int, int, int, str]:
+            name = rel.rsplit('/', 1)[1].lower()
+            return FONT_EXTENSIONS.index(os.path.splitext(name)[1]), 0 if 'regular' in name else 1, len(name), rel
+
+        return min(candidates, key=rank)
+
+    def resolve_pixelbuddha(self, font_id: str, font: Dict[str, Any]) -> Dict[str, Any]:
+        resolved = None
+        for file_info in font.get('files', []) or []:
+            rel = file_info.get('path') or file_info.get('url') or file_info.get('filename')
+            if rel and self._exists(rel):
+                resolved = rel
+                break
+        if resolved is None:
+            resolved = self._best_in_folder(f"{PIXELBUDDHA_EXTRACTED}/{font_id}")
+        if resolved is None:
+            # Folder named loosely after the id, e.g. "<id> (1)" downloads or "<id>-v2"
+            base_id = font_id.split(' (')[0]
+            for name in self.extracted_dirs:
+                if name == font_id or name == base_id or name.startswith(base_id + '-'):
+                    resolved = self._best_in_folder(f"{PIXELBUDDHA_EXTRACTED}/{name}")
+                    break
+        return {'styles': {}, 'default': resolved}
+
+    def resolve_designer(self, font_id: str, font: Dict[str, Any]) -> Dict[str, Any]:
+        styles = font.get('styles', {}) or {}
+        resolved_styles: Dict[str, str] = {}
+        for style, style_files in styles.items():
+            if style_files:
+                rel = f"{self.prefix}/designer/{style_files[0]['path']}"
+                if self._exists(rel):
+                    resolved_styles[style] = rel
+        default = None
+        for fallback in ['regular', 'normal'] + list(styles.keys()):
+            if fallback in resolved_styles:
+                default = resolved_styles[fallback]
+                break
+        if default is None:
+            default = self._best_in_folder(f"designer/{font_id}")
+        return {'styles': resolved_styles, 'default': default}
+
+
+def _load_saved(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"[FONT MANIFEST] ignoring unreadable manifest {path}: {e}")
+        return None
+
+
+class FontManifestWatcher:
+    """Rebuilds the manifest when files under the font tree change."""
+
+    def __init__(self, on_change, root: Path = FONTS_ROOT, poll_interval: float = FONT_MANIFEST_POLL_INTERVAL):
+        self.on_change = on_change
+        self.root = root
+        self.poll_interval = poll_interval
+        self.mode: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        try:
+            import watchfiles  # noqa: F401
+            self.mode = 'watchfiles'
+        except ImportError:
+            self.mode = 'poll'
+        self._thread = threading.Thread(target=self._run, name='font-manifest-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            if self.mode == 'watchfiles':
+                from watchfiles import watch
+                for _changes in watch(self.root, stop_event=self._stop, debounce=2000, raise_interrupt=False):
+                    self._notify()
+            else:
+                signature = self._signature()
+                while not self._stop.wait(self.poll_interval):
+                    current = self._signature()
+                    if current != signature:
+                        signature = current
+                        self._notify()
+        except Exception as e:
+            logger.warning(f"[FONT MANIFEST] watcher stopped: {e}")
+
+    def _notify(self) -> None:
+        try:
+            self.on_change()
+        except Exception as e:
+            logger.warning(f"[FONT MANIFEST] rebuild after change failed: {e}")
+
+    def _signature(self) -> Tuple[Tuple[str, int], ...]:
+        # Adding, removing or renaming a file bumps its directory's mtime
+        entries = []
+        for dirpath, _dirnames, _filenames in os.walk(self.root):
+            try:
+                entries.append((dirpath, os.stat(dirpath).st_mtime_ns))
+            except OSError:
+                continue
+        return tuple(entries)
+
+
+_manifest: Optional[FontManifest] = None
+_manifest_lock = threading.Lock()
+_watcher: Optional[FontManifestWatcher] = None
+
+
+def _build_from_disk() -> FontManifest:
+    start = time.perf_counter()
+    manifest = FontManifest.build(previous=_load_saved(FONT_MANIFEST_PATH))
+    summary = manifest.summary()
+    logger.info(
+        f"[FONT MANIFEST] {summary['resolved_fonts']}/{summary['fonts']} fonts resolved, "
+        f"{summary['files']} files in {(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+    return manifest
+
+
+def rebuild_font_manifest() -> FontManifest:
+    global _manifest
+    manifest = _build_from_disk()
+    with _manifest_lock:
+        _manifest = manifest
+    return manifest
+
+
+def get_font_manifest() -> FontManifest:
+    """The process-wide manifest; built on first use, which also starts the watcher."""
+    global _manifest, _watcher
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                _manifest = _build_from_disk()
+                if FONT_MANIFEST_WATCH and _watcher is None:
+                    _watcher = FontManifestWatcher(rebuild_font_manifest)
+                    _watcher.start()
+    return _manifest
+
+
+def get_font_manifest_stats() -> Dict[str, Any]:
+    stats = _manifest.summary() if _manifest is not None else {'built_at': None}
+    stats['watcher'] = _watcher.mode if _watcher is not None else None
+    return stats
+
+
+def stop_font_manifest_watcher() -> None:
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
@@ -0,0 +1,177 @@
+"""
+Vectorized font recommendation scoring.
+
+``EnhancedFontService._score_font_for_context`` scores one font at a time,
+rebuilding lower-cased tag sets and intersecting them with the context on
+every call. ``FontFeatureMatrix`` compiles the font metadata once into sparse
+font x tag and font x best_for incidence matrices (COO index arrays), so a
+context is scored against the whole catalog with one weighted sparse
+matrix-vector product per matrix plus a few precomputed masks. The scores are
+the same as the per-font method's, and ties rank in catalog order as before.
+
+Ranked results are cached per normalized context (LRU).
+"""
+
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Tags that earn +7 each when the context has the matching style
+STYLE_TAGS = {
+    'professional': ['clean', 'modern', 'professional', 'corporate'],
+    'creative': ['creative', 'artistic', 'unique', 'playful'],
+    'elegant': ['elegant', 'sophisticated', 'luxury', 'refined'],
+    'modern': ['modern', 'minimal', 'contemporary'],
+    'retro': ['retro', 'vintage', 'nostalgic', 'classic']
+}
+# Any of these tags costs -50 in a professional context
+PROFESSIONAL_INAPPROPRIATE_TAGS = ['graffiti', 'horror', 'comic', 'distorted', 'halloween']
+
+RANK_CACHE_SIZE = 256
+DESCRIPTION_CACHE_SIZE = 1024
+
+
+class _Incidence:
+    """Sparse 0/1 font x term matrix stored as (row, col) index arrays."""
+
+    def __init__(self, rows: List[int], cols: List[int], vocab: Dict[str, int], n_fonts: int):
+        self.rows = np.asarray(rows, dtype=np.int32)
+        self.cols = np.asarray(cols, dtype=np.int32)
+        self.vocab = vocab
+        self.n_fonts = n_fonts
+
+    @classmethod
+    def build(cls, term_sets: List[Iterable[str]]) -> '_Incidence':
+        vocab: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, terms in enumerate(term_sets):
+            for term in set(terms):
+                rows.append(row)
+                cols.append(vocab.setdefault(term, len(vocab)))
+        return cls(rows, cols, vocab, len(term_sets))
+
+    def weights(self, term_weights: Dict[str, float]) -> np.ndarray:
+        weights = np.zeros(len(self.vocab))
+        for term, weight in term_weights.items():
+            col = self.vocab.get(term)
+            if col is not None:
+                weights[col] += weight
+        return weights
+
+    def dot(self, weights: np.ndarray) -> np.ndarray:
+        """Matrix-vector product: per font, the sum of the weights of its terms."""
+        return np.bincount(self.rows, weights=weights[self.cols], minlength=self.n_fonts)
+
+    def any_of(self, terms: Iterable[str]) -> np.ndarray:
+        return self.dot(self.weights({term: 1.0 for term in terms})) > 0
+
+
+class FontFeatureMatrix:
+    """Font metadata compiled for scoring all fonts against a context at once."""
+
+    def __init__(self, font_ids: List[str], font_metadata: Dict[str, Dict[str, Any]]):
+        self.font_ids = list(font_ids)
+        metadata = [font_metadata.get(font_id) or {} for font_id in self.font_ids]
+        self.has_metadata = np.array([bool(m) for m in metadata], dtype=bool)
+        self.tags = _Incidence.build([[tag.lower() for tag in m.get('tags', [])] for m in metadata])
+        self.best_for = _Incidence.build([m.get('best_for', []) for m in metadata])
+        self.descriptions = [m.get('description', '').lower() for m in metadata]
+
+        # Context-independent parts of the score
+        self.body_bonus = 15.0 * self.best_for.any_of(['body_text']) + 10.0 * self.tags.any_of(['readable', 'clean'])
+        self.hero_bonus = (
+            15.0 * self.best_for.any_of(['headline', 'display']) + 10.0 * self.best_for.any_of(['poster', 'logo'])
+        )
+        self.professional_penalty = 50.0 * self.tags.any_of(PROFESSIONAL_INAPPROPRIATE_TAGS)
+
+        self._lock = threading.Lock()
+        self._ranked: 'OrderedDict[Tuple, List[str]]' = OrderedDict()
+        self._description_hits: Dict[str, np.ndarray] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _description_contains(self, word: str) -> np.ndarray:
+        hits = self._description_hits.get(word)
+        if hits is None:
+            hits = np.fromiter((word in d for d in self.descriptions), dtype=bool, count=len(self.descriptions))
+            if len(self._description_hits) >= DESCRIPTION_CACHE_SIZE:
+                self._description_hits.clear()
+            self._description_hits[word] = hits
+        return hits
+
+    def score(self, context: Dict[str, Any], for_body: bool = False) -> np.ndarray:
+        """Scores of every font, in ``font_ids`` order."""
+        required = context['required_tags']
+        style = context['style']
+
+        tag_weights: Counter = Counter()
+        for tag in required:
+            tag_weights[tag] += 10
+        for tag in context['preferred_tags']:
+            tag_weights[tag] += 5
+        for tag in context['avoid_tags']:
+            tag_weights[tag] -= 20
+        for tag in STYLE_TAGS.get(style, []):
+            tag_weights[tag] += 7
+        scores = self.tags.dot(self.tags.weights(tag_weights))
+
+        scores += self.body_bonus if for_body else self.hero_bonus
+        for word, count in Counter(context['keywords'] + [context['vibe']]).items():
+            scores += 3.0 * count * self._description_contains(word)
+        if style == 'professional':
+            scores -= self.professional_penalty
+            if required:
+                # Fonts with none of the required tags are excluded outright
+                scores[self.tags.dot(self.tags.weights({tag: 1.0 for tag in required})) == 0] = 0.0
+
+        np.maximum(scores, 0.0, out=scores)
+        scores[~self.has_metadata] = 1.0
+        return scores
+
+    def rank(self, context: Dict[str, Any], for_body: bool = False, limit: Optional[int] = None) -> List[str]:
+        """Font IDs with a positive score, best first (ties in catalog order), cached per context."""
+        key = (
+            for_body,
+            limit,
+            context['style'],
+            frozenset(context['required_tags']),
+            frozenset(context['preferred_tags']),
+            frozenset(context['avoid_tags']),
+            tuple(sorted(context['keywords'] + [context['vibe']])),
+        )
+        with self._lock:
+            ranked = self._ranked.get(key)
+            if ranked is not None:
+                self._ranked.move_to_end(key)
+                self.cache_hits += 1
+                return list(ranked)
+            self.cache_misses += 1
+
+        scores = self.score(context, for_body)
+        positive = np.flatnonzero(scores > 0)
+        if limit is not None and limit < len(positive):
+            # Partial selection on (score desc, catalog index asc), then order just the top k
+            order_key = -scores[positive] * (len(scores) + 1) + positive
+            positive = positive[np.argpartition(order_key, limit)[:limit]]
+        order = np.lexsort((positive, -scores[positive]))
+        ranked = [self.font_ids[i] for i in positive[order]]
+
+        with self._lock:
+            self._ranked[key] = ranked
+            if len(self._ranked) > RANK_CACHE_SIZE:
+                self._ranked.popitem(last=False)
+        return list(ranked)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'fonts': len(self.font_ids),
+            'tags': len(self.tags.vocab),
+            'best_for': len(self.best_for.vocab),
+            'nonzeros': int(len(self.tags.rows) + len(self.best_for.rows)),
+            'cached_contexts': len(self._ranked),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
@@ -0,0 +1,247 @@
+"""
+Async client for the frontend render service (``ssr/api-server.ts`` on port 3334).
+
+Unlike ``frontend_renderer.render_deck_to_base64`` this never ships the whole
+deck: each request carries only the slides being rendered plus the deck-level
+fields the renderer needs for styling (size, theme, fonts). Several slides are
+batched into a single ``POST /api/render`` call, connections come from the
+shared per-loop pool in ``utils.http_client``, and screenshots are cached by
+slide content hash so re-rendering an unchanged slide is free.
+``frontend_renderer.render_deck_to_base64`` goes through this client.
+
+Usage:
+    client = get_frontend_render_client()
+    images = await client.render_slides(deck, [0, 3, 4])  # {index: base64_png}
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import aiohttp
+
+from utils.http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RENDER_URL = os.getenv("FRONTEND_RENDER_URL", "http://localhost:3334")
+
+# Top-level deck fields the renderer reads when styling a slide
+DECK_RENDER_CONTEXT_KEYS = ("uuid", "name", "size", "version", "theme", "workspaceTheme", "fonts")
+# Keys under deck["data"] that carry theme/font information
+DECK_DATA_RENDER_KEYS = ("theme", "fonts", "style_spec", "styleSpec", "themeOverrides", "workspaceTheme")
+
+PNG_DATA_URL_PREFIX = "data:image/png;base64,"
+
+
+def _default(obj: Any) -> Any:
+    isoformat = getattr(obj, "isoformat", None)
+    if callable(isoformat):
+        return isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def build_render_context(deck: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the deck-level fields a slide render depends on."""
+    if "deckData" in deck:
+        deck = deck["deckData"]
+    context = {key: deck[key] for key in DECK_RENDER_CONTEXT_KEYS if key in deck}
+    data = deck.get("data")
+    if isinstance(data, dict):
+        slim_data = {key: data[key] for key in DECK_DATA_RENDER_KEYS if key in data}
+        if slim_data:
+            context["data"] = slim_data
+    return context
+
+
+def build_render_payload(deck: Dict[str, Any], slide_indexes: Sequence[int]) -> Dict[str, Any]:
+    """Build a minimal deck containing only ``slide_indexes``, renumbered from 0."""
+    if "deckData" in deck:
+        deck = deck["deckData"]
+    slides = deck.get("slides") or []
+    deck_data = build_render_context(deck)
+    deck_data["slides"] = [slides[i] for i in slide_indexes]
+    return {"deckData": deck_data, "slideIndexes": list(range(len(slide_indexes)))}
+
+
+def render_cache_key(slide: Dict[str, Any], context: Dict[str, Any], debug: bool = False) -> str:
+    """Content hash of a slide together with the deck context it is rendered in."""
+    digest = hashlib.sha256()
+    digest.update(b"debug" if debug else b"plain")
+    digest.update(json.dumps(context, sort_keys=True, separators=(",", ":"), default=_default).encode("utf-8"))
+    digest.update(json.dumps(slide, sort_keys=True, separators=(",", ":"), default=_default).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _strip_data_url(screenshot: str) -> str:
+    if screenshot.startswith(PNG_DATA_URL_PREFIX):
+        return screenshot[len(PNG_DATA_URL_PREFIX):]
+    return screenshot
+
+
+class FrontendRenderError(Exception):
+    """Raised when the render service cannot produce a screenshot."""
+
+
+class FrontendRenderClient:
+    """Pooled, batching, caching client for the frontend render service."""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_RENDER_URL,
+        batch_size: int = 8,
+        timeouts: Sequence[float] = (10, 30, 60),
+        cache_size: int = 512,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.batch_size = max(1, batch_size)
+        self.timeouts = tuple(timeouts)
+        self.cache_size = cache_size
+        # The sync wrapper renders from several threads (one loop each)
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.stats = {"requests": 0, "slides_rendered": 0, "cache_hits": 0, "cache_misses": 0}
+
+    async def __aenter__(self) -> "FrontendRenderClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        """Nothing to release: connections belong to the shared pool."""
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, key: str, value: str) -> None:
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    async def render_slide(self, deck: Dict[str, Any], slide_index: int = 0, debug: bool = False) -> str:
+        """Render one slide and return its base64 PNG (no data URL prefix)."""
+        results = await self.render_slides(deck, [slide_index], debug=debug)
+        return results[slide_index]
+
+    async def render_slides(
+        self,
+        deck: Dict[str, Any],
+        slide_indexes: Optional[Iterable[int]] = None,
+        debug: bool = False,
+    ) -> Dict[int, str]:
+        """
+        Render several slides, batching cache misses into as few requests as possible.
+
+        Returns:
+            Mapping of slide index to base64 PNG
+
+        Raises:
+            FrontendRenderError: if any requested slide could not be rendered
+        """
+        if "deckData" in deck:
+            deck = deck["deckData"]
+        slides = deck.get("slides") or []
+        if slide_indexes is None:
+            slide_indexes = range(len(slides))
+
+        context = build_render_context(deck)
+        results: Dict[int, str] = {}
+        misses: Dict[str, List[int]] = OrderedDict()
+        for index in slide_indexes:
+            if index < 0 or index >= len(slides):
+                raise FrontendRenderError(f"Slide at index {index} does not exist")
+            key = render_cache_key(slides[index], context, debug)
+            cached = self._cache_get(key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                results[index] = cached
+            else:
+                # Identical slides in one deck only need rendering once
+                misses.setdefault(key, []).append(index)
+
+        self.stats["cache_misses"] += len(misses)
+        keys = list(misses.keys())
+        batches = [keys[i:i + self.batch_size] for i in range(0, len(keys), self.batch_size)]
+        rendered = await asyncio.gather(
+            *(self._render_batch(deck, [misses[k][0] for k in batch], debug) for batch in batches)
+        )
+        for batch, screenshots in zip(batches, rendered):
+            for key, screenshot in zip(batch, screenshots):
+                self._cache_put(key, screenshot)
+                for index in misses[key]:
+                    results[index] = screenshot
+        return results
+
+    async def _render_batch(self, deck: Dict[str, Any], slide_indexes: List[int], debug: bool) -> List[str]:
+        payload = build_render_payload(deck, slide_indexes)
+        payload["options"] = {"debug": debug}
+        data = json.dumps(payload, default=_default)
+        session = get_http_session()
+        last_error: Optional[str] = None
+
+        for timeout in self.timeouts:
+            try:
+                self.stats["requests"] += 1
+                async with session.post(
+                    f"{self.base_url}/api/render",
+                    data=data,
+                    headers={"Content-Type": "application/json"},
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                ) as response:
+                    body = await response.json(content_type=None)
+                    if response.status == 200 and body.get("success"):
+                        screenshots = self._extract_screenshots(body, len(slide_indexes))
+                        self.stats["slides_rendered"] += len(screenshots)
+                        return screenshots
+                    error = str((body or {}).get("error", ""))
+                    last_error = f"HTTP {response.status}: {error or body}"
+                    if response.status == 500 and "timeout" in error.lower():
+                        continue
+                    break
+            except asyncio.TimeoutError:
+                last_error = f"Request timed out after {timeout}s"
+                continue
+            except aiohttp.ClientConnectionError as e:
+                last_error = f"Connection error: {e}"
+                break
+            except (aiohttp.ClientError, ValueError) as e:
+                last_error = f"Unexpected error: {e}"
+                break
+
+        raise FrontendRenderError(last_error or "Render failed")
+
+    @staticmethod
+    def _extract_screenshots(body: Dict[str, Any], expected: int) -> List[str]:
+        results = body.get("results") or []
+        if len(results) != expected:
+            raise FrontendRenderError(f"Renderer returned {len(results)} results for {expected} slides")
+        screenshots = []
+        for result in results:
+            screenshot = (result or {}).get("screenshot") or ""
+            if not screenshot:
+                raise FrontendRenderError("Renderer returned an empty screenshot")
+            screenshots.append(_strip_data_url(screenshot))
+        return screenshots
+
+
+_client: Optional[FrontendRenderClient] = None
+_client_lock = threading.Lock()
+
+
+def get_frontend_render_client() -> FrontendRenderClient:
+    """Process-wide client so the screenshot cache is shared."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = FrontendRenderClient()
+    return _client
@@ -0,0 +1,109 @@
+"""
+Offline stand-in for the frontend render service.
+
+Implements the same ``/api/render`` and ``/api/render/{slideIndex}`` contract as
+``ssr/api-server.ts`` but answers with a tiny placeholder PNG instead of driving
+a headless browser. Every request body is recorded so callers can assert on
+what was sent (payload size, slide count, batching).
+
+Run standalone:
+    python -m services.frontend_render_stub --port 3334
+"""
+
+import argparse
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# 1x1 transparent PNG, same placeholder frontend_renderer falls back to
+PLACEHOLDER_PNG = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+class StubRenderServer:
+    """Minimal aiohttp server mimicking the render API."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.requests: List[Dict[str, Any]] = []
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application(client_max_size=256 * 1024 * 1024)
+        self.app.router.add_get("/health", self._health)
+        self.app.router.add_post("/api/render", self._render)
+        self.app.router.add_post("/api/render/{slide_index}", self._render_one)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @staticmethod
+    def _result(slide_index: int) -> Dict[str, Any]:
+        return {"slideIndex": slide_index, "screenshot": f"data:image/png;base64,{PLACEHOLDER_PNG}"}
+
+    async def _record(self, request: web.Request) -> Dict[str, Any]:
+        raw = await request.read()
+        body = json.loads(raw or b"{}")
+        self.requests.append({"path": request.path, "bytes": len(raw), "body": body})
+        return body
+
+    async def _health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", "renderers": 1})
+
+    async def _render(self, request: web.Request) -> web.Response:
+        body = await self._record(request)
+        deck = body.get("deckData")
+        if not deck or not isinstance(deck.get("slides"), list):
+            return web.json_response({"error": "Missing deckData in request body"}, status=400)
+        indexes = body.get("slideIndexes")
+        if indexes is None:
+            indexes = list(range(len(deck["slides"])))
+        return web.json_response({"success": True, "results": [self._result(i) for i in indexes]})
+
+    async def _render_one(self, request: web.Request) -> web.Response:
+        body = await self._record(request)
+        deck = body.get("deckData")
+        index = int(request.match_info["slide_index"])
+        if not deck or index >= len(deck.get("slides") or []):
+            return web.json_response({"error": f"Slide at index {index} does not exist"}, status=400)
+        return web.json_response({"success": True, "result": self._result(index)})
+
+    async def start(self) -> "StubRenderServer":
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Resolve the real port when bound to 0
+        self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"Stub render server listening on {self.base_url}")
+        return self
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "StubRenderServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the stub frontend render service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3334)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(StubRenderServer(args.host, args.port).app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 import requests
 import json
 import base64
+import asyncio
 from typing import Optional
 from datetime import datetime
 
+from services.frontend_render_client import build_render_payload, get_frontend_render_client
+
 
 class CustomJsonEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -27,6 +30,11 @@ def render_deck_to_base64(deck_data: dict, slide_index: int = 0, use_fast_render
     """
     Render a deck slide using the frontend renderer service and return base64 image.
     
+    Only the target slide and the deck-level theme/fonts are sent. Outside an event
+    loop this goes through the shared ``FrontendRenderClient`` (pooled connections,
+    screenshot cache); the per-slide endpoints below are the fallback. Async callers
+    should use the client directly, which also batches.
+    
     Args:
         deck_data: The deck data dictionary
         slide_index: The index of the slide to render (default: 0)
@@ -40,9 +48,18 @@ def render_deck_to_base64(deck_data: dict, slide_index: int = 0, use_fast_render
         Exception: If rendering fails
     """
     try:
-        # Wrap deck data if needed
-        if "deckData" not in deck_data:
-            deck_data = {"deckData": deck_data}
+        asyncio.get_running_loop()
+    except RuntimeError:
+        try:
+            return asyncio.run(get_frontend_render_client().render_slide(deck_data, slide_index, debug=debug))
+        except Exception:
+            pass  # Fall back to the per-slide endpoints
+
+    try:
+        # Send a one-slide deck instead of the whole thing
+        payload = build_render_payload(deck_data, [slide_index])
+        deck_data = {"deckData": payload["deckData"]}
+        target_index = 0
         
         # Try fast render endpoint first if enabled
         if use_fast_render:
@@ -56,7 +73,7 @@ def render_deck_to_base64(deck_data: dict, slide_index: int = 0, use_fast_render
                             "format": "png",
                             "parallel": True,
                             "batchSize": 4,
-                            "slideIndex": slide_index,
+                            "slideIndex": target_index,
                             "debug": debug
                         }
                     }),
@@ -89,7 +106,7 @@ def render_deck_to_base64(deck_data: dict, slide_index: int = 0, use_fast_render
                 request_data["options"]["debug"] = debug
                 
                 response = requests.post(
-                    f"http://localhost:3334/api/render/{slide_index}",
+                    f"http://localhost:3334/api/render/{target_index}",
                     data=safe_json_dumps(request_data),
                     headers={'Content-Type': 'application/json'},
                     timeout=timeout
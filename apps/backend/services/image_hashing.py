@@ -0,0 +1,316 @@
+"""
+Perceptual hashes for search-result images.
+
+``CombinedImageService`` used to tell images apart by URL only, so the same
+stock photo served from another CDN, or at another size, could land on
+several slides of one deck. Here each candidate's thumbnail is fetched over
+the shared HTTP pool and hashed in a worker pool:
+
+- ``phash``: sign of the 8x8 low-frequency DCT block of a 32x32 grayscale
+  copy against its median (robust to rescaling, recompression, small colour
+  shifts);
+- ``dhash``: horizontal gradient signs of a 9x8 grayscale copy, used to
+  confirm a pHash match.
+
+Both are 64-bit ints compared by Hamming distance. ``DeckImageIndex`` keeps a
+deck's selected images as packed uint64 arrays, so a candidate is checked
+against everything already used with one vectorized XOR + popcount (tens of
+microseconds).
+Images whose thumbnail can't be fetched or decoded within
+``IMAGE_HASH_DEADLINE`` just have no hash and fall back to URL identity.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import aiohttp
+import numpy as np
+from PIL import Image
+
+from services.public_share_cache import TTLCache
+from utils.http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+IMAGE_HASH_ENABLED = os.getenv("IMAGE_HASH_ENABLED", "true").lower() == "true"
+# Pillow releases the GIL while decoding and resizing, so threads parallelize
+IMAGE_HASH_WORKERS = int(os.getenv("IMAGE_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# A batch of candidates is hashed within this many seconds; the rest go unhashed
+IMAGE_HASH_DEADLINE = float(os.getenv("IMAGE_HASH_DEADLINE", "3"))
+IMAGE_HASH_FETCH_TIMEOUT = float(os.getenv("IMAGE_HASH_FETCH_TIMEOUT", "2"))
+IMAGE_HASH_MAX_BYTES = int(os.getenv("IMAGE_HASH_MAX_BYTES", str(2 * 1024 * 1024)))
+IMAGE_HASH_CACHE_SIZE = int(os.getenv("IMAGE_HASH_CACHE_SIZE", "4096"))
+# Hamming distances (of 64 bits) at or below which two images are the same picture
+IMAGE_DUPLICATE_PHASH_DISTANCE = int(os.getenv("IMAGE_DUPLICATE_PHASH_DISTANCE", "10"))
+IMAGE_DUPLICATE_DHASH_DISTANCE = int(os.getenv("IMAGE_DUPLICATE_DHASH_DISTANCE", "12"))
+
+_HASH_SIZE = 8
+_PHASH_SIZE = 32
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix: ``C @ x`` transforms the columns of ``x``."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    c = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    c[0] /= np.sqrt(2.0)
+    return c
+
+
+_DCT = _dct_matrix(_PHASH_SIZE)
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _grayscale(image: Image.Image, size: Tuple[int, int]) -> np.ndarray:
+    return np.asarray(image.resize(size, Image.Resampling.BILINEAR), dtype=np.float64)
+
+
+def phash(image: Image.Image) -> int:
+    pixels = _grayscale(image, (_PHASH_SIZE, _PHASH_SIZE))
+    low = (_DCT @ pixels @ _DCT.T)[:_HASH_SIZE, :_HASH_SIZE]
+    # The DC term is overall brightness, not structure
+    median = np.median(low.ravel()[1:])
+    return _bits_to_int(low > median)
+
+
+def dhash(image: Image.Image) -> int:
+    pixels = _grayscale(image, (_HASH_SIZE + 1, _HASH_SIZE))
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+@dataclass(frozen=True)
+class ImageHash:
+    phash: int
+    dhash: int
+
+    def distance(self, other: "ImageHash") -> int:
+        return hamming(self.phash, other.phash)
+
+    def is_duplicate(
+        self,
+        other: "ImageHash",
+        phash_distance: int = IMAGE_DUPLICATE_PHASH_DISTANCE,
+        dhash_distance: int = IMAGE_DUPLICATE_DHASH_DISTANCE,
+    ) -> bool:
+        return (hamming(self.phash, other.phash) <= phash_distance
+                and hamming(self.dhash, other.dhash) <= dhash_distance)
+
+
+def hash_image_bytes(data: bytes) -> Optional[ImageHash]:
+    """Hashes of an encoded image (runs in the worker pool); None if it can't be decoded."""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            # JPEG: decode at a reduced scale, we only need 32x32
+            image.draft("L", (_PHASH_SIZE * 2, _PHASH_SIZE * 2))
+            gray = image.convert("L")
+        return ImageHash(phash=phash(gray), dhash=dhash(gray))
+    except Exception as e:
+        logger.debug(f"[IMAGE HASH] undecodable image: {e}")
+        return None
+
+
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """Set bits per uint64."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _POPCOUNT8[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+class DeckImageIndex:
+    """
+    Images already chosen for one deck, indexed for near-duplicate lookups.
+
+    Hashes live in growable uint64 arrays; a lookup is one XOR + popcount
+    over the whole index. (A BK-tree prunes little at radius ~10 on 64-bit
+    hashes; in pure Python it was slower than a plain scan even at 20k entries.)
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._phash = np.zeros(capacity, dtype=np.uint64)
+        self._dhash = np.zeros(capacity, dtype=np.uint64)
+        self._urls: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def add(self, image_hash: ImageHash, url: str = "") -> None:
+        n = len(self._urls)
+        if n == len(self._phash):
+            self._phash = np.concatenate([self._phash, np.zeros(n, dtype=np.uint64)])
+            self._dhash = np.concatenate([self._dhash, np.zeros(n, dtype=np.uint64)])
+        self._phash[n] = image_hash.phash
+        self._dhash[n] = image_hash.dhash
+        self._urls.append(url)
+
+    def _distances(self, values: np.ndarray, value: int) -> np.ndarray:
+        return _popcount(values[:len(self._urls)] ^ np.uint64(value))
+
+    def find_duplicate(self, image_hash: ImageHash) -> Optional[str]:
+        """URL (or '') of an indexed image that is the same picture, else None."""
+        if not self._urls:
+            return None
+        match = ((self._distances(self._phash, image_hash.phash) <= IMAGE_DUPLICATE_PHASH_DISTANCE)
+                 & (self._distances(self._dhash, image_hash.dhash) <= IMAGE_DUPLICATE_DHASH_DISTANCE))
+        hits = np.flatnonzero(match)
+        return self._urls[hits[0]] if len(hits) else None
+
+    def nearest_distance(self, image_hash: ImageHash) -> int:
+        """pHash distance to the closest indexed image (65 when empty)."""
+        if not self._urls:
+            return 65
+        return int(self._distances(self._phash, image_hash.phash).min())
+
+
+def thumbnail_url(img: Dict[str, Any]) -> Optional[str]:
+    """Smallest rendition of a search result worth hashing."""
+    src = img.get("src")
+    if isinstance(src, dict):
+        for size in ("tiny", "small", "thumbnail", "medium"):
+            if src.get(size):
+                return src[size]
+    url = img.get("thumbnail") or img.get("url") or img.get("original")
+    if not url or not isinstance(url, str) or url.startswith("data:"):
+        return None
+    return url
+
+
+def select_diverse(
+    candidates: Sequence[Tuple[Any, Optional[ImageHash]]],
+    num_images: int,
+    used: Optional[DeckImageIndex] = None,
+    keep_top: int = 0,
+) -> List[Any]:
+    """
+    Pick ``num_images`` candidates that look as different as possible.
+
+    The first ``keep_top`` candidates (most relevant) are always kept; then,
+    greedily, the hashed candidate farthest (pHash) from everything picked
+    and everything in ``used``, earlier ranks winning ties. Unhashed
+    candidates fill any remaining slots in rank order.
+    """
+    picked = list(candidates[:min(keep_top, num_images)])
+    rest = [c for c in candidates[len(picked):] if c[1] is not None]
+    unhashed = [c for c in candidates[len(picked):] if c[1] is None]
+    picked_hashes = [h for _, h in picked if h is not None]
+
+    def score(h: ImageHash) -> int:
+        nearest = min((h.distance(p) for p in picked_hashes), default=65)
+        if used is not None:
+            nearest = min(nearest, used.nearest_distance(h))
+        return nearest
+
+    while rest and len(picked) < num_images:
+        best = max(range(len(rest)), key=lambda i: (score(rest[i][1]), -i))
+        item = rest.pop(best)
+        picked.append(item)
+        picked_hashes.append(item[1])
+    picked.extend(unhashed[:num_images - len(picked)])
+    return [item for item, _ in picked]
+
+
+class ImageHasher:
+    """Fetches thumbnails and hashes them in a thread pool, caching hashes by URL."""
+
+    def __init__(self, workers: int = IMAGE_HASH_WORKERS, cache_size: int = IMAGE_HASH_CACHE_SIZE):
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="image-hash")
+        self._cache = TTLCache(cache_size)
+        self.hashed = 0
+        self.failed = 0
+        self.timed_out = 0
+
+    async def _fetch(self, url: str) -> Optional[bytes]:
+        session = get_http_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=IMAGE_HASH_FETCH_TIMEOUT)) as response:
+            if response.status != 200:
+                return None
+            if (response.content_length or 0) > IMAGE_HASH_MAX_BYTES:
+                return None
+            data = await response.content.read(IMAGE_HASH_MAX_BYTES + 1)
+            return data if len(data) <= IMAGE_HASH_MAX_BYTES else None
+
+    async def hash_url(self, url: str) -> Optional[ImageHash]:
+        cached = self._cache.get(url)
+        if cached is not None:
+            return cached
+        try:
+            data = await self._fetch(url)
+        except Exception as e:
+            logger.debug(f"[IMAGE HASH] fetch failed for {url[:80]}: {e}")
+            data = None
+        image_hash = None
+        if data:
+            image_hash = await asyncio.get_running_loop().run_in_executor(self._pool, hash_image_bytes, data)
+        if image_hash is None:
+            self.failed += 1
+            return None
+        self.hashed += 1
+        self._cache.set(url, image_hash)
+        return image_hash
+
+    async def hash_images(
+        self, images: Iterable[Dict[str, Any]], deadline: float = IMAGE_HASH_DEADLINE
+    ) -> List[Optional[ImageHash]]:
+        """Hash per image (same order); None where there's no thumbnail, it failed, or the deadline passed."""
+        images = list(images)
+        urls = [thumbnail_url(img) for img in images]
+        tasks = {
+            url: asyncio.create_task(self.hash_url(url))
+            for url in dict.fromkeys(u for u in urls if u)
+        }
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+            for task in pending:
+                task.cancel()
+            self.timed_out += len(pending)
+        return [
+            tasks[url].result() if url and tasks[url].done() and not tasks[url].cancelled() else None
+            for url in urls
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hashed": self.hashed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "cache": self._cache.stats(),
+        }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_hasher: Optional[ImageHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_image_hasher() -> ImageHasher:
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = ImageHasher()
+    return _hasher
+
+
+def shutdown_image_hasher() -> None:
+    global _hasher
+    with _hasher_lock:
+        if _hasher is not None:
+            _hasher.shutdown()
+            _hasher = None
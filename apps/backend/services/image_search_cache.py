@@ -0,0 +1,340 @@
+"""
+Shared image-search result cache.
+
+``SerpAPIService``, ``PerplexityImageService`` and ``PexelsService`` answer
+``search_images`` through ``get_image_search_cache().get_or_fetch``. Stock
+topics ("team collaboration", "growth chart") recur across users and decks,
+and each service instance / worker used to start cold. Two tiers:
+
+- an in-process LRU (``IMAGE_SEARCH_CACHE_MEMORY_SIZE`` entries);
+- a SQLite file (``IMAGE_SEARCH_CACHE_PATH``) shared by every worker on the
+  host, opened per call like the job queue.
+
+Entries are keyed by provider + normalized query + search filters; a result
+fetched for ``per_page=30`` also serves requests for fewer images. Each
+provider has its own TTL (``IMAGE_SEARCH_CACHE_TTLS="serpapi=86400,..."``).
+For ``IMAGE_SEARCH_CACHE_MAX_STALE`` seconds past its TTL an entry is still
+served while one background fetch refreshes it (stale-while-revalidate).
+Concurrent misses for the same key share one provider call when the fetch in
+flight asked for at least as many images. The call runs as its own task, so a
+caller that is cancelled (e.g. by ``wait_for``) doesn't cancel it for the
+others. Single-flight is per event loop: callers on another loop (sync code
+using ``asyncio.run``) never join a task bound to a different loop. Empty results
+(no images, provider errors) are not cached.
+
+Results carry ``cache``: 'hit', 'stale', 'shared' (joined an in-flight
+fetch) or 'miss', so callers can count the searches that actually reached a
+provider.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from agents.config import CACHE_DIR
+from services.public_share_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+IMAGE_SEARCH_CACHE_PATH = os.getenv("IMAGE_SEARCH_CACHE_PATH", os.path.join(CACHE_DIR, "image_search_cache.sqlite3"))
+IMAGE_SEARCH_CACHE_MEMORY_SIZE = int(os.getenv("IMAGE_SEARCH_CACHE_MEMORY_SIZE", "512"))
+IMAGE_SEARCH_CACHE_MAX_STALE = float(os.getenv("IMAGE_SEARCH_CACHE_MAX_STALE", "604800"))
+# Rows past TTL + max stale are purged every this many writes
+IMAGE_SEARCH_CACHE_PURGE_EVERY = int(os.getenv("IMAGE_SEARCH_CACHE_PURGE_EVERY", "200"))
+
+DEFAULT_TTLS = {
+    'serpapi': 86400.0,
+    'perplexity': 21600.0,
+    'pexels': 604800.0,
+}
+DEFAULT_TTL = 3600.0
+
+
+def _load_ttls() -> Dict[str, float]:
+    ttls = dict(DEFAULT_TTLS)
+    for item in os.getenv("IMAGE_SEARCH_CACHE_TTLS", "").split(","):
+        provider, _, value = item.partition("=")
+        try:
+            ttls[provider.strip().lower()] = float(value)
+        except ValueError:
+            continue
+    return ttls
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS image_search_cache (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    query TEXT NOT NULL,
+    per_page INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_image_search_cache_stored ON image_search_cache (provider, stored_at);
+"""
+
+_SPACE_RE = re.compile(r"\s+")
+
+# (stored_at, per_page, result)
+Entry = Tuple[float, int, Dict[str, Any]]
+
+
+def normalize_query(query: str) -> str:
+    return _SPACE_RE.sub(" ", (query or "").strip().lower())
+
+
+def cache_key(provider: str, query: str, **filters: Any) -> str:
+    """Key for a provider + normalized query + the filters that change results (not page size)."""
+    filters = {name: value for name, value in filters.items() if value is not None}
+    raw = json.dumps([provider, normalize_query(query), filters], sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ImageSearchCache:
+    """In-process LRU over a SQLite store shared by the host's workers."""
+
+    def __init__(
+        self,
+        path: Optional[str] = IMAGE_SEARCH_CACHE_PATH,
+        memory_size: int = IMAGE_SEARCH_CACHE_MEMORY_SIZE,
+        ttls: Optional[Dict[str, float]] = None,
+        max_stale: float = IMAGE_SEARCH_CACHE_MAX_STALE,
+    ):
+        self.path = path
+        self.ttls = ttls if ttls is not None else _load_ttls()
+        self.max_stale = max_stale
+        self._memory = TTLCache(memory_size)
+        # key -> (per_page, task) of the provider call in flight
+        self._inflight: Dict[str, Tuple[int, "asyncio.Task[Dict[str, Any]]"]] = {}
+        self._revalidating: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+        self._writes = 0
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with self._connect() as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+            except sqlite3.Error as e:
+                logger.warning(f"[IMAGE CACHE] shared store at {path} unavailable, memory only: {e}")
+                self.path = None
+
+    def ttl(self, provider: str) -> float:
+        return self.ttls.get(provider, DEFAULT_TTL)
+
+    # --- SQLite tier (blocking; called through asyncio.to_thread) ----------------
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _load(self, key: str) -> Optional[Entry]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT stored_at, per_page, value FROM image_search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def _store(self, key: str, provider: str, query: str, entry: Entry) -> None:
+        stored_at, per_page, result = entry
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO image_search_cache (key, provider, query, per_page, value, stored_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, normalize_query(query), per_page, json.dumps(result, default=str), stored_at),
+            )
+            self._writes += 1
+            if self._writes % IMAGE_SEARCH_CACHE_PURGE_EVERY == 0:
+                self._purge(conn)
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        now = time.time()
+        for provider, ttl in self.ttls.items():
+            conn.execute(
+                "DELETE FROM image_search_cache WHERE provider = ? AND stored_at < ?",
+                (provider, now - ttl - self.max_stale),
+            )
+        if self.ttls:
+            conn.execute(
+                "DELETE FROM image_search_cache WHERE provider NOT IN (%s) AND stored_at < ?" % ",".join("?" * len(self.ttls)),
+                (*self.ttls, now - DEFAULT_TTL - self.max_stale),
+            )
+
+    # --- Lookup ---------------------------------------------------------------
+
+    def _count(self, provider: str, outcome: str) -> None:
+        with self._stats_lock:
+            counts = self._stats.setdefault(provider, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    async def _lookup(self, key: str) -> Optional[Entry]:
+        entry = self._memory.get(key)
+        if entry is not None or not self.path:
+            return entry
+        try:
+            entry = await asyncio.to_thread(self._load, key)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"[IMAGE CACHE] shared store read failed: {e}")
+            return None
+        if entry is not None:
+            self._memory.set(key, entry)
+        return entry
+
+    async def _save(self, key: str, provider: str, query: str, per_page: int, result: Dict[str, Any]) -> None:
+        entry = (time.time(), per_page, result)
+        self._memory.set(key, entry)
+        if self.path:
+            try:
+                await asyncio.to_thread(self._store, key, provider, query, entry)
+            except sqlite3.Error as e:
+                logger.warning(f"[IMAGE CACHE] shared store write failed: {e}")
+
+    def _joinable(self, key: str, per_page: int) -> "Optional[asyncio.Task[Dict[str, Any]]]":
+        """The in-flight call for ``key`` if it fetches enough images and runs on this loop."""
+        pending = self._inflight.get(key)
+        if pending is None or pending[0] < per_page or pending[1].get_loop() is not asyncio.get_running_loop():
+            return None
+        return pending[1]
+
+    async def _call_provider(
+        self, key: str, provider: str, query: str, per_page: int,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        started = time.time()
+        result = await fetch()
+        stored = self._memory.get(key)
+        # Don't replace a larger result stored while this call was running
+        superseded = stored is not None and stored[0] >= started and stored[1] > per_page
+        if result and result.get("photos") and not superseded:
+            await self._save(key, provider, query, per_page, result)
+        return result
+
+    def _call_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key, (0, None))[1] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Waiters re-raise it; don't warn about an unretrieved exception
+            task.exception()
+
+    async def _fetch(
+        self, key: str, provider: str, query: str, per_page: int,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        One provider call per key at a time; concurrent callers await the same result.
+
+        A caller wanting more images than the call in flight makes its own call,
+        which later callers join instead. Every caller, the starting one included,
+        awaits the call through ``shield``: cancelling a caller leaves it running.
+        """
+        task = self._joinable(key, per_page)
+        if task is not None:
+            result = await asyncio.shield(task)
+            return {**result, "photos": result.get("photos", [])[:per_page]} if result else result
+        task = asyncio.ensure_future(self._call_provider(key, provider, query, per_page, fetch))
+        pending = self._inflight.get(key)
+        if pending is None or pending[1].get_loop() is task.get_loop() or pending[1].done():
+            self._inflight[key] = (per_page, task)
+        task.add_done_callback(functools.partial(self._call_done, key))
+        return await asyncio.shield(task)
+
+    def _revalidate(
+        self, key: str, provider: str, query: str, per_page: int,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> None:
+        if key in self._revalidating or self._joinable(key, per_page) is not None:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._fetch(key, provider, query, per_page, fetch)
+                self._count(provider, "revalidated")
+            except Exception as e:
+                logger.warning(f"[IMAGE CACHE] revalidation of {provider} '{query}' failed: {e}")
+            finally:
+                self._revalidating.pop(key, None)
+
+        self._revalidating[key] = asyncio.create_task(refresh())
+
+    async def get_or_fetch(
+        self,
+        provider: str,
+        query: str,
+        per_page: int,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        **filters: Any,
+    ) -> Dict[str, Any]:
+        """
+        Cached provider search result.
+
+        Args:
+            provider: 'serpapi', 'perplexity', 'pexels', ...
+            query: Search query (normalized for the key)
+            per_page: Images wanted; served from any entry fetched with at least as many
+            fetch: Performs the uncached search, returning {'photos': [...], 'total_results': n}
+            **filters: Other parameters that change the results (page, orientation, color, ...)
+        """
+        key = cache_key(provider, query, **filters)
+        entry = await self._lookup(key)
+        if entry is not None:
+            stored_at, cached_per_page, result = entry
+            age = time.time() - stored_at
+            ttl = self.ttl(provider)
+            if cached_per_page >= per_page and age <= ttl + self.max_stale:
+                if age > ttl:
+                    self._count(provider, "stale")
+                    self._revalidate(key, provider, query, cached_per_page, fetch)
+                    outcome = "stale"
+                else:
+                    self._count(provider, "hit")
+                    outcome = "hit"
+                return {**result, "photos": result.get("photos", [])[:per_page], "cache": outcome}
+
+        # Joining a fetch already in flight (for at least as many images) costs no provider call
+        outcome = "shared" if self._joinable(key, per_page) is not None else "miss"
+        self._count(provider, outcome)
+        result = await self._fetch(key, provider, query, per_page, fetch)
+        return {**(result or {"photos": [], "total_results": 0}), "cache": outcome}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            providers = {}
+            for provider, counts in self._stats.items():
+                served = counts.get("hit", 0) + counts.get("stale", 0) + counts.get("shared", 0)
+                lookups = served + counts.get("miss", 0)
+                providers[provider] = {**counts, "hit_rate": round(served / lookups, 3) if lookups else 0.0}
+        return {
+            "path": self.path,
+            "memory": self._memory.stats(),
+            "providers": providers,
+            "revalidating": len(self._revalidating),
+        }
+
+
+_cache: Optional[ImageSearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_image_search_cache() -> ImageSearchCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ImageSearchCache()
+    return _cache
@@ -0,0 +1,224 @@
+"""
+Deck-level image search planning.
+
+``CombinedImageService`` used to extract topics per slide and run one
+provider search per distinct topic string, so "Pikachu battles" on one slide
+and "pikachu battle" on another cost two near-identical SerpAPI/Perplexity
+calls (the result cache only matches exact keys). The planner works on the
+whole deck instead:
+
+- ``normalize_topic``: lowercase word tokens, stop/vague words dropped,
+  plural ``s`` stripped, order ignored;
+- ``plan_image_searches``: topics whose token sets are equal, or overlap by
+  at least ``IMAGE_TOPIC_SIMILARITY`` (Jaccard), form one cluster and one
+  query, the phrasing most slides asked for;
+- ``execute_plan``: runs the queries with at most ``IMAGE_SEARCH_CONCURRENCY``
+  in flight;
+- ``assign_images``: gives each slide sharing a query its own share of the
+  results first, so slides don't lead with the same pictures.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+IMAGE_SEARCH_CONCURRENCY = int(os.getenv("IMAGE_SEARCH_CONCURRENCY", "4"))
+IMAGE_TOPIC_SIMILARITY = float(os.getenv("IMAGE_TOPIC_SIMILARITY", "0.8"))
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+
+
+def _singular(token: str) -> str:
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def normalize_topic(topic: str, ignore: Iterable[str] = ()) -> FrozenSet[str]:
+    """Order-insensitive token set identifying what a topic searches for."""
+    ignore = set(ignore)
+    return frozenset(
+        _singular(token.strip("'-")) for token in _WORD_RE.findall((topic or '').lower())
+        if token not in ignore and token.strip("'-")
+    )
+
+
+@dataclass
+class SearchCluster:
+    query: str
+    tokens: FrozenSet[str]
+    topics: List[str] = field(default_factory=list)
+    slide_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ImageSearchPlan:
+    clusters: List[SearchCluster]
+    # slide id -> queries (cluster representatives) in the slide's topic order
+    slide_queries: Dict[str, List[str]]
+    topics_requested: int
+
+    @property
+    def queries(self) -> List[str]:
+        return [cluster.query for cluster in self.clusters]
+
+    def slides_for(self, query: str) -> List[str]:
+        for cluster in self.clusters:
+            if cluster.query == query:
+                return cluster.slide_ids
+        return []
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'topics_requested': self.topics_requested,
+            'queries_planned': len(self.clusters),
+            'slides': len(self.slide_queries),
+        }
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def plan_image_searches(
+    slide_topics: Dict[str, Sequence[str]],
+    ignore: Iterable[str] = (),
+    similarity: float = IMAGE_TOPIC_SIMILARITY,
+) -> ImageSearchPlan:
+    """
+    Cluster the topics of every slide into one search query per cluster.
+
+    Args:
+        slide_topics: slide id -> topics, in slide order
+        ignore: Words that don't distinguish topics (stop words, vague terms)
+        similarity: Minimum Jaccard overlap of token sets to share a query
+    """
+    ignore = frozenset(ignore)
+    clusters: List[SearchCluster] = []
+    by_tokens: Dict[FrozenSet[str], SearchCluster] = {}
+    topic_cluster: Dict[Tuple[str, str], SearchCluster] = {}
+    requested = 0
+
+    for slide_id, topics in slide_topics.items():
+        for topic in topics:
+            requested += 1
+            tokens = normalize_topic(topic, ignore)
+            if not tokens:
+                continue
+            cluster = by_tokens.get(tokens)
+            if cluster is None and similarity < 1.0:
+                cluster = next((c for c in clusters if _jaccard(c.tokens, tokens) >= similarity), None)
+            if cluster is None:
+                cluster = SearchCluster(query=topic.strip(), tokens=tokens)
+                clusters.append(cluster)
+            by_tokens.setdefault(tokens, cluster)
+            cluster.topics.append(topic.strip())
+            if slide_id not in cluster.slide_ids:
+                cluster.slide_ids.append(slide_id)
+            topic_cluster[(slide_id, topic)] = cluster
+
+    # The phrasing asked for most often (first seen on ties) is the query
+    for cluster in clusters:
+        counts: Dict[str, int] = {}
+        for topic in cluster.topics:
+            counts[topic] = counts.get(topic, 0) + 1
+        cluster.query = max(counts, key=counts.get)
+
+    slide_queries: Dict[str, List[str]] = {}
+    for slide_id, topics in slide_topics.items():
+        queries = list(dict.fromkeys(
+            topic_cluster[(slide_id, topic)].query for topic in topics if (slide_id, topic) in topic_cluster
+        ))
+        if queries:
+            slide_queries[slide_id] = queries
+
+    plan = ImageSearchPlan(clusters=clusters, slide_queries=slide_queries, topics_requested=requested)
+    logger.info(f"[IMAGE PLAN] {requested} slide topics -> {len(clusters)} queries for {len(slide_queries)} slides")
+    return plan
+
+
+def execute_plan(
+    plan: ImageSearchPlan,
+    search: Callable[[str, int], Awaitable[List[Dict[str, Any]]]],
+    images_for: Callable[[int], int],
+    concurrency: int = IMAGE_SEARCH_CONCURRENCY,
+) -> List["asyncio.Task[Tuple[str, List[Dict[str, Any]]]]"]:
+    """
+    Start one search per planned query (as tasks on the running loop), at most ``concurrency`` at a time.
+
+    Args:
+        search: ``search(query, num_images)`` -> images
+        images_for: Number of images to request given how many slides share the query
+
+    Returns:
+        Tasks resolving to (query, images); failures resolve to (query, [])
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(cluster: SearchCluster) -> Tuple[str, List[Dict[str, Any]]]:
+        async with semaphore:
+            try:
+                return cluster.query, await search(cluster.query, images_for(len(cluster.slide_ids))) or []
+            except Exception as e:
+                logger.error(f"[IMAGE PLAN] search for '{cluster.query}' failed: {e}")
+                return cluster.query, []
+
+    return [asyncio.create_task(run(cluster)) for cluster in plan.clusters]
+
+
+def _image_key(img: Dict[str, Any]) -> Optional[str]:
+    return img.get('id') or img.get('url')
+
+
+def assign_images(
+    plan: ImageSearchPlan,
+    results: Dict[str, List[Dict[str, Any]]],
+    max_per_slide: Optional[int] = None,
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """
+    Distribute query results to slides: slide id -> {query: images}.
+
+    Each slide sharing a query first claims up to its share
+    (ceil(len(images) / slides)) of images no other slide has claimed; the
+    remaining images follow as extra options. No image appears twice on one
+    slide, and ``max_per_slide`` caps each slide's total.
+    """
+    claimed: set = set()
+    shares = {
+        cluster.query: math.ceil(len(results.get(cluster.query) or ()) / len(cluster.slide_ids))
+        for cluster in plan.clusters if cluster.slide_ids
+    }
+    assigned: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for slide_id, queries in plan.slide_queries.items():
+        seen: set = set()
+        taken = 0
+        by_query: Dict[str, List[Dict[str, Any]]] = {}
+        for query in queries:
+            images = results.get(query) or []
+            own, shared = [], []
+            for img in images:
+                key = _image_key(img)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if key not in claimed and len(own) < shares.get(query, 0):
+                    own.append(img)
+                else:
+                    shared.append(img)
+            picked = own + shared
+            if max_per_slide is not None:
+                picked = picked[:max(0, max_per_slide - taken)]
+            taken += len(picked)
+            claimed.update(_image_key(img) for img in picked[:len(own)])
+            if picked:
+                by_query[query] = picked
+        assigned[slide_id] = by_query
+    return assigned
@@ -7,6 +7,8 @@ from urllib.parse import urlparse
 import mimetypes
 import logging
 from utils.supabase import get_supabase_client
+from utils.http_client import get_http_session
+from agents.generation.tracing import traced
 import base64
 from io import BytesIO
 
@@ -19,29 +21,19 @@ class ImageStorageService:
         """Initialize the image storage service."""
         self.supabase = get_supabase_client()
         self.bucket_name = "slide-media"
-        self.session = None
         self._cache = {}  # URL -> Supabase URL cache
-        self._session_owner = False  # Track if we created the session
         
     async def __aenter__(self):
         """Async context manager entry."""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            self._session_owner = True
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session and self._session_owner:
-            await self.session.close()
-            self.session = None
+        pass
             
     def _get_session(self):
-        """Get or create aiohttp session."""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            self._session_owner = True
-        return self.session
+        """Shared pooled HTTP session (see utils.http_client); not owned by this service."""
+        return get_http_session()
             
     def _truncate_data_url(self, url: str) -> str:
         """Truncate data URLs for logging to avoid huge base64 strings."""
@@ -70,6 +62,7 @@ class ImageStorageService:
         # Organize by first 2 chars of hash for better bucket organization
         return f"images/{url_hash[:2]}/{url_hash}{ext}"
     
+    @traced("image.upload")
     async def upload_image_from_url(self, image_url: str, metadata: Optional[Dict[str, Any]] = None, headers_override: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         Upload an image from a URL to Supabase storage.
@@ -308,8 +301,5 @@ class ImageStorageService:
         return url_mapping 
     
     async def cleanup(self):
-        """Clean up resources."""
-        if self.session and not self.session.closed:
-            await self.session.close()
-            self.session = None
-            self._session_owner = False 
\ No newline at end of file
+        """Clean up resources (HTTP connections are pooled process-wide and closed at shutdown)."""
+        pass 
\ No newline at end of file
@@ -4,11 +4,19 @@ Image validation service to check if images are accessible and not behind Cloudf
 
 import aiohttp
 import asyncio
+import os
 from typing import Dict, Any, List, Optional
 import logging
 
+from utils.http_client import get_http_session
+
 logger = logging.getLogger(__name__)
 
+# Checks run concurrently over the shared connection pool (per-host limits apply)
+IMAGE_VALIDATION_CONCURRENCY = int(os.getenv("IMAGE_VALIDATION_CONCURRENCY", "16"))
+# A batch answers within this many seconds; URLs not checked by then count as invalid
+IMAGE_VALIDATION_DEADLINE = float(os.getenv("IMAGE_VALIDATION_DEADLINE", "8"))
+
 class ImageValidator:
     """Validates that images are accessible and not behind protection."""
     
@@ -43,71 +51,71 @@ class ImageValidator:
             - headers: dict - Response headers (for debugging)
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.head(
-                    url, 
-                    headers=ImageValidator.BROWSER_HEADERS,
-                    timeout=aiohttp.ClientTimeout(total=timeout),
-                    allow_redirects=True
-                ) as response:
-                    
-                    # Check for Cloudflare protection
-                    response_headers = {k.lower(): v for k, v in response.headers.items()}
-                    
-                    # Check if Cloudflare headers are present
-                    has_cloudflare = any(
-                        cf_header in response_headers 
-                        for cf_header in ImageValidator.CLOUDFLARE_HEADERS
-                    )
-                    
-                    # Check for Cloudflare challenge page
-                    if response.status in ImageValidator.CLOUDFLARE_STATUS_CODES and has_cloudflare:
-                        return {
-                            'valid': False,
-                            'reason': 'Cloudflare protection detected',
-                            'status': response.status,
-                            'headers': dict(response_headers)
-                        }
-                    
-                    # Check for other access issues
-                    if response.status == 403:
-                        return {
-                            'valid': False,
-                            'reason': 'Access forbidden',
-                            'status': response.status
-                        }
-                    
-                    if response.status == 404:
-                        return {
-                            'valid': False,
-                            'reason': 'Image not found',
-                            'status': response.status
-                        }
-                    
-                    # Check if it's actually an image
-                    content_type = response_headers.get('content-type', '')
-                    if response.status == 200 and not content_type.startswith('image/'):
-                        return {
-                            'valid': False,
-                            'reason': f'Not an image (content-type: {content_type})',
-                            'status': response.status
-                        }
-                    
-                    # Image seems accessible
-                    if response.status == 200:
-                        return {
-                            'valid': True,
-                            'reason': 'Image accessible',
-                            'status': response.status
-                        }
-                    
-                    # Other status codes
+            session = get_http_session()
+            async with session.head(
+                url, 
+                headers=ImageValidator.BROWSER_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                allow_redirects=True
+            ) as response:
+                
+                # Check for Cloudflare protection
+                response_headers = {k.lower(): v for k, v in response.headers.items()}
+                
+                # Check if Cloudflare headers are present
+                has_cloudflare = any(
+                    cf_header in response_headers 
+                    for cf_header in ImageValidator.CLOUDFLARE_HEADERS
+                )
+                
+                # Check for Cloudflare challenge page
+                if response.status in ImageValidator.CLOUDFLARE_STATUS_CODES and has_cloudflare:
+                    return {
+                        'valid': False,
+                        'reason': 'Cloudflare protection detected',
+                        'status': response.status,
+                        'headers': dict(response_headers)
+                    }
+                
+                # Check for other access issues
+                if response.status == 403:
                     return {
                         'valid': False,
-                        'reason': f'HTTP {response.status}',
+                        'reason': 'Access forbidden',
                         'status': response.status
                     }
-                    
+                
+                if response.status == 404:
+                    return {
+                        'valid': False,
+                        'reason': 'Image not found',
+                        'status': response.status
+                    }
+                
+                # Check if it's actually an image
+                content_type = response_headers.get('content-type', '')
+                if response.status == 200 and not content_type.startswith('image/'):
+                    return {
+                        'valid': False,
+                        'reason': f'Not an image (content-type: {content_type})',
+                        'status': response.status
+                    }
+                
+                # Image seems accessible
+                if response.status == 200:
+                    return {
+                        'valid': True,
+                        'reason': 'Image accessible',
+                        'status': response.status
+                    }
+                
+                # Other status codes
+                return {
+                    'valid': False,
+                    'reason': f'HTTP {response.status}',
+                    'status': response.status
+                }
+                
         except asyncio.TimeoutError:
             return {
                 'valid': False,
@@ -125,32 +133,60 @@ class ImageValidator:
             }
     
     @staticmethod
-    async def validate_images(urls: List[str], max_concurrent: int = 5) -> Dict[str, Dict[str, Any]]:
+    async def validate_images(
+        urls: List[str],
+        max_concurrent: int = IMAGE_VALIDATION_CONCURRENCY,
+        deadline: Optional[float] = IMAGE_VALIDATION_DEADLINE,
+        timeout: int = 5
+    ) -> Dict[str, Dict[str, Any]]:
         """
-        Validates multiple image URLs concurrently.
+        Validates multiple image URLs concurrently over the shared connection pool.
+        
+        Args:
+            urls: URLs to check (duplicates are checked once)
+            max_concurrent: Maximum checks in flight
+            deadline: Seconds for the whole batch; URLs still unchecked then are
+                reported invalid ('Validation deadline exceeded'). None waits for all.
+            timeout: Per-URL request timeout
         
         Returns:
             Dict mapping URL to validation result
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
         
-        async def validate_with_semaphore(url: str) -> tuple[str, Dict[str, Any]]:
+        async def validate_with_semaphore(url: str) -> Dict[str, Any]:
             async with semaphore:
-                result = await ImageValidator.validate_image(url)
-                return url, result
+                return await ImageValidator.validate_image(url, timeout=timeout)
         
-        tasks = [validate_with_semaphore(url) for url in urls]
-        results = await asyncio.gather(*tasks)
+        tasks = {url: asyncio.create_task(validate_with_semaphore(url)) for url in unique_urls}
+        _done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.info(f"Image validation deadline ({deadline}s): {len(pending)}/{len(tasks)} URLs unchecked")
         
-        return dict(results)
+        results = {}
+        for url, task in tasks.items():
+            if task in pending:
+                results[url] = {'valid': False, 'reason': 'Validation deadline exceeded'}
+            else:
+                results[url] = task.result()
+        return results
     
     @staticmethod
-    async def filter_valid_images(images: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def filter_valid_images(
+        images: List[Dict[str, Any]],
+        deadline: Optional[float] = IMAGE_VALIDATION_DEADLINE
+    ) -> List[Dict[str, Any]]:
         """
         Filters a list of image dictionaries to only include accessible images.
         
         Args:
             images: List of image dicts with 'url' field
+            deadline: Seconds to spend validating (see ``validate_images``)
             
         Returns:
             List of valid images
@@ -163,7 +199,7 @@ class ImageValidator:
         urls = [url for url in urls if url]  # Filter out empty URLs
         
         # Validate all URLs
-        validation_results = await ImageValidator.validate_images(urls)
+        validation_results = await ImageValidator.validate_images(urls, deadline=deadline)
         
         # Filter images
         valid_images = []
@@ -0,0 +1,67 @@
+"""Durable background jobs (imports/exports) executed outside the API event loop.
+
+Usage:
+    runner = get_job_runner()
+    job_id = await runner.submit("IMPORT_PPTX", {"path": ...}, user_id=user_id)
+
+Worker-only deployment:
+    python -m services.jobs.worker
+"""
+
+import os
+from typing import Optional
+
+from agents.config import APP_DATA_DIR
+
+from .queue import JobQueue, JobRecord, JobState, SQLiteJobQueue, open_queue
+from .runner import (
+    JobContext,
+    JobError,
+    JobRunner,
+    JobTypeConfig,
+    PermanentJobError,
+    get_job_types,
+    register_job_type,
+    stream_job_progress,
+)
+
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", os.path.join(APP_DATA_DIR, "jobs.sqlite3"))
+# Set to "false" on API instances when jobs are run by a dedicated worker service
+JOB_RUNNER_EMBEDDED = os.getenv("JOB_RUNNER_EMBEDDED", "true").lower() == "true"
+
+_queue: Optional[JobQueue] = None
+_runner: Optional[JobRunner] = None
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+    if _queue is None:
+        _queue = SQLiteJobQueue(JOB_QUEUE_PATH)
+    return _queue
+
+
+def get_job_runner() -> JobRunner:
+    global _runner
+    if _runner is None:
+        _runner = JobRunner(get_job_queue())
+    return _runner
+
+
+__all__ = [
+    "JobQueue",
+    "JobRecord",
+    "JobState",
+    "SQLiteJobQueue",
+    "open_queue",
+    "JobContext",
+    "JobError",
+    "JobRunner",
+    "JobTypeConfig",
+    "PermanentJobError",
+    "get_job_types",
+    "register_job_type",
+    "stream_job_progress",
+    "get_job_queue",
+    "get_job_runner",
+    "JOB_RUNNER_EMBEDDED",
+]
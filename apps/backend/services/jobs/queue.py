@@ -0,0 +1,331 @@
+"""
+Durable job queue backends.
+
+``JobQueue`` is the interface the runner talks to; ``SQLiteJobQueue`` is the
+local implementation. Jobs survive process restarts: a worker claims a job by
+taking a time-limited lease, renews it with heartbeats while running, and any
+job whose lease expires (worker crashed / restarted) is picked up again until
+it runs out of attempts.
+
+All methods are synchronous; async callers should wrap them in
+``asyncio.to_thread``. SQLite connections are opened per call so the same
+queue file can be shared by the API process and worker processes.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+
+class JobState:
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+    TERMINAL = (SUCCEEDED, FAILED)
+
+
+@dataclass
+class JobRecord:
+    id: str
+    type: str
+    status: str
+    payload: Dict[str, Any]
+    user_id: Optional[str] = None
+    attempts: int = 0
+    max_attempts: int = 3
+    progress: float = 0.0
+    progress_message: Optional[str] = None
+    progress_seq: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+    available_at: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in JobState.TERMINAL
+
+    def to_status_dict(self) -> Dict[str, Any]:
+        """Shape returned by the /jobs endpoints."""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.progress_message,
+            "attempts": self.attempts,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue(ABC):
+    """Interface for pluggable queue backends."""
+
+    @abstractmethod
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        max_attempts: int = 3,
+        job_id: Optional[str] = None,
+    ) -> str:
+        ...
+
+    @abstractmethod
+    def claim(self, owner: str, job_types: Iterable[str], lease_seconds: float) -> Optional[JobRecord]:
+        """Atomically lease the oldest runnable job of one of ``job_types``."""
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend a lease; returns False if the lease was lost."""
+
+    @abstractmethod
+    def report_progress(self, job_id: str, progress: float, message: Optional[str] = None) -> None:
+        ...
+
+    @abstractmethod
+    def complete(self, job_id: str, owner: str, result: Optional[Dict[str, Any]]) -> bool:
+        ...
+
+    @abstractmethod
+    def fail(self, job_id: str, owner: str, error: str, retry_delay: Optional[float] = None) -> str:
+        """Record a failed attempt; requeue after ``retry_delay`` if attempts remain. Returns new status."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        ...
+
+    @abstractmethod
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Job counts by type and status."""
+
+    @abstractmethod
+    def spec(self) -> Dict[str, Any]:
+        """Picklable description used to reopen the queue in a worker process (see ``open_queue``)."""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    user_id TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    progress REAL NOT NULL DEFAULT 0,
+    progress_message TEXT,
+    progress_seq INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    available_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_runnable ON jobs (status, type, available_at);
+"""
+
+
+class SQLiteJobQueue(JobQueue):
+    """Single-file SQLite queue; a local stand-in for a shared broker."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def spec(self) -> Dict[str, Any]:
+        return {"backend": "sqlite", "path": self.path}
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit mode; multi-statement updates use explicit BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> JobRecord:
+        data = dict(row)
+        data["payload"] = json.loads(data["payload"]) if data["payload"] else {}
+        data["result"] = json.loads(data["result"]) if data["result"] else None
+        return JobRecord(**data)
+
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        max_attempts: int = 3,
+        job_id: Optional[str] = None,
+    ) -> str:
+        job_id = job_id or str(uuid.uuid4())
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, type, status, payload, user_id, max_attempts, available_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, job_type, JobState.QUEUED, json.dumps(payload, default=str), user_id,
+                 max_attempts, now, now, now),
+            )
+        return job_id
+
+    def _reap_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        """Requeue (or fail) RUNNING jobs whose worker stopped heartbeating."""
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = 'Lease expired after final attempt', lease_owner = NULL,"
+            " lease_expires_at = NULL, finished_at = ?, updated_at = ?"
+            " WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts",
+            (JobState.FAILED, now, now, JobState.RUNNING, now),
+        )
+        conn.execute(
+            "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires_at = NULL, available_at = ?, updated_at = ?"
+            " WHERE status = ? AND lease_expires_at < ?",
+            (JobState.QUEUED, now, now, JobState.RUNNING, now),
+        )
+
+    def claim(self, owner: str, job_types: Iterable[str], lease_seconds: float) -> Optional[JobRecord]:
+        types = list(job_types)
+        if not types:
+            return None
+        now = time.time()
+        placeholders = ",".join("?" for _ in types)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._reap_expired(conn, now)
+                row = conn.execute(
+                    f"SELECT id FROM jobs WHERE status = ? AND available_at <= ? AND type IN ({placeholders})"
+                    " ORDER BY available_at, created_at LIMIT 1",
+                    (JobState.QUEUED, now, *types),
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1,"
+                    " started_at = ?, error = NULL, updated_at = ? WHERE id = ?",
+                    (JobState.RUNNING, owner, now + lease_seconds, now, now, row["id"]),
+                )
+                claimed = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self._row_to_record(claimed)
+
+    def heartbeat(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                (now + lease_seconds, now, job_id, owner, JobState.RUNNING),
+            )
+            return cur.rowcount == 1
+
+    def report_progress(self, job_id: str, progress: float, message: Optional[str] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, progress_message = COALESCE(?, progress_message),"
+                " progress_seq = progress_seq + 1, updated_at = ? WHERE id = ? AND status = ?",
+                (max(0.0, min(1.0, progress)), message, time.time(), job_id, JobState.RUNNING),
+            )
+
+    def complete(self, job_id: str, owner: str, result: Optional[Dict[str, Any]]) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, progress = 1, progress_seq = progress_seq + 1,"
+                " lease_owner = NULL, lease_expires_at = NULL, finished_at = ?, updated_at = ?"
+                " WHERE id = ? AND lease_owner = ? AND status = ?",
+                (JobState.SUCCEEDED, json.dumps(result, default=str) if result is not None else None,
+                 now, now, job_id, owner, JobState.RUNNING),
+            )
+            return cur.rowcount == 1
+
+    def fail(self, job_id: str, owner: str, error: str, retry_delay: Optional[float] = None) -> str:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_owner = ? AND status = ?",
+                (job_id, owner, JobState.RUNNING),
+            ).fetchone()
+            if row is None:
+                # Lease was lost (expired and reclaimed); leave the job to its new owner
+                conn.execute("COMMIT")
+                current = self.get(job_id)
+                return current.status if current else JobState.FAILED
+            if retry_delay is not None and row["attempts"] < row["max_attempts"]:
+                status = JobState.QUEUED
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL,"
+                    " available_at = ?, progress_seq = progress_seq + 1, updated_at = ? WHERE id = ?",
+                    (status, error, now + retry_delay, now, job_id),
+                )
+            else:
+                status = JobState.FAILED
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL,"
+                    " progress_seq = progress_seq + 1, finished_at = ?, updated_at = ? WHERE id = ?",
+                    (status, error, now, now, job_id),
+                )
+            conn.execute("COMMIT")
+        return status
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT type, status, COUNT(*) AS n FROM jobs GROUP BY type, status").fetchall()
+        counts: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            counts.setdefault(row["type"], {})[row["status"]] = row["n"]
+        return counts
+
+    def purge_finished(self, older_than_seconds: float) -> int:
+        """Delete terminal jobs older than the cutoff; returns rows removed."""
+        cutoff = time.time() - older_than_seconds
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (JobState.SUCCEEDED, JobState.FAILED, cutoff),
+            )
+            return cur.rowcount
+
+
+def open_queue(spec: Dict[str, Any]) -> JobQueue:
+    """Reopen a queue from ``JobQueue.spec()`` (used inside worker processes)."""
+    backend = spec.get("backend")
+    if backend == "sqlite":
+        return SQLiteJobQueue(spec["path"])
+    raise ValueError(f"Unknown job queue backend: {backend}")
+
@@ -0,0 +1,368 @@
+"""
+Job runner: claims jobs from a ``JobQueue`` and executes them in a worker
+process pool, so heavy imports/exports never run on the API event loop.
+
+- Per-type concurrency limits (``JobTypeConfig.concurrency``)
+- Leases renewed by heartbeat; a crashed runner's jobs are reclaimed after the
+  lease expires
+- Retries with exponential backoff; ``PermanentJobError`` and timeouts skip
+  retries (a timed-out worker can't be stopped and may still have side effects)
+- Progress written by the worker straight into the queue (``JobContext.progress``)
+- Throughput / latency metrics per job type (``JobRunner.stats()``)
+
+Handlers are referenced by dotted path (``"package.module:function"``) so they
+can be resolved inside spawned worker processes. A handler takes
+``(payload, ctx)`` and returns a JSON-serializable dict; it may be async.
+"""
+
+import asyncio
+import importlib
+import inspect
+import logging
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from services.jobs.queue import JobQueue, JobRecord, JobState, open_queue
+
+logger = logging.getLogger(__name__)
+
+THROUGHPUT_WINDOW_SECONDS = 900
+
+
+class JobError(Exception):
+    """Retryable job failure."""
+
+
+class PermanentJobError(JobError):
+    """Job failure that retrying will not fix (bad input, auth revoked, ...)."""
+
+
+@dataclass
+class JobTypeConfig:
+    handler: str
+    concurrency: int = 1
+    max_attempts: int = 3
+    timeout: float = 600.0
+    retry_backoff: float = 5.0
+    # Payload key listing temp files to delete once the job is finished for good
+    cleanup_key: Optional[str] = "cleanup_files"
+
+
+_JOB_TYPES: Dict[str, JobTypeConfig] = {}
+
+
+def register_job_type(job_type: str, handler: str, **options: Any) -> JobTypeConfig:
+    """Register (or replace) the handler and limits for a job type."""
+    config = JobTypeConfig(handler=handler, **options)
+    _JOB_TYPES[job_type] = config
+    return config
+
+
+def get_job_types() -> Dict[str, JobTypeConfig]:
+    return dict(_JOB_TYPES)
+
+
+class JobContext:
+    """Handed to handlers inside the worker process."""
+
+    def __init__(self, job_id: str, attempt: int, queue: JobQueue):
+        self.job_id = job_id
+        self.attempt = attempt
+        self._queue = queue
+
+    def progress(self, fraction: float, message: Optional[str] = None) -> None:
+        try:
+            self._queue.report_progress(self.job_id, fraction, message)
+        except Exception as e:  # Progress is best-effort
+            logger.debug(f"[Jobs] progress update failed for {self.job_id}: {e}")
+
+
+def _resolve_handler(path: str) -> Callable[..., Any]:
+    module_name, _, attr = path.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr)
+
+
+def _execute_job(queue_spec: Dict[str, Any], handler_path: str, job_id: str, attempt: int, payload: Dict[str, Any]) -> Any:
+    """Worker-process entry point."""
+    ctx = JobContext(job_id, attempt, open_queue(queue_spec))
+    handler = _resolve_handler(handler_path)
+    result = handler(payload, ctx)
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+    return result
+
+
+class _TypeMetrics:
+    def __init__(self) -> None:
+        self.started = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.timed_out = 0
+        self.lost_leases = 0
+        self.run_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.finished_at: Deque[float] = deque()
+
+    def record_finish(self, now: float) -> None:
+        self.finished_at.append(now)
+        while self.finished_at and now - self.finished_at[0] > THROUGHPUT_WINDOW_SECONDS:
+            self.finished_at.popleft()
+
+    def snapshot(self, active: int, limit: int) -> Dict[str, Any]:
+        done = self.succeeded + self.failed
+        now = time.time()
+        recent = sum(1 for t in self.finished_at if now - t <= THROUGHPUT_WINDOW_SECONDS)
+        return {
+            "active": active,
+            "concurrency_limit": limit,
+            "started": self.started,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "timed_out": self.timed_out,
+            "lost_leases": self.lost_leases,
+            "avg_run_seconds": round(self.run_seconds / done, 3) if done else None,
+            "avg_queue_wait_seconds": round(self.wait_seconds / self.started, 3) if self.started else None,
+            "throughput_per_minute": round(recent / (THROUGHPUT_WINDOW_SECONDS / 60.0), 3),
+        }
+
+
+OnUpdate = Callable[[JobRecord], Awaitable[None]]
+
+
+class JobRunner:
+    """Claims and runs jobs; one instance per process that should do work."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        job_types: Optional[Dict[str, JobTypeConfig]] = None,
+        max_workers: Optional[int] = None,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 1.0,
+        on_update: Optional[OnUpdate] = None,
+    ):
+        self.queue = queue
+        self._job_types = job_types
+        self.max_workers = max_workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.on_update = on_update
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._active: Dict[str, int] = {}
+        self._metrics: Dict[str, _TypeMetrics] = {}
+        self._wake = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def job_types(self) -> Dict[str, JobTypeConfig]:
+        return self._job_types if self._job_types is not None else _JOB_TYPES
+
+    # ---- lifecycle ---------------------------------------------------------
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            workers = self.max_workers or max(1, sum(c.concurrency for c in self.job_types.values()))
+            # spawn: forking a process that owns an event loop and SDK clients is unsafe
+            self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def start(self) -> None:
+        if self._loop_task is None:
+            self._stopping = False
+            self._loop_task = asyncio.create_task(self._claim_loop())
+            logger.info(f"[Jobs] Runner {self.owner} started for types: {sorted(self.job_types)}")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop claiming; give running jobs ``timeout`` seconds, then leave them to lease expiry."""
+        self._stopping = True
+        self._wake.set()
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+        if self._tasks:
+            await asyncio.wait(list(self._tasks.values()), timeout=timeout)
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def notify(self) -> None:
+        """Wake the claim loop (call after enqueueing in the same process)."""
+        self._wake.set()
+
+    async def submit(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+    ) -> str:
+        config = self.job_types.get(job_type)
+        if config is None:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job_id = await asyncio.to_thread(
+            self.queue.enqueue, job_type, payload, user_id, config.max_attempts, job_id
+        )
+        self.notify()
+        return job_id
+
+    # ---- claiming ----------------------------------------------------------
+
+    async def _claim_loop(self) -> None:
+        while not self._stopping:
+            claimed = 0
+            for job_type, config in self.job_types.items():
+                while self._active.get(job_type, 0) < config.concurrency and not self._stopping:
+                    try:
+                        job = await asyncio.to_thread(self.queue.claim, self.owner, [job_type], self.lease_seconds)
+                    except Exception as e:
+                        logger.error(f"[Jobs] claim failed: {e}")
+                        job = None
+                    if job is None:
+                        break
+                    claimed += 1
+                    self._active[job_type] = self._active.get(job_type, 0) + 1
+                    self._tasks[job.id] = asyncio.create_task(self._run(job, config))
+            if claimed == 0:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _heartbeat(self, job_id: str) -> None:
+        interval = max(1.0, self.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            alive = await asyncio.to_thread(self.queue.heartbeat, job_id, self.owner, self.lease_seconds)
+            if not alive:
+                logger.warning(f"[Jobs] Lost lease on {job_id}")
+                return
+
+    # ---- execution ---------------------------------------------------------
+
+    async def _run(self, job: JobRecord, config: JobTypeConfig) -> None:
+        metrics = self._metrics.setdefault(job.type, _TypeMetrics())
+        metrics.started += 1
+        metrics.wait_seconds += max(0.0, (job.started_at or time.time()) - job.available_at)
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        started = time.perf_counter()
+        status = JobState.RUNNING
+        lease_lost = False
+        try:
+            await self._publish(job.id)
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._get_pool(), _execute_job, self.queue.spec(), config.handler, job.id, job.attempts, job.payload
+            )
+            # On timeout the worker process keeps running to completion (a pool
+            # worker can't be killed without killing its neighbours' jobs); its
+            # result is discarded, and the job is not retried so its side effects
+            # (Slides/Drive exports) can't run twice.
+            result = await asyncio.wait_for(future, timeout=config.timeout)
+            if await asyncio.to_thread(self.queue.complete, job.id, self.owner, result):
+                status = JobState.SUCCEEDED
+                metrics.succeeded += 1
+            else:
+                # Lease expired and the job was reclaimed; its new owner reports the outcome
+                lease_lost = True
+                metrics.lost_leases += 1
+                logger.warning(f"[Jobs] {job.type} {job.id} finished after losing its lease; result discarded")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # Worker died (OOM, segfault in a parser); rebuild the pool for the next job
+                self._pool = None
+            if isinstance(e, asyncio.TimeoutError):
+                metrics.timed_out += 1
+                error = f"Timed out after {config.timeout:.0f}s"
+            else:
+                error = str(e) or e.__class__.__name__
+            if isinstance(e, (PermanentJobError, asyncio.TimeoutError)):
+                retry_delay = None
+            else:
+                retry_delay = config.retry_backoff * (2 ** max(0, job.attempts - 1))
+            status = await asyncio.to_thread(self.queue.fail, job.id, self.owner, error, retry_delay)
+            if status == JobState.QUEUED:
+                metrics.retried += 1
+                logger.warning(f"[Jobs] {job.type} {job.id} attempt {job.attempts} failed, retrying in {retry_delay:.0f}s: {error}")
+                self.notify()
+            else:
+                metrics.failed += 1
+                logger.error(f"[Jobs] {job.type} {job.id} failed: {error}")
+        finally:
+            heartbeat.cancel()
+            self._active[job.type] = max(0, self._active.get(job.type, 1) - 1)
+            self._tasks.pop(job.id, None)
+            if status in JobState.TERMINAL:
+                metrics.run_seconds += time.perf_counter() - started
+                metrics.record_finish(time.time())
+                self._cleanup(job, config)
+            self._wake.set()
+        if not lease_lost:
+            await self._publish(job.id)
+
+    def _cleanup(self, job: JobRecord, config: JobTypeConfig) -> None:
+        if not config.cleanup_key:
+            return
+        for path in job.payload.get(config.cleanup_key) or []:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    async def _publish(self, job_id: str) -> None:
+        if not self.on_update:
+            return
+        try:
+            record = await asyncio.to_thread(self.queue.get, job_id)
+            if record:
+                await self.on_update(record)
+        except Exception as e:
+            logger.warning(f"[Jobs] on_update hook failed for {job_id}: {e}")
+
+    # ---- introspection -----------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        types = {}
+        for job_type, config in self.job_types.items():
+            metrics = self._metrics.get(job_type) or _TypeMetrics()
+            types[job_type] = metrics.snapshot(self._active.get(job_type, 0), config.concurrency)
+        return {"owner": self.owner, "running": self._loop_task is not None, "types": types}
+
+
+async def stream_job_progress(
+    queue: JobQueue, job_id: str, poll_interval: float = 0.5
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield a status dict each time the job's progress changes, ending on a terminal state."""
+    last_seq: Optional[Tuple[int, str]] = None
+    while True:
+        record = await asyncio.to_thread(queue.get, job_id)
+        if record is None:
+            return
+        marker = (record.progress_seq, record.status)
+        if marker != last_seq:
+            last_seq = marker
+            yield record.to_status_dict()
+        if record.is_terminal:
+            return
+        await asyncio.sleep(poll_interval)
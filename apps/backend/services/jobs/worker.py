@@ -0,0 +1,51 @@
+"""
+Standalone job worker.
+
+Runs the job runner without the HTTP API so heavy imports/exports can be scaled
+separately (set ``JOB_RUNNER_EMBEDDED=false`` on API instances).
+
+Usage:
+    python -m services.jobs.worker
+"""
+
+import asyncio
+import importlib
+import logging
+import signal
+
+from services.jobs import get_job_runner
+
+logger = logging.getLogger(__name__)
+
+# Modules that register job types on import
+JOB_MODULES = [
+    "api.requests.api_google_integration",
+]
+
+
+def load_job_modules() -> None:
+    for module in JOB_MODULES:
+        importlib.import_module(module)
+
+
+async def run_worker() -> None:
+    load_job_modules()
+    runner = get_job_runner()
+    await runner.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+
+    await stop.wait()
+    logger.info("[Jobs] Shutting down worker")
+    await runner.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker())
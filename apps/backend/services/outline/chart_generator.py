@@ -5,6 +5,7 @@ import logging
 from typing import List, Dict, Any, Optional, Tuple
 
 from agents.ai.clients import get_client, invoke, get_max_tokens_for_model
+from services.chart_reduction import CATEGORY_CHARTS, OTHER_LABEL, fold_categories, point_budget, reduce_points
 from .models import ChartData
 
 logger = logging.getLogger(__name__)
@@ -352,6 +353,11 @@ class ChartGenerator:
         if not self._validate_unit_consistency(normalized_points):
             logger.warning("[CHART] Mixed units detected in chart data - converting to text instead of chart")
             return None
+
+        # Bring the series within the chart type's point budget before it goes into the slide
+        reduction = None
+        if not grouping_key:
+            normalized_points, reduction = self._reduce_points(frontend_type, normalized_points)
         
         # Carry forward any citation metadata so frontend can render sources
         metadata = chart_data.metadata or {}
@@ -400,6 +406,13 @@ class ChartGenerator:
                     continue
                 groups.setdefault(group_name, []).append({"label": label_str, "value": float(value)})
 
+            groups, reduction = self._reduce_groups(frontend_type, groups)
+            if reduction:
+                normalized_points = [
+                    {"label": p["label"], "name": p["label"], "value": p["value"]}
+                    for pts in groups.values() for p in pts
+                ]
+
             for name, pts in groups.items():
                 if is_time:
                     data_pts = [{"x": p["label"], "y": p["value"]} for p in pts]
@@ -420,6 +433,9 @@ class ChartGenerator:
                 data_pts = [{"name": p["label"], "y": p["value"]} for p in normalized_points]
             series = [{"name": chart_data.title or "Series 1", "data": data_pts}]
 
+        if reduction:
+            metadata['reduction'] = reduction
+
         return {
             "chartType": frontend_type,
             "data": normalized_points,
@@ -427,4 +443,48 @@ class ChartGenerator:
             "xType": x_type,
             "title": chart_data.title or slide_title,
             "metadata": metadata
-        }
\ No newline at end of file
+        }
+
+    def _reduce_points(
+        self, chart_type: str, points: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Downsample/fold normalized {label, name, value} points to the chart type's budget"""
+        labels, values, info = reduce_points(chart_type, [p["label"] for p in points], [p["value"] for p in points])
+        if info is None:
+            return points, None
+        return [{"label": l, "name": l, "value": float(v)} for l, v in zip(labels, values)], info
+
+    def _reduce_groups(
+        self, chart_type: str, groups: Dict[str, List[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Optional[Dict[str, Any]]]:
+        """Per-series reduction; categorical charts keep the same top categories in every series"""
+        budget = point_budget(chart_type)
+        if not budget:
+            return groups, None
+        original = sum(len(pts) for pts in groups.values())
+
+        if chart_type in CATEGORY_CHARTS:
+            totals: Dict[str, float] = {}
+            for pts in groups.values():
+                for p in pts:
+                    totals[p["label"]] = totals.get(p["label"], 0.0) + abs(p["value"])
+            keep = fold_categories(totals, budget)
+            if keep is None:
+                return groups, None
+            reduced = {}
+            for name, pts in groups.items():
+                rest = [p["value"] for p in pts if p["label"] not in keep]
+                reduced[name] = [p for p in pts if p["label"] in keep]
+                if rest:
+                    reduced[name].append({"label": OTHER_LABEL, "value": float(sum(rest))})
+            method = 'top_n_other'
+        else:
+            reduced, method = {}, None
+            for name, pts in groups.items():
+                labels, values, info = reduce_points(chart_type, [p["label"] for p in pts], [p["value"] for p in pts], budget)
+                reduced[name] = [{"label": l, "value": float(v)} for l, v in zip(labels, values)] if info else pts
+                method = method or (info and info['method'])
+            if method is None:
+                return groups, None
+
+        return reduced, {'method': method, 'original_points': original, 'points': sum(len(pts) for pts in reduced.values())}
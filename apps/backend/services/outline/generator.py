@@ -28,6 +28,7 @@ from agents.ai.clients import get_max_tokens_for_model
 from services.openai_service import OpenAIService
 from agents.generation.file_processor import create_file_processor
 from setup_logging_optimized import get_logger
+from agents.generation.tracing import traced
 from services.pptx_text_extractor import extract_pptx_text_from_bytes
 
 logger = get_logger(__name__)
@@ -55,6 +56,7 @@ class OutlineGenerator:
         
         logger.info(f"OutlineGenerator initialized with {len(self.chart_generator.chart_types)} chart types")
     
+    @traced("outline")
     async def generate(self, options: OutlineOptions, progress_callback=None) -> OutlineResult:
         """Generate complete outline"""
         start_time = time.time()
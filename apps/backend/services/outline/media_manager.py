@@ -2,9 +2,12 @@
 
 import uuid
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
 
 from .models import SlideContent
+from services.chart_reduction import aggregate_time_buckets, default_aggregation, parse_times, point_budget, reduce_points
 from agents.ai.clients import get_client, invoke
 from setup_logging_optimized import get_logger
 
@@ -362,15 +365,16 @@ Only include images that have good matches. Be thoughtful and strategic about as
     def generate_chart_from_data_file(self, data_file: Dict[str, Any], slide_title: str) -> Optional[Dict[str, Any]]:
         """Generate chart data from an uploaded data file"""
         try:
-            if data_file.get('format') != 'csv' or 'data' not in data_file:
+            if 'data' not in data_file:
                 return None
             
             csv_data = data_file['data']
             headers = csv_data.get('headers', [])
             rows = csv_data.get('rows', [])
             numeric_cols = csv_data.get('numeric_columns', [])
+            table = data_file.get('table')
             
-            if not headers or not rows or not numeric_cols:
+            if not headers or not numeric_cols or (table is None and (data_file.get('format') != 'csv' or not rows)):
                 return None
             
             # Get chart suggestion
@@ -380,7 +384,12 @@ Only include images that have good matches. Be thoughtful and strategic about as
             # Extract data based on chart type
             chart_data_points = []
             
-            if chart_type == 'pie':
+            if table is not None:
+                # Typed columns from services.tabular_ingestion
+                chart_data_points, value_col = self._chart_points_from_table(table, chart_type)
+                numeric_cols = [value_col] + [c for c in numeric_cols if c != value_col]
+            
+            elif chart_type == 'pie':
                 # For pie charts, use first column as labels and first numeric column as values
                 label_col = 0
                 value_col = numeric_cols[0] if numeric_cols else 1
@@ -448,6 +457,30 @@ Only include images that have good matches. Be thoughtful and strategic about as
             logger.error(f"Error generating chart from data file: {e}")
             return None
     
+    def _chart_points_from_table(self, table: Any, chart_type: str) -> Tuple[List[Dict[str, Any]], int]:
+        """Chart points from an ingested table: label column x first other numeric column, within the chart's point budget."""
+        label_col = table.label_column
+        value_cols = [c for c in table.numeric_columns if c != label_col] or table.numeric_columns
+        value_col = value_cols[0]
+        labels = table.labels(label_col)
+        values = table.numeric(value_col)
+        valid = np.flatnonzero(~np.isnan(values))
+        labels, values = [labels[i] for i in valid], values[valid]
+        reduce_type = 'line' if chart_type == 'line' else ('pie' if chart_type == 'pie' else 'bar')
+        budget = point_budget(reduce_type)
+        times = parse_times(labels) if chart_type == 'line' and table.columns[label_col].is_time and len(values) > budget else None
+        if times is not None and len(np.unique(times)) < len(times):
+            # Repeated timestamps mean row-level records (e.g. one row per sale): roll up per day/week/month/...
+            how = default_aggregation(table.headers[value_col])
+            labels, values, unit = aggregate_time_buckets(times, values, budget, how=how)
+            logger.info(f"[CHART] aggregated {len(valid)} rows into {len(values)} {unit} buckets ({how})")
+        labels, values, _ = reduce_points(reduce_type, labels, values, budget)
+        if chart_type == 'line':
+            points = [{'x': label, 'y': float(value)} for label, value in zip(labels, values)]
+        else:
+            points = [{'name': label, 'value': float(value)} for label, value in zip(labels, values)]
+        return points, value_col
+    
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract meaningful keywords from text for matching"""
         # Common words to ignore
@@ -9,6 +9,7 @@ from openai import OpenAI
 from utils.supabase import get_supabase_client
 from agents.config import OPENAI_EMBEDDINGS_MODEL
 from setup_logging_optimized import get_logger
+from agents.generation.tracing import traced
 import numpy as np
 import random
 
@@ -37,6 +38,7 @@ class PaletteDBService:
             logger.error(f"Error generating embedding: {e}")
             return None
     
+    @traced("palette.db")
     def search_palettes(
         self, 
         query: str, 
@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from agents.ai.clients import get_client
 from agents.config import PERPLEXITY_IMAGE_MODEL
 from services.image_validator import ImageValidator
+from services.image_search_cache import get_image_search_cache
 
 
 class PerplexityImageService:
@@ -38,11 +39,18 @@ class PerplexityImageService:
         """Find images matching `query` using Perplexity.
 
         Returns a dict with keys: {'photos': List[Dict], 'total_results': int}
-        matching the SerpAPI service shape.
+        matching the SerpAPI service shape. Results go through the shared
+        image-search cache.
         """
         if not self.is_available or not query:
             return {"photos": [], "total_results": 0}
 
+        return await get_image_search_cache().get_or_fetch(
+            "perplexity", query, per_page, lambda: self._fetch_images(query, per_page), model=PERPLEXITY_IMAGE_MODEL,
+        )
+
+    async def _fetch_images(self, query: str, per_page: int) -> Dict[str, Any]:
+        """Uncached Perplexity image search."""
         try:
             client, model = get_client(PERPLEXITY_IMAGE_MODEL)
 
@@ -4,6 +4,9 @@ import asyncio
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
+from services.image_search_cache import get_image_search_cache
+from utils.http_client import get_http_session
+
 # Load environment variables
 load_dotenv()
 
@@ -110,10 +113,29 @@ class PexelsService:
         color: Optional[str] = None,  # red, orange, yellow, green, turquoise, blue, violet, pink, brown, black, gray, white or hex
         locale: Optional[str] = None,  # en-US, pt-BR, es-ES, etc.
     ) -> Dict[str, Any]:
-        """Performs the actual Pexels API search."""
+        """Performs the actual Pexels API search, through the shared result cache."""
         if not query:
             return {"photos": [], "total_results": 0}
 
+        # Later pages are offset by per_page, so only page 1 is shared across page sizes
+        return await get_image_search_cache().get_or_fetch(
+            'pexels', query, per_page,
+            lambda: self._fetch_images(query, per_page, page, orientation, size, color, locale),
+            page=page, page_size=per_page if page > 1 else None,
+            orientation=orientation, size=size, color=color, locale=locale,
+        )
+
+    async def _fetch_images(
+        self,
+        query: str,
+        per_page: int = 10,
+        page: int = 1,
+        orientation: Optional[str] = None,
+        size: Optional[str] = None,
+        color: Optional[str] = None,
+        locale: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Uncached Pexels search request."""
         params = {
             "query": query,
             "per_page": min(per_page, 80),  # API max is 80
@@ -128,11 +150,10 @@ class PexelsService:
         # Configure timeout for Pexels API requests (30 seconds should be enough)
         timeout = aiohttp.ClientTimeout(total=30, connect=10, sock_read=30)
         
-        session = None
         try:
-            session = aiohttp.ClientSession(timeout=timeout)
+            session = get_http_session()
             
-            async with session.get(f"{self.base_url}/search", headers=self.headers, params=params) as response:
+            async with session.get(f"{self.base_url}/search", headers=self.headers, params=params, timeout=timeout) as response:
                 if response.status == 200:
                     data = await response.json()
                     return self._process_image_results(data)
@@ -149,13 +170,6 @@ class PexelsService:
         except Exception as e:
             print(f"Error searching Pexels ({query=}): {str(e)}")
             return {"photos": [], "total_results": 0}
-        finally:
-            # Shield session cleanup from cancellation
-            if session:
-                try:
-                    await asyncio.shield(session.close())
-                except Exception as e:
-                    print(f"Error closing Pexels session: {e}")
     
     async def search_images_for_slide(
         self,
@@ -207,11 +221,10 @@ class PexelsService:
         # Configure timeout for Pexels API requests
         timeout = aiohttp.ClientTimeout(total=30, connect=10, sock_read=30)
         
-        session = None
         try:
-            session = aiohttp.ClientSession(timeout=timeout)
+            session = get_http_session()
             
-            async with session.get(f"{self.base_url}/curated", headers=self.headers, params=params) as response:
+            async with session.get(f"{self.base_url}/curated", headers=self.headers, params=params, timeout=timeout) as response:
                 if response.status == 200:
                     return self._process_image_results(await response.json())
                 else:
@@ -227,13 +240,6 @@ class PexelsService:
         except Exception as e:
             print(f"Error getting curated Pexels images: {str(e)}")
             return {"photos": [], "total_results": 0}
-        finally:
-            # Shield session cleanup from cancellation
-            if session:
-                try:
-                    await asyncio.shield(session.close())
-                except Exception as e:
-                    print(f"Error closing Pexels session: {e}")
     
     async def search_images_for_deck(
         self,
@@ -8,6 +8,8 @@ from typing import Dict, List, Optional
 from pathlib import Path
 import logging
 
+from services.font_manifest import get_font_manifest
+
 logger = logging.getLogger(__name__)
 
 class PixelBuddhaFontServiceV3:
@@ -85,6 +87,11 @@ class PixelBuddhaFontServiceV3:
         self.registry = self._load_registry()
         self.categories = self._load_categories()
         self.recent_selections = []  # Track recent selections to avoid repetition
+        # Display name -> font ID (first registry entry wins, as the old linear scan did)
+        self._ids_by_name: Dict[str, str] = {}
+        for font_id, font_data in self.registry.items():
+            if isinstance(font_data, dict) and font_data.get('name'):
+                self._ids_by_name.setdefault(font_data['name'], font_id)
     
     def _load_registry(self) -> Dict:
         """Load the full font registry"""
@@ -284,13 +291,15 @@ class PixelBuddhaFontServiceV3:
     
     def get_font_details(self, font_name: str) -> Optional[Dict]:
         """Get detailed information about a specific font"""
-        for font_id, font_data in self.registry.items():
-            if font_data.get('name') == font_name:
-                return {
-                    'id': font_id,
-                    'name': font_name,
-                    'files': font_data.get('files', []),
-                    'description': font_data.get('description', ''),
-                    'tags': font_data.get('tags', [])
-                }
-        return None
\ No newline at end of file
+        font_id = self._ids_by_name.get(font_name)
+        if font_id is None:
+            return None
+        font_data = self.registry[font_id]
+        return {
+            'id': font_id,
+            'name': font_name,
+            'files': font_data.get('files', []),
+            'path': get_font_manifest().resolve(font_id, source='pixelbuddha'),
+            'description': font_data.get('description', ''),
+            'tags': font_data.get('tags', [])
+        }
\ No newline at end of file
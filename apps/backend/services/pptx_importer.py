@@ -1,12 +1,24 @@
 """
 Clean PPTX Import Service
 Converts PowerPoint presentations to our internal format using python-pptx
+
+Slides are parsed in a process pool (python-pptx is pure Python and CPU bound)
+and can be consumed as an async stream via ``PPTXImporter.iter_slides`` so the
+UI can show the first slides before the whole file is done. With
+``PPTX_EXTERNALIZE_IMAGES`` enabled, pictures are written to the
+content-addressed blob store and referenced by URL instead of being inlined as
+base64 data URLs.
 """
 
+import os
 import uuid
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Union
-from io import BytesIO
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple, Union
 import base64
 
 from pptx import Presentation
@@ -17,13 +29,73 @@ from pptx.dml.color import RGBColor
 
 logger = logging.getLogger(__name__)
 
+# Off by default: blob URLs are saved into decks, so the blob store must be
+# durable, shared and publicly addressable first (see services.blob_store)
+PPTX_EXTERNALIZE_IMAGES = os.getenv("PPTX_EXTERNALIZE_IMAGES", "false").lower() == "true"
+PPTX_IMPORT_WORKERS = int(os.getenv("PPTX_IMPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Below this many slides the pool start-up cost outweighs the parallelism
+PPTX_POOL_MIN_SLIDES = 4
+
+_STAT_KEYS = ("components", "images", "text_blocks", "shapes", "errors")
+
+_import_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_import_pool() -> ProcessPoolExecutor:
+    global _import_pool
+    if _import_pool is None:
+        # spawn: forking the multi-threaded server can deadlock children on held locks
+        _import_pool = ProcessPoolExecutor(
+            max_workers=max(1, PPTX_IMPORT_WORKERS), mp_context=multiprocessing.get_context("spawn")
+        )
+    return _import_pool
+
+
+# Per-worker cache so a worker handed several slides of one file parses it once
+_worker_presentation: Tuple[Optional[Tuple[str, float]], Any] = (None, None)
+
+
+def _process_slides_in_worker(
+    file_path: str,
+    indexes: List[int],
+    scale: float,
+    theme_colors: Dict[str, Any],
+    theme_fonts: Dict[str, Any],
+    externalize_images: bool,
+    blob_root: Optional[str],
+    blob_url_prefix: Optional[str],
+) -> List[Tuple[int, Dict[str, Any], Dict[str, int]]]:
+    """Process-pool entry point: build slides ``indexes`` of ``file_path``."""
+    global _worker_presentation
+    key = (file_path, os.path.getmtime(file_path))
+    if _worker_presentation[0] != key:
+        _worker_presentation = (key, Presentation(file_path))
+    prs = _worker_presentation[1]
+
+    store = None
+    if externalize_images:
+        from services.blob_store import ContentAddressedBlobStore
+        store = ContentAddressedBlobStore(blob_root, blob_url_prefix)
+
+    importer = PPTXImporter(externalize_images=externalize_images, blob_store=store)
+    importer.theme_colors = theme_colors
+    importer.theme_fonts = theme_fonts
+    slides = list(prs.slides)
+    results = []
+    for idx in indexes:
+        importer.stats = {k: 0 for k in _STAT_KEYS}
+        slide = importer._build_slide_safe(slides[idx], idx, scale)
+        results.append((idx, slide, dict(importer.stats)))
+    return results
+
+
 class PPTXImporter:
     """
     Clean implementation of PPTX import functionality.
     Converts PowerPoint files to our slide format.
     """
     
-    def __init__(self):
+    def __init__(self, externalize_images: Optional[bool] = None, blob_store=None, use_process_pool: bool = True):
         self.stats = {
             "slides": 0,
             "components": 0,
@@ -32,29 +104,176 @@ class PPTXImporter:
             "shapes": 0,
             "errors": 0
         }
+        self.externalize_images = PPTX_EXTERNALIZE_IMAGES if externalize_images is None else externalize_images
+        self.use_process_pool = use_process_pool
+        self._blob_store = blob_store
+        # Blob references by hash, collected into deck["assets"]
+        self.assets: Dict[str, Dict[str, Any]] = {}
+        
+    @property
+    def blob_store(self):
+        if self._blob_store is None:
+            from services.blob_store import get_blob_store
+            self._blob_store = get_blob_store()
+        return self._blob_store
+    
+    def _image_src(self, image_bytes: bytes, mime_type: str) -> str:
+        """Return the src for an image: blob-store URL, or a base64 data URL when not externalizing."""
+        if self.externalize_images:
+            try:
+                ref = self.blob_store.put(image_bytes, self._detect_image_mime_from_bytes(image_bytes) if mime_type == 'image/png' else mime_type)
+                self.assets[ref["hash"]] = ref
+                return ref["url"]
+            except Exception as e:
+                logger.warning(f"Failed to externalize image, inlining instead: {e}")
+        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        return f"data:{mime_type};base64,{image_base64}"
         
     async def import_file(self, file_path: str) -> Dict[str, Any]:
         """Import a PPTX file from disk"""
         try:
-            prs = Presentation(file_path)
-            # Store file path for theme extraction
-            self._file_path = file_path
-            return await self._process_presentation(prs)
+            deck: Optional[Dict[str, Any]] = None
+            slides: List[Dict[str, Any]] = []
+            async for event in self.iter_slides(file_path):
+                if event["type"] == "deck":
+                    deck = event["deck"]
+                elif event["type"] == "slide":
+                    slides.append(event["slide"])
+            deck["slides"] = slides
+            self._finalize_deck(deck)
+            return deck
         except Exception as e:
             logger.error(f"Failed to import PPTX file: {e}")
             raise
             
     async def import_bytes(self, file_bytes: bytes) -> Dict[str, Any]:
         """Import a PPTX file from bytes"""
+        # Spill to disk so worker processes can open the file themselves
+        fd, tmp_path = tempfile.mkstemp(suffix=".pptx")
         try:
-            prs = Presentation(BytesIO(file_bytes))
-            return await self._process_presentation(prs)
+            with os.fdopen(fd, "wb") as f:
+                f.write(file_bytes)
+            return await self.import_file(tmp_path)
         except Exception as e:
             logger.error(f"Failed to import PPTX bytes: {e}")
             raise
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
+    async def iter_slides(self, file_path: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream an import: yields {"type": "deck", "deck": ...} with deck-level data
+        (no slides yet), then {"type": "slide", "index": i, "slide": ...} in slide order.
+        """
+        self._file_path = file_path
+        prs = await asyncio.to_thread(Presentation, file_path)
+        deck, scale = await asyncio.to_thread(self._prepare_presentation, prs)
+        slide_count = len(prs.slides)
+        yield {"type": "deck", "deck": deck}
+        
+        if not self.use_process_pool or slide_count < PPTX_POOL_MIN_SLIDES:
+            slides = list(prs.slides)
+            for idx in range(slide_count):
+                slide = await asyncio.to_thread(self._build_slide_safe, slides[idx], idx, scale)
+                yield {"type": "slide", "index": idx, "slide": slide}
+            return
+        
+        async for idx, slide in self._iter_slides_pooled(file_path, slide_count, scale):
+            yield {"type": "slide", "index": idx, "slide": slide}
+    
+    async def _iter_slides_pooled(self, file_path: str, slide_count: int, scale: float) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Fan slides out to the process pool; yield results in slide order as they land."""
+        global _import_pool
+        loop = asyncio.get_running_loop()
+        workers = max(1, PPTX_IMPORT_WORKERS)
+        # Small leading chunks so slide 1 arrives fast, larger ones after to amortize parsing
+        chunks: List[List[int]] = [[i] for i in range(min(workers, slide_count))]
+        rest = list(range(len(chunks), slide_count))
+        chunk_size = max(1, -(-len(rest) // (workers * 2)))
+        chunks += [rest[i:i + chunk_size] for i in range(0, len(rest), chunk_size)]
+        
+        store = self.blob_store if self.externalize_images else None
+        args = (
+            dict(getattr(self, 'theme_colors', {}) or {}),
+            dict(getattr(self, 'theme_fonts', {}) or {}),
+            self.externalize_images,
+            str(store.root) if store else None,
+            store.url_prefix if store else None,
+        )
+        try:
+            pool = _get_import_pool()
+            futures = [
+                loop.run_in_executor(pool, _process_slides_in_worker, file_path, chunk, scale, *args)
+                for chunk in chunks
+            ]
+        except (BrokenProcessPool, OSError) as e:
+            _import_pool = None
+            logger.warning(f"PPTX import pool unavailable ({e}); importing in-process")
+            futures = []
+        
+        if not futures:
+            prs = await asyncio.to_thread(Presentation, file_path)
+            slides = list(prs.slides)
+            for idx in range(slide_count):
+                yield idx, await asyncio.to_thread(self._build_slide_safe, slides[idx], idx, scale)
+            return
+        
+        ready: Dict[int, Dict[str, Any]] = {}
+        next_idx = 0
+        try:
+            for future in asyncio.as_completed(futures):
+                try:
+                    results = await future
+                except BrokenProcessPool:
+                    _import_pool = None
+                    raise
+                for idx, slide, stats in results:
+                    ready[idx] = slide
+                    for k in _STAT_KEYS:
+                        self.stats[k] += stats.get(k, 0)
+                    for component in slide.get("components", []):
+                        self._collect_asset(component)
+                while next_idx in ready:
+                    yield next_idx, ready.pop(next_idx)
+                    next_idx += 1
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    def _collect_asset(self, component: Dict[str, Any]) -> None:
+        """Record blob-store references produced in worker processes."""
+        if not self.externalize_images:
+            return
+        prefix = self.blob_store.url_prefix + "/"
+        props = component.get("props") or {}
+        for key in ("src", "backgroundImageUrl"):
+            value = props.get(key)
+            if isinstance(value, str) and value.startswith(prefix):
+                name = value[len(prefix):]
+                path = self.blob_store.path_for(name)
+                if path is not None and path.exists():
+                    digest = name.split(".", 1)[0]
+                    self.assets.setdefault(digest, {"hash": digest, "name": name, "size": path.stat().st_size, "url": value})
+    
+    def _finalize_deck(self, deck: Dict[str, Any]) -> None:
+        deck["metadata"]["import_stats"] = self.stats
+        if self.assets:
+            deck["assets"] = self.assets
+        logger.info(f"Import complete. Stats: {self.stats}")
             
     async def _process_presentation(self, prs: Presentation) -> Dict[str, Any]:
-        """Process a PowerPoint presentation object"""
+        """Process a PowerPoint presentation object in-process (no worker pool)"""
+        deck, scale = self._prepare_presentation(prs)
+        for idx, slide in enumerate(prs.slides):
+            deck["slides"].append(self._build_slide_safe(slide, idx, scale))
+        self._finalize_deck(deck)
+        return deck
+    
+    def _prepare_presentation(self, prs: Presentation) -> Tuple[Dict[str, Any], float]:
+        """Extract deck-level data (theme, size, scale); returns the deck without slides"""
         logger.info(f"Processing presentation with {len(prs.slides)} slides")
         
         # Reset stats
@@ -66,6 +285,7 @@ class PPTXImporter:
             "shapes": 0,
             "errors": 0
         }
+        self.assets = {}
         
         # Extract theme data once for the entire presentation
         self.theme_colors = self._extract_theme_colors(prs)
@@ -83,27 +303,10 @@ class PPTXImporter:
         # Use uniform scaling to maintain aspect ratio
         scale = min(scale_x, scale_y)
         
-        slides = []
-        for idx, slide in enumerate(prs.slides):
-            try:
-                if idx == 0:
-                    logger.info(f"=== PROCESSING SLIDE 1 with {len(slide.shapes)} shapes ===")
-                processed_slide = await self._process_slide(slide, idx, scale)
-                slides.append(processed_slide)
-            except Exception as e:
-                logger.error(f"Error processing slide {idx}: {e}")
-                self.stats["errors"] += 1
-                # Add empty slide on error
-                slides.append({
-                    "id": str(uuid.uuid4()),
-                    "title": f"Slide {idx + 1} (Error)",
-                    "components": []
-                })
-                
         deck = {
             "uuid": str(uuid.uuid4()),
             "name": "Imported Presentation",
-            "slides": slides,
+            "slides": [],
             "size": {"width": 1920, "height": 1080},
             "metadata": {
                 "source": "pptx",
@@ -114,9 +317,24 @@ class PPTXImporter:
                 "slide_count": len(prs.slides)
             }
         }
-        
-        logger.info(f"Import complete. Stats: {self.stats}")
-        return deck
+        return deck, scale
+    
+    def _build_slide_safe(self, slide, idx: int, scale: float) -> Dict[str, Any]:
+        """Build a slide, substituting an empty slide on error"""
+        try:
+            if idx == 0:
+                logger.info(f"=== PROCESSING SLIDE 1 with {len(slide.shapes)} shapes ===")
+            return self._build_slide(slide, idx, scale)
+        except Exception as e:
+            logger.error(f"Error processing slide {idx}: {e}")
+            self.stats["errors"] += 1
+            # Add empty slide on error
+            return {
+                "id": str(uuid.uuid4()),
+                "title": f"Slide {idx + 1} (Error)",
+                "components": []
+            }
+    
     def _extract_theme_fonts(self, file_path: Optional[str]) -> Dict[str, Any]:
         """Extract theme font scheme (major/minor fonts) from theme XML if available."""
         fonts: Dict[str, Any] = {}
@@ -151,6 +369,10 @@ class PPTXImporter:
         
     async def _process_slide(self, slide, idx: int, scale: float) -> Dict[str, Any]:
         """Process a single slide"""
+        return self._build_slide(slide, idx, scale)
+    
+    def _build_slide(self, slide, idx: int, scale: float) -> Dict[str, Any]:
+        """Build a single slide (synchronous; safe to run in a worker process)"""
         components = []
         background_shape_id = None  # Track if we found a shape-based background
         
@@ -625,8 +847,7 @@ class PPTXImporter:
             mime_type = self._detect_image_mime_from_bytes(image_bytes)
             
             # Convert to base64 data URL
-            image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-            data_url = f"data:{mime_type};base64,{image_base64}"
+            data_url = self._image_src(image_bytes, mime_type)
             
             # Check for cropping and flips
             crop_props = {}
@@ -819,8 +1040,7 @@ class PPTXImporter:
                     if picture_blob is not None:
                         try:
                             # Build image data URL
-                            image_base64 = base64.b64encode(picture_blob).decode('utf-8')
-                            data_url = f"data:image/png;base64,{image_base64}"
+                            data_url = self._image_src(picture_blob, 'image/png')
                             # If the original shape was a circle, apply circular mask via borderRadius
                             border_radius = 0
                             if our_shape_type == "circle":
@@ -1658,8 +1878,7 @@ class PPTXImporter:
         """Create an Image component from raw image bytes extracted via blipFill."""
         try:
             mime_type = self._detect_image_mime_from_bytes(image_bytes)
-            image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-            data_url = f"data:{mime_type};base64,{image_base64}"
+            data_url = self._image_src(image_bytes, mime_type)
             props: Dict[str, Any] = {
                 **bounds,
                 'src': data_url,
@@ -1726,8 +1945,7 @@ class PPTXImporter:
 
             # Build data URL
             mime_type = self._detect_image_mime_from_bytes(image_bytes)
-            image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-            data_url = f"data:{mime_type};base64,{image_base64}"
+            data_url = self._image_src(image_bytes, mime_type)
 
             # If the shape is circular, compute border radius hint
             border_radius = 0
@@ -1842,8 +2060,7 @@ class PPTXImporter:
                                     picture_blob = self._try_extract_picture_fill_blob(shape)
                                     if picture_blob is not None:
                                         try:
-                                            image_base64 = base64.b64encode(picture_blob).decode('utf-8')
-                                            data_url = f"data:image/png;base64,{image_base64}"
+                                            data_url = self._image_src(picture_blob, 'image/png')
                                             return ({
                                                 "id": str(uuid.uuid4()),
                                                 "type": "Background",
@@ -1953,8 +2170,7 @@ class PPTXImporter:
             direct_blob = _extract_slide_bg_blip(slide)
             if direct_blob:
                 try:
-                    image_base64 = base64.b64encode(direct_blob).decode('utf-8')
-                    data_url = f"data:image/png;base64,{image_base64}"
+                    data_url = self._image_src(direct_blob, 'image/png')
                     return {
                         "id": str(uuid.uuid4()),
                         "type": "Background",
@@ -2046,8 +2262,7 @@ class PPTXImporter:
                 picture_blob = self._try_extract_picture_fill_blob_from_background(slide, fill)
                 if picture_blob:
                     try:
-                        image_base64 = base64.b64encode(picture_blob).decode('utf-8')
-                        data_url = f"data:image/png;base64,{image_base64}"
+                        data_url = self._image_src(picture_blob, 'image/png')
                         
                         return {
                             "id": str(uuid.uuid4()),
@@ -2089,8 +2304,7 @@ class PPTXImporter:
                                     # Extract picture from layout background
                                     blob = self._try_extract_picture_fill_blob_for_part(getattr(layout, 'part', None), layout_fill)
                                     if blob:
-                                        image_base64 = base64.b64encode(blob).decode('utf-8')
-                                        data_url = f"data:image/png;base64,{image_base64}"
+                                        data_url = self._image_src(blob, 'image/png')
                                         return {
                                             "id": str(uuid.uuid4()),
                                             "type": "Background",
@@ -2123,8 +2337,7 @@ class PPTXImporter:
                                                 elif master_fill.type == MSO_FILL_TYPE.PICTURE:
                                                     blob = self._try_extract_picture_fill_blob_for_part(getattr(master, 'part', None), master_fill)
                                                     if blob:
-                                                        image_base64 = base64.b64encode(blob).decode('utf-8')
-                                                        data_url = f"data:image/png;base64,{image_base64}"
+                                                        data_url = self._image_src(blob, 'image/png')
                                                         return {
                                                             "id": str(uuid.uuid4()),
                                                             "type": "Background",
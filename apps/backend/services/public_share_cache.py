@@ -0,0 +1,193 @@
+"""
+Caching and access-count buffering for the public share read path.
+
+Every viewer of ``/api/public/deck/{short_code}`` used to cost three Supabase
+round trips: the ``record_share_access`` RPC (validate the code, bump its
+counters, return the deck UUID), a full ``decks`` select and a
+``deck_shares`` select. ``DeckSharingService.get_public_deck`` now reads
+through these pieces:
+
+- ``TTLCache`` for share codes (one projected ``deck_shares`` select) and
+  deck version probes, and as an LRU for deck bodies keyed by
+  (short_code, deck version), so an edit is served as soon as the version
+  probe sees it.
+- ``ShareAccessBuffer``: access counts per share code, flushed in batches by
+  a background thread instead of one RPC per view.
+- ``make_etag`` / ``etag_matches`` for conditional requests (304).
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Revoked/expired links keep working for at most this long on a warm process
+PUBLIC_SHARE_TTL = float(os.getenv("PUBLIC_SHARE_TTL", "30"))
+# Deck edits show up on public links after at most this long
+PUBLIC_DECK_VERSION_TTL = float(os.getenv("PUBLIC_DECK_VERSION_TTL", "2"))
+PUBLIC_DECK_CACHE_SIZE = int(os.getenv("PUBLIC_DECK_CACHE_SIZE", "64"))
+SHARE_ACCESS_FLUSH_INTERVAL = float(os.getenv("SHARE_ACCESS_FLUSH_INTERVAL", "10"))
+SHARE_ACCESS_FLUSH_MAX_PENDING = int(os.getenv("SHARE_ACCESS_FLUSH_MAX_PENDING", "500"))
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU whose entries expire after ``ttl`` seconds (``ttl=None``: never)."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (self.ttl is not None and now - entry[0] > self.ttl):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Cached value, or ``loader()`` stored under ``key`` (None results are cached too)."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+class ShareAccessBuffer:
+    """Per-share-code access counts, handed to ``flush_fn`` in batches from a daemon thread.
+
+    A batch is flushed every ``interval`` seconds, or sooner once
+    ``max_pending`` accesses are waiting. ``flush_fn`` may consume ``counts``
+    as it writes them; whatever is left in it when it raises is put back and
+    retried on the next flush.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[Dict[str, int]], None],
+        interval: float = SHARE_ACCESS_FLUSH_INTERVAL,
+        max_pending: int = SHARE_ACCESS_FLUSH_MAX_PENDING,
+    ):
+        self.flush_fn = flush_fn
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: Dict[str, int] = {}
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.recorded = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+
+    def record(self, short_code: str) -> None:
+        with self._lock:
+            self._pending[short_code] = self._pending.get(short_code, 0) + 1
+            self._pending_total += 1
+            self.recorded += 1
+            full = self._pending_total >= self.max_pending
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(target=self._run, name="share-access-flusher", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        with self._lock:
+            counts, self._pending, self._pending_total = self._pending, {}, 0
+        if not counts:
+            return 0
+        total = sum(counts.values())
+        try:
+            self.flush_fn(counts)
+        except Exception as e:
+            logger.warning(f"[SHARE ACCESS] flush of {len(counts)} share codes failed, will retry: {e}")
+            with self._lock:
+                for short_code, count in counts.items():
+                    self._pending[short_code] = self._pending.get(short_code, 0) + count
+                    self._pending_total += count
+                self.failed_flushes += 1
+                self.flushed += total - sum(counts.values())
+            return 0
+        with self._lock:
+            self.flushed += total
+            self.flushes += 1
+        return total
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def stop(self) -> None:
+        """Stop the flusher thread and flush whatever is still pending."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pending": self._pending_total,
+                "recorded": self.recorded,
+                "flushed": self.flushed,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+            }
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:20]
+    # Weak: the body also carries per-request fields (accessed_at)
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
@@ -1,12 +1,13 @@
 import os
 import re
 import asyncio
-import aiohttp
 import urllib.parse
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 from serpapi import GoogleSearch
 from services.image_validator import ImageValidator
+from services.image_search_cache import get_image_search_cache
+from utils.http_client import get_http_session
 
 # Load environment variables
 load_dotenv()
@@ -22,40 +23,16 @@ class SerpAPIService:
         
         if not self.is_available:
             print("Warning: SERPAPI_API_KEY not set. SerpAPI service will not be available.")
-        
-        # Create a persistent session for better performance
-        self._session = None
 
     async def _get_session(self):
-        """Get or create aiohttp session."""
-        if self._session is None:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        """Shared pooled HTTP session (see utils.http_client); not owned by this service."""
+        return get_http_session()
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._session:
-            await self._session.close()
-            self._session = None
-
-    def __del__(self):
-        """Cleanup session when object is garbage collected"""
-        if self._session and not self._session.closed:
-            # Create a new event loop if necessary to close the session
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # Schedule the close for later
-                    asyncio.create_task(self._session.close())
-                else:
-                    # Run it now
-                    loop.run_until_complete(self._session.close())
-            except Exception:
-                # If we can't close properly, at least try to detach
-                if hasattr(self._session, '_connector'):
-                    self._session._connector._close()
+        """Nothing to release: the pooled session outlives this service."""
     
     def _simple_keyword_extraction(self, title: str, content: str) -> str:
         """Simple fallback keyword extraction if AI fails."""
@@ -160,6 +137,24 @@ class SerpAPIService:
         if not query or not self.is_available:
             return {"photos": [], "total_results": 0}
 
+        # Later pages are offset by per_page, so only page 1 is shared across page sizes
+        return await get_image_search_cache().get_or_fetch(
+            'serpapi', query, per_page,
+            lambda: self._fetch_images(query, per_page, page, orientation, size, color),
+            page=page, page_size=per_page if page > 1 else None,
+            orientation=orientation, size=size, color=color,
+        )
+
+    async def _fetch_images(
+        self,
+        query: str,
+        per_page: int = 10,
+        page: int = 1,
+        orientation: Optional[str] = None,
+        size: Optional[str] = None,
+        color: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Uncached SerpAPI Google Images request."""
         # Clamp and sanitize query to avoid huge prompts
         query = (query or "").strip()
         if len(query) > 100:
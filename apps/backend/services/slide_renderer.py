@@ -60,15 +60,52 @@ from pathlib import Path
 import textwrap
 import logging
 import math
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
 logger = logging.getLogger(__name__)
 
+# Bump when rendering output changes so stale cache entries are not reused
+RENDER_CACHE_VERSION = "1"
+RENDER_CACHE_DIRNAME = "cache"
+THUMBNAIL_SIZE = (320, 180)  # 1920/6 x 1080/6
+THUMBNAIL_CACHE_SIZE = 256
+
+
+def slide_content_hash(slide_data: Dict[str, Any], width: int = 1920, height: int = 1080) -> str:
+    """Stable content hash of a slide used as its render cache key"""
+    payload = json.dumps(slide_data, sort_keys=True, separators=(',', ':'), default=str)
+    digest = hashlib.sha256()
+    digest.update(f"v{RENDER_CACHE_VERSION}:{width}x{height}:".encode('utf-8'))
+    digest.update(payload.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _make_thumbnail(img: Image.Image) -> Image.Image:
+    thumb = img.copy()
+    thumb.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+    return thumb
+
+
+# One renderer per worker process; building it probes the filesystem for fonts
+_worker_renderer: Optional["SlideRenderer"] = None
+
+
+def _render_to_cache(cache_dir: str, slide_data: Dict[str, Any], content_hash: str) -> Tuple[Tuple[int, int], str, bytes]:
+    """Process-pool entry point: render a slide into the cache, return its raw thumbnail"""
+    global _worker_renderer
+    if _worker_renderer is None:
+        _worker_renderer = SlideRenderer(output_dir=str(Path(cache_dir).parent))
+    thumb = _worker_renderer._render_slide_to_cache(slide_data, content_hash, Path(cache_dir))
+    return thumb.size, thumb.mode, thumb.tobytes()
+
 class SlideRenderer:
     """Renders slide components to PNG images for visualization and debugging"""
     
     def __init__(self, output_dir: str = "/tmp/slide_renders"):
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
         
         self.canvas_width = 1920
         self.canvas_height = 1080
@@ -120,6 +157,9 @@ class SlideRenderer:
         
         # Font cache
         self._font_cache = {}
+        
+        # Thumbnails of cached renders, keyed by slide content hash (insertion-ordered LRU)
+        self._thumbnail_cache: Dict[str, Image.Image] = {}
 
     def _resolve_color(self, value: Optional[str]) -> Optional[str]:
         """Normalize color to #RRGGBB, return None for transparent/none."""
@@ -217,6 +257,22 @@ class SlideRenderer:
         Returns:
             Path to the rendered PNG file
         """
+        img, report = self.render_slide_image(slide_data)
+        
+        # Save image
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"slide_{deck_uuid or 'test'}_{slide_index}_{timestamp}.png"
+        filepath = self.output_dir / filename
+        self._save_render(img, report, filepath)
+        return str(filepath)
+    
+    def render_slide_image(self, slide_data: Dict[str, Any]) -> Tuple[Image.Image, Dict[str, Any]]:
+        """
+        Render a slide in memory without touching disk
+        
+        Returns:
+            (image, report) where report holds overlap/overflow diagnostics
+        """
         # Create canvas
         img = Image.new('RGB', (self.canvas_width, self.canvas_height), color='white')
         draw = ImageDraw.Draw(img)
@@ -288,31 +344,31 @@ class SlideRenderer:
         # Add debug info
         self._add_debug_info(draw, slide_data, overlaps, text_overflows)
         
-        # Save image
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"slide_{deck_uuid or 'test'}_{slide_index}_{timestamp}.png"
-        filepath = self.output_dir / filename
-        
+        report = {
+            'slide_id': slide_data.get('id'),
+            'overlaps': overlaps,
+            'text_overflows': text_overflows,
+            'component_count': len(components)
+        }
+        return img, report
+    
+    def _save_render(self, img: Image.Image, report: Dict[str, Any], filepath: Path) -> None:
+        """Write a rendered slide and, when there are issues, its overlap report"""
         img.save(filepath, 'PNG', quality=95)
         logger.info(f"Rendered slide to: {filepath}")
         
         # Also save overlap report - include text overflow issues
+        overlaps = report.get('overlaps') or []
+        text_overflows = report.get('text_overflows') or []
         if overlaps or text_overflows:
             report_path = filepath.with_suffix('.json')
             with open(report_path, 'w') as f:
-                json.dump({
-                    'slide_id': slide_data.get('id'),
-                    'overlaps': overlaps,
-                    'text_overflows': text_overflows,
-                    'component_count': len(components)
-                }, f, indent=2)
+                json.dump(report, f, indent=2)
             
             if overlaps:
                 logger.warning(f"Found {len(overlaps)} overlaps! Report saved to: {report_path}")
             if text_overflows:
                 logger.warning(f"Found {len(text_overflows)} text overflow issues! Report saved to: {report_path}")
-        
-        return str(filepath)
     
     def _get_z_index(self, component: Dict[str, Any]) -> int:
         """Get z-index for component type"""
@@ -1890,42 +1946,177 @@ class SlideRenderer:
         # For multi-line text, check if it fits with a small margin
         return height_needed > (available_height * 1.05)  # 5% margin
     
-    def render_deck(self, deck_data: Dict[str, Any]) -> List[str]:
-        """Render all slides in a deck"""
-        rendered_files = []
+    def render_deck(
+        self,
+        deck_data: Dict[str, Any],
+        parallel: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Render all slides in a deck
+        
+        Slides are rendered into a content-addressed cache under
+        ``output_dir/cache`` keyed by the slide's content hash, so only slides
+        that changed since the last call are re-rendered. Changed slides are
+        fanned out to a process pool when there is more than one of them.
+        
+        Returns:
+            Paths of the rendered PNG files, in slide order (failed slides are skipped)
+        """
         deck_uuid = deck_data.get('uuid', 'unknown')
+        slides = deck_data.get('slides', []) or []
         
-        for i, slide in enumerate(deck_data.get('slides', [])):
+        slide_hashes: List[Optional[str]] = []
+        for i, slide in enumerate(slides):
             try:
-                filepath = self.render_slide(slide, deck_uuid, i)
-                rendered_files.append(filepath)
+                slide_hashes.append(slide_content_hash(slide, self.canvas_width, self.canvas_height))
             except Exception as e:
-                logger.error(f"Failed to render slide {i}: {e}")
+                logger.error(f"Failed to hash slide {i}: {e}")
+                slide_hashes.append(None)
+        
+        # Work out which slides actually need rendering
+        pending: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        for i, (slide, content_hash) in enumerate(zip(slides, slide_hashes)):
+            if content_hash and content_hash not in pending and not self._cache_path(content_hash).exists():
+                pending[content_hash] = (i, slide)
+        
+        cached_count = sum(1 for h in slide_hashes if h) - len(pending)
+        logger.info(
+            f"Rendering deck {deck_uuid}: {len(pending)} changed slide(s), {cached_count} cached"
+        )
+        
+        rendered = self._render_pending(pending, parallel, max_workers)
+        
+        rendered_files = []
+        thumbnails = []
+        for i, content_hash in enumerate(slide_hashes):
+            if not content_hash:
+                continue
+            if content_hash in pending and content_hash not in rendered:
+                continue  # Render failed, already logged
+            thumb = rendered.get(content_hash) or self._load_thumbnail(content_hash)
+            if thumb is None:
+                continue
+            rendered_files.append(str(self._cache_path(content_hash)))
+            thumbnails.append((i, thumb))
         
         # Create summary image with all slides
-        if rendered_files:
-            self._create_deck_summary(rendered_files, deck_uuid)
+        if thumbnails:
+            self._create_deck_summary(thumbnails, deck_uuid)
         
         return rendered_files
     
-    def _create_deck_summary(self, slide_images: List[str], deck_uuid: str):
-        """Create a summary image with thumbnails of all slides"""
-        # Load all images
-        images = []
-        for path in slide_images:
+    def _cache_dir(self) -> Path:
+        cache_dir = self.output_dir / RENDER_CACHE_DIRNAME
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir
+    
+    def _cache_path(self, content_hash: str) -> Path:
+        return self._cache_dir() / f"{content_hash}.png"
+    
+    def _load_thumbnail(self, content_hash: str) -> Optional[Image.Image]:
+        """Return a cached thumbnail, regenerating it from the full render if missing"""
+        thumb = self._thumbnail_cache.pop(content_hash, None)
+        if thumb is not None:
+            self._thumbnail_cache[content_hash] = thumb
+            return thumb
+        
+        thumb_path = self._cache_dir() / f"{content_hash}.thumb.png"
+        try:
+            if thumb_path.exists():
+                with Image.open(thumb_path) as f:
+                    thumb = f.convert('RGB')
+            else:
+                with Image.open(self._cache_path(content_hash)) as f:
+                    thumb = _make_thumbnail(f.convert('RGB'))
+                thumb.save(thumb_path, 'PNG')
+        except Exception as e:
+            logger.error(f"Failed to load cached render {content_hash}: {e}")
+            return None
+        
+        self._remember_thumbnail(content_hash, thumb)
+        return thumb
+    
+    def _remember_thumbnail(self, content_hash: str, thumb: Image.Image) -> None:
+        self._thumbnail_cache[content_hash] = thumb
+        while len(self._thumbnail_cache) > THUMBNAIL_CACHE_SIZE:
+            self._thumbnail_cache.pop(next(iter(self._thumbnail_cache)))
+    
+    def _render_pending(
+        self,
+        pending: Dict[str, Tuple[int, Dict[str, Any]]],
+        parallel: bool,
+        max_workers: Optional[int],
+    ) -> Dict[str, Image.Image]:
+        """Render changed slides into the cache and return their thumbnails by hash"""
+        results: Dict[str, Image.Image] = {}
+        if not pending:
+            return results
+        
+        cache_dir = str(self._cache_dir())
+        jobs = [(content_hash, index, slide) for content_hash, (index, slide) in pending.items()]
+        
+        if parallel and len(jobs) > 1:
+            workers = max(1, min(len(jobs), max_workers or (os.cpu_count() or 1)))
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = {
+                        pool.submit(_render_to_cache, cache_dir, slide, content_hash): (content_hash, index)
+                        for content_hash, index, slide in jobs
+                    }
+                    for future in as_completed(futures):
+                        content_hash, index = futures[future]
+                        try:
+                            size, mode, data = future.result()
+                            results[content_hash] = Image.frombytes(mode, size, data)
+                        except BrokenProcessPool:
+                            raise
+                        except Exception as e:
+                            logger.error(f"Failed to render slide {index}: {e}")
+            except (BrokenProcessPool, OSError) as e:
+                # Pool could not start (restricted sandbox, fork limits): fall back to serial
+                logger.warning(f"Render pool unavailable ({e}); rendering serially")
+                jobs = [job for job in jobs if job[0] not in results]
+            else:
+                jobs = []
+        
+        for content_hash, index, slide in jobs:
             try:
-                img = Image.open(path)
-                images.append(img)
+                thumb = self._render_slide_to_cache(slide, content_hash, Path(cache_dir))
+                results[content_hash] = thumb
             except Exception as e:
-                logger.error(f"Failed to load image {path}: {e}")
+                logger.error(f"Failed to render slide {index}: {e}")
         
-        if not images:
+        for content_hash, thumb in results.items():
+            self._remember_thumbnail(content_hash, thumb)
+        return results
+    
+    def _render_slide_to_cache(self, slide_data: Dict[str, Any], content_hash: str, cache_dir: Path) -> Image.Image:
+        """Render one slide into the cache and return its thumbnail"""
+        img, report = self.render_slide_image(slide_data)
+        
+        # Write to a temp name first so a half-written file is never treated as a cache hit
+        final_path = cache_dir / f"{content_hash}.png"
+        tmp_path = cache_dir / f".{content_hash}.{os.getpid()}.tmp.png"
+        self._save_render(img, report, tmp_path)
+        os.replace(tmp_path, final_path)
+        tmp_report = tmp_path.with_suffix('.json')
+        if tmp_report.exists():
+            os.replace(tmp_report, final_path.with_suffix('.json'))
+        
+        thumb = _make_thumbnail(img)
+        thumb.save(cache_dir / f"{content_hash}.thumb.png", 'PNG')
+        return thumb
+    
+    def _create_deck_summary(self, thumbnails: List[Tuple[int, Image.Image]], deck_uuid: str):
+        """Create a summary image from in-memory (slide_index, thumbnail) pairs"""
+        if not thumbnails:
             return
         
         # Create thumbnail grid
-        thumb_size = (320, 180)  # 1920/6 x 1080/6
+        thumb_size = THUMBNAIL_SIZE
         cols = 4
-        rows = (len(images) + cols - 1) // cols
+        rows = (len(thumbnails) + cols - 1) // cols
         
         summary_width = cols * thumb_size[0] + (cols + 1) * 20
         summary_height = rows * thumb_size[1] + (rows + 1) * 20 + 60  # Extra space for title
@@ -1940,24 +2131,20 @@ class SlideRenderer:
         # Add thumbnails
         x_offset = 20
         y_offset = 60
+        label_font = self.get_font('Arial', 12)
         
-        for i, img in enumerate(images):
-            # Create thumbnail
-            thumb = img.copy()
-            thumb.thumbnail(thumb_size, Image.Resampling.LANCZOS)
-            
+        for position, (slide_index, thumb) in enumerate(thumbnails):
             # Paste thumbnail
             summary_img.paste(thumb, (x_offset, y_offset))
             
             # Add slide number
-            label_font = self.get_font('Arial', 12)
-            draw.text((x_offset + 5, y_offset + 5), f"Slide {i + 1}", 
+            draw.text((x_offset + 5, y_offset + 5), f"Slide {slide_index + 1}", 
                      font=label_font, fill='#FFFFFF', 
                      stroke_width=1, stroke_fill='#000000')
             
             # Move to next position
             x_offset += thumb_size[0] + 20
-            if (i + 1) % cols == 0:
+            if (position + 1) % cols == 0:
                 x_offset = 20
                 y_offset += thumb_size[1] + 20
         
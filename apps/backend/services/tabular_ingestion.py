@@ -0,0 +1,500 @@
+"""
+Streaming ingestion of uploaded CSV/XLSX data into typed NumPy columns.
+
+Uploaded data files used to be read whole into Python lists of lists, with
+numeric columns guessed from the first 10 rows (and Excel files not read at
+all). ``ingest_csv`` / ``ingest_xlsx`` stream the rows instead (csv.reader
+over the bytes, openpyxl in read_only mode) in chunks of ``INGEST_CHUNK_ROWS``:
+
+- each chunk is transposed into columns and parsed with one vectorized
+  ``float64`` conversion per column, falling back to per-value cleaning
+  ("$1,200", "35%", "(40)") only for chunks that need it;
+- per-column stats (non-null/null counts, min/max/sum, mean/std merged with
+  Chan's parallel update, distinct text values) and type inference are
+  accumulated in the same pass;
+- only the first ``max_rows`` rows are kept in memory (a float64 buffer per
+  numeric column, strings only for text/date columns); stats still cover the
+  whole file.
+
+``TabularData.summary()`` is the compact form handed to prompts; chart code
+reads ``labels()`` / ``numeric()`` columns.
+"""
+
+import csv
+import io
+import logging
+import math
+import os
+import re
+from datetime import date, datetime, time as dt_time
+from itertools import compress, islice
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rows kept in column buffers per file; stats cover every row regardless
+INGEST_MAX_ROWS = int(os.getenv("INGEST_MAX_ROWS", "200000"))
+INGEST_CHUNK_ROWS = int(os.getenv("INGEST_CHUNK_ROWS", "8192"))
+
+# A column is numeric / date-like when this share of its non-empty values is
+NUMERIC_RATIO = 0.9
+DATE_RATIO = 0.8
+# Date-likeness is judged on the first this-many text values of a column
+DATE_SAMPLE_VALUES = 4096
+DISTINCT_CAP = 1000
+SAMPLE_VALUES = 3
+
+TIME_HEADER_PATTERNS = ('year', 'month', 'date', 'time', 'quarter', 'week', 'day', 'period')
+
+_DATE_RE = re.compile(
+    r'^\s*(\d{4}[-/.]\d{1,2}([-/.]\d{1,2})?'
+    r'|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4}'
+    r'|q[1-4][\s\-]*\d{2,4}|\d{4}[\s\-]*q[1-4]'
+    r'|(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?([\s\-,]+\d{1,4})*)\b',
+    re.IGNORECASE,
+)
+
+CSVSource = Union[bytes, bytearray, str, IO]
+
+# Thousands separators, currency and percent signs dropped before parsing numbers
+_NUMBER_NOISE = str.maketrans('', '', ',$%')
+
+
+def _to_number(value: Any) -> float:
+    """Lenient numeric parse; NaN for anything that is not a number."""
+    if isinstance(value, bool):
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return math.nan
+    text = value.strip()
+    negative = text.startswith('(') and text.endswith(')')
+    if negative:
+        text = text[1:-1]
+    text = text.translate(_NUMBER_NOISE).strip()
+    try:
+        number = float(text)
+    except ValueError:
+        return math.nan
+    return -number if negative else number
+
+
+def _parse_float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+def _parse_text_numbers(cells: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """``_to_number`` over a chunk of str cells: (values with NaN for non-numbers, blank mask)."""
+    cleaned = [c.translate(_NUMBER_NOISE).strip() for c in cells]
+    n = len(cleaned)
+    nulls = np.fromiter(map(len, cleaned), dtype=np.intp, count=n) == 0
+    negative = None
+    if '(' in ''.join(cleaned):
+        negative = np.fromiter((c[:1] == '(' and c[-1:] == ')' for c in cleaned), dtype=bool, count=n)
+        cleaned = [c[1:-1].strip() if neg else c for c, neg in zip(cleaned, negative)]
+    filled = [c or 'nan' for c in cleaned]
+    try:
+        values = np.array(filled, dtype=np.float64)
+    except ValueError:
+        # Some cells are text: parse one by one
+        values = np.fromiter(map(_parse_float, filled), dtype=np.float64, count=n)
+    if negative is not None:
+        values[negative] *= -1
+    return values, nulls
+
+
+def _is_null(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _label(value: Any) -> str:
+    return '' if value is None else str(value)
+
+
+def _format_number(value: float) -> str:
+    if math.isnan(value):
+        return ''
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
+
+
+class ColumnBuffer:
+    """One column: a bounded value buffer plus stats accumulated chunk by chunk."""
+
+    def __init__(self, name: str, max_rows: int):
+        self.name = name
+        self.max_rows = max_rows
+        self._values = np.empty(0, dtype=np.float64)
+        self._labels: List[str] = []
+        # Strings are kept only for columns that are not mostly numeric (decided on the first non-empty chunk)
+        self._store_labels: Optional[bool] = None
+        self.retained = 0
+
+        self.non_null = 0
+        self.nulls = 0
+        self.numeric = 0
+        self.date_like = 0
+        self.date_checked = 0
+        self.text_only = False
+        # Cleared once a chunk needed blank/"$1,200"-style handling; later chunks go straight there
+        self._plain_numbers = True
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._distinct: set = set()
+        self.distinct_capped = False
+        self.sample: List[str] = []
+
+    def add_chunk(self, raw: Sequence[Any], text_cells: bool = False) -> None:
+        """Parse and accumulate one chunk of cells (``text_cells``: all cells are str, as from CSV)."""
+        n = len(raw)
+        if self.text_only:
+            values = None
+            if text_cells:
+                # csv.reader cells: only '' is blank (whitespace-only cells count as text here)
+                nulls = np.fromiter(map(len, raw), dtype=np.intp, count=n) == 0
+            else:
+                nulls = np.fromiter((_is_null(v) for v in raw), dtype=bool, count=n)
+            numeric_mask = np.zeros(n, dtype=bool)
+        else:
+            try:
+                if not self._plain_numbers:
+                    raise ValueError
+                # Clean numbers (and None for empty xlsx cells) convert in one call
+                values = np.array(raw, dtype=np.float64)
+                nulls = np.isnan(values)
+            except (TypeError, ValueError):
+                self._plain_numbers = False
+                if text_cells:
+                    values, nulls = _parse_text_numbers(raw)
+                else:
+                    values = np.fromiter((_to_number(v) for v in raw), dtype=np.float64, count=n)
+                    nulls = np.fromiter((_is_null(v) for v in raw), dtype=bool, count=n)
+            numeric_mask = np.isfinite(values)
+            nulls |= np.isinf(values)
+        text_mask = ~(nulls | numeric_mask)
+
+        non_null = n - int(nulls.sum())
+        numeric = int(numeric_mask.sum())
+        self.nulls += n - non_null
+        self.non_null += non_null
+        self.numeric += numeric
+
+        if self._store_labels is None and non_null:
+            mostly_numeric = numeric >= NUMERIC_RATIO * non_null
+            self._store_labels = not mostly_numeric
+            # Clearly textual columns skip numeric parsing from here on
+            self.text_only = numeric < 0.5 * non_null
+            if mostly_numeric:
+                self._labels = []
+
+        if numeric:
+            self._merge_stats(values[numeric_mask])
+
+        if text_mask.any():
+            text_idx = np.flatnonzero(text_mask)
+            if len(self.sample) < SAMPLE_VALUES:
+                for i in text_idx[:SAMPLE_VALUES * 4]:
+                    label = _label(raw[i])
+                    if label not in self.sample and len(self.sample) < SAMPLE_VALUES:
+                        self.sample.append(label)
+            if self.date_checked < DATE_SAMPLE_VALUES:
+                check = text_idx[:DATE_SAMPLE_VALUES - self.date_checked]
+                self.date_checked += len(check)
+                self.date_like += sum(
+                    1 for i in check
+                    if isinstance(raw[i], (datetime, date)) or _DATE_RE.match(_label(raw[i]))
+                )
+            if not self.distinct_capped:
+                if text_cells:
+                    self._distinct.update(compress(raw, text_mask))
+                else:
+                    self._distinct.update(_label(raw[i]) for i in text_idx)
+                if len(self._distinct) > DISTINCT_CAP:
+                    self.distinct_capped = True
+                    self._distinct = set()
+        elif numeric and len(self.sample) < SAMPLE_VALUES:
+            for v in values[numeric_mask][:SAMPLE_VALUES]:
+                label = _format_number(float(v))
+                if label not in self.sample and len(self.sample) < SAMPLE_VALUES:
+                    self.sample.append(label)
+
+        self._retain(raw, values, text_cells)
+
+    def _merge_stats(self, x: np.ndarray) -> None:
+        m = len(x)
+        mean = float(x.mean())
+        m2 = float(((x - mean) ** 2).sum())
+        n = self.numeric - m
+        total = n + m
+        delta = mean - self._mean
+        self._mean += delta * m / total
+        self._m2 += m2 + delta * delta * n * m / total
+        self.sum += float(x.sum())
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+
+    def _retain(self, raw: Sequence[Any], values: Optional[np.ndarray], text_cells: bool) -> None:
+        room = self.max_rows - self.retained
+        if room <= 0:
+            return
+        take = min(room, len(raw))
+        if values is not None:
+            needed = self.retained + take
+            if needed > len(self._values):
+                grown = np.empty(min(self.max_rows, max(needed, 2 * len(self._values))), dtype=np.float64)
+                grown[:self.retained] = self._values[:self.retained]
+                self._values = grown
+            self._values[self.retained:needed] = values[:take]
+        if self._store_labels is not False:
+            self._labels.extend(raw[:take] if text_cells else (_label(v) for v in raw[:take]))
+        self.retained += take
+
+    @property
+    def kind(self) -> str:
+        if not self.non_null:
+            return 'empty'
+        if self.numeric >= NUMERIC_RATIO * self.non_null:
+            return 'number'
+        if self.date_checked and self.date_like >= DATE_RATIO * self.date_checked:
+            return 'date'
+        return 'text'
+
+    @property
+    def is_time(self) -> bool:
+        return self.kind == 'date' or any(p in self.name.lower() for p in TIME_HEADER_PATTERNS)
+
+    def numeric_values(self) -> np.ndarray:
+        """Retained values as float64, NaN where a cell is empty or not a number."""
+        if self.text_only:
+            return np.full(self.retained, np.nan)
+        return self._values[:self.retained]
+
+    def labels(self) -> List[str]:
+        """Retained values as display strings."""
+        if self._store_labels is not False:
+            return list(self._labels)
+        return [_format_number(float(v)) for v in self.numeric_values()]
+
+    def summary(self) -> Dict[str, Any]:
+        info: Dict[str, Any] = {
+            'name': self.name,
+            'type': self.kind,
+            'non_null': self.non_null,
+            'nulls': self.nulls,
+        }
+        if self.kind == 'number':
+            std = math.sqrt(self._m2 / (self.numeric - 1)) if self.numeric > 1 else 0.0
+            info.update(min=self.min, max=self.max, sum=self.sum, mean=self._mean, std=std)
+        if self.kind != 'number':
+            info['distinct'] = f'{DISTINCT_CAP}+' if self.distinct_capped else len(self._distinct)
+        if self.sample:
+            info['sample'] = list(self.sample)
+        return info
+
+
+class TabularData:
+    """Ingested table: headers, per-column buffers and stats."""
+
+    def __init__(self, headers: List[str], columns: List[ColumnBuffer], row_count: int, fmt: str, ragged_rows: int = 0):
+        self.headers = headers
+        self.columns = columns
+        self.row_count = row_count
+        self.format = fmt
+        self.ragged_rows = ragged_rows
+
+    @property
+    def retained_rows(self) -> int:
+        return self.columns[0].retained if self.columns else 0
+
+    @property
+    def truncated(self) -> bool:
+        return self.retained_rows < self.row_count
+
+    @property
+    def numeric_columns(self) -> List[int]:
+        return [i for i, col in enumerate(self.columns) if col.kind == 'number']
+
+    @property
+    def label_column(self) -> int:
+        """First time column (by header or values), else first text column, else the first column."""
+        for i, col in enumerate(self.columns):
+            if col.is_time and col.kind != 'empty':
+                return i
+        for i, col in enumerate(self.columns):
+            if col.kind == 'text':
+                return i
+        return 0
+
+    @property
+    def has_time(self) -> bool:
+        return any(col.is_time for col in self.columns)
+
+    def numeric(self, column: int) -> np.ndarray:
+        return self.columns[column].numeric_values()
+
+    def labels(self, column: int) -> List[str]:
+        return self.columns[column].labels()
+
+    def preview_rows(self, limit: int = 20) -> List[List[str]]:
+        columns = [col.labels()[:limit] for col in self.columns]
+        return [list(row) for row in zip(*columns)]
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact, JSON-serializable description of the table."""
+        return {
+            'format': self.format,
+            'row_count': self.row_count,
+            'column_count': len(self.columns),
+            'retained_rows': self.retained_rows,
+            'truncated': self.truncated,
+            'numeric_columns': self.numeric_columns,
+            'label_column': self.label_column,
+            'columns': [col.summary() for col in self.columns],
+        }
+
+    def describe(self, max_columns: int = 8) -> str:
+        """One-line column summary for prompts."""
+        parts = []
+        for col in self.columns[:max_columns]:
+            if col.kind == 'number' and col.numeric:
+                parts.append(f"{col.name} (number, {col.min:g} to {col.max:g}, mean {col._mean:.4g})")
+            else:
+                parts.append(f"{col.name} ({col.kind})")
+        if len(self.columns) > max_columns:
+            parts.append(f"... {len(self.columns) - max_columns} more")
+        return "Columns: " + ", ".join(parts)
+
+
+def _clean_headers(row: Sequence[Any]) -> List[str]:
+    headers: List[str] = []
+    seen: Dict[str, int] = {}
+    for i, value in enumerate(row):
+        name = _label(value).strip() or f"Column {i + 1}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name} ({seen[name]})"
+        else:
+            seen[name] = 1
+        headers.append(name)
+    return headers
+
+
+def ingest_rows(
+    rows: Iterable[Sequence[Any]],
+    fmt: str,
+    max_rows: int = INGEST_MAX_ROWS,
+    limit: Optional[int] = None,
+    text_cells: bool = False,
+) -> Optional[TabularData]:
+    """
+    Ingest rows whose first non-empty row is the header.
+
+    Args:
+        rows: Row iterator (lists/tuples of cell values); empty rows are skipped
+        fmt: Format label for the summary ('csv', 'xlsx')
+        max_rows: Data rows kept in memory
+        limit: Stop reading after this many data rows
+        text_cells: Every cell is a str (csv.reader output), enabling vectorized parsing
+
+    Returns:
+        TabularData, or None if there is no header row
+    """
+    iterator: Iterator[Sequence[Any]] = filter(None, rows)
+    header = next(iterator, None)
+    if header is None:
+        return None
+    headers = _clean_headers(header)
+    width = len(headers)
+    columns = [ColumnBuffer(name, max_rows) for name in headers]
+    if limit is not None:
+        iterator = islice(iterator, limit)
+    pad = '' if text_cells else None
+    row_count = 0
+    ragged_rows = 0
+
+    while True:
+        chunk: List[Sequence[Any]] = list(islice(iterator, INGEST_CHUNK_ROWS))
+        if not chunk:
+            break
+        row_count += len(chunk)
+        if any(map(width.__ne__, map(len, chunk))):
+            ragged = [i for i, row in enumerate(chunk) if len(row) != width]
+            ragged_rows += len(ragged)
+            for i in ragged:
+                row = chunk[i]
+                chunk[i] = tuple(row[:width]) + (pad,) * (width - len(row))
+        for column, values in zip(columns, zip(*chunk)):
+            column.add_chunk(values, text_cells)
+
+    table = TabularData(headers, columns, row_count, fmt, ragged_rows)
+    if table.truncated:
+        logger.info(f"[INGEST] {fmt}: kept {table.retained_rows} of {row_count} rows in memory")
+    return table
+
+
+def ingest_csv(source: CSVSource, max_rows: int = INGEST_MAX_ROWS, limit: Optional[int] = None) -> Optional[TabularData]:
+    """Ingest CSV from bytes, text or an open text/binary file."""
+    if isinstance(source, (bytes, bytearray)):
+        stream: IO = io.TextIOWrapper(io.BytesIO(source), encoding='utf-8-sig', errors='replace', newline='')
+    elif isinstance(source, str):
+        stream = io.StringIO(source, newline='')
+    elif isinstance(source, io.TextIOBase):
+        stream = source
+    else:
+        stream = io.TextIOWrapper(source, encoding='utf-8-sig', errors='replace', newline='')
+    return ingest_rows(csv.reader(stream), 'csv', max_rows=max_rows, limit=limit, text_cells=True)
+
+
+def ingest_csv_file(path: str, max_rows: int = INGEST_MAX_ROWS, limit: Optional[int] = None) -> Optional[TabularData]:
+    with open(path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+        return ingest_csv(f, max_rows=max_rows, limit=limit)
+
+
+def _xlsx_rows(worksheet) -> Iterator[Sequence[Any]]:
+    for row in worksheet.iter_rows(values_only=True):
+        if any(cell is not None and cell != "" for cell in row):
+            # Time-of-day cells have no date part; show them as text
+            yield tuple(cell.isoformat() if isinstance(cell, dt_time) else cell for cell in row)
+
+
+def ingest_xlsx(
+    source: Union[bytes, bytearray, str, IO],
+    max_rows: int = INGEST_MAX_ROWS,
+    limit: Optional[int] = None,
+    sheet: Optional[str] = None,
+) -> Optional[TabularData]:
+    """Ingest one worksheet (the active one unless ``sheet`` is given) of an .xlsx workbook."""
+    import openpyxl
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        return ingest_rows(_xlsx_rows(worksheet), 'xlsx', max_rows=max_rows, limit=limit)
+    finally:
+        workbook.close()
+
+
+def ingest_data_file(
+    content: Union[bytes, str],
+    filename: str = '',
+    mime_type: str = '',
+    max_rows: int = INGEST_MAX_ROWS,
+    limit: Optional[int] = None,
+) -> Optional[TabularData]:
+    """Dispatch on file name / MIME type: .xlsx/.xlsm via openpyxl, everything else as CSV."""
+    name = (filename or '').lower()
+    if name.endswith(('.xlsx', '.xlsm')) or 'spreadsheetml' in (mime_type or ''):
+        if isinstance(content, str):
+            return None  # Not raw workbook bytes
+        return ingest_xlsx(content, max_rows=max_rows, limit=limit)
+    return ingest_csv(content, max_rows=max_rows, limit=limit)
@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import logging
 
+from services.font_manifest import get_font_manifest
+
 logger = logging.getLogger(__name__)
 
 # Lazy import within methods to avoid heavy imports during module load
@@ -84,6 +86,14 @@ class UnifiedFontService:
         self.pixelbuddha_fonts = self._load_pixelbuddha_fonts()
         self.designer_fonts = self._load_designer_fonts()
         self.all_fonts = {**self.pixelbuddha_fonts, **self.designer_fonts}
+        # Catalog-order candidates for the hero/body fallbacks, filtered once instead of per request
+        self._clean_sans_serif = [
+            font_id for font_id, font_data in self.all_fonts.items()
+            if font_data.get('category') in ['sans', 'serif'] and not self._is_inappropriate(font_id)
+        ]
+        self._clean_sans = [
+            font_id for font_id in self._clean_sans_serif if self.all_fonts[font_id].get('category') == 'sans'
+        ]
         logger.info(f"Loaded {len(self.pixelbuddha_fonts)} PixelBuddha fonts and {len(self.designer_fonts)} Designer fonts")
     
     def _load_pixelbuddha_fonts(self) -> Dict:
@@ -297,12 +307,8 @@ class UnifiedFontService:
         
         # Add appropriate fonts from the full collection
         if context['style'] in ['professional', 'modern']:
-            # Add clean sans and serif fonts
-            for font_id, font_data in self.all_fonts.items():
-                if font_data.get('category') in ['sans', 'serif'] and not self._is_inappropriate(font_id):
-                    fonts.append(font_id)
-                    if len(fonts) >= 20:
-                        break
+            # Add clean sans and serif fonts (at least one, up to 20 fonts in total)
+            fonts.extend(self._clean_sans_serif[:max(20 - len(fonts), 1)])
         
         # Shuffle for variety
         random.shuffle(fonts)
@@ -326,12 +332,8 @@ class UnifiedFontService:
         fonts.extend(self.PREMIUM_FONTS['body']['professional'])
         fonts.extend(self.PREMIUM_FONTS['body']['readable'])
         
-        # Add more readable fonts from collection
-        for font_id, font_data in self.all_fonts.items():
-            if font_data.get('category') == 'sans' and not self._is_inappropriate(font_id):
-                fonts.append(font_id)
-                if len(fonts) >= 20:
-                    break
+        # Add more readable fonts from collection (at least one, up to 20 fonts in total)
+        fonts.extend(self._clean_sans[:max(20 - len(fonts), 1)])
         
         # Shuffle for variety
         random.shuffle(fonts)
@@ -473,30 +475,8 @@ class UnifiedFontService:
         if not font_data:
             return None
         
-        source = font_data.get('source', 'pixelbuddha')
-        
-        if source == 'pixelbuddha':
-            # PixelBuddha fonts have 'files' field
-            files = font_data.get('files', [])
-            if files:
-                # Just return the path directly - it's already complete
-                return files[0].get('path', '')
-        else:
-            # Designer fonts have 'styles' field
-            styles = font_data.get('styles', {})
-            
-            # Try requested style first
-            if style in styles and styles[style]:
-                file_info = styles[style][0]  # Get first file for this style
-                return f"assets/fonts/designer/{file_info['path']}"
-            
-            # Fall back to regular or first available style
-            for fallback in ['regular', 'normal', list(styles.keys())[0] if styles else None]:
-                if fallback and fallback in styles and styles[fallback]:
-                    file_info = styles[fallback][0]
-                    return f"assets/fonts/designer/{file_info['path']}"
-        
-        return None
+        # Only files that exist on disk; see services/font_manifest.py
+        return get_font_manifest().resolve(font_id, style, font_data.get('source'))
     
     def get_statistics(self) -> Dict:
         """Get statistics about the font collection"""
@@ -0,0 +1,76 @@
+"""
+Test the frontend render client against the offline stub renderer.
+Verifies slim payloads, batching and the content-hash cache.
+"""
+
+import asyncio
+import json
+
+from services.frontend_render_client import FrontendRenderClient, build_render_payload
+from services.frontend_render_stub import PLACEHOLDER_PNG, StubRenderServer
+from utils.http_client import close_http_sessions
+
+
+def make_deck(slide_count: int = 20) -> dict:
+    return {
+        "uuid": "deck-1",
+        "name": "Render Client Test",
+        "size": {"width": 1920, "height": 1080},
+        "data": {
+            "theme": {"fonts": {"heading": "Inter"}},
+            "outline": {"slides": ["x" * 5000] * slide_count},
+        },
+        "notes": {"story_arc": "y" * 5000},
+        "slides": [
+            {"id": f"s{i}", "components": [{"id": "t", "type": "TiptapTextBlock", "props": {"text": f"Slide {i}"}}]}
+            for i in range(slide_count)
+        ],
+    }
+
+
+async def _run_render_client_checks():
+    print("\n=== TESTING FRONTEND RENDER CLIENT ===\n")
+    deck = make_deck()
+
+    payload = build_render_payload(deck, [3])
+    assert len(payload["deckData"]["slides"]) == 1
+    assert payload["deckData"]["data"] == {"theme": deck["data"]["theme"]}
+    assert "notes" not in payload["deckData"]
+    print(f"Slim payload: {len(json.dumps(payload))} bytes vs full deck {len(json.dumps(deck))} bytes")
+
+    async with StubRenderServer() as server:
+        async with FrontendRenderClient(base_url=server.base_url, batch_size=4) as client:
+            image = await client.render_slide(deck, 3)
+            assert image == PLACEHOLDER_PNG
+            assert len(server.requests) == 1
+            assert len(server.requests[0]["body"]["deckData"]["slides"]) == 1
+
+            # Slide 3 is cached, the other 5 go out in ceil(5 / 4) = 2 batches
+            images = await client.render_slides(deck, [0, 1, 2, 3, 4, 5])
+            assert sorted(images) == [0, 1, 2, 3, 4, 5]
+            assert len(server.requests) == 3
+            assert client.stats["cache_hits"] == 1
+
+            # Editing one slide only re-renders that slide
+            deck["slides"][4]["components"][0]["props"]["text"] = "Edited"
+            await client.render_slides(deck, [0, 1, 2, 3, 4, 5])
+            assert len(server.requests) == 4
+            assert server.requests[-1]["body"]["deckData"]["slides"][0]["id"] == "s4"
+
+            # A theme change invalidates every slide
+            deck["data"]["theme"] = {"fonts": {"heading": "Roboto"}}
+            await client.render_slides(deck, [0, 1])
+            assert len(server.requests) == 5
+        await close_http_sessions()
+
+    print(f"Stats: {client.stats}")
+    print("✅ ALL TESTS PASSED")
+
+
+def test_render_client():
+    """Only target slides are sent, batched, and cached by content."""
+    asyncio.run(_run_render_client_checks())
+
+
+if __name__ == "__main__":
+    test_render_client()
@@ -0,0 +1,103 @@
+"""
+Test single-flight behaviour of the shared image-search cache (memory tier only).
+Verifies joiners survive the owner's cancellation, per_page-aware joining and
+that callers on another event loop never join a task bound to this one.
+"""
+
+import asyncio
+import threading
+
+from services.image_search_cache import ImageSearchCache
+
+
+def make_fetch(calls: list, count: int, delay: float = 0.2):
+    async def fetch():
+        calls.append(count)
+        await asyncio.sleep(delay)
+        return {"photos": [{"id": i} for i in range(count)], "total_results": count}
+    return fetch
+
+
+async def _owner_timeout_checks() -> None:
+    cache = ImageSearchCache(path=None)
+    calls: list = []
+    fetch = make_fetch(calls, 5)
+
+    owner = asyncio.create_task(asyncio.wait_for(cache.get_or_fetch("pexels", "team", 5, fetch), timeout=0.05))
+    await asyncio.sleep(0.01)
+    joiner = asyncio.create_task(cache.get_or_fetch("pexels", "team", 5, fetch))
+
+    try:
+        await owner
+        raise AssertionError("owner should have timed out")
+    except asyncio.TimeoutError:
+        pass
+    result = await joiner
+    assert not joiner.cancelled()
+    assert result["cache"] == "shared"
+    assert len(result["photos"]) == 5
+    assert calls == [5]
+
+    # The abandoned call still filled the cache
+    cached = await cache.get_or_fetch("pexels", "team", 5, fetch)
+    assert cached["cache"] == "hit"
+    assert calls == [5]
+    print("Owner timeout: joiner got the shared result, one provider call")
+
+
+async def _per_page_checks() -> None:
+    cache = ImageSearchCache(path=None)
+    calls: list = []
+    small = asyncio.create_task(cache.get_or_fetch("pexels", "growth", 5, make_fetch(calls, 5)))
+    await asyncio.sleep(0.01)
+    large = asyncio.create_task(cache.get_or_fetch("pexels", "growth", 20, make_fetch(calls, 20)))
+    await asyncio.sleep(0.01)
+    medium = asyncio.create_task(cache.get_or_fetch("pexels", "growth", 10, make_fetch(calls, 10)))
+    results = await asyncio.gather(small, large, medium)
+    assert calls == [5, 20]
+    assert [(len(r["photos"]), r["cache"]) for r in results] == [(5, "miss"), (20, "miss"), (10, "shared")]
+    print("per_page: a larger request does not join a smaller fetch")
+
+
+async def _other_loop_checks() -> None:
+    cache = ImageSearchCache(path=None)
+    calls: list = []
+    owner = asyncio.create_task(cache.get_or_fetch("pexels", "chart", 5, make_fetch(calls, 5)))
+    await asyncio.sleep(0.01)
+
+    box = {}
+
+    def sync_caller():
+        try:
+            box["result"] = asyncio.run(cache.get_or_fetch("pexels", "chart", 5, make_fetch(calls, 5, delay=0.01)))
+        except BaseException as e:
+            box["error"] = e
+
+    thread = threading.Thread(target=sync_caller)
+    thread.start()
+    await asyncio.to_thread(thread.join)
+    await owner
+    assert "error" not in box, box.get("error")
+    assert box["result"]["cache"] == "miss"
+    assert len(calls) == 2
+    print("Other loop: made its own call instead of joining")
+
+
+def test_owner_cancellation_does_not_cancel_joiners():
+    asyncio.run(_owner_timeout_checks())
+
+
+def test_join_requires_enough_images():
+    asyncio.run(_per_page_checks())
+
+
+def test_other_event_loop_does_not_join():
+    asyncio.run(_other_loop_checks())
+
+
+if __name__ == "__main__":
+    print("\n=== TESTING IMAGE SEARCH CACHE ===\n")
+    test_owner_cancellation_does_not_cancel_joiners()
+    test_join_requires_enough_images()
+    test_other_event_loop_does_not_join()
+    print("✅ ALL TESTS PASSED")
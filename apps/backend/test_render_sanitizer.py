@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Golden-file test for CustomComponent render sanitization.
+
+The corpus is every render function in the RAG knowledge base, plus escaped
+and deliberately broken variants of them (emojis, template literals,
+apostrophes in text children, duplicate declarations, fixed widths, ...).
+For each case, testdata/render_sanitizer_golden.json stores the output of
+every sanitizer step, of ``ComponentValidator._fix_custom_component_render``
+and of ``AISlideGenerator._sanitize_custom_component``. Steps that leave the
+input unchanged are stored as null.
+
+Run:
+    python test_render_sanitizer.py            # compare against the golden file
+    python test_render_sanitizer.py --update   # regenerate it (review the diff!)
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List
+
+from agents.generation.components.ai_generator import AISlideGenerator
+from agents.generation.components.component_validator import ComponentValidator
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_PATH = os.path.join(BACKEND_DIR, "testdata", "render_sanitizer_golden.json")
+KNOWLEDGE_BASE_GLOB = os.path.join(BACKEND_DIR, "agents", "rag", "knowledge_base", "*.json")
+
+VALIDATOR_STEPS = [
+    "_sanitize_render_string",
+    "_normalize_text_literal_fallbacks",
+    "_inject_missing_variable_definitions",
+    "_dedupe_common_declarations",
+    "_normalize_render_dimensions",
+    "_normalize_layout_responsiveness",
+    "_ensure_root_container_styles",
+    "_sanitize_prohibited_apis",
+]
+
+
+def _knowledge_base_renders() -> List[str]:
+    renders = set()
+
+    def walk(obj: Any) -> None:
+        if isinstance(obj, dict):
+            for value in obj.values():
+                walk(value)
+        elif isinstance(obj, list):
+            for value in obj:
+                walk(value)
+        elif isinstance(obj, str) and obj.lstrip().startswith("function render") and len(obj) > 200:
+            renders.add(obj)
+
+    for path in sorted(glob.glob(KNOWLEDGE_BASE_GLOB)):
+        try:
+            with open(path) as f:
+                walk(json.loads(f.read(), strict=False))
+        except ValueError:
+            continue
+    return sorted(renders)
+
+
+# Variants exercising the rewrite paths the knowledge base renders rarely hit
+MUTATORS: Dict[str, Callable[[str], str]] = {
+    "escaped": lambda r: r.replace("\\", "\\\\").replace("\n", "\\n"),
+    "emoji_and_template": lambda r: r.replace("'", "`", 2).replace("props.title", "`${props.title} 🚀`", 1) + "\n// ✨⭐‍",
+    "apostrophes": lambda r: r.replace(
+        "React.createElement('div', {", "React.createElement('div', {}, 'Dyna.co\\'s \"best\" quarter'), React.createElement('div', {", 1
+    ).replace("|| '", "|| 'Goku\\'s \"saga\" ", 1),
+    "duplicates_and_widths": lambda r: r.replace(
+        "{\n", "{\n  const primaryColor = props.primaryColor || '#FFF';\n  const primaryColor = '#000';\n"
+        "  const r = 280;\n  const r = 10;\n  const x = props.width - 80;\n"
+        "  const s = { maxWidth: '640px', whiteSpace: 'nowrap', flexWrap: \"nowrap\", gridTemplateColumns: '1fr 1fr 1fr' };\n"
+        "  const g = { gridTemplateColumns: repeat(3, 1fr), alignItems: 'center', justifyContent: \"center\" };\n", 1
+    ),
+    "overlay_fixes": lambda r: r.replace(
+        "{\n", "{\n  const v = props.variant || defaultVariant;\n  const blurred = { stdDeviation: blur, cx: x, r: r, strokeDasharray: c };\n"
+        "  const w = props.width - padding * 2;\n  const t = rayCount + iconSize;\n", 1
+    ),
+    "prohibited": lambda r: r.replace("{\n", "{\n  setTimeout(() => {}, 10);\n", 1),
+}
+
+
+def build_cases() -> List[Dict[str, str]]:
+    cases = []
+    for index, render in enumerate(_knowledge_base_renders()):
+        cases.append({"id": f"kb{index:02d}", "input": render})
+        for name, mutate in MUTATORS.items():
+            # Every mutator on a few renders; escaping on all of them
+            if name == "escaped" or index % 6 == list(MUTATORS).index(name):
+                cases.append({"id": f"kb{index:02d}-{name}", "input": mutate(render)})
+    return cases
+
+
+def run_case(render: str) -> Dict[str, Any]:
+    validator = ComponentValidator()
+    outputs: Dict[str, Any] = {}
+    for step in VALIDATOR_STEPS:
+        result = getattr(validator, step)(render)
+        outputs[step] = None if result == render else result
+
+    component = {"type": "CustomComponent", "props": {"render": render}}
+    validator._fix_custom_component_render(component)
+    outputs["fix_custom_component_render"] = component["props"]
+
+    component = {"type": "CustomComponent", "props": {"render": render}}
+    AISlideGenerator()._sanitize_custom_component(component)
+    outputs["ai_sanitize_custom_component"] = component["props"]
+    return outputs
+
+
+def golden_mismatches() -> List[str]:
+    with open(GOLDEN_PATH) as f:
+        golden = json.load(f)
+    failures = []
+    for case in golden["cases"]:
+        actual = run_case(case["input"])
+        for step, expected in case["outputs"].items():
+            if actual.get(step) != expected:
+                failures.append(f"{case['id']}: {step}")
+    return failures
+
+
+def test_golden_corpus():
+    failures = golden_mismatches()
+    assert not failures, f"{len(failures)} golden mismatches: {failures[:20]}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update", action="store_true", help="Regenerate the golden file")
+    args = parser.parse_args()
+
+    if args.update:
+        cases = build_cases()
+        for case in cases:
+            case["outputs"] = run_case(case["input"])
+        os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+        with open(GOLDEN_PATH, "w") as f:
+            json.dump({"cases": cases}, f, indent=1, ensure_ascii=False)
+            f.write("\n")
+        print(f"Wrote {len(cases)} cases to {GOLDEN_PATH}")
+        return
+
+    failures = golden_mismatches()
+    if failures:
+        print(f"❌ {len(failures)} golden mismatches:")
+        for failure in failures[:50]:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("✅ Render sanitizer output matches the golden corpus")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Process-wide pooled HTTP client.
+
+Image validation, provider searches and image downloads used to open an
+``aiohttp.ClientSession`` per call (or per service instance), so validating
+50 candidate images cost 50 TCP+TLS handshakes and DNS lookups.
+``get_http_session()`` returns one shared session per event loop:
+
+- connection pool with a global limit (``HTTP_POOL_LIMIT``) and a per-host
+  limit (``HTTP_POOL_LIMIT_PER_HOST``) so one slow CDN can't take every
+  connection;
+- keep-alive (``HTTP_KEEPALIVE_TIMEOUT``) and DNS caching
+  (``HTTP_DNS_CACHE_TTL``).
+
+Callers pass their own headers and ``timeout`` per request, and must not
+close the session. ``close_http_sessions()`` runs in the FastAPI lifespan.
+Sessions are per loop because aiohttp sessions can't be shared across
+event loops (worker threads running their own loop get their own pool).
+A session holds its loop, so each one is closed and dropped when its loop
+ends: a watcher task is cancelled by ``asyncio.run`` on exit and closes it,
+and sessions of loops closed some other way are dropped on the next lookup.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+# Default for requests that don't pass their own timeout
+HTTP_DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "30"))
+
+
+class HttpClientManager:
+    """One pooled ``aiohttp.ClientSession`` per event loop."""
+
+    def __init__(
+        self,
+        limit: int = HTTP_POOL_LIMIT,
+        limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = HTTP_DNS_CACHE_TTL,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        # Per-loop task that closes the loop's session when the loop shuts down
+        self._watchers: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.sessions_created = 0
+
+    def session(self) -> aiohttp.ClientSession:
+        """The running loop's shared session (created on first use)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._drop_closed_loops()
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    use_dns_cache=True,
+                )
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=HTTP_DEFAULT_TIMEOUT),
+                )
+                self._sessions[loop] = session
+                self.sessions_created += 1
+                if loop not in self._watchers:
+                    self._watchers[loop] = loop.create_task(self._close_with_loop(loop))
+            return session
+
+    def _drop_closed_loops(self) -> None:
+        """Forget sessions of loops closed without cancelling their tasks (caller holds the lock)."""
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            self._sessions.pop(loop, None)
+            self._watchers.pop(loop, None)
+
+    async def _close_with_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            # Never resolves; asyncio.run cancels leftover tasks before closing the loop
+            await loop.create_future()
+        finally:
+            with self._lock:
+                session = self._sessions.pop(loop, None)
+                self._watchers.pop(loop, None)
+            if session is not None and not session.closed:
+                await session.close()
+
+    async def close(self) -> None:
+        """Close the running loop's session; sessions of other (finished) loops are dropped."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sessions = list(self._sessions.items())
+            watchers = dict(self._watchers)
+            self._sessions.clear()
+            self._watchers.clear()
+        for session_loop, watcher in watchers.items():
+            if session_loop is loop:
+                watcher.cancel()
+            elif not session_loop.is_closed():
+                session_loop.call_soon_threadsafe(watcher.cancel)
+        for session_loop, session in sessions:
+            if session.closed:
+                continue
+            if session_loop is loop:
+                await session.close()
+            elif not session_loop.is_closed() and session_loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+        logger.info(f"[HTTP] closed {len(sessions)} pooled session(s)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pools = []
+            for session in self._sessions.values():
+                connector = session.connector
+                pools.append({
+                    "closed": session.closed,
+                    # Idle keep-alive connections, by host
+                    "idle": sum(len(conns) for conns in getattr(connector, "_conns", {}).values()),
+                    "in_use": len(getattr(connector, "_acquired", ())),
+                })
+            return {
+                "limit": self.limit,
+                "limit_per_host": self.limit_per_host,
+                "sessions_created": self.sessions_created,
+                "pools": pools,
+            }
+
+
+_manager: Optional[HttpClientManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_http_client_manager() -> HttpClientManager:
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = HttpClientManager()
+    return _manager
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Shared pooled session for the running loop. Don't close it."""
+    return get_http_client_manager().session()
+
+
+async def close_http_sessions() -> None:
+    if _manager is not None:
+        await _manager.close()
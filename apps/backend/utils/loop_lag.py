@@ -0,0 +1,89 @@
+"""
+Event-loop lag monitor.
+
+A background task sleeps for a fixed interval and records how late it wakes
+up. Anything that holds the loop (CPU-bound post-processing, blocking I/O)
+shows up as lag, which every concurrent request on the worker pays for —
+e.g. SSE streams of other decks stall for that long.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.1"))
+LOOP_LAG_WINDOW = int(os.getenv("LOOP_LAG_WINDOW", "3000"))
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LoopLagMonitor:
+    """Samples loop lag every ``interval`` seconds; keeps the last ``window`` samples."""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, window: int = LOOP_LAG_WINDOW):
+        self.interval = interval
+        self._samples: deque = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self._started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._started_at = time.time()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self._samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def reset(self) -> None:
+        self._samples.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        samples = sorted(self._samples)
+        count = len(samples)
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "samples": count,
+            "mean_ms": round(sum(samples) / count * 1000, 2) if count else 0.0,
+            "p50_ms": round(_percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(_percentile(samples, 0.99) * 1000, 2),
+            "max_ms": round(samples[-1] * 1000, 2) if count else 0.0,
+            "over_100ms": sum(1 for s in samples if s > 0.1),
+        }
+
+
+_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_lag_monitor() -> LoopLagMonitor:
+    global _monitor
+    if _monitor is None:
+        _monitor = LoopLagMonitor()
+    return _monitor
@@ -5,62 +5,65 @@ from utils.numbers import round_numbers
 from utils.images import image_exists
 
 
-def build_deck_digest(deck_data, current_slide_id=None):
-    """Produce a lightweight deck digest used for caching/prompting."""
-
-    if not deck_data:
-        return {
-            "summary_text": "Deck unavailable",
-            "slides": [],
-            "meta": {"slide_count": 0},
-        }
-
+def deck_title(deck_data):
     title = getattr(deck_data, "name", None)
     if title is None and isinstance(deck_data, dict):
         title = deck_data.get("title") or deck_data.get("name")
-    title = title or "Untitled Deck"
+    return title or "Untitled Deck"
 
+
+def deck_slides(deck_data):
     if hasattr(deck_data, "slides"):
-        slides_iter = list(getattr(deck_data, "slides", []) or [])
-    elif isinstance(deck_data, dict):
-        slides_iter = list(deck_data.get("slides", []) or [])
+        return list(getattr(deck_data, "slides", []) or [])
+    if isinstance(deck_data, dict):
+        return list(deck_data.get("slides", []) or [])
+    return []
+
+
+def build_slide_digest(slide, index):
+    """Digest entry for one slide; position-dependent fields are filled in by assemble_deck_digest."""
+    slide_id = getattr(slide, "id", None)
+    if slide_id is None and isinstance(slide, dict):
+        slide_id = slide.get("id")
+
+    slide_title = getattr(slide, "title", None)
+    if slide_title is None and isinstance(slide, dict):
+        slide_title = slide.get("title")
+
+    if hasattr(slide, "components"):
+        components = list(getattr(slide, "components", []) or [])
+    elif isinstance(slide, dict):
+        components = list(slide.get("components", []) or [])
     else:
-        slides_iter = []
+        components = []
 
-    slides_meta = []
-    for index, slide in enumerate(slides_iter):
-        slide_id = getattr(slide, "id", None)
-        if slide_id is None and isinstance(slide, dict):
-            slide_id = slide.get("id")
-
-        slide_title = getattr(slide, "title", None)
-        if slide_title is None and isinstance(slide, dict):
-            slide_title = slide.get("title")
-        slide_title = slide_title or f"Slide {index + 1}"
-
-        if hasattr(slide, "components"):
-            components = list(getattr(slide, "components", []) or [])
-        elif isinstance(slide, dict):
-            components = list(slide.get("components", []) or [])
-        else:
-            components = []
-
-        component_types = []
-        for comp in components:
-            ctype = getattr(comp, "type", None)
-            if ctype is None and isinstance(comp, dict):
-                ctype = comp.get("type")
-            if ctype:
-                component_types.append(str(ctype))
+    component_types = []
+    for comp in components:
+        ctype = getattr(comp, "type", None)
+        if ctype is None and isinstance(comp, dict):
+            ctype = comp.get("type")
+        if ctype:
+            component_types.append(str(ctype))
+
+    return {
+        "id": slide_id,
+        "title": slide_title,
+        "index": index,
+        "componentCount": len(components),
+        "componentTypes": component_types[:6],
+    }
 
+
+def assemble_deck_digest(title, slide_digests, current_slide_id=None):
+    """Build the deck digest from per-slide entries (see build_slide_digest)."""
+    slides_meta = []
+    for index, entry in enumerate(slide_digests):
         slides_meta.append(
             {
-                "id": slide_id,
-                "title": slide_title,
+                **entry,
+                "title": entry.get("title") or f"Slide {index + 1}",
                 "index": index,
-                "componentCount": len(components),
-                "componentTypes": component_types[:6],
-                "isCurrent": bool(current_slide_id and slide_id == current_slide_id),
+                "isCurrent": bool(current_slide_id and entry.get("id") == current_slide_id),
             }
         )
 
@@ -82,6 +85,20 @@ def build_deck_digest(deck_data, current_slide_id=None):
         "meta": {"title": title, "slide_count": len(slides_meta)},
     }
 
+
+def build_deck_digest(deck_data, current_slide_id=None):
+    """Produce a lightweight deck digest used for caching/prompting."""
+
+    if not deck_data:
+        return {
+            "summary_text": "Deck unavailable",
+            "slides": [],
+            "meta": {"slide_count": 0},
+        }
+
+    slide_digests = [build_slide_digest(slide, index) for index, slide in enumerate(deck_slides(deck_data))]
+    return assemble_deck_digest(deck_title(deck_data), slide_digests, current_slide_id=current_slide_id)
+
 def summarize_chat_history(chat_history):
     chat_history_str = ""
     for message in chat_history:
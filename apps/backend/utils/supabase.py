@@ -439,4 +439,66 @@ def update_deck_notes(deck_uuid: str, notes: Dict[str, Any]) -> bool:
             
     except Exception as e:
         logger.error(f"Error updating deck notes: {e}")
-        return False 
\ No newline at end of file
+        return False
+
+
+def update_deck_slides_if_version(
+    deck_uuid: str,
+    slides: Any,
+    expected_version: Optional[str],
+    user_id: Optional[str] = None,
+    expected_last_modified: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Write a deck's slides in a single UPDATE guarded by an optimistic version check.
+
+    Only ``slides``, ``version`` and ``last_modified`` (plus ``user_id`` when given)
+    are sent, and the row is only touched if its version still equals
+    ``expected_version`` and, when given, its last_modified still equals
+    ``expected_last_modified``. UI saves (PUT /auth/decks) don't send a version
+    and leave it unchanged, but always set last_modified.
+
+    Args:
+        deck_uuid: The UUID of the deck to update
+        slides: The full slides list to store
+        expected_version: The version the caller read; None matches a NULL version
+        user_id: Optional user ID to set on the deck
+        expected_last_modified: The last_modified the caller read; None skips that check
+
+    Returns:
+        Dict with the new ``version`` and ``last_modified`` on success, None if the
+        deck was modified concurrently (or does not exist)
+    """
+    from datetime import datetime
+
+    logger = logging.getLogger(__name__)
+    supabase = get_supabase_client()
+
+    new_version = str(uuid.uuid4())
+    last_modified = datetime.utcnow().isoformat()
+    record: Dict[str, Any] = {"slides": slides, "version": new_version, "last_modified": last_modified}
+    if user_id:
+        record["user_id"] = user_id
+
+    def _update():
+        query = supabase.table("decks").update(record).eq("uuid", deck_uuid)
+        if expected_version is None:
+            query = query.is_("version", "null")
+        else:
+            query = query.eq("version", expected_version)
+        if expected_last_modified is not None:
+            query = query.eq("last_modified", expected_last_modified)
+        return query.execute()
+
+    # Single attempt: retrying a write that may have landed would turn into a false conflict
+    response = perform_supabase_operation_with_retry(
+        _update,
+        description=f"conditional slides update for deck {deck_uuid}",
+        max_attempts=1,
+        timeout_seconds=15.0
+    )
+    if not response.data:
+        logger.info(f"Deck {deck_uuid} changed since version {expected_version}; update skipped")
+        return None
+    # The stored form of the timestamp, so the next conditional update matches it
+    return {"version": new_version, "last_modified": response.data[0].get("last_modified") or last_modified}